@@ -55,6 +55,7 @@ def setup_app(pecan_config=None, extra_hooks=None):
                  hooks.DBHook(),
                  hooks.ContextHook(pecan_config.app.acl_public_routes),
                  hooks.RPCHook(),
+                 hooks.FeaturesHook(),
                  hooks.NoExceptionTracebackHook(),
                  hooks.PublicUrlHook()]
     if extra_hooks:
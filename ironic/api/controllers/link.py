@@ -31,6 +31,67 @@ def build_url(resource, resource_args, bookmark=False, base_url=None):
     return template % {'url': base_url, 'res': resource, 'args': resource_args}
 
 
+class LinkTemplates(object):
+    """Builder of the links to the resources of an API endpoint.
+
+    The URL prefix of the links to every resource is only computed once, so
+    that building the links of all the objects of a collection just
+    appends their identifiers to it.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self._prefixes = {}
+
+    def build_url(self, resource, resource_args, bookmark=False):
+        """Same as :func:`build_url`, for the base URL of this builder."""
+        query = resource_args.startswith('?')
+        key = (resource, bookmark, query)
+        try:
+            prefix = self._prefixes[key]
+        except KeyError:
+            prefix = build_url(resource, '?' if query else '',
+                               bookmark=bookmark, base_url=self.base_url)
+            if query:
+                prefix = prefix[:-1]
+            self._prefixes[key] = prefix
+        return prefix + resource_args
+
+    def make_link(self, rel_name, resource, resource_args, bookmark=False,
+                  type=wtypes.Unset):
+        """Same as :meth:`Link.make_link`, for the base URL of this builder."""
+        href = self.build_url(resource, resource_args, bookmark=bookmark)
+        return Link(href=href, rel=rel_name, type=type)
+
+    def make_links(self, resource, resource_args):
+        """Return the self and bookmark links to a resource."""
+        return [self.make_link('self', resource, resource_args),
+                self.make_link('bookmark', resource, resource_args,
+                               bookmark=True)]
+
+
+def get_templates(base_url):
+    """Return the link builder for a base URL.
+
+    Builders are cached until the end of the current request, see
+    :class:`ironic.api.hooks.PublicUrlHook`.
+
+    :param base_url: the base URL of the links.
+    :returns: a :class:`LinkTemplates` object.
+    """
+    try:
+        cache = pecan.request.link_templates
+    except AttributeError:
+        # NOTE: outside of a request, e.g. when building samples.
+        return LinkTemplates(base_url)
+
+    try:
+        return cache[base_url]
+    except KeyError:
+        templates = cache[base_url] = LinkTemplates(base_url)
+        return templates
+
+
 class Link(base.APIBase):
     """A link representation."""
 
@@ -0,0 +1,41 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import pecan
+from pecan import rest
+from six.moves import http_client
+
+from ironic.common import exception
+from ironic.common import metrics
+from ironic.common import policy
+from ironic.conf import CONF
+
+
+class MetricsController(rest.RestController):
+    """REST controller exposing the metrics of the API service.
+
+    The metrics are rendered in the Prometheus text exposition format, so
+    this endpoint is not versioned and does not return JSON.
+    """
+
+    @pecan.expose(content_type=metrics.CONTENT_TYPE)
+    def get(self):
+        if not CONF.metrics.expose_registry:
+            pecan.abort(http_client.NOT_FOUND)
+
+        cdict = pecan.request.context.to_policy_values()
+        try:
+            policy.authorize('baremetal:metrics:get', cdict, cdict)
+        except exception.HTTPForbidden as e:
+            pecan.abort(http_client.FORBIDDEN, str(e))
+
+        return metrics.REGISTRY.render()
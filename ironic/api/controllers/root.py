@@ -20,6 +20,7 @@ from wsme import types as wtypes
 
 from ironic.api.controllers import base
 from ironic.api.controllers import link
+from ironic.api.controllers import metrics
 from ironic.api.controllers import v1
 from ironic.api.controllers.v1 import versions
 from ironic.api import expose
@@ -101,6 +102,8 @@ class RootController(rest.RestController):
 
     v1 = v1.Controller()
 
+    metrics = metrics.MetricsController()
+
     @expose.expose(Root)
     def get(self):
         # NOTE: The reason why convert() it's being called for every
@@ -116,6 +119,6 @@ class RootController(rest.RestController):
         if the version number is not specified in the url.
         """
 
-        if args[0] and args[0] not in self._versions:
+        if args[0] and args[0] not in self._versions + ['metrics']:
             args = [self._default_version] + args
         return super(RootController, self)._route(args, request)
@@ -27,6 +27,7 @@ from ironic.api.controllers import base
 from ironic.api.controllers import link
 from ironic.api.controllers.v1 import chassis
 from ironic.api.controllers.v1 import driver
+from ironic.api.controllers.v1 import job
 from ironic.api.controllers.v1 import node
 from ironic.api.controllers.v1 import port
 from ironic.api.controllers.v1 import portgroup
@@ -94,6 +95,9 @@ class V1(base.APIBase):
     heartbeat = [link.Link]
     """Links to the heartbeat resource"""
 
+    jobs = [link.Link]
+    """Links to the jobs resource"""
+
     @staticmethod
     def convert():
         v1 = V1()
@@ -169,6 +173,14 @@ class V1(base.APIBase):
                                                 'heartbeat', '',
                                                 bookmark=True)
                             ]
+        if utils.allow_async_jobs():
+            v1.jobs = [link.Link.make_link('self', pecan.request.public_url,
+                                           'jobs', ''),
+                       link.Link.make_link('bookmark',
+                                           pecan.request.public_url,
+                                           'jobs', '',
+                                           bookmark=True)
+                       ]
         return v1
 
 
@@ -183,6 +195,7 @@ class Controller(rest.RestController):
     volume = volume.VolumeController()
     lookup = ramdisk.LookupController()
     heartbeat = ramdisk.HeartbeatController()
+    jobs = job.JobsController()
 
     @expose.expose(V1)
     def get(self):
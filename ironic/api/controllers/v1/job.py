@@ -0,0 +1,152 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+import pecan
+from pecan import rest
+from six.moves import http_client
+import wsme
+from wsme import types as wtypes
+
+from ironic.api.controllers import base
+from ironic.api.controllers import link
+from ironic.api.controllers.v1 import types
+from ironic.api.controllers.v1 import utils as api_utils
+from ironic.api import expose
+from ironic.common import exception
+from ironic.common import metrics_utils
+from ironic.common import policy
+from ironic.common import states as ir_states
+from ironic import objects
+
+METRICS = metrics_utils.get_metrics_logger(__name__)
+
+
+class Job(base.APIBase):
+    """API representation of an asynchronous job.
+
+    A job is created when a client asks for a long-running call to the
+    conductor to be run asynchronously, it tracks the outcome of that call.
+    """
+
+    uuid = types.uuid
+    """Unique UUID for this job"""
+
+    node_uuid = types.uuid
+    """The UUID of the node this job acts on"""
+
+    action = wtypes.text
+    """The conductor action run by this job"""
+
+    status = wtypes.text
+    """The status of this job: pending, running, success or error"""
+
+    result = {wtypes.text: types.jsontype}
+    """The result of the action, once the job succeeded"""
+
+    error = wtypes.text
+    """The error message, if the job failed"""
+
+    links = wsme.wsattr([link.Link], readonly=True)
+    """A list containing a self link and associated job links"""
+
+    def __init__(self, **kwargs):
+        self.fields = []
+        for field in objects.Job.fields:
+            # Skip fields we do not expose.
+            if not hasattr(self, field):
+                continue
+            self.fields.append(field)
+            setattr(self, field, kwargs.get(field, wtypes.Unset))
+
+        # NOTE: node_uuid is not part of objects.Job.fields because it's an
+        # API-only attribute.
+        self.fields.append('node_uuid')
+        setattr(self, 'node_uuid', kwargs.get('node_uuid', wtypes.Unset))
+
+    @staticmethod
+    def _convert_with_links(job, url):
+        job.links = [link.Link.make_link('self', url, 'jobs', job.uuid),
+                     link.Link.make_link('bookmark', url, 'jobs', job.uuid,
+                                         bookmark=True)]
+        return job
+
+    @classmethod
+    def convert_with_links(cls, rpc_job, node_uuid):
+        job = Job(node_uuid=node_uuid, **rpc_job.as_dict())
+        return cls._convert_with_links(job, pecan.request.public_url)
+
+    @classmethod
+    def sample(cls):
+        now = datetime.datetime(2000, 1, 1, 12, 0, 0)
+        sample = cls(uuid='1bd2e0c8-9b1e-4a3e-8a4c-6d0f3b9f1e6a',
+                     node_uuid='1be26c0b-03f2-4d2e-ae87-c02d7f33c123',
+                     action='get_boot_device',
+                     status=ir_states.JOB_SUCCESS,
+                     result={'boot_device': 'pxe', 'persistent': False},
+                     created_at=now,
+                     updated_at=now)
+        return cls._convert_with_links(sample, 'http://localhost:6385')
+
+
+def submit_job(rpc_node, action, topic, **kwargs):
+    """Run a conductor action asynchronously.
+
+    Store a job for the action and ask the conductor to run it, instead of
+    waiting for the conductor to return the result of the action.
+
+    :param rpc_node: RPC node object the action acts on.
+    :param action: the name of the conductor method to run, one of
+        :data:`ironic.conductor.utils.JOB_ACTIONS`.
+    :param topic: RPC topic of the conductor managing the node.
+    :param kwargs: arguments of the conductor method, except for the
+        context and the node ID.
+    :returns: A WSME response object with the newly created job, to be
+        returned by the API with a 202 status code.
+    """
+    context = pecan.request.context
+    rpc_job = objects.Job(context, node_id=rpc_node.id, action=action,
+                          args=kwargs, status=ir_states.JOB_PENDING)
+    rpc_job.create()
+    pecan.request.rpcapi.run_job(context, rpc_job.uuid, topic=topic)
+
+    pecan.response.location = link.build_url('jobs', rpc_job.uuid)
+    return wsme.api.Response(Job.convert_with_links(rpc_job, rpc_node.uuid),
+                             status_code=http_client.ACCEPTED,
+                             return_type=Job)
+
+
+class JobsController(rest.RestController):
+    """REST controller for asynchronous jobs."""
+
+    @METRICS.timer('JobsController.get_one')
+    @expose.expose(Job, types.uuid)
+    def get_one(self, job_uuid):
+        """Retrieve information about the given job.
+
+        :param job_uuid: UUID of a job.
+        :returns: API-serializable job object.
+        :raises: NotFound if requested version of the API doesn't support
+                 jobs.
+        :raises: JobNotFound if no job exists with the specified UUID.
+        """
+        if not api_utils.allow_async_jobs():
+            raise exception.NotFound()
+
+        cdict = pecan.request.context.to_policy_values()
+        policy.authorize('baremetal:job:get', cdict, cdict)
+
+        rpc_job = objects.Job.get_by_uuid(pecan.request.context, job_uuid)
+        rpc_node = objects.Node.get_by_id(pecan.request.context,
+                                          rpc_job.node_id)
+        return Job.convert_with_links(rpc_job, rpc_node.uuid)
@@ -13,15 +13,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import datetime
 
-from ironic_lib import metrics_utils
 import jsonschema
 from oslo_log import log
 from oslo_utils import strutils
 from oslo_utils import uuidutils
 import pecan
 from pecan import rest
+import six
 from six.moves import http_client
 import wsme
 from wsme import types as wtypes
@@ -29,16 +30,17 @@ from wsme import types as wtypes
 from ironic.api.controllers import base
 from ironic.api.controllers import link
 from ironic.api.controllers.v1 import collection
+from ironic.api.controllers.v1 import job as job_api
 from ironic.api.controllers.v1 import notification_utils as notify
 from ironic.api.controllers.v1 import port
 from ironic.api.controllers.v1 import portgroup
 from ironic.api.controllers.v1 import types
 from ironic.api.controllers.v1 import utils as api_utils
-from ironic.api.controllers.v1 import versions
 from ironic.api.controllers.v1 import volume
 from ironic.api import expose
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics_utils
 from ironic.common import policy
 from ironic.common import states as ir_states
 from ironic.conductor import utils as conductor_utils
@@ -80,6 +82,41 @@ _CLEAN_STEPS_SCHEMA = {
     }
 }
 
+_BULK_ACTION_SCHEMA = {
+    "$schema": "http://json-schema.org/schema#",
+    "title": "Bulk node action schema",
+    "type": "object",
+    "required": ["action", "target", "nodes"],
+    "properties": {
+        "action": {
+            "description": "action to apply to every node",
+            "enum": list(conductor_utils.BULK_NODE_ACTIONS)
+        },
+        "target": {
+            "description": "power state, provision state or maintenance "
+                           "mode to move the nodes to",
+            "type": ["string", "boolean"]
+        },
+        "nodes": {
+            "description": "UUIDs or logical names of the nodes",
+            "type": "array",
+            "items": {"type": "string", "minLength": 1},
+            "minItems": 1,
+            "uniqueItems": True
+        },
+        "timeout": {
+            "description": "timeout of the power action",
+            "type": "integer",
+            "minimum": 1
+        },
+        "reason": {
+            "description": "reason for setting maintenance mode",
+            "type": "string"
+        },
+    },
+    "additionalProperties": False
+}
+
 METRICS = metrics_utils.get_metrics_logger(__name__)
 
 # Vendor information for node's driver:
@@ -101,6 +138,13 @@ PROVISION_ACTION_STATES = (ir_states.VERBS['manage'],
                            ir_states.VERBS['abort'],
                            ir_states.VERBS['adopt'])
 
+# Provision states and verbs which can be requested with a bulk action.
+# Actions requiring additional per-node arguments (configdrive, clean_steps)
+# are not supported in bulk.
+BULK_PROVISION_TARGETS = ((ir_states.ACTIVE, ir_states.REBUILD,
+                           ir_states.DELETED, ir_states.VERBS['inspect']) +
+                          PROVISION_ACTION_STATES)
+
 _NODES_CONTROLLER_RESERVED_WORDS = None
 
 ALLOWED_TARGET_POWER_STATES = (ir_states.POWER_ON,
@@ -118,53 +162,65 @@ def get_nodes_controller_reserved_names():
     return _NODES_CONTROLLER_RESERVED_WORDS
 
 
-def hide_fields_in_newer_versions(obj):
+def hide_fields_in_newer_versions(obj, features=None):
     """This method hides fields that were added in newer API versions.
 
     Certain node fields were introduced at certain API versions.
     These fields are only made available when the request's API version
     matches or exceeds the versions when these fields were introduced.
+
+    :param obj: The node object being returned to the API client.
+    :param features: The bitmap of the API features available to the
+        request, defaults to the features of the current request.
     """
-    if pecan.request.version.minor < versions.MINOR_3_DRIVER_INTERNAL_INFO:
+    if features is None:
+        features = api_utils.get_request_features()
+
+    if not features & api_utils.FEATURE_DRIVER_INTERNAL_INFO:
         obj.driver_internal_info = wsme.Unset
 
-    if not api_utils.allow_node_logical_names():
+    if not features & api_utils.FEATURE_NODE_LOGICAL_NAMES:
         obj.name = wsme.Unset
 
     # if requested version is < 1.6, hide inspection_*_at fields
-    if pecan.request.version.minor < versions.MINOR_6_INSPECT_STATE:
+    if not features & api_utils.FEATURE_INSPECT_STATE:
         obj.inspection_finished_at = wsme.Unset
         obj.inspection_started_at = wsme.Unset
 
-    if pecan.request.version.minor < versions.MINOR_7_NODE_CLEAN:
+    if not features & api_utils.FEATURE_NODE_CLEAN:
         obj.clean_step = wsme.Unset
 
-    if pecan.request.version.minor < versions.MINOR_12_RAID_CONFIG:
+    if not features & api_utils.FEATURE_RAID_CONFIG:
         obj.raid_config = wsme.Unset
         obj.target_raid_config = wsme.Unset
 
-    if pecan.request.version.minor < versions.MINOR_20_NETWORK_INTERFACE:
+    if not features & api_utils.FEATURE_NETWORK_INTERFACE:
         obj.network_interface = wsme.Unset
 
-    if not api_utils.allow_resource_class():
+    if not features & api_utils.FEATURE_RESOURCE_CLASS:
         obj.resource_class = wsme.Unset
 
-    if not api_utils.allow_dynamic_interfaces():
+    if not features & api_utils.FEATURE_DYNAMIC_INTERFACES:
         for field in api_utils.V31_FIELDS:
             setattr(obj, field, wsme.Unset)
 
-    if not api_utils.allow_storage_interface():
+    if not features & api_utils.FEATURE_STORAGE_INTERFACE:
         obj.storage_interface = wsme.Unset
 
 
-def update_state_in_older_versions(obj):
+def update_state_in_older_versions(obj, features=None):
     """Change provision state names for API backwards compatibility.
 
     :param obj: The object being returned to the API client that is
                 to be updated by this method.
+    :param features: The bitmap of the API features available to the
+        request, defaults to the features of the current request.
     """
+    if features is None:
+        features = api_utils.get_request_features()
+
     # if requested version is < 1.2, convert AVAILABLE to the old NOSTATE
-    if (pecan.request.version.minor < versions.MINOR_2_AVAILABLE_STATE and
+    if (not features & api_utils.FEATURE_AVAILABLE_STATE and
             obj.provision_state == ir_states.AVAILABLE):
         obj.provision_state = ir_states.NOSTATE
 
@@ -216,6 +272,11 @@ class BootDeviceController(rest.RestController):
 
         rpc_node = api_utils.get_rpc_node(node_ident)
         topic = pecan.request.rpcapi.get_topic_for(rpc_node)
+        if api_utils.is_async_job_requested():
+            return job_api.submit_job(rpc_node, 'set_boot_device', topic,
+                                      device=boot_device,
+                                      persistent=persistent)
+
         pecan.request.rpcapi.set_boot_device(pecan.request.context,
                                              rpc_node.uuid,
                                              boot_device,
@@ -239,6 +300,11 @@ class BootDeviceController(rest.RestController):
         cdict = pecan.request.context.to_policy_values()
         policy.authorize('baremetal:node:get_boot_device', cdict, cdict)
 
+        if api_utils.is_async_job_requested():
+            rpc_node = api_utils.get_rpc_node(node_ident)
+            topic = pecan.request.rpcapi.get_topic_for(rpc_node)
+            return job_api.submit_job(rpc_node, 'get_boot_device', topic)
+
         return self._get_boot_device(node_ident)
 
     @METRICS.timer('BootDeviceController.supported')
@@ -288,6 +354,9 @@ class InjectNmiController(rest.RestController):
 
         rpc_node = api_utils.get_rpc_node(node_ident)
         topic = pecan.request.rpcapi.get_topic_for(rpc_node)
+        if api_utils.is_async_job_requested():
+            return job_api.submit_job(rpc_node, 'inject_nmi', topic)
+
         pecan.request.rpcapi.inject_nmi(pecan.request.context,
                                         rpc_node.uuid,
                                         topic=topic)
@@ -512,26 +581,7 @@ class NodeStatesController(rest.RestController):
         rpc_node = api_utils.get_rpc_node(node_ident)
         topic = pecan.request.rpcapi.get_topic_for(rpc_node)
 
-        if ((target in [ir_states.SOFT_REBOOT, ir_states.SOFT_POWER_OFF] or
-             timeout) and not api_utils.allow_soft_power_off()):
-            raise exception.NotAcceptable()
-        # FIXME(naohirot): This check is workaround because
-        #                  wtypes.IntegerType(minimum=1) is not effective
-        if timeout is not None and timeout < 1:
-            raise exception.Invalid(
-                _("timeout has to be positive integer"))
-
-        if target not in ALLOWED_TARGET_POWER_STATES:
-            raise exception.InvalidStateRequested(
-                action=target, node=node_ident,
-                state=rpc_node.power_state)
-
-        # Don't change power state for nodes being cleaned
-        elif rpc_node.provision_state in (ir_states.CLEANWAIT,
-                                          ir_states.CLEANING):
-            raise exception.InvalidStateRequested(
-                action=target, node=node_ident,
-                state=rpc_node.provision_state)
+        _check_power_target(rpc_node, node_ident, target, timeout)
 
         pecan.request.rpcapi.change_node_power_state(pecan.request.context,
                                                      rpc_node.uuid, target,
@@ -599,28 +649,7 @@ class NodeStatesController(rest.RestController):
         rpc_node = api_utils.get_rpc_node(node_ident)
         topic = pecan.request.rpcapi.get_topic_for(rpc_node)
 
-        if (target in (ir_states.ACTIVE, ir_states.REBUILD)
-                and rpc_node.maintenance):
-            raise exception.NodeInMaintenance(op=_('provisioning'),
-                                              node=rpc_node.uuid)
-
-        m = ir_states.machine.copy()
-        m.initialize(rpc_node.provision_state)
-        if not m.is_actionable_event(ir_states.VERBS.get(target, target)):
-            # Normally, we let the task manager recognize and deal with
-            # NodeLocked exceptions. However, that isn't done until the RPC
-            # calls below.
-            # In order to main backward compatibility with our API HTTP
-            # response codes, we have this check here to deal with cases where
-            # a node is already being operated on (DEPLOYING or such) and we
-            # want to continue returning 409. Without it, we'd return 400.
-            if rpc_node.reservation:
-                raise exception.NodeLocked(node=rpc_node.uuid,
-                                           host=rpc_node.reservation)
-
-            raise exception.InvalidStateRequested(
-                action=target, node=rpc_node.uuid,
-                state=rpc_node.provision_state)
+        _check_provision_target(rpc_node, target)
 
         if configdrive and target != ir_states.ACTIVE:
             msg = (_('Adding a config drive is only supported when setting '
@@ -673,6 +702,192 @@ class NodeStatesController(rest.RestController):
         pecan.response.location = link.build_url('nodes', url_args)
 
 
+def _bulk_result(exc):
+    """Convert an exception into a failed bulk action result entry."""
+    return {'success': False,
+            'error': six.text_type(exc),
+            'code': getattr(exc, 'code', http_client.INTERNAL_SERVER_ERROR)}
+
+
+def _get_bulk_action_policy(bulk_action):
+    """Get the policy rule of the per-node call of a bulk node action.
+
+    :param bulk_action: the body of a bulk node action request.
+    :returns: the name of the policy rule to authorize.
+    """
+    action = bulk_action['action']
+    if action == 'power':
+        return 'baremetal:node:set_power_state'
+    elif action == 'provision':
+        return 'baremetal:node:set_provision_state'
+    elif bulk_action['target']:
+        return 'baremetal:node:set_maintenance'
+    else:
+        return 'baremetal:node:clear_maintenance'
+
+
+def _group_bulk_nodes(bulk_action, results):
+    """Validate the nodes of a bulk node action and group them by conductor.
+
+    :param bulk_action: the body of a bulk node action request.
+    :param results: a dictionary updated with the failed result of the
+        nodes which cannot be acted on, by node identifier.
+    :returns: an ordered dictionary mapping the RPC topic of every conductor
+        to an ordered dictionary mapping the UUID of its nodes to tuples
+        (node identifier, RPC node).
+    """
+    action = bulk_action['action']
+    target = bulk_action['target']
+    batches = collections.OrderedDict()
+    for node_ident in bulk_action['nodes']:
+        try:
+            rpc_node = api_utils.get_rpc_node(node_ident)
+            topic = pecan.request.rpcapi.get_topic_for(rpc_node)
+            if action == 'power':
+                _check_power_target(rpc_node, node_ident, target,
+                                    bulk_action.get('timeout'))
+            elif action == 'provision':
+                _check_provision_target(rpc_node, target)
+        except exception.IronicException as e:
+            results[node_ident] = _bulk_result(e)
+            continue
+        batches.setdefault(topic, collections.OrderedDict())[
+            rpc_node.uuid] = (node_ident, rpc_node)
+    return batches
+
+
+def _run_bulk_batch(context, topic, batch, bulk_action):
+    """Send the nodes of a bulk node action mapped to one conductor.
+
+    :param context: the request context.
+    :param topic: the RPC topic of the conductor.
+    :param batch: an ordered dictionary mapping node UUIDs to tuples
+        (node identifier, RPC node).
+    :param bulk_action: the body of a bulk node action request.
+    :returns: a dictionary mapping the UUID of every failed node to a
+        dictionary with 'error' and 'code' keys.
+    """
+    action = bulk_action['action']
+    target = bulk_action['target']
+    reason = bulk_action.get('reason')
+    if action == 'maintenance':
+        for node_ident, rpc_node in batch.values():
+            rpc_node.maintenance = target
+            rpc_node.maintenance_reason = reason if target else None
+            notify.emit_start_notification(context, rpc_node,
+                                           'maintenance_set')
+    try:
+        return pecan.request.rpcapi.bulk_node_action(
+            context, list(batch), action, target,
+            timeout=bulk_action.get('timeout'), reason=reason, topic=topic)
+    except Exception as e:
+        LOG.warning('Bulk action %(action)s failed for nodes %(nodes)s: '
+                    '%(err)s', {'action': action, 'nodes': ', '.join(batch),
+                                'err': e})
+        return dict.fromkeys(
+            batch, {'error': six.text_type(e),
+                    'code': getattr(e, 'code',
+                                    http_client.SERVICE_UNAVAILABLE)})
+
+
+def _collate_bulk_results(context, action, batch, batch_results, results):
+    """Record the results of the nodes of a bulk node action batch.
+
+    :param context: the request context.
+    :param action: the bulk node action.
+    :param batch: an ordered dictionary mapping node UUIDs to tuples
+        (node identifier, RPC node).
+    :param batch_results: a dictionary mapping the UUID of every failed
+        node to a dictionary with 'error' and 'code' keys.
+    :param results: a dictionary updated with the result of every node, by
+        node identifier.
+    """
+    for node_uuid, (node_ident, rpc_node) in batch.items():
+        error = batch_results.get(node_uuid)
+        if error is None:
+            results[node_ident] = {'success': True}
+        else:
+            results[node_ident] = dict(error, success=False)
+        if action == 'maintenance':
+            if error is None:
+                notify.emit_end_notification(context, rpc_node,
+                                             'maintenance_set')
+            else:
+                notify.emit_error_notification(context, rpc_node,
+                                               'maintenance_set')
+
+
+def _check_power_target(rpc_node, node_ident, target, timeout=None):
+    """Ensure the power state of the node can be changed to the target.
+
+    :param rpc_node: RPC node object.
+    :param node_ident: the UUID or logical name of the node, used for error
+        messages.
+    :param target: The desired power state of the node.
+    :param timeout: timeout (in seconds) of the power action or None.
+    :raises: NotAcceptable for soft reboot, soft power off or timeout
+        parameter, if requested version of the API is less than 1.27.
+    :raises: Invalid if timeout value is less than 1.
+    :raises: InvalidStateRequested if the requested target state is not
+        valid or if the node is in CLEANING state.
+    """
+    if ((target in [ir_states.SOFT_REBOOT, ir_states.SOFT_POWER_OFF] or
+         timeout) and not api_utils.allow_soft_power_off()):
+        raise exception.NotAcceptable()
+    # FIXME(naohirot): This check is workaround because
+    #                  wtypes.IntegerType(minimum=1) is not effective
+    if timeout is not None and timeout < 1:
+        raise exception.Invalid(
+            _("timeout has to be positive integer"))
+
+    if target not in ALLOWED_TARGET_POWER_STATES:
+        raise exception.InvalidStateRequested(
+            action=target, node=node_ident,
+            state=rpc_node.power_state)
+
+    # Don't change power state for nodes being cleaned
+    elif rpc_node.provision_state in (ir_states.CLEANWAIT,
+                                      ir_states.CLEANING):
+        raise exception.InvalidStateRequested(
+            action=target, node=node_ident,
+            state=rpc_node.provision_state)
+
+
+def _check_provision_target(rpc_node, target):
+    """Ensure the node can be moved to the target provision state.
+
+    :param rpc_node: RPC node object.
+    :param target: The desired provision state of the node or verb.
+    :raises: NodeInMaintenance if the node is in maintenance mode and
+        the target requires provisioning.
+    :raises: NodeLocked if the node is being operated on.
+    :raises: InvalidStateRequested if the requested transition is not
+        possible from the current state.
+    """
+    if (target in (ir_states.ACTIVE, ir_states.REBUILD)
+            and rpc_node.maintenance):
+        raise exception.NodeInMaintenance(op=_('provisioning'),
+                                          node=rpc_node.uuid)
+
+    m = ir_states.frozen_machine.cursor()
+    m.initialize(rpc_node.provision_state)
+    if not m.is_actionable_event(ir_states.VERBS.get(target, target)):
+        # Normally, we let the task manager recognize and deal with
+        # NodeLocked exceptions. However, that isn't done until the RPC
+        # calls below.
+        # In order to main backward compatibility with our API HTTP
+        # response codes, we have this check here to deal with cases where
+        # a node is already being operated on (DEPLOYING or such) and we
+        # want to continue returning 409. Without it, we'd return 400.
+        if rpc_node.reservation:
+            raise exception.NodeLocked(node=rpc_node.uuid,
+                                       host=rpc_node.reservation)
+
+        raise exception.InvalidStateRequested(
+            action=target, node=rpc_node.uuid,
+            state=rpc_node.provision_state)
+
+
 def _check_clean_steps(clean_steps):
     """Ensure all necessary keys are present and correct in clean steps.
 
@@ -690,6 +905,52 @@ def _check_clean_steps(clean_steps):
                                               exc)
 
 
+def _check_bulk_action(bulk_action):
+    """Ensure a bulk node action request is well formed.
+
+    :param bulk_action: the body of a bulk node action request. For more
+        details, see the bulk_action parameter of
+        :func:`NodesController.bulk`.
+    :raises: InvalidParameterValue if validation of the request fails.
+    """
+    try:
+        jsonschema.validate(bulk_action, _BULK_ACTION_SCHEMA)
+    except jsonschema.ValidationError as exc:
+        raise exception.InvalidParameterValue(
+            _('Invalid bulk node action: %s') % exc)
+
+    action = bulk_action['action']
+    target = bulk_action['target']
+    if action == 'maintenance':
+        if not isinstance(target, bool):
+            raise exception.InvalidParameterValue(
+                _('The target of the "maintenance" bulk action must be a '
+                  'boolean, got %s') % target)
+    elif not isinstance(target, six.string_types):
+        raise exception.InvalidParameterValue(
+            _('The target of the "%(action)s" bulk action must be a '
+              'string, got %(target)s') % {'action': action,
+                                           'target': target})
+
+    if action != 'power' and 'timeout' in bulk_action:
+        raise exception.InvalidParameterValue(
+            _('"timeout" is only valid for the "power" bulk action'))
+    if action != 'maintenance' and 'reason' in bulk_action:
+        raise exception.InvalidParameterValue(
+            _('"reason" is only valid for the "maintenance" bulk action'))
+    if action == 'provision' and target not in BULK_PROVISION_TARGETS:
+        raise exception.InvalidParameterValue(
+            _('The provision state "%(target)s" can not be requested with '
+              'a bulk action. Valid values are: %(valid)s') %
+            {'target': target, 'valid': ', '.join(BULK_PROVISION_TARGETS)})
+
+    max_nodes = CONF.api.max_limit
+    if len(bulk_action['nodes']) > max_nodes:
+        raise exception.InvalidParameterValue(
+            _('A bulk node action can be applied to at most %d nodes') %
+            max_nodes)
+
+
 class Node(base.APIBase):
     """API representation of a bare metal node.
 
@@ -879,55 +1140,37 @@ class Node(base.APIBase):
 
     @staticmethod
     def _convert_with_links(node, url, fields=None, show_states_links=True,
-                            show_portgroups=True, show_volume=True):
+                            show_portgroups=True, show_volume=True,
+                            sub_links=True):
         # NOTE(lucasagomes): Since we are able to return a specified set of
         # fields the "uuid" can be unset, so we need to save it in another
         # variable to use when building the links
         node_uuid = node.uuid
+        templates = link.get_templates(url)
         if fields is not None:
             node.unset_fields_except(fields)
-        else:
-            node.ports = [link.Link.make_link('self', url, 'nodes',
-                                              node_uuid + "/ports"),
-                          link.Link.make_link('bookmark', url, 'nodes',
-                                              node_uuid + "/ports",
-                                              bookmark=True)
-                          ]
+        elif sub_links:
+            node.ports = templates.make_links('nodes', node_uuid + "/ports")
             if show_states_links:
-                node.states = [link.Link.make_link('self', url, 'nodes',
-                                                   node_uuid + "/states"),
-                               link.Link.make_link('bookmark', url, 'nodes',
-                                                   node_uuid + "/states",
-                                                   bookmark=True)]
+                node.states = templates.make_links('nodes',
+                                                   node_uuid + "/states")
             if show_portgroups:
-                node.portgroups = [
-                    link.Link.make_link('self', url, 'nodes',
-                                        node_uuid + "/portgroups"),
-                    link.Link.make_link('bookmark', url, 'nodes',
-                                        node_uuid + "/portgroups",
-                                        bookmark=True)]
+                node.portgroups = templates.make_links(
+                    'nodes', node_uuid + "/portgroups")
 
             if show_volume:
-                node.volume = [
-                    link.Link.make_link('self', url, 'nodes',
-                                        node_uuid + "/volume"),
-                    link.Link.make_link('bookmark', url, 'nodes',
-                                        node_uuid + "/volume",
-                                        bookmark=True)]
+                node.volume = templates.make_links('nodes',
+                                                   node_uuid + "/volume")
 
         # NOTE(lucasagomes): The numeric ID should not be exposed to
         #                    the user, it's internal only.
         node.chassis_id = wtypes.Unset
 
-        node.links = [link.Link.make_link('self', url, 'nodes',
-                                          node_uuid),
-                      link.Link.make_link('bookmark', url, 'nodes',
-                                          node_uuid, bookmark=True)
-                      ]
+        node.links = templates.make_links('nodes', node_uuid)
         return node
 
     @classmethod
-    def convert_with_links(cls, rpc_node, fields=None):
+    def convert_with_links(cls, rpc_node, fields=None, sub_links=True):
         node = Node(**rpc_node.as_dict())
 
         if fields is not None:
@@ -964,17 +1207,20 @@ class Node(base.APIBase):
             if node.instance_info.get('image_url'):
                 node.instance_info['image_url'] = "******"
 
-        update_state_in_older_versions(node)
-        hide_fields_in_newer_versions(node)
-        show_states_links = (
-            api_utils.allow_links_node_states_and_driver_properties())
-        show_portgroups = api_utils.allow_portgroups_subcontrollers()
-        show_volume = api_utils.allow_volume()
+        features = api_utils.get_request_features()
+        update_state_in_older_versions(node, features)
+        hide_fields_in_newer_versions(node, features)
+        show_states_links = bool(
+            features & api_utils.FEATURE_LINKS_NODE_STATES)
+        show_portgroups = bool(
+            features & api_utils.FEATURE_PORTGROUPS_SUBCONTROLLERS)
+        show_volume = bool(features & api_utils.FEATURE_VOLUME)
         return cls._convert_with_links(node, pecan.request.public_url,
                                        fields=fields,
                                        show_states_links=show_states_links,
                                        show_portgroups=show_portgroups,
-                                       show_volume=show_volume)
+                                       show_volume=show_volume,
+                                       sub_links=sub_links)
 
     @classmethod
     def sample(cls, expand=True):
@@ -1039,9 +1285,11 @@ class NodeCollection(collection.Collection):
         self._type = 'nodes'
 
     @staticmethod
-    def convert_with_links(nodes, limit, url=None, fields=None, **kwargs):
+    def convert_with_links(nodes, limit, url=None, fields=None,
+                           sub_links=True, **kwargs):
         collection = NodeCollection()
-        collection.nodes = [Node.convert_with_links(n, fields=fields)
+        collection.nodes = [Node.convert_with_links(n, fields=fields,
+                                                    sub_links=sub_links)
                             for n in nodes]
         collection.next = collection.get_next(limit, url=url, **kwargs)
         return collection
@@ -1054,6 +1302,26 @@ class NodeCollection(collection.Collection):
         return sample
 
 
+class NodeBulkActionResult(base.APIBase):
+    """API representation of the result of a bulk node action."""
+
+    nodes = {wtypes.text: types.jsontype}
+    """A dictionary mapping every requested node identifier to the result
+    of the action on that node: ``{"success": true}`` or
+    ``{"success": false, "error": <message>, "code": <HTTP status>}``"""
+
+    @classmethod
+    def sample(cls):
+        return cls(nodes={
+            '1be26c0b-03f2-4d2e-ae87-c02d7f33c123': {'success': True},
+            'database16-dc02': {
+                'success': False,
+                'error': 'Node database16-dc02 is locked by host '
+                         'conductor-1, please retry after the current '
+                         'operation is completed.',
+                'code': http_client.CONFLICT}})
+
+
 class NodeVendorPassthruController(rest.RestController):
     """REST controller for VendorPassthru.
 
@@ -1106,6 +1374,12 @@ class NodeVendorPassthruController(rest.RestController):
         # Raise an exception if node is not found
         rpc_node = api_utils.get_rpc_node(node_ident)
         topic = pecan.request.rpcapi.get_topic_for(rpc_node)
+        if method and api_utils.is_async_job_requested():
+            return job_api.submit_job(
+                rpc_node, 'vendor_passthru', topic, driver_method=method,
+                http_method=pecan.request.method.upper(),
+                info=data if data is not None else {})
+
         return api_utils.vendor_passthru(rpc_node.uuid, method, topic,
                                          data=data)
 
@@ -1211,6 +1485,10 @@ class NodeVIFController(rest.RestController):
         cdict = pecan.request.context.to_policy_values()
         policy.authorize('baremetal:node:vif:attach', cdict, cdict)
         rpc_node, topic = self._get_node_and_topic()
+        if api_utils.is_async_job_requested():
+            return job_api.submit_job(rpc_node, 'vif_attach', topic,
+                                      vif_info=vif)
+
         pecan.request.rpcapi.vif_attach(pecan.request.context, rpc_node.uuid,
                                         vif_info=vif, topic=topic)
 
@@ -1256,6 +1534,7 @@ class NodesController(rest.RestController):
     from the top-level resource Chassis"""
 
     _custom_actions = {
+        'bulk': ['POST'],
         'detail': ['GET'],
         'validate': ['GET'],
     }
@@ -1292,7 +1571,8 @@ class NodesController(rest.RestController):
                               maintenance, provision_state, marker, limit,
                               sort_key, sort_dir, driver=None,
                               resource_class=None,
-                              resource_url=None, fields=None):
+                              resource_url=None, fields=None,
+                              sub_links=True):
         if self.from_chassis and not chassis_uuid:
             raise exception.MissingParameterValue(
                 _("Chassis id not specified."))
@@ -1336,9 +1616,12 @@ class NodesController(rest.RestController):
             parameters['associated'] = associated
         if maintenance:
             parameters['maintenance'] = maintenance
+        if not sub_links:
+            parameters['links'] = False
         return NodeCollection.convert_with_links(nodes, limit,
                                                  url=resource_url,
                                                  fields=fields,
+                                                 sub_links=sub_links,
                                                  **parameters)
 
     def _get_nodes_by_instance(self, instance_uuid):
@@ -1481,11 +1764,11 @@ class NodesController(rest.RestController):
     @METRICS.timer('NodesController.detail')
     @expose.expose(NodeCollection, types.uuid, types.uuid, types.boolean,
                    types.boolean, wtypes.text, types.uuid, int, wtypes.text,
-                   wtypes.text, wtypes.text, wtypes.text)
+                   wtypes.text, wtypes.text, wtypes.text, types.boolean)
     def detail(self, chassis_uuid=None, instance_uuid=None, associated=None,
                maintenance=None, provision_state=None, marker=None,
                limit=None, sort_key='id', sort_dir='asc', driver=None,
-               resource_class=None):
+               resource_class=None, links=None):
         """Retrieve a list of nodes with detail.
 
         :param chassis_uuid: Optional UUID of a chassis, to get only nodes for
@@ -1511,6 +1794,8 @@ class NodesController(rest.RestController):
                        driver.
         :param resource_class: Optional string value to get only nodes with
                                that resource_class.
+        :param links: Optional boolean value, whether to include the links
+                      to the sub-resources of every node. Default: True.
         """
         cdict = pecan.request.context.to_policy_values()
         policy.authorize('baremetal:node:get', cdict, cdict)
@@ -1518,6 +1803,7 @@ class NodesController(rest.RestController):
         api_utils.check_for_invalid_state_and_allow_filter(provision_state)
         api_utils.check_allow_specify_driver(driver)
         api_utils.check_allow_specify_resource_class(resource_class)
+        api_utils.check_allow_links_parameter(links)
         api_utils.check_allowed_fields([sort_key])
         # /detail should only work against collections
         parent = pecan.request.path.split('/')[:-1][-1]
@@ -1531,7 +1817,8 @@ class NodesController(rest.RestController):
                                           limit, sort_key, sort_dir,
                                           driver=driver,
                                           resource_class=resource_class,
-                                          resource_url=resource_url)
+                                          resource_url=resource_url,
+                                          sub_links=links is not False)
 
     @METRICS.timer('NodesController.validate')
     @expose.expose(wtypes.text, types.uuid_or_name, types.uuid)
@@ -1557,9 +1844,71 @@ class NodesController(rest.RestController):
         rpc_node = api_utils.get_rpc_node(node_uuid or node)
 
         topic = pecan.request.rpcapi.get_topic_for(rpc_node)
+        if api_utils.is_async_job_requested():
+            return job_api.submit_job(rpc_node, 'validate_driver_interfaces',
+                                      topic)
+
         return pecan.request.rpcapi.validate_driver_interfaces(
             pecan.request.context, rpc_node.uuid, topic)
 
+    @METRICS.timer('NodesController.bulk')
+    @expose.expose(NodeBulkActionResult, body=types.jsontype,
+                   status_code=http_client.ACCEPTED)
+    def bulk(self, bulk_action):
+        """Apply the same action to several nodes.
+
+        The nodes are grouped by the conductor they are mapped to and a
+        single RPC carrying the whole group is sent to every conductor.
+        Like the corresponding per-node calls, the actions are only started
+        by this call; the client should GET the nodes to observe the outcome.
+
+        :param bulk_action: a dictionary with the following keys:
+
+            :action: one of "power", "provision" or "maintenance".
+            :nodes: a list of UUIDs or logical names of nodes.
+            :target: the desired power state for "power", the desired
+                provision state or verb for "provision", or a boolean value
+                telling whether to set or clear maintenance mode for
+                "maintenance".
+            :timeout: Optional. Timeout (in seconds) of the power action.
+            :reason: Optional. The reason for setting maintenance mode.
+
+        :returns: a NodeBulkActionResult with the result for every node.
+        :raises: NotFound if requested version of the API doesn't support
+                 bulk node actions.
+        :raises: InvalidParameterValue (HTTP 400) if the request is invalid.
+        :raises: NotAcceptable (HTTP 406) if the API version specified does
+                 not allow the requested target, or if the conductors are
+                 not able to run bulk node actions yet, e.g. during a
+                 rolling upgrade.
+        """
+        if not api_utils.allow_bulk_node_actions():
+            raise exception.NotFound()
+
+        if self.from_chassis:
+            raise exception.OperationNotPermitted()
+
+        if not pecan.request.rpcapi.can_run_bulk_node_actions():
+            # The RPC API is pinned during a rolling upgrade
+            raise exception.NotAcceptable()
+
+        context = pecan.request.context
+        _check_bulk_action(bulk_action)
+        cdict = context.to_policy_values()
+        policy.authorize(_get_bulk_action_policy(bulk_action), cdict, cdict)
+        if bulk_action['action'] == 'provision':
+            api_utils.check_allow_management_verbs(bulk_action['target'])
+
+        results = {}
+        batches = _group_bulk_nodes(bulk_action, results)
+        for topic, batch in batches.items():
+            batch_results = _run_bulk_batch(context, topic, batch,
+                                            bulk_action)
+            _collate_bulk_results(context, bulk_action['action'], batch,
+                                  batch_results, results)
+
+        return NodeBulkActionResult(nodes=results)
+
     @METRICS.timer('NodesController.get_one')
     @expose.expose(Node, types.uuid_or_name, types.listtype)
     def get_one(self, node_ident, fields=None):
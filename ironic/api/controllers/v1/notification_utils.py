@@ -64,6 +64,10 @@ def _emit_api_notification(context, obj, action, level, status, **kwargs):
                    `ironic.objects.fields.NotificationStatus.ALL`
     :param **kwargs: kwargs to use when creating the notification payload.
     """
+    # NOTE: avoid building and masking the payload if it won't be sent
+    if not notification.should_notify(level):
+        return
+
     resource = obj.__class__.__name__.lower()
     # value wsme.Unset can be passed from API representation of resource
     extra_args = {k: (v if v != wtypes.Unset else None)
@@ -152,6 +156,23 @@ def handle_error_notification(context, obj, action, **kwargs):
                                    **kwargs)
 
 
+def emit_error_notification(context, obj, action, **kwargs):
+    """Helper for emitting API 'error' notifications.
+
+    Used when the failure is not raised as an exception in the API, e.g.
+    when a conductor reports it in the result of a bulk action.
+
+    :param context: request context.
+    :param obj: resource rpc object.
+    :param action: Action string to go in the EventType.
+    :param **kwargs: kwargs to use when creating the notification payload.
+    """
+    _emit_api_notification(context, obj, action,
+                           fields.NotificationLevel.ERROR,
+                           fields.NotificationStatus.ERROR,
+                           **kwargs)
+
+
 def emit_end_notification(context, obj, action, **kwargs):
     """Helper for emitting API 'end' notifications.
 
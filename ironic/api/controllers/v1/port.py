@@ -15,7 +15,6 @@
 
 import datetime
 
-from ironic_lib import metrics_utils
 from oslo_utils import uuidutils
 import pecan
 from pecan import rest
@@ -32,6 +31,7 @@ from ironic.api.controllers.v1 import utils as api_utils
 from ironic.api import expose
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics_utils
 from ironic.common import policy
 from ironic.common import utils as common_utils
 from ironic import objects
@@ -43,19 +43,20 @@ _DEFAULT_RETURN_FIELDS = ('uuid', 'address')
 
 
 def hide_fields_in_newer_versions(obj):
+    features = api_utils.get_request_features()
     # if requested version is < 1.18, hide internal_info field
-    if not api_utils.allow_port_internal_info():
+    if not features & api_utils.FEATURE_PORT_INTERNAL_INFO:
         obj.internal_info = wsme.Unset
     # if requested version is < 1.19, hide local_link_connection and
     # pxe_enabled fields
-    if not api_utils.allow_port_advanced_net_fields():
+    if not features & api_utils.FEATURE_PORT_ADVANCED_NET_FIELDS:
         obj.pxe_enabled = wsme.Unset
         obj.local_link_connection = wsme.Unset
     # if requested version is < 1.24, hide portgroup_uuid field
-    if not api_utils.allow_portgroups_subcontrollers():
+    if not features & api_utils.FEATURE_PORTGROUPS_SUBCONTROLLERS:
         obj.portgroup_uuid = wsme.Unset
     # if requested version is < 1.34, hide physical_network field.
-    if not api_utils.allow_port_physical_network():
+    if not features & api_utils.FEATURE_PORT_PHYSICAL_NETWORK:
         obj.physical_network = wsme.Unset
 
 
@@ -199,12 +200,7 @@ class Port(base.APIBase):
         # never expose the portgroup_id attribute
         port.portgroup_id = wtypes.Unset
 
-        port.links = [link.Link.make_link('self', url,
-                                          'ports', port_uuid),
-                      link.Link.make_link('bookmark', url,
-                                          'ports', port_uuid,
-                                          bookmark=True)
-                      ]
+        port.links = link.get_templates(url).make_links('ports', port_uuid)
         return port
 
     @classmethod
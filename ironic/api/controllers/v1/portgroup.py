@@ -12,7 +12,6 @@
 
 import datetime
 
-from ironic_lib import metrics_utils
 from oslo_utils import uuidutils
 import pecan
 from six.moves import http_client
@@ -29,6 +28,7 @@ from ironic.api.controllers.v1 import utils as api_utils
 from ironic.api import expose
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics_utils
 from ironic.common import policy
 from ironic.common import utils as common_utils
 from ironic import objects
@@ -129,35 +129,27 @@ class Portgroup(base.APIBase):
         setattr(self, 'node_uuid', kwargs.get('node_id', wtypes.Unset))
 
     @staticmethod
-    def _convert_with_links(portgroup, url, fields=None):
+    def _convert_with_links(portgroup, url, fields=None, sub_links=True):
         """Add links to the portgroup."""
         # NOTE(lucasagomes): Since we are able to return a specified set of
         # fields the "uuid" can be unset, so we need to save it in another
         # variable to use when building the links
         portgroup_uuid = portgroup.uuid
+        templates = link.get_templates(url)
         if fields is not None:
             portgroup.unset_fields_except(fields)
-        else:
-            portgroup.ports = [
-                link.Link.make_link('self', url, 'portgroups',
-                                    portgroup_uuid + "/ports"),
-                link.Link.make_link('bookmark', url, 'portgroups',
-                                    portgroup_uuid + "/ports", bookmark=True)
-            ]
+        elif sub_links:
+            portgroup.ports = templates.make_links('portgroups',
+                                                   portgroup_uuid + "/ports")
 
         # never expose the node_id attribute
         portgroup.node_id = wtypes.Unset
 
-        portgroup.links = [link.Link.make_link('self', url,
-                                               'portgroups', portgroup_uuid),
-                           link.Link.make_link('bookmark', url,
-                                               'portgroups', portgroup_uuid,
-                                               bookmark=True)
-                           ]
+        portgroup.links = templates.make_links('portgroups', portgroup_uuid)
         return portgroup
 
     @classmethod
-    def convert_with_links(cls, rpc_portgroup, fields=None):
+    def convert_with_links(cls, rpc_portgroup, fields=None, sub_links=True):
         """Add links to the portgroup."""
         portgroup = Portgroup(**rpc_portgroup.as_dict())
 
@@ -165,7 +157,7 @@ class Portgroup(base.APIBase):
             api_utils.check_for_invalid_fields(fields, portgroup.as_dict())
 
         return cls._convert_with_links(portgroup, pecan.request.host_url,
-                                       fields=fields)
+                                       fields=fields, sub_links=sub_links)
 
     @classmethod
     def sample(cls, expand=True):
@@ -210,10 +202,12 @@ class PortgroupCollection(collection.Collection):
 
     @staticmethod
     def convert_with_links(rpc_portgroups, limit, url=None, fields=None,
-                           **kwargs):
+                           sub_links=True, **kwargs):
         collection = PortgroupCollection()
-        collection.portgroups = [Portgroup.convert_with_links(p, fields=fields)
-                                 for p in rpc_portgroups]
+        collection.portgroups = [
+            Portgroup.convert_with_links(p, fields=fields,
+                                         sub_links=sub_links)
+            for p in rpc_portgroups]
         collection.next = collection.get_next(limit, url=url, **kwargs)
         return collection
 
@@ -262,7 +256,8 @@ class PortgroupsController(pecan.rest.RestController):
 
     def _get_portgroups_collection(self, node_ident, address,
                                    marker, limit, sort_key, sort_dir,
-                                   resource_url=None, fields=None):
+                                   resource_url=None, fields=None,
+                                   sub_links=True):
         """Return portgroups collection.
 
         :param node_ident: UUID or name of a node.
@@ -274,6 +269,8 @@ class PortgroupsController(pecan.rest.RestController):
         :param resource_url: Optional, URL to the portgroup resource.
         :param fields: Optional, a list with a specified set of fields
                        of the resource to be returned.
+        :param sub_links: Optional, whether to include the links to the
+                          sub-resources of every portgroup. Default: True.
         """
         limit = api_utils.validate_limit(limit)
         sort_dir = api_utils.validate_sort_dir(sort_dir)
@@ -306,11 +303,14 @@ class PortgroupsController(pecan.rest.RestController):
                                                 marker_obj, sort_key=sort_key,
                                                 sort_dir=sort_dir)
 
+        parameters = {'sort_key': sort_key, 'sort_dir': sort_dir}
+        if not sub_links:
+            parameters['links'] = False
         return PortgroupCollection.convert_with_links(portgroups, limit,
                                                       url=resource_url,
                                                       fields=fields,
-                                                      sort_key=sort_key,
-                                                      sort_dir=sort_dir)
+                                                      sub_links=sub_links,
+                                                      **parameters)
 
     def _get_portgroups_by_address(self, address):
         """Retrieve a portgroup by its address.
@@ -368,9 +368,9 @@ class PortgroupsController(pecan.rest.RestController):
 
     @METRICS.timer('PortgroupsController.detail')
     @expose.expose(PortgroupCollection, types.uuid_or_name, types.macaddress,
-                   types.uuid, int, wtypes.text, wtypes.text)
+                   types.uuid, int, wtypes.text, wtypes.text, types.boolean)
     def detail(self, node=None, address=None, marker=None,
-               limit=None, sort_key='id', sort_dir='asc'):
+               limit=None, sort_key='id', sort_dir='asc', links=None):
         """Retrieve a list of portgroups with detail.
 
         :param node: UUID or name of a node, to get only portgroups for that
@@ -384,6 +384,8 @@ class PortgroupsController(pecan.rest.RestController):
                       max_limit resources will be returned.
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
+        :param links: Optional boolean value, whether to include the links
+                      to the sub-resources of every portgroup. Default: True.
         """
         if not api_utils.allow_portgroups():
             raise exception.NotFound()
@@ -391,6 +393,7 @@ class PortgroupsController(pecan.rest.RestController):
         cdict = pecan.request.context.to_policy_values()
         policy.authorize('baremetal:portgroup:get', cdict, cdict)
         api_utils.check_allowed_portgroup_fields([sort_key])
+        api_utils.check_allow_links_parameter(links)
 
         # NOTE: /detail should only work against collections
         parent = pecan.request.path.split('/')[:-1][-1]
@@ -400,7 +403,7 @@ class PortgroupsController(pecan.rest.RestController):
         resource_url = '/'.join(['portgroups', 'detail'])
         return self._get_portgroups_collection(
             node, address, marker, limit, sort_key, sort_dir,
-            resource_url=resource_url)
+            resource_url=resource_url, sub_links=links is not False)
 
     @METRICS.timer('PortgroupsController.get_one')
     @expose.expose(Portgroup, types.uuid_or_name, types.listtype)
@@ -392,6 +392,19 @@ def check_allow_driver_detail(detail):
              'opr': versions.MINOR_30_DYNAMIC_DRIVERS})
 
 
+def check_allow_links_parameter(links):
+    """Check if omitting the links to sub-resources is allowed.
+
+    Version 1.37 of the API allows this.
+    """
+    if links is not None and not allow_links_parameter():
+        raise exception.NotAcceptable(_(
+            "Request not acceptable. The minimal required API version "
+            "should be %(base)s.%(opr)s") %
+            {'base': versions.BASE_VERSION,
+             'opr': versions.MINOR_37_LINKS_PARAMETER})
+
+
 def initial_node_provision_state():
     """Return node state to use by default when creating new nodes.
 
@@ -581,6 +594,137 @@ def allow_port_physical_network():
             objects.Port.supports_physical_network())
 
 
+def allow_bulk_node_actions():
+    """Check if bulk node actions are allowed.
+
+    Version 1.35 of the API added the /v1/nodes/bulk endpoint.
+    """
+    return pecan.request.version.minor >= versions.MINOR_35_BULK_NODE_ACTIONS
+
+
+def allow_async_jobs():
+    """Check if asynchronous jobs are allowed.
+
+    Version 1.36 of the API added the /v1/jobs endpoint and the ability to
+    run some long-running calls asynchronously.
+    """
+    return pecan.request.version.minor >= versions.MINOR_36_ASYNC_JOBS
+
+
+def allow_links_parameter():
+    """Check if the links query parameter is allowed.
+
+    Version 1.37 of the API added the links parameter to the node and
+    portgroup detailed listings.
+    """
+    return pecan.request.version.minor >= versions.MINOR_37_LINKS_PARAMETER
+
+
+# Bits of the bitmap of the API features available to a request, each of
+# them is enabled starting with an API version, see compute_features().
+FEATURE_AVAILABLE_STATE = 1 << 0
+FEATURE_DRIVER_INTERNAL_INFO = 1 << 1
+FEATURE_NODE_LOGICAL_NAMES = 1 << 2
+FEATURE_INSPECT_STATE = 1 << 3
+FEATURE_NODE_CLEAN = 1 << 4
+FEATURE_RAID_CONFIG = 1 << 5
+FEATURE_LINKS_NODE_STATES = 1 << 6
+FEATURE_PORT_INTERNAL_INFO = 1 << 7
+FEATURE_PORT_ADVANCED_NET_FIELDS = 1 << 8
+FEATURE_NETWORK_INTERFACE = 1 << 9
+FEATURE_RESOURCE_CLASS = 1 << 10
+FEATURE_PORTGROUPS_SUBCONTROLLERS = 1 << 11
+FEATURE_DYNAMIC_INTERFACES = 1 << 12
+FEATURE_VOLUME = 1 << 13
+FEATURE_STORAGE_INTERFACE = 1 << 14
+FEATURE_PORT_PHYSICAL_NETWORK = 1 << 15
+
+_FEATURE_MIN_VERSIONS = (
+    (FEATURE_AVAILABLE_STATE, versions.MINOR_2_AVAILABLE_STATE),
+    (FEATURE_DRIVER_INTERNAL_INFO, versions.MINOR_3_DRIVER_INTERNAL_INFO),
+    (FEATURE_NODE_LOGICAL_NAMES, versions.MINOR_5_NODE_NAME),
+    (FEATURE_INSPECT_STATE, versions.MINOR_6_INSPECT_STATE),
+    (FEATURE_NODE_CLEAN, versions.MINOR_7_NODE_CLEAN),
+    (FEATURE_RAID_CONFIG, versions.MINOR_12_RAID_CONFIG),
+    (FEATURE_LINKS_NODE_STATES,
+     versions.MINOR_14_LINKS_NODESTATES_DRIVERPROPERTIES),
+    (FEATURE_PORT_INTERNAL_INFO, versions.MINOR_18_PORT_INTERNAL_INFO),
+    (FEATURE_PORT_ADVANCED_NET_FIELDS,
+     versions.MINOR_19_PORT_ADVANCED_NET_FIELDS),
+    (FEATURE_NETWORK_INTERFACE, versions.MINOR_20_NETWORK_INTERFACE),
+    (FEATURE_RESOURCE_CLASS, versions.MINOR_21_RESOURCE_CLASS),
+    (FEATURE_PORTGROUPS_SUBCONTROLLERS,
+     versions.MINOR_24_PORTGROUPS_SUBCONTROLLERS),
+    (FEATURE_DYNAMIC_INTERFACES, versions.MINOR_31_DYNAMIC_INTERFACES),
+    (FEATURE_VOLUME, versions.MINOR_32_VOLUME),
+    (FEATURE_STORAGE_INTERFACE, versions.MINOR_33_STORAGE_INTERFACE),
+    (FEATURE_PORT_PHYSICAL_NETWORK, versions.MINOR_34_PORT_PHYSICAL_NETWORK),
+)
+
+# Maps a minor API version to the bitmap of the features it enables.
+_FEATURES_BY_MINOR = {}
+
+
+def compute_features(version):
+    """Compute the bitmap of the API features available to a version.
+
+    :param version: the API version object of a request.
+    :returns: an integer, bitwise OR of the FEATURE_* constants.
+    """
+    try:
+        features = _FEATURES_BY_MINOR[version.minor]
+    except KeyError:
+        features = 0
+        for feature, min_minor in _FEATURE_MIN_VERSIONS:
+            if version.minor >= min_minor:
+                features |= feature
+        _FEATURES_BY_MINOR[version.minor] = features
+
+    # NOTE: the Port object may not support the physical_network field
+    # during a rolling upgrade, see allow_port_physical_network().
+    if (features & FEATURE_PORT_PHYSICAL_NETWORK and
+            not objects.Port.supports_physical_network()):
+        features &= ~FEATURE_PORT_PHYSICAL_NETWORK
+    return features
+
+
+def get_request_features():
+    """Return the bitmap of the API features available to this request.
+
+    The bitmap is computed once per request by
+    :class:`ironic.api.hooks.FeaturesHook`, it is computed here if the
+    hook did not run.
+
+    :returns: an integer, bitwise OR of the FEATURE_* constants.
+    """
+    features = getattr(pecan.request, 'features', None)
+    if features is None:
+        features = compute_features(pecan.request.version)
+    return features
+
+
+def is_async_job_requested():
+    """Check if the request should be run asynchronously through a job.
+
+    The client opts in by sending the ``Prefer: respond-async`` header
+    (RFC 7240). The request is run synchronously if the API version is
+    older than 1.36 or if the conductors are not able to run jobs yet, for
+    example during a rolling upgrade.
+
+    :returns: True if a job should be created, False otherwise.
+    """
+    if not allow_async_jobs():
+        return False
+
+    prefer = pecan.request.headers.get('Prefer', '')
+    preferences = [p.split(';')[0].strip().lower()
+                   for p in prefer.split(',')]
+    if 'respond-async' not in preferences:
+        return False
+
+    return pecan.request.rpcapi.can_run_jobs()
+
+
 def get_controller_reserved_names(cls):
     """Get reserved names for a given controller.
 
@@ -22,6 +22,7 @@ from pecan import hooks
 import six
 from six.moves import http_client
 
+from ironic.api.controllers.v1 import utils as api_utils
 from ironic.common import context
 from ironic.common import policy
 from ironic.conductor import rpcapi
@@ -91,6 +92,10 @@ class ContextHook(hooks.PecanHook):
         if cfg.CONF.auth_strategy == 'noauth':
             ctx.auth_token = None
 
+        # NOTE: policy decisions only depend on the credentials and the
+        # target, which can't change while processing a request, so they
+        # are cached until the end of the request.
+        policy.enable_request_cache()
         creds = ctx.to_policy_values()
         is_admin = policy.check('is_admin', creds, creds)
         ctx.is_admin = is_admin
@@ -99,6 +104,7 @@ class ContextHook(hooks.PecanHook):
         state.request.context = ctx
 
     def after(self, state):
+        policy.disable_request_cache()
         if state.request.context == {}:
             # An incorrect url path will not create RequestContext
             return
@@ -115,6 +121,21 @@ class RPCHook(hooks.PecanHook):
         state.request.rpcapi = rpcapi.ConductorAPI()
 
 
+class FeaturesHook(hooks.PecanHook):
+    """Attach the API features available to the requested API version.
+
+    Controllers check the bitmap instead of comparing versions for every
+    object they convert.
+    """
+
+    def before(self, state):
+        # NOTE: the version is only set for requests routed to a versioned
+        # controller.
+        version = getattr(state.request, 'version', None)
+        if version is not None:
+            state.request.features = api_utils.compute_features(version)
+
+
 class NoExceptionTracebackHook(hooks.PecanHook):
     """Workaround rpc.common: deserialize_remote_exception.
 
@@ -167,3 +188,6 @@ class PublicUrlHook(hooks.PecanHook):
     def before(self, state):
         state.request.public_url = (cfg.CONF.api.public_endpoint or
                                     state.request.host_url)
+        # NOTE: cache of ironic.api.controllers.link.LinkTemplates, by base
+        # URL, used to build the links of the objects returned by the API.
+        state.request.link_templates = {}
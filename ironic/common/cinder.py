@@ -17,6 +17,7 @@ import json
 
 from cinderclient import exceptions as cinder_exceptions
 from cinderclient.v3 import client as client
+import eventlet
 from oslo_log import log
 
 from ironic.common import exception
@@ -30,6 +31,7 @@ AVAILABLE = 'available'
 IN_USE = 'in-use'
 
 _CINDER_SESSION = None
+_CINDER_CLIENT = None
 
 
 def _get_cinder_session():
@@ -43,8 +45,18 @@ def _get_cinder_session():
 def get_client():
     """Get a cinder client connection.
 
+    The client is created once and shared by all the callers, reusing the
+    connections of its session.
+
     :returns: A cinder client.
     """
+    global _CINDER_CLIENT
+    if _CINDER_CLIENT is None:
+        _CINDER_CLIENT = _create_client()
+    return _CINDER_CLIENT
+
+
+def _create_client():
     params = {
         'connect_retries': CONF.cinder.retries
     }
@@ -148,12 +160,146 @@ def _init_client(task):
         raise exception.StorageError(msg)
 
 
+def _map_volumes(func, volume_list):
+    """Call a function on each volume of a list.
+
+    Up to [cinder]request_concurrency calls run at once, in green threads.
+
+    :param func: a callable accepting a volume ID and raising StorageError
+        on failure.
+    :param volume_list: List of volume_id UUID values.
+    :returns: a list of (result, error) tuples in the order of the volumes,
+        where error is the StorageError raised by the call, if any.
+    """
+    def _call(volume_id):
+        try:
+            return func(volume_id), None
+        except exception.StorageError as e:
+            return None, e
+
+    if len(volume_list) <= 1:
+        return [_call(volume_id) for volume_id in volume_list]
+    pool = eventlet.GreenPool(CONF.cinder.request_concurrency)
+    return list(pool.imap(_call, volume_list))
+
+
+def _rollback_attachment(client, node, volume_id, connector=None):
+    """Undo the first steps of the attachment of a volume.
+
+    :param client: A cinder client.
+    :param node: The object representing the node.
+    :param volume_id: The volume_id UUID value of the reserved volume.
+    :param connector: The connector the connection of the volume was
+        initialized with, if it was.
+    """
+    try:
+        if connector is not None:
+            client.volumes.terminate_connection(volume_id, connector)
+        client.volumes.unreserve(volume_id)
+    except cinder_exceptions.ClientException as e:
+        LOG.warning('Failed to roll back the attachment of volume '
+                    '%(vol_id)s to node %(node)s: %(err)s',
+                    {'vol_id': volume_id, 'node': node.uuid, 'err': e})
+
+
+def _attach_volume(client, node, volume_id, connector):
+    """Attach a volume to a node.
+
+    See attach_volumes for the parameters and the connection returned. On
+    failure, the reservation of the volume and its connection are rolled
+    back.
+
+    :raises: StorageError If storage subsystem exception is raised.
+    """
+    try:
+        volume = client.volumes.get(volume_id)
+    except cinder_exceptions.ClientException as e:
+        msg = (_('Failed to get volume %(vol_id)s from cinder for node '
+                 '%(uuid)s: %(err)s') %
+               {'vol_id': volume_id, 'uuid': node.uuid, 'err': e})
+        LOG.error(msg)
+        raise exception.StorageError(msg)
+    if is_volume_attached(node, volume):
+        LOG.debug('Volume %(vol_id)s is already attached to node '
+                  '%(uuid)s. Skipping attachment.',
+                  {'vol_id': volume_id, 'uuid': node.uuid})
+
+        # NOTE(jtaryma): Actual connection info of already connected
+        # volume will be provided by nova. Adding this dictionary to
+        # 'connected' list so it contains also already connected volumes.
+        return {'data': {'ironic_volume_uuid': volume.id,
+                         'volume_id': volume_id},
+                'already_attached': True}
+
+    try:
+        client.volumes.reserve(volume_id)
+    except cinder_exceptions.ClientException as e:
+        msg = (_('Failed to reserve volume %(vol_id)s for node %(node)s: '
+                 '%(err)s)') %
+               {'vol_id': volume_id, 'node': node.uuid, 'err': e})
+        LOG.error(msg)
+        raise exception.StorageError(msg)
+
+    try:
+        # Provide connector information to cinder
+        connection = client.volumes.initialize_connection(volume_id,
+                                                          connector)
+    except cinder_exceptions.ClientException as e:
+        msg = (_('Failed to initialize connection for volume '
+                 '%(vol_id)s to node %(node)s: %(err)s') %
+               {'vol_id': volume_id, 'node': node.uuid, 'err': e})
+        LOG.error(msg)
+        _rollback_attachment(client, node, volume_id)
+        raise exception.StorageError(msg)
+
+    if 'volume_id' not in connection['data']:
+        connection['data']['volume_id'] = volume_id
+    connection['data']['ironic_volume_uuid'] = volume.id
+
+    LOG.info('Successfully initialized volume %(vol_id)s for '
+             'node %(node)s.', {'vol_id': volume_id, 'node': node.uuid})
+
+    instance_uuid = node.instance_uuid or node.uuid
+
+    try:
+        # NOTE(TheJulia): The final step of the cinder volume
+        # attachment process involves updating the volume
+        # database record to indicate that the attachment has
+        # been completed, which moves the volume to the
+        # 'attached' state. This action also sets a mountpoint
+        # for the volume, if known. In our use case, there is
+        # no way for us to know what the mountpoint is inside of
+        # the operating system, thus we send None.
+        client.volumes.attach(volume_id, instance_uuid, None)
+
+    except cinder_exceptions.ClientException as e:
+        msg = (_('Failed to inform cinder that the attachment for volume '
+                 '%(vol_id)s for node %(node)s has been completed: '
+                 '%(err)s') %
+               {'vol_id': volume_id, 'node': node.uuid, 'err': e})
+        LOG.error(msg)
+        _rollback_attachment(client, node, volume_id, connector)
+        raise exception.StorageError(msg)
+
+    try:
+        # Set metadata to assist a user in volume identification
+        client.volumes.set_metadata(
+            volume_id,
+            _create_metadata_dictionary(node, 'attached'))
+
+    except cinder_exceptions.ClientException as e:
+        LOG.warning('Failed to update volume metadata for volume '
+                    '%(vol_id)s for node %(node)s: %(err)s',
+                    {'vol_id': volume_id, 'node': node.uuid, 'err': e})
+    return connection
+
+
 def attach_volumes(task, volume_list, connector):
     """Attach volumes to a node.
 
-       Enumerate through the provided list of volumes and attach the volumes
-       to the node defined in the task utilizing the provided connector
-       information.
+       Attach the provided list of volumes to the node defined in the task
+       utilizing the provided connector information. Up to
+       [cinder]request_concurrency volumes are attached at once.
 
        If an attachment appears to already exist, we will skip attempting to
        attach the volume. If use of the volume fails, a user may need to
@@ -184,7 +330,10 @@ def attach_volumes(task, volume_list, connector):
                              'host': 'hostname',
                              }
 
-       :raises: StorageError If storage subsystem exception is raised.
+       :raises: StorageError If storage subsystem exception is raised. The
+                volumes failing to attach are not left reserved, the
+                volumes attached successfully are left attached for the
+                caller to detach them.
        :returns: List of connected volumes, including volumes that were
                  already connected to desired nodes. The returned list
                  can be relatively consistent depending on the end storage
@@ -237,98 +386,22 @@ def attach_volumes(task, volume_list, connector):
     node = task.node
     client = _init_client(task)
 
-    connected = []
-    for volume_id in volume_list:
-        try:
-            volume = client.volumes.get(volume_id)
-        except cinder_exceptions.ClientException as e:
-            msg = (_('Failed to get volume %(vol_id)s from cinder for node '
-                     '%(uuid)s: %(err)s') %
-                   {'vol_id': volume_id, 'uuid': node.uuid, 'err': e})
-            LOG.error(msg)
-            raise exception.StorageError(msg)
-        if is_volume_attached(node, volume):
-            LOG.debug('Volume %(vol_id)s is already attached to node '
-                      '%(uuid)s. Skipping attachment.',
-                      {'vol_id': volume_id, 'uuid': node.uuid})
-
-            # NOTE(jtaryma): Actual connection info of already connected
-            # volume will be provided by nova. Adding this dictionary to
-            # 'connected' list so it contains also already connected volumes.
-            connection = {'data': {'ironic_volume_uuid': volume.id,
-                                   'volume_id': volume_id},
-                          'already_attached': True}
-            connected.append(connection)
-            continue
-
-        try:
-            client.volumes.reserve(volume_id)
-        except cinder_exceptions.ClientException as e:
-            msg = (_('Failed to reserve volume %(vol_id)s for node %(node)s: '
-                     '%(err)s)') %
-                   {'vol_id': volume_id, 'node': node.uuid, 'err': e})
-            LOG.error(msg)
-            raise exception.StorageError(msg)
-
-        try:
-            # Provide connector information to cinder
-            connection = client.volumes.initialize_connection(volume_id,
-                                                              connector)
-        except cinder_exceptions.ClientException as e:
-            msg = (_('Failed to initialize connection for volume '
-                     '%(vol_id)s to node %(node)s: %(err)s') %
-                   {'vol_id': volume_id, 'node': node.uuid, 'err': e})
-            LOG.error(msg)
-            raise exception.StorageError(msg)
-
-        if 'volume_id' not in connection['data']:
-            connection['data']['volume_id'] = volume_id
-        connection['data']['ironic_volume_uuid'] = volume.id
-        connected.append(connection)
-
-        LOG.info('Successfully initialized volume %(vol_id)s for '
-                 'node %(node)s.', {'vol_id': volume_id, 'node': node.uuid})
-
-        instance_uuid = node.instance_uuid or node.uuid
-
-        try:
-            # NOTE(TheJulia): The final step of the cinder volume
-            # attachment process involves updating the volume
-            # database record to indicate that the attachment has
-            # been completed, which moves the volume to the
-            # 'attached' state. This action also sets a mountpoint
-            # for the volume, if known. In our use case, there is
-            # no way for us to know what the mountpoint is inside of
-            # the operating system, thus we send None.
-            client.volumes.attach(volume_id, instance_uuid, None)
-
-        except cinder_exceptions.ClientException as e:
-            msg = (_('Failed to inform cinder that the attachment for volume '
-                     '%(vol_id)s for node %(node)s has been completed: '
-                     '%(err)s') %
-                   {'vol_id': volume_id, 'node': node.uuid, 'err': e})
-            LOG.error(msg)
-            raise exception.StorageError(msg)
-
-        try:
-            # Set metadata to assist a user in volume identification
-            client.volumes.set_metadata(
-                volume_id,
-                _create_metadata_dictionary(node, 'attached'))
-
-        except cinder_exceptions.ClientException as e:
-            LOG.warning('Failed to update volume metadata for volume '
-                        '%(vol_id)s for node %(node)s: %(err)s',
-                        {'vol_id': volume_id, 'node': node.uuid, 'err': e})
-    return connected
+    results = _map_volumes(
+        lambda volume_id: _attach_volume(client, node, volume_id, connector),
+        volume_list)
+    for _connection, error in results:
+        if error is not None:
+            raise error
+    return [connection for connection, _error in results]
 
 
 def detach_volumes(task, volume_list, connector, allow_errors=False):
     """Detach a list of volumes from a provided connector detail.
 
-       Enumerates through a provided list of volumes and issues
-       detachment requests utilizing the connector information
-       that describes the node.
+       Issues detachment requests for a provided list of volumes utilizing
+       the connector information that describes the node. Up to
+       [cinder]request_concurrency volumes are detached at once, a failure
+       to detach a volume does not prevent detaching the others.
 
        :param task: The TaskManager task representing the request.
        :param volume_list: The list of volume id values to detach.
@@ -367,7 +440,7 @@ def detach_volumes(task, volume_list, connector, allow_errors=False):
     client = _init_client(task)
     node = task.node
 
-    for volume_id in volume_list:
+    def _detach_volume(volume_id):
         try:
             volume = client.volumes.get(volume_id)
         except cinder_exceptions.ClientException as e:
@@ -377,13 +450,13 @@ def detach_volumes(task, volume_list, connector, allow_errors=False):
             # If we do not raise an exception, we should move on to
             # the next volume since the volume could have been deleted
             # before we're attempting to power off the node.
-            continue
+            return
 
         if not is_volume_attached(node, volume):
             LOG.debug('Volume %(vol_id)s is not attached to node '
                       '%(uuid)s: Skipping detachment.',
                       {'vol_id': volume_id, 'uuid': node.uuid})
-            continue
+            return
 
         try:
             client.volumes.begin_detaching(volume_id)
@@ -406,7 +479,7 @@ def detach_volumes(task, volume_list, connector, allow_errors=False):
             # errors. This will leave the volume in the detaching
             # state, but in that case something very unexpected
             # has occured.
-            continue
+            return
 
         # Attempt to identify the attachment id value to provide
         # accessible relationship data to leave in the cinder API
@@ -432,3 +505,7 @@ def detach_volumes(task, volume_list, connector, allow_errors=False):
             LOG.warning('Failed to update volume %(vol_id)s metadata for node '
                         '%(node)s: %(err)s',
                         {'vol_id': volume_id, 'node': node.uuid, 'err': e})
+
+    for _result, error in _map_volumes(_detach_volume, volume_list):
+        if error is not None:
+            raise error
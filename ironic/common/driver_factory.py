@@ -21,6 +21,7 @@ from stevedore import dispatch
 
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics
 from ironic.conf import CONF
 from ironic.drivers import base as driver_base
 from ironic.drivers import fake_hardware
@@ -31,6 +32,21 @@ LOG = log.getLogger(__name__)
 
 EM_SEMAPHORE = 'extension_manager'
 
+# Interface types and the corresponding node fields, in a stable order
+_INTERFACE_NAMES = tuple(sorted(driver_base.ALL_INTERFACES))
+_INTERFACE_FIELDS = tuple('%s_interface' % iface
+                          for iface in _INTERFACE_NAMES)
+
+# Cache of validated driver compositions. Keys are tuples (driver name,
+# node interface field values), values are tuples (extension managers the
+# composition was built with, calculated defaults for the unset interface
+# fields, attributes of the composed BareDriver).
+_COMPOSITION_CACHE = {}
+
+_COMPOSITION_CACHE_LOOKUPS = metrics.REGISTRY.counter(
+    'ironic_driver_composition_cache_lookups_total',
+    'Number of lookups of the cache of driver compositions by result.')
+
 
 def build_driver_for_task(task, driver_name=None):
     """Builds a composable driver for a given task.
@@ -40,6 +56,9 @@ def build_driver_for_task(task, driver_name=None):
     the monolithic driver singleton, for hardware types - from separate
     driver factories and are configurable via the database.
 
+    Validated compositions are cached per driver name and values of the node
+    interface fields, until the driver factories are reloaded.
+
     :param task: The task containing the node to build a driver for.
     :param driver_name: The name of the classic driver or hardware type to use
                         as a base, if different than task.node.driver.
@@ -55,6 +74,22 @@ def build_driver_for_task(task, driver_name=None):
     driver_name = driver_name or node.driver
 
     driver_or_hw_type = get_driver_or_hardware_type(driver_name)
+
+    # Changing the driver may reset interface fields, so the composition
+    # cache is only consulted for nodes keeping their driver.
+    key = None
+    if 'driver' not in node.obj_what_changed():
+        key = (driver_name, _get_node_interfaces(node))
+        cached = _COMPOSITION_CACHE.get(key)
+        if cached is not None and cached[0] == _get_extension_managers():
+            for field_name, impl_name in cached[1].items():
+                setattr(node, field_name, impl_name)
+            bare_driver = driver_base.BareDriver()
+            bare_driver.__dict__.update(cached[2])
+            _COMPOSITION_CACHE_LOOKUPS.inc(result='hit')
+            return bare_driver
+        _COMPOSITION_CACHE_LOOKUPS.inc(result='miss')
+
     try:
         check_and_update_node_interfaces(
             node, driver_or_hw_type=driver_or_hw_type)
@@ -66,13 +101,51 @@ def build_driver_for_task(task, driver_name=None):
         #             users totally, we'll spam them with warnings instead.
         LOG.warning('%s They will be ignored. To avoid this warning, '
                     'please set them to None.', e)
+        # Do not cache, so that the warning is repeated on each acquire
+        key = None
 
     bare_driver = driver_base.BareDriver()
     _attach_interfaces_to_driver(bare_driver, node, driver_or_hw_type)
 
+    if key is not None:
+        # Remember the calculated defaults to set them on cache hits
+        defaults = {}
+        for field_name, impl_name in zip(_INTERFACE_FIELDS, key[1]):
+            if impl_name is None and field_name in node:
+                impl_name = getattr(node, field_name)
+                if impl_name is not None:
+                    defaults[field_name] = impl_name
+        _COMPOSITION_CACHE[key] = (_get_extension_managers(), defaults,
+                                   dict(bare_driver.__dict__))
+
     return bare_driver
 
 
+def _get_node_interfaces(node):
+    """Get the values of all interface fields of a node.
+
+    :param node: Node object
+    :returns: a tuple of interface implementation names (or None for unset
+              fields) in the order of _INTERFACE_FIELDS.
+    """
+    # NOTE(dtantsur): objects raise NotImplementedError on accessing fields
+    # that are known, but missing from an object.
+    return tuple(getattr(node, field_name) if field_name in node else None
+                 for field_name in _INTERFACE_FIELDS)
+
+
+def _get_extension_managers():
+    """Get the currently loaded extension managers of all driver factories.
+
+    Used to detect that the factories were reloaded since a composition was
+    cached.
+    """
+    return ((DriverFactory._extension_manager,
+             HardwareTypesFactory._extension_manager) +
+            tuple(_INTERFACE_LOADERS[iface]._extension_manager
+                  for iface in _INTERFACE_NAMES))
+
+
 def _attach_interfaces_to_driver(bare_driver, node, driver_or_hw_type):
     """Attach interface implementations to a bare driver object.
 
@@ -455,6 +528,8 @@ class BaseDriverFactory(object):
         #             creation of multiple NameDispatchExtensionManagers.
         if cls._extension_manager:
             return
+        # Compositions built with the previous set of drivers are stale now
+        _COMPOSITION_CACHE.clear()
         enabled_drivers = getattr(CONF, cls._enabled_driver_list_config_option,
                                   [])
 
@@ -226,6 +226,10 @@ class VolumeTargetBootIndexAlreadyExists(Conflict):
                  "for the same node already exists.")
 
 
+class JobAlreadyExists(Conflict):
+    _msg_fmt = _("A job with UUID %(uuid)s already exists.")
+
+
 class VifAlreadyAttached(Conflict):
     _msg_fmt = _("Unable to attach VIF because VIF %(vif)s is already "
                  "attached to Ironic %(object_type)s %(object_uuid)s")
@@ -424,6 +428,10 @@ class VolumeTargetNotFound(NotFound):
     _msg_fmt = _("Volume target %(target)s could not be found.")
 
 
+class JobNotFound(NotFound):
+    _msg_fmt = _("Job %(job)s could not be found.")
+
+
 class DriverNameConflict(IronicException):
     _msg_fmt = _("Classic and dynamic drivers cannot have the "
                  "same names '%(names)s'.")
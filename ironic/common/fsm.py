@@ -155,3 +155,179 @@ class FSM(machines.FiniteMachine):
             #             we want to use the specified state instead.
             self._validate_target_state(target_state)
             self._target_state = target_state
+
+
+class FrozenFSM(object):
+    """A precompiled, read-only transition table of an :class:`FSM`.
+
+    The table is built once and shared by all its users, each of them tracks
+    its own position in the state machine with a lightweight
+    :class:`FSMCursor` returned by :meth:`cursor`.
+
+    The source state machine is frozen, so that no states or transitions can
+    be added to it after the table was built.
+    """
+
+    def __init__(self, machine):
+        machine.freeze()
+        self._default_start_state = machine.default_start_state
+        self._stable = {}
+        self._targets = {}
+        self._terminal = set()
+        # state -> event -> (new state, on_exit callback, on_enter callback)
+        self._transitions = {}
+        for state, data in machine._states.items():
+            self._stable[state] = data['stable']
+            self._targets[state] = data['target']
+            if data['terminal']:
+                self._terminal.add(state)
+            self._transitions[state] = {
+                event: (jump.name, jump.on_exit, jump.on_enter)
+                for event, jump in machine._transitions[state].items()}
+
+    def __contains__(self, state):
+        return state in self._stable
+
+    @property
+    def states(self):
+        """Returns the state names."""
+        return list(self._stable)
+
+    def is_stable(self, state):
+        """Is the state stable?
+
+        :param state: the state of interest
+        :raises: InvalidState if the state is invalid
+        :returns: True if it is a stable state; False otherwise
+        """
+        try:
+            return self._stable[state]
+        except KeyError:
+            raise excp.InvalidState(_("State '%s' does not exist") % state)
+
+    def validate_target_state(self, target):
+        """Validate the target state.
+
+        A target state must be a valid state that is 'stable'.
+
+        :param target: The target state
+        :raises: exception.InvalidState if it is an invalid target state
+        """
+        if target is None:
+            return
+
+        if target not in self._stable:
+            raise excp.InvalidState(
+                _("Target state '%s' does not exist") % target)
+        if not self._stable[target]:
+            raise excp.InvalidState(
+                _("Target state '%s' is not a 'stable' state") % target)
+
+    def cursor(self):
+        """Create a new, uninitialized cursor over this table."""
+        return FSMCursor(self)
+
+
+class FSMCursor(object):
+    """The position of a single user in a :class:`FrozenFSM`.
+
+    Only holds the current and the target states, the transitions are looked
+    up in the shared table. Provides the same interface for driving the state
+    machine as :class:`FSM`.
+    """
+
+    __slots__ = ('_table', '_current_state', '_target_state')
+
+    def __init__(self, table):
+        self._table = table
+        self._current_state = None
+        self._target_state = None
+
+    @property
+    def current_state(self):
+        return self._current_state
+
+    @property
+    def target_state(self):
+        return self._target_state
+
+    def is_stable(self, state):
+        """Is the state stable?
+
+        :param state: the state of interest
+        :raises: InvalidState if the state is invalid
+        :returns: True if it is a stable state; False otherwise
+        """
+        return self._table.is_stable(state)
+
+    def is_actionable_event(self, event):
+        """Check whether the event is actionable in the current state."""
+        if self._current_state is None:
+            return False
+        return event in self._table._transitions[self._current_state]
+
+    def initialize(self, start_state=None, target_state=None):
+        """Initialize the cursor.
+
+        :param start_state: the cursor is initialized to start from this state
+        :param target_state: if specified, the cursor is initialized to this
+                             target state. Otherwise use the default target
+                             state
+        :raises: InvalidState if the start or the target state is invalid
+        """
+        table = self._table
+        if start_state is None:
+            start_state = table._default_start_state
+        if start_state not in table:
+            raise excp.InvalidState(
+                _("Can not start from a undefined state '%s'") % start_state)
+        if start_state in table._terminal:
+            raise excp.InvalidState(
+                _("Can not start from a terminal state '%s'") % start_state)
+        table.validate_target_state(target_state)
+        self._current_state = start_state
+        self._target_state = target_state or table._targets[start_state]
+
+    def process_event(self, event, target_state=None):
+        """process the event.
+
+        :param event: the event to be processed
+        :param target_state: if specified, the 'final' target state for the
+                             event. Otherwise, use the default target state
+        :raises: InvalidState if the event is not allowed in the current state
+                 or the target state is invalid
+        """
+        table = self._table
+        current = self._current_state
+        if current is None:
+            raise excp.InvalidState(
+                _("Can not process event '%s'; the state machine hasn't "
+                  "been initialized") % event)
+        if current in table._terminal:
+            raise excp.InvalidState(
+                _("Can not transition from terminal state '%(state)s' on "
+                  "event '%(event)s'") % {'state': current, 'event': event})
+        try:
+            new_state, on_exit, on_enter = table._transitions[current][event]
+        except KeyError:
+            raise excp.InvalidState(
+                _("Can not transition from state '%(state)s' on event "
+                  "'%(event)s' (no defined transition)") %
+                {'state': current, 'event': event})
+
+        if on_exit is not None:
+            on_exit(current, event)
+        if on_enter is not None:
+            on_enter(new_state, event)
+        self._current_state = new_state
+
+        # Clear the target state if we've reached it
+        if self._target_state == new_state:
+            self._target_state = None
+        # If new state has a different target, update the target state
+        if table._targets[new_state] is not None:
+            self._target_state = table._targets[new_state]
+
+        if target_state:
+            table.validate_target_state(target_state)
+            self._target_state = target_state
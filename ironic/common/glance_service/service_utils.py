@@ -168,6 +168,27 @@ def parse_image_ref(image_href):
             raise exception.InvalidImageRef(image_href=image_href)
 
 
+def parse_image_id(image_href):
+    """Parse the ID of an image from its href.
+
+    Unlike parse_image_ref, this does not look up the glance endpoint.
+
+    :param image_href: href of an image
+    :returns: the image ID
+
+    :raises InvalidImageRef: when input image href is invalid
+    """
+    if '/' not in six.text_type(image_href):
+        return image_href
+    try:
+        url = urlparse.urlparse(image_href)
+    except ValueError:
+        raise exception.InvalidImageRef(image_href=image_href)
+    if url.scheme == 'glance':
+        return image_href.split('/')[-1]
+    return url.path.split('/')[-1]
+
+
 def translate_from_glance(image):
     image_meta = _extract_attributes(image)
     image_meta = _convert_timestamps_to_datetimes(image_meta)
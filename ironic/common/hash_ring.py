@@ -20,17 +20,24 @@ from tooz import hashring
 
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics
 from ironic.conf import CONF
 from ironic.db import api as dbapi
 
+_RING_HOSTS = metrics.REGISTRY.gauge(
+    'ironic_hash_ring_hosts',
+    'Number of conductors in the hash ring of a driver.')
+
 
 class HashRingManager(object):
     _hash_rings = None
+    _saturation = None
     _lock = threading.Lock()
 
     def __init__(self):
         self.dbapi = dbapi.get_instance()
         self.updated_at = time.time()
+        self.saturation_updated_at = time.time()
 
     @property
     def ring(self):
@@ -47,6 +54,26 @@ class HashRingManager(object):
                 self.updated_at = time.time()
             return self.__class__._hash_rings
 
+    @property
+    def saturation(self):
+        """Ratio of busy workers of the conductors, by hostname.
+
+        As reported by the conductors in their heart beats. Loaded lazily,
+        since it is only needed to choose between several conductors.
+        """
+        limit = time.time() - CONF.hash_ring_reset_interval
+        saturation = self.__class__._saturation
+        if saturation is not None and self.saturation_updated_at >= limit:
+            return saturation
+
+        with self._lock:
+            if (self.__class__._saturation is None or
+                    self.saturation_updated_at < limit):
+                self.__class__._saturation = (
+                    self.dbapi.get_active_conductor_saturation())
+                self.saturation_updated_at = time.time()
+            return self.__class__._saturation
+
     def _load_hash_rings(self):
         rings = {}
         d2c = self.dbapi.get_active_driver_dict()
@@ -55,12 +82,14 @@ class HashRingManager(object):
         for driver_name, hosts in d2c.items():
             rings[driver_name] = hashring.HashRing(
                 hosts, partitions=2 ** CONF.hash_partition_exponent)
+            _RING_HOSTS.set(len(hosts), driver=driver_name)
         return rings
 
     @classmethod
     def reset(cls):
         with cls._lock:
             cls._hash_rings = None
+            cls._saturation = None
 
     def __getitem__(self, driver_name):
         try:
@@ -0,0 +1,326 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""In-process registry of metrics.
+
+The registry holds counters, gauges and histograms, which can be rendered in
+the Prometheus text exposition format. It is fed by the metric loggers
+returned by :func:`ironic.common.metrics_utils.get_metrics_logger` and by
+explicit instrumentation of the conductor and API internals.
+"""
+
+import collections
+import re
+import threading
+
+import eventlet
+from eventlet import wsgi
+from oslo_log import log
+import six
+
+LOG = log.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+"""Content type of the Prometheus text exposition format."""
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0, 300.0)
+"""Default upper bounds of histogram buckets, in seconds."""
+
+_INVALID_CHARS = re.compile(r'[^a-zA-Z0-9_:]')
+
+
+def sanitize_name(name):
+    """Convert a metric name to a valid Prometheus metric name.
+
+    :param name: metric name, e.g. ironic.conductor.manager.do_sync
+    :returns: the name with invalid characters replaced by underscores.
+    """
+    name = _INVALID_CHARS.sub('_', name)
+    if name[:1].isdigit():
+        name = '_' + name
+    return name
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{%s}' % ','.join(
+        '%s="%s"' % (key, six.text_type(value).replace('\\', '\\\\')
+                     .replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels)
+
+
+class _Metric(object):
+    """Base class for metrics of the registry."""
+
+    metric_type = None
+
+    def __init__(self, name, documentation=''):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        self._values = collections.OrderedDict()
+
+    @staticmethod
+    def _key(labels):
+        return tuple(sorted(labels.items()))
+
+    def reset(self):
+        """Forget all recorded values."""
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        """Get samples of this metric.
+
+        :returns: a list of tuples (sample name, labels, value) where labels
+                  is a tuple of (name, value) pairs.
+        """
+        with self._lock:
+            return [(self.name, key, value)
+                    for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    """A value that only ever increases."""
+
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Increment the counter.
+
+        :param amount: the amount to increment by, must not be negative.
+        :param labels: labels of the incremented value.
+        """
+        if amount < 0:
+            raise ValueError('Counters can only be incremented')
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value, **labels):
+        """Set the counter to a total counted elsewhere.
+
+        Used by collectors exposing the statistics of other libraries, the
+        value must only decrease when these statistics are reset.
+
+        :param value: the new total.
+        :param labels: labels of the set value.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    metric_type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """A distribution of observed values, counted in buckets."""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation='', buckets=DEFAULT_BUCKETS):
+        super(Histogram, self).__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        """Observe a value.
+
+        :param value: the observed value, e.g. duration in seconds.
+        :param labels: labels of the observed value.
+        """
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # Bucket counts followed by the sum of observed values
+                counts = self._values[key] = [0] * len(self.buckets) + [0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            counts[-1] += value
+
+    def get(self, **labels):
+        """Get the count and the sum of observed values."""
+        counts = self._values.get(self._key(labels))
+        if counts is None:
+            return 0, 0
+        return sum(counts[:-1]), counts[-1]
+
+    def samples(self):
+        result = []
+        with self._lock:
+            for key, counts in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    result.append(('%s_bucket' % self.name,
+                                   key + (('le', _format_value(bound)),),
+                                   cumulative))
+                result.append(('%s_count' % self.name, key, cumulative))
+                result.append(('%s_sum' % self.name, key, counts[-1]))
+        return result
+
+
+class Registry(object):
+    """A collection of metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = collections.OrderedDict()
+        self._collectors = []
+
+    def _get_or_create(self, metric_class, name, documentation, **kwargs):
+        name = sanitize_name(name)
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = metric_class(name, documentation, **kwargs)
+                    self._metrics[name] = metric
+        if not isinstance(metric, metric_class):
+            raise ValueError('Metric %(name)s is already registered as a '
+                             '%(type)s' % {'name': name,
+                                           'type': metric.metric_type})
+        return metric
+
+    def counter(self, name, documentation=''):
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, documentation)
+
+    def gauge(self, name, documentation=''):
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, documentation)
+
+    def histogram(self, name, documentation='', buckets=DEFAULT_BUCKETS):
+        """Get or create a histogram."""
+        return self._get_or_create(Histogram, name, documentation,
+                                   buckets=buckets)
+
+    def add_collector(self, collector):
+        """Add a callable updating metrics right before they are rendered.
+
+        Allows exposing values that are expensive to track on every change,
+        e.g. statistics of periodic tasks. Exceptions raised by collectors
+        are logged and ignored.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector):
+        with self._lock:
+            try:
+                self._collectors.remove(collector)
+            except ValueError:
+                pass
+
+    def reset(self):
+        """Reset the values of all metrics, keeping them registered."""
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception:
+                LOG.exception('Metrics collector %s failed', collector)
+
+        lines = []
+        for metric in list(self._metrics.values()):
+            if metric.documentation:
+                lines.append('# HELP %s %s' % (
+                    metric.name, metric.documentation.replace('\n', ' ')))
+            lines.append('# TYPE %s %s' % (metric.name, metric.metric_type))
+            for name, labels, value in metric.samples():
+                lines.append('%s%s %s' % (name, _format_labels(labels),
+                                          _format_value(value)))
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+"""The registry of metrics of this process."""
+
+
+def _exporter_app(environ, start_response):
+    """WSGI application serving the registry."""
+    if environ.get('REQUEST_METHOD') not in ('GET', 'HEAD'):
+        start_response('405 Method Not Allowed',
+                       [('Content-Type', 'text/plain'), ('Allow', 'GET')])
+        return [b'']
+    body = REGISTRY.render().encode('utf-8')
+    start_response('200 OK', [('Content-Type', CONTENT_TYPE),
+                              ('Content-Length', str(len(body)))])
+    return [body]
+
+
+class Exporter(object):
+    """An HTTP server exposing the registry of this process.
+
+    Used by services that do not have an HTTP API of their own.
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._socket = None
+        self._thread = None
+
+    def start(self):
+        """Start serving the metrics in a green thread."""
+        self._socket = eventlet.listen((self.host, self.port))
+        self._thread = eventlet.spawn(
+            wsgi.server, self._socket, _exporter_app, log_output=False)
+        LOG.info('Exposing metrics on %(host)s:%(port)s',
+                 {'host': self.host, 'port': self.port})
+
+    def stop(self):
+        """Stop serving the metrics."""
+        if self._thread is not None:
+            self._thread.kill()
+            self._thread = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
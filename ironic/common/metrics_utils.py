@@ -0,0 +1,75 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Metric loggers feeding the in-process registry of metrics.
+
+Drop-in replacement for :func:`ironic_lib.metrics_utils.get_metrics_logger`:
+the returned loggers send metrics to the configured ironic_lib backend (e.g.
+statsd) and also record them in :data:`ironic.common.metrics.REGISTRY`.
+"""
+
+from ironic_lib import metrics as ironic_lib_metrics
+from ironic_lib import metrics_utils
+
+from ironic.common import metrics
+
+
+class RegistryMetricLogger(ironic_lib_metrics.MetricLogger):
+    """Metric logger recording metrics in the registry.
+
+    Timers are recorded as histograms named <metric>_seconds, counters as
+    counters named <metric>_total and gauges as gauges.
+
+    :param backend: ironic_lib metric logger to also send metrics to.
+    """
+
+    def __init__(self, backend, registry=None):
+        super(RegistryMetricLogger, self).__init__(backend._prefix,
+                                                   backend._delimiter)
+        self._backend = backend
+        self._registry = registry or metrics.REGISTRY
+        # Metric name -> registry metric, to avoid sanitizing names again
+        self._metrics = {}
+
+    def _get_metric(self, factory, name):
+        try:
+            return self._metrics[name]
+        except KeyError:
+            metric = self._metrics[name] = factory(name)
+            return metric
+
+    def _gauge(self, name, value):
+        self._backend._gauge(name, value)
+        self._get_metric(self._registry.gauge, name).set(value)
+
+    def _counter(self, name, value, sample_rate=None):
+        self._backend._counter(name, value, sample_rate=sample_rate)
+        self._get_metric(self._registry.counter,
+                         '%s_total' % name).inc(value)
+
+    def _timer(self, name, value):
+        self._backend._timer(name, value)
+        # NOTE: ironic_lib timers are in milliseconds
+        self._get_metric(self._registry.histogram,
+                         '%s_seconds' % name).observe(value / 1000.0)
+
+
+def get_metrics_logger(prefix='', backend=None, host=None, delimiter='.'):
+    """Return a metric logger with the specified prefix.
+
+    Accepts the same arguments as
+    :func:`ironic_lib.metrics_utils.get_metrics_logger`.
+
+    :returns: a :class:`RegistryMetricLogger` instance.
+    """
+    return RegistryMetricLogger(metrics_utils.get_metrics_logger(
+        prefix=prefix, backend=backend, host=host, delimiter=delimiter))
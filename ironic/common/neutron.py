@@ -10,6 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import threading
+import time
+
+import eventlet
 from neutronclient.common import exceptions as neutron_exceptions
 from neutronclient.v2_0 import client as clientv20
 from oslo_log import log
@@ -25,6 +29,12 @@ LOG = log.getLogger(__name__)
 DEFAULT_NEUTRON_URL = 'http://%s:9696' % CONF.my_ip
 
 _NEUTRON_SESSION = None
+_NEUTRON_CLIENT = None
+
+# Results of the lookups of networks and security groups, keyed by lookup,
+# as (time of the lookup, result) tuples
+_LOOKUP_CACHE = {}
+_LOOKUP_CACHE_LOCK = threading.Lock()
 
 PHYSNET_PARAM_NAME = 'provider:physical_network'
 """Name of the neutron network API physical network parameter."""
@@ -42,6 +52,62 @@ def _get_neutron_session():
 
 
 def get_client(token=None):
+    """Get a Neutron client.
+
+    Without a token, the client is created once and shared by all the
+    callers, reusing the connections of its session.
+
+    :param token: optional auth token.
+    :returns: a Neutron client object.
+    """
+    global _NEUTRON_CLIENT
+    if token is None:
+        if _NEUTRON_CLIENT is None:
+            _NEUTRON_CLIENT = _create_client()
+        return _NEUTRON_CLIENT
+    return _create_client(token)
+
+
+def _cached_lookup(key, lookup, is_valid=None):
+    """Return the result of a lookup in neutron, cached for all the tasks.
+
+    Results are kept for [neutron]lookup_cache_ttl seconds. Exceptions
+    raised by the lookup are not cached.
+
+    :param key: a hashable key identifying the lookup.
+    :param lookup: a callable without arguments doing the lookup.
+    :param is_valid: an optional callable telling whether a cached result
+        can be used; if it returns False, the lookup is done again.
+    :returns: the result of the lookup.
+    """
+    ttl = CONF.neutron.lookup_cache_ttl
+    if not ttl:
+        return lookup()
+
+    with _LOOKUP_CACHE_LOCK:
+        entry = _LOOKUP_CACHE.get(key)
+    if (entry is not None and time.time() - entry[0] < ttl
+            and (is_valid is None or is_valid(entry[1]))):
+        return entry[1]
+
+    looked_up_at = time.time()
+    result = lookup()
+    with _LOOKUP_CACHE_LOCK:
+        _LOOKUP_CACHE[key] = (looked_up_at, result)
+    return result
+
+
+def invalidate_lookup_cache():
+    """Drop the cached results of the lookups of networks and security groups.
+
+    Called when neutron reports that a network or security group is not
+    found, as it may have been deleted or recreated since it was looked up.
+    """
+    with _LOOKUP_CACHE_LOCK:
+        _LOOKUP_CACHE.clear()
+
+
+def _create_client(token=None):
     params = {'retries': CONF.neutron.retries}
     url = CONF.neutron.url
     if CONF.neutron.auth_strategy == 'noauth':
@@ -78,6 +144,21 @@ def get_client(token=None):
     return clientv20.Client(**params)
 
 
+def map_requests(func, items):
+    """Call a function sending requests to Neutron on several items.
+
+    Up to [neutron]request_concurrency calls run at once, in green threads.
+
+    :param func: a callable accepting an item.
+    :param items: a list of items.
+    :returns: a list of the results of the calls, in the order of the items.
+    """
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    pool = eventlet.GreenPool(CONF.neutron.request_concurrency)
+    return list(pool.imap(func, items))
+
+
 def unbind_neutron_port(port_id, client=None):
     """Unbind a neutron port
 
@@ -153,17 +234,24 @@ def _verify_security_groups(security_groups, client):
 
     if not security_groups:
         return
-    try:
-        neutron_sec_groups = (
-            client.list_security_groups().get('security_groups', []))
-    except neutron_exceptions.NeutronClientException as e:
-        msg = (_("Could not retrieve security groups from neutron: %(exc)s") %
-               {'exc': e})
-        LOG.exception(msg)
-        raise exception.NetworkError(msg)
 
-    existing_sec_groups = [sec_group['id'] for sec_group in neutron_sec_groups]
-    missing_sec_groups = set(security_groups) - set(existing_sec_groups)
+    def list_security_groups():
+        try:
+            neutron_sec_groups = (
+                client.list_security_groups().get('security_groups', []))
+        except neutron_exceptions.NeutronClientException as e:
+            msg = (_("Could not retrieve security groups from neutron: "
+                     "%(exc)s") % {'exc': e})
+            LOG.exception(msg)
+            raise exception.NetworkError(msg)
+        return frozenset(sec_group['id'] for sec_group in neutron_sec_groups)
+
+    # NOTE: security groups created since the cached lookup are looked up
+    # again instead of being reported missing.
+    existing_sec_groups = _cached_lookup(
+        ('security_groups',), list_security_groups,
+        is_valid=lambda ids: ids.issuperset(security_groups))
+    missing_sec_groups = set(security_groups) - existing_sec_groups
     if missing_sec_groups:
         msg = (_('Could not find these security groups (specified via ironic '
                  'config) in neutron: %(ir-sg)s')
@@ -196,46 +284,66 @@ def add_ports_to_network(task, network_uuid, security_groups=None):
               '%(network_uuid)s using %(net_iface)s network interface.',
               {'net_iface': task.driver.network.__class__.__name__,
                'node': node.uuid, 'network_uuid': network_uuid})
-    body = {
-        'port': {
-            'network_id': network_uuid,
-            'admin_state_up': True,
-            'binding:vnic_type': 'baremetal',
-            'device_owner': 'baremetal:none',
-            'binding:host_id': node.uuid,
-        }
+    port_body = {
+        'network_id': network_uuid,
+        'admin_state_up': True,
+        'binding:vnic_type': 'baremetal',
+        'device_owner': 'baremetal:none',
+        'binding:host_id': node.uuid,
     }
     if security_groups:
-        body['port']['security_groups'] = security_groups
+        port_body['security_groups'] = security_groups
 
     # Since instance_uuid will not be available during cleaning
     # operations, we need to check that and populate them only when
     # available
-    body['port']['device_id'] = node.instance_uuid or node.uuid
+    port_body['device_id'] = node.instance_uuid or node.uuid
 
     ports = {}
     failures = []
     portmap = get_node_portmap(task)
     pxe_enabled_ports = [p for p in task.ports if p.pxe_enabled]
+    ports_to_create = []
     for ironic_port in pxe_enabled_ports:
         # Skip ports that are missing required information for deploy.
         if not validate_port_info(node, ironic_port):
             failures.append(ironic_port.uuid)
             continue
-        body['port']['mac_address'] = ironic_port.address
+        body = dict(port_body, mac_address=ironic_port.address)
         binding_profile = {'local_link_information':
                            [portmap[ironic_port.uuid]]}
-        body['port']['binding:profile'] = binding_profile
+        body['binding:profile'] = binding_profile
         client_id = ironic_port.extra.get('client-id')
         if client_id:
             client_id_opt = {'opt_name': 'client-id', 'opt_value': client_id}
-            extra_dhcp_opts = body['port'].get('extra_dhcp_opts', [])
-            extra_dhcp_opts.append(client_id_opt)
-            body['port']['extra_dhcp_opts'] = extra_dhcp_opts
+            body['extra_dhcp_opts'] = [client_id_opt]
+        ports_to_create.append((ironic_port, body))
+
+    if len(ports_to_create) > 1:
+        # NOTE: a bulk creation either creates all the ports or none of
+        # them, ports are then created one by one to find the failing ones.
+        try:
+            created = client.create_port(
+                {'ports': [body for _port, body in ports_to_create]})
+        except neutron_exceptions.NeutronClientException as e:
+            LOG.warning("Could not create the neutron ports of node "
+                        "%(node)s on the neutron network %(net)s at once, "
+                        "creating them one by one. %(exc)s",
+                        {'net': network_uuid, 'node': node.uuid, 'exc': e})
+        else:
+            for (ironic_port, _body), port in zip(ports_to_create,
+                                                  created['ports']):
+                ports[ironic_port.uuid] = port['id']
+            ports_to_create = []
+
+    for ironic_port, body in ports_to_create:
         try:
-            port = client.create_port(body)
+            port = client.create_port({'port': body})
         except neutron_exceptions.NeutronClientException as e:
             failures.append(ironic_port.uuid)
+            if isinstance(e, neutron_exceptions.NotFound):
+                # The network or security groups are gone
+                invalidate_lookup_cache()
             LOG.warning("Could not create neutron port for node's "
                         "%(node)s port %(ir-port)s on the neutron "
                         "network %(net)s. %(exc)s",
@@ -306,7 +414,7 @@ def remove_neutron_ports(task, params):
         LOG.debug('No ports to remove for node %s', node_uuid)
         return
 
-    for port in ports:
+    def _delete_port(port):
         LOG.debug('Deleting neutron port %(vif_port_id)s of node '
                   '%(node_id)s.',
                   {'vif_port_id': port['id'], 'node_id': node_uuid})
@@ -318,7 +426,12 @@ def remove_neutron_ports(task, params):
                      'a network issue: %(exc)s') %
                    {'vif': port['id'], 'node': node_uuid, 'exc': e})
             LOG.exception(msg)
-            raise exception.NetworkError(msg)
+            return msg
+
+    # NOTE: the ports are all deleted, even if some of them fail.
+    errors = [msg for msg in map_requests(_delete_port, ports) if msg]
+    if errors:
+        raise exception.NetworkError(errors[0])
 
     LOG.info('Successfully removed node %(node_uuid)s neutron ports.',
              {'node_uuid': node_uuid})
@@ -407,7 +520,8 @@ def _get_network_by_uuid_or_name(client, uuid_or_name, net_type=_('network'),
     :param net_type: human-readable network type for error messages
     :param params: Additional parameters to pass to the neutron client
         list_networks method.
-    :returns: A dict describing the neutron network.
+    :returns: A dict describing the neutron network. It is cached and
+        shared with the other callers, so it must not be modified.
     :raises: NetworkError on failure to contact Neutron
     :raises: InvalidParameterValue for missing or duplicated network
     """
@@ -416,26 +530,33 @@ def _get_network_by_uuid_or_name(client, uuid_or_name, net_type=_('network'),
     else:
         params['name'] = uuid_or_name
 
-    try:
-        networks = client.list_networks(**params)
-    except neutron_exceptions.NeutronClientException as exc:
-        raise exception.NetworkError(_('Could not retrieve network list: %s') %
-                                     exc)
-
-    LOG.debug('Got list of networks matching %(cond)s: %(result)s',
-              {'cond': params, 'result': networks})
-    networks = networks.get('networks', [])
-    if not networks:
-        raise exception.InvalidParameterValue(
-            _('%(type)s with name or UUID %(uuid_or_name)s was not found') %
-            {'type': net_type, 'uuid_or_name': uuid_or_name})
-    elif len(networks) > 1:
-        network_ids = [n['id'] for n in networks]
-        raise exception.InvalidParameterValue(
-            _('More than one %(type)s was found for name %(name)s: %(nets)s') %
-            {'name': uuid_or_name, 'nets': ', '.join(network_ids),
-             'type': net_type})
-    return networks[0]
+    def list_networks():
+        try:
+            networks = client.list_networks(**params)
+        except neutron_exceptions.NeutronClientException as exc:
+            raise exception.NetworkError(
+                _('Could not retrieve network list: %s') % exc)
+
+        LOG.debug('Got list of networks matching %(cond)s: %(result)s',
+                  {'cond': params, 'result': networks})
+        networks = networks.get('networks', [])
+        if not networks:
+            raise exception.InvalidParameterValue(
+                _('%(type)s with name or UUID %(uuid_or_name)s was not '
+                  'found') % {'type': net_type, 'uuid_or_name': uuid_or_name})
+        elif len(networks) > 1:
+            network_ids = [n['id'] for n in networks]
+            raise exception.InvalidParameterValue(
+                _('More than one %(type)s was found for name %(name)s: '
+                  '%(nets)s') % {'name': uuid_or_name,
+                                 'nets': ', '.join(network_ids),
+                                 'type': net_type})
+        return networks[0]
+
+    key = ('network',) + tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in sorted(params.items()))
+    return _cached_lookup(key, list_networks)
 
 
 def _get_port_by_uuid(client, port_uuid, **params):
@@ -498,19 +619,10 @@ def get_physnets_by_port_uuid(client, port_uuid):
 
 class NeutronNetworkInterfaceMixin(object):
 
-    _cleaning_network_uuid = None
-    _provisioning_network_uuid = None
-
     def get_cleaning_network_uuid(self):
-        if self._cleaning_network_uuid is None:
-            self._cleaning_network_uuid = validate_network(
-                CONF.neutron.cleaning_network,
-                _('cleaning network'))
-        return self._cleaning_network_uuid
+        return validate_network(CONF.neutron.cleaning_network,
+                                _('cleaning network'))
 
     def get_provisioning_network_uuid(self):
-        if self._provisioning_network_uuid is None:
-            self._provisioning_network_uuid = validate_network(
-                CONF.neutron.provisioning_network,
-                _('provisioning network'))
-        return self._provisioning_network_uuid
+        return validate_network(CONF.neutron.provisioning_network,
+                                _('provisioning network'))
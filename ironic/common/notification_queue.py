@@ -0,0 +1,185 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Asynchronous publishing of versioned notifications.
+
+When the ``[DEFAULT]notification_queue_size`` option is set, versioned
+notifications are not sent on the thread emitting them (e.g. while holding
+a node lock). Instead, they are put into a bounded in-process queue, which
+is drained in batches by a background publisher.
+"""
+
+import threading
+
+from oslo_config import cfg
+from oslo_log import log
+from six.moves import queue
+
+from ironic.common import rpc
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+# Sentinel asking the publisher to stop
+_STOP = object()
+
+_QUEUE = None
+_QUEUE_LOCK = threading.Lock()
+
+
+class NotificationQueue(object):
+    """A bounded queue of notifications with a background publisher.
+
+    Notifications that do not fit into the queue are dropped and counted.
+    """
+
+    def __init__(self, max_size, batch_size):
+        self._queue = queue.Queue(max_size)
+        self._batch_size = batch_size
+        self._thread = None
+        self._lock = threading.Lock()
+        self._overflowing = False
+        # Counters, mostly useful for monitoring and debugging
+        self.queued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def put(self, context, publisher_id, level, event_type, payload):
+        """Queue a notification for publishing.
+
+        :param context: request context.
+        :param publisher_id: publisher ID of the notification.
+        :param level: notification level, e.g. 'info'.
+        :param event_type: event type string of the notification.
+        :param payload: notification payload as a primitive.
+        :returns: True if the notification was queued, False if it was
+                  dropped because the queue is full.
+        """
+        try:
+            self._queue.put_nowait(
+                (context, publisher_id, level, event_type, payload))
+        except queue.Full:
+            self.dropped += 1
+            if not self._overflowing:
+                self._overflowing = True
+                LOG.warning('The notification queue is full, dropping '
+                            'notification %(event_type)s. Consider increasing '
+                            'the [DEFAULT]notification_queue_size option. '
+                            '%(count)d notifications dropped so far.',
+                            {'event_type': event_type,
+                             'count': self.dropped})
+            return False
+
+        self._overflowing = False
+        self.queued += 1
+        self._ensure_publisher()
+        return True
+
+    def _ensure_publisher(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run,
+                                          name='notification-publisher')
+                thread.daemon = True
+                thread.start()
+                self._thread = thread
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = _STOP in batch
+            self._publish([item for item in batch if item is not _STOP])
+            if stop:
+                return
+
+    def _publish(self, batch):
+        notifiers = {}
+        for context, publisher_id, level, event_type, payload in batch:
+            try:
+                notifier = notifiers.get(publisher_id)
+                if notifier is None:
+                    notifier = rpc.get_versioned_notifier(publisher_id)
+                    notifiers[publisher_id] = notifier
+                getattr(notifier, level)(context, event_type=event_type,
+                                         payload=payload)
+            except Exception:
+                self.failed += 1
+                LOG.exception('Failed to send notification %s',
+                              event_type)
+            else:
+                self.sent += 1
+
+    def flush(self):
+        """Publish all queued notifications and stop the publisher.
+
+        Blocks until the queue is drained. A new publisher is started if more
+        notifications are queued afterwards.
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is not None:
+                # NOTE: the publisher keeps draining the queue, so there will
+                # be room for the sentinel eventually.
+                self._queue.put(_STOP)
+                thread.join()
+                self._thread = None
+
+        # Publish anything queued after the publisher was asked to stop
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._publish(batch)
+
+
+def enabled():
+    """Whether versioned notifications are published asynchronously."""
+    return CONF.notification_queue_size > 0
+
+
+def _get_queue():
+    global _QUEUE
+    if _QUEUE is None:
+        with _QUEUE_LOCK:
+            if _QUEUE is None:
+                _QUEUE = NotificationQueue(CONF.notification_queue_size,
+                                           CONF.notification_batch_size)
+    return _QUEUE
+
+
+def put(context, publisher_id, level, event_type, payload):
+    """Queue a notification for asynchronous publishing.
+
+    See :meth:`NotificationQueue.put` for the arguments.
+    """
+    return _get_queue().put(context, publisher_id, level, event_type,
+                            payload)
+
+
+def flush():
+    """Publish all queued notifications, if any.
+
+    Is called on service shutdown to avoid losing notifications.
+    """
+    if _QUEUE is not None:
+        _QUEUE.flush()
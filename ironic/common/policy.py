@@ -16,6 +16,7 @@
 """Policy Engine For Ironic."""
 
 import sys
+import threading
 
 from oslo_concurrency import lockutils
 from oslo_config import cfg
@@ -28,6 +29,10 @@ _ENFORCER = None
 CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
+# Storage of the policy decisions made while processing the current API
+# request, see enable_request_cache().
+_REQUEST_CACHE = threading.local()
+
 default_policies = [
     # Legacy setting, don't remove. Likely to be overridden by operators who
     # forget to update their policy.json configuration file.
@@ -223,6 +228,18 @@ volume_policies = [
                                    'records'),
 ]
 
+job_policies = [
+    policy.RuleDefault('baremetal:job:get',
+                       'rule:is_admin or rule:is_observer',
+                       description='Retrieve asynchronous Job records'),
+]
+
+metrics_policies = [
+    policy.RuleDefault('baremetal:metrics:get',
+                       'rule:is_admin or rule:is_observer',
+                       description='Retrieve service metrics'),
+]
+
 
 def list_policies():
     policies = (default_policies
@@ -232,7 +249,9 @@ def list_policies():
                 + chassis_policies
                 + driver_policies
                 + extra_policies
-                + volume_policies)
+                + volume_policies
+                + job_policies
+                + metrics_policies)
     return policies
 
 
@@ -297,6 +316,66 @@ def get_oslo_policy_enforcer():
     return get_enforcer()
 
 
+def enable_request_cache():
+    """Start caching policy decisions for the current request.
+
+    Until :func:`disable_request_cache` is called, the results of
+    :func:`authorize` and :func:`check` are memoized per rule, credentials
+    and target, so that checking the same rule for every item of a
+    collection only evaluates it once. Any decision cached by a previous
+    request of this thread is dropped.
+    """
+    _REQUEST_CACHE.decisions = {}
+
+
+def disable_request_cache():
+    """Stop caching policy decisions and drop the cached ones."""
+    _REQUEST_CACHE.decisions = None
+
+
+def _fingerprint(data):
+    """Return a hashable representation of a credentials or target dict.
+
+    :returns: a tuple, or None if the dict holds values which can't be
+        hashed, in which case the decision must not be cached.
+    """
+    try:
+        fingerprint = tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in data.items()))
+        hash(fingerprint)
+    except (AttributeError, TypeError):
+        return None
+    return fingerprint
+
+
+def _cached_decision(method, rule, target, creds, decide):
+    """Return a cached policy decision, making it if needed.
+
+    :param method: name of the calling function, part of the cache key.
+    :param rule: the policy rule.
+    :param target: the target dict.
+    :param creds: the credentials dict.
+    :param decide: a callable without arguments making the decision.
+    :returns: the decision.
+    """
+    cache = getattr(_REQUEST_CACHE, 'decisions', None)
+    if cache is None:
+        return decide()
+
+    target_fp = _fingerprint(target)
+    creds_fp = _fingerprint(creds)
+    if target_fp is None or creds_fp is None:
+        return decide()
+
+    key = (method, rule, creds_fp, target_fp)
+    try:
+        return cache[key]
+    except KeyError:
+        decision = cache[key] = decide()
+        return decision
+
+
 # NOTE(deva): We can't call these methods from within decorators because the
 # 'target' and 'creds' parameter must be fetched from the call time
 # context-local pecan.request magic variable, but decorators are compiled
@@ -315,11 +394,21 @@ def authorize(rule, target, creds, *args, **kwargs):
     if CONF.auth_strategy == 'noauth':
         return True
     enforcer = get_enforcer()
-    try:
-        return enforcer.authorize(rule, target, creds, do_raise=True,
-                                  *args, **kwargs)
-    except policy.PolicyNotAuthorized:
+    if args or kwargs:
+        try:
+            return enforcer.authorize(rule, target, creds, do_raise=True,
+                                      *args, **kwargs)
+        except policy.PolicyNotAuthorized:
+            raise exception.HTTPForbidden(resource=rule)
+
+    # NOTE: decisions are cached rather than exceptions, a rule which is
+    # not registered still raises PolicyNotRegistered every time.
+    result = _cached_decision(
+        'authorize', rule, target, creds,
+        lambda: enforcer.authorize(rule, target, creds, do_raise=False))
+    if not result:
         raise exception.HTTPForbidden(resource=rule)
+    return result
 
 
 def check(rule, target, creds, *args, **kwargs):
@@ -329,7 +418,11 @@ def check(rule, target, creds, *args, **kwargs):
     and returns True or False.
     """
     enforcer = get_enforcer()
-    return enforcer.enforce(rule, target, creds, *args, **kwargs)
+    if args or kwargs:
+        return enforcer.enforce(rule, target, creds, *args, **kwargs)
+    return _cached_decision(
+        'check', rule, target, creds,
+        lambda: enforcer.enforce(rule, target, creds))
 
 
 def enforce(rule, target, creds, do_raise=False, exc=None, *args, **kwargs):
@@ -70,10 +70,9 @@ def _link_mac_pxe_configs(task):
     """
 
     def create_link(mac_path):
-        ironic_utils.unlink_without_raise(mac_path)
         relative_source_path = os.path.relpath(
             pxe_config_file_path, os.path.dirname(mac_path))
-        utils.create_link_without_raise(relative_source_path, mac_path)
+        utils.replace_link_without_raise(relative_source_path, mac_path)
 
     pxe_config_file_path = get_pxe_config_file_path(task.node.uuid)
     for port in task.ports:
@@ -102,11 +101,10 @@ def _link_ip_address_pxe_configs(task, hex_form):
     for port_ip_address in ip_addrs:
         ip_address_path = _get_pxe_ip_address_path(port_ip_address,
                                                    hex_form)
-        ironic_utils.unlink_without_raise(ip_address_path)
         relative_source_path = os.path.relpath(
             pxe_config_file_path, os.path.dirname(ip_address_path))
-        utils.create_link_without_raise(relative_source_path,
-                                        ip_address_path)
+        utils.replace_link_without_raise(relative_source_path,
+                                         ip_address_path)
 
 
 def _get_pxe_mac_path(mac, delimiter='-', client_id=None):
@@ -184,7 +182,8 @@ def create_pxe_config(task, pxe_options, template=None):
     MAC address or DHCP IP address (port) of that node, a symlink for
     the configuration file will be created under the PXE configuration
     directory, so regardless of which port boots first they'll get the
-    same PXE configuration.
+    same PXE configuration. The file and the symlinks are replaced
+    atomically, so that a booting node never misses them.
     If elilo is the bootloader in use, then its configuration file will
     be created based on hex form of DHCP IP address.
     If grub2 bootloader is in use, then its configuration will be created
@@ -233,7 +232,7 @@ def create_pxe_config(task, pxe_options, template=None):
               'DISK_IDENTIFIER': pxe_config_disk_ident}
 
     pxe_config = utils.render_template(template, params)
-    utils.write_to_file(pxe_config_file_path, pxe_config)
+    utils.replace_file(pxe_config_file_path, pxe_config)
 
     if is_uefi_boot_mode and not CONF.pxe.ipxe_enabled:
         _link_ip_address_pxe_configs(task, hex_form)
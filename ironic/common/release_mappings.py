@@ -70,15 +70,16 @@ RELEASE_MAPPING = {
         }
     },
     'master': {
-        'rpc': '1.41',
+        'rpc': '1.43',
         'objects': {
             'Node': '1.21',
-            'Conductor': '1.2',
+            'Conductor': '1.3',
             'Chassis': '1.3',
             'Port': '1.7',
             'Portgroup': '1.3',
             'VolumeConnector': '1.0',
             'VolumeTarget': '1.0',
+            'Job': '1.0',
         }
     },
 }
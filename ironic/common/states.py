@@ -219,6 +219,26 @@ SOFT_POWER_OFF = 'soft power off'
 """ Node is in the process of soft power off. """
 
 
+############
+# Job states
+############
+
+JOB_PENDING = 'pending'
+""" Job was accepted by the API and is waiting for a conductor. """
+
+JOB_RUNNING = 'running'
+""" Job is being executed by a conductor. """
+
+JOB_SUCCESS = 'success'
+""" Job finished successfully, its result is available. """
+
+JOB_ERROR = 'error'
+""" Job failed, the error message is available. """
+
+JOB_FINISHED_STATES = (JOB_SUCCESS, JOB_ERROR)
+"""States in which a job will not change anymore."""
+
+
 #####################
 # State machine model
 #####################
@@ -391,3 +411,8 @@ machine.add_transition(ADOPTFAIL, ADOPTING, 'adopt')
 
 # A node that failed adoption can be moved back to manageable
 machine.add_transition(ADOPTFAIL, MANAGEABLE, 'manage')
+
+# NOTE: no more states or transitions can be added after this point. Users
+# of the state machine share this table and track their own position in it
+# via FrozenFSM.cursor(), which is much cheaper than copying the machine.
+frozen_machine = fsm.FrozenFSM(machine)
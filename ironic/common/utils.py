@@ -27,11 +27,14 @@ import re
 import shutil
 import tempfile
 
+from ironic_lib import utils as ironic_utils
 import jinja2
 from oslo_concurrency import processutils
 from oslo_log import log as logging
+from oslo_utils import excutils
 from oslo_utils import netutils
 from oslo_utils import timeutils
+from oslo_utils import uuidutils
 import paramiko
 import pytz
 import six
@@ -44,6 +47,9 @@ LOG = logging.getLogger(__name__)
 
 warn_deprecated_extra_vif_port_id = False
 
+# Jinja2 environments loading the templates of a directory, by directory
+_JINJA_ENVIRONMENTS = {}
+
 
 def _get_root_helper():
     # NOTE(jlvillal): This function has been moved to ironic-lib. And is
@@ -329,6 +335,53 @@ def write_to_file(path, contents):
         f.write(contents)
 
 
+def _temporary_path(path):
+    """Return a unique path for a temporary file next to the given path."""
+    directory, name = os.path.split(path)
+    return os.path.join(directory,
+                        '.%s.%s' % (name, uuidutils.generate_uuid()))
+
+
+def replace_file(path, contents):
+    """Replace the contents of a file atomically.
+
+    The contents are written to a temporary file in the same directory,
+    which is then renamed over the file, so that readers, e.g. a TFTP
+    server, never see a partially written file.
+
+    :param path: path to the file.
+    :param contents: the new contents of the file.
+    """
+    tmp_path = _temporary_path(path)
+    try:
+        write_to_file(tmp_path, contents)
+        os.rename(tmp_path, path)
+    except Exception:
+        with excutils.save_and_reraise_exception():
+            ironic_utils.unlink_without_raise(tmp_path)
+
+
+def replace_link_without_raise(source, link):
+    """Create a symbolic link, atomically replacing any existing file.
+
+    Unlike removing the file and then creating the link, the link path
+    never disappears, so that readers always find either the old file or
+    the new link.
+
+    :param source: the target of the link.
+    :param link: path to the link.
+    """
+    tmp_link = _temporary_path(link)
+    try:
+        os.symlink(source, tmp_link)
+        os.rename(tmp_link, link)
+    except OSError as e:
+        ironic_utils.unlink_without_raise(tmp_link)
+        LOG.warning("Failed to create symlink from "
+                    "%(source)s to %(link)s, error: %(e)s",
+                    {'source': source, 'link': link, 'e': e})
+
+
 def create_link_without_raise(source, link):
     try:
         os.symlink(source, link)
@@ -523,6 +576,10 @@ def validate_network_port(port, port_name="Port"):
 def render_template(template, params, is_file=True):
     """Renders Jinja2 template file with given parameters.
 
+    Template files are compiled once and kept in the cache of the Jinja2
+    environment of their directory, which compiles them again when their
+    modification time changes.
+
     :param template: full path to the Jinja2 template file
     :param params: dictionary with parameters to use when rendering
     :param is_file: whether template is file or string with template itself
@@ -530,11 +587,15 @@ def render_template(template, params, is_file=True):
     """
     if is_file:
         tmpl_path, tmpl_name = os.path.split(template)
-        loader = jinja2.FileSystemLoader(tmpl_path)
+        env = _JINJA_ENVIRONMENTS.get(tmpl_path)
+        if env is None:
+            env = _JINJA_ENVIRONMENTS.setdefault(
+                tmpl_path,
+                jinja2.Environment(loader=jinja2.FileSystemLoader(tmpl_path)))
     else:
         tmpl_name = 'template'
         loader = jinja2.DictLoader({tmpl_name: template})
-    env = jinja2.Environment(loader=loader)
+        env = jinja2.Environment(loader=loader)
     tmpl = env.get_template(tmpl_name)
     return tmpl.render(params)
 
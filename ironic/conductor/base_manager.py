@@ -22,15 +22,22 @@ from futurist import rejection
 from oslo_db import exception as db_exception
 from oslo_log import log
 from oslo_utils import excutils
+from oslo_utils import timeutils
 
 from ironic.common import context as ironic_context
 from ironic.common import driver_factory
 from ironic.common import exception
 from ironic.common import hash_ring
 from ironic.common.i18n import _
+from ironic.common import metrics
+from ironic.common import notification_queue
 from ironic.common import rpc
 from ironic.common import states
+from ironic.conductor import deadlines
+from ironic.conductor import node_snapshot
 from ironic.conductor import notification_utils as notify_utils
+from ironic.conductor import periodic_scheduler
+from ironic.conductor import power_events
 from ironic.conductor import task_manager
 from ironic.conf import CONF
 from ironic.db import api as dbapi
@@ -41,6 +48,35 @@ from ironic.objects import fields as obj_fields
 
 LOG = log.getLogger(__name__)
 
+_WORKERS_BACKLOG = metrics.REGISTRY.gauge(
+    'ironic_conductor_workers_backlog',
+    'Number of tasks waiting for a free worker of the conductor.')
+_WORKERS_REJECTED = metrics.REGISTRY.counter(
+    'ironic_conductor_workers_rejected_total',
+    'Number of tasks rejected because the pool of workers was full, '
+    'by priority.')
+_WORKERS_SATURATION = metrics.REGISTRY.gauge(
+    'ironic_conductor_workers_saturation',
+    'Ratio of busy workers of the conductor, including waiting tasks.')
+_WORKER_DURATION = metrics.REGISTRY.histogram(
+    'ironic_conductor_worker_duration_seconds',
+    'Time spent running tasks in the workers of the conductor, by task.')
+_TASKS_EXECUTED = metrics.REGISTRY.counter(
+    'ironic_conductor_tasks_executed_total',
+    'Number of tasks executed by the workers of the conductor.')
+_TASKS_FAILED = metrics.REGISTRY.counter(
+    'ironic_conductor_tasks_failed_total',
+    'Number of tasks executed by the workers of the conductor which failed.')
+_PERIODIC_RUNS = metrics.REGISTRY.counter(
+    'ironic_conductor_periodic_runs_total',
+    'Number of runs of a periodic task.')
+_PERIODIC_FAILURES = metrics.REGISTRY.counter(
+    'ironic_conductor_periodic_failures_total',
+    'Number of failed runs of a periodic task.')
+_PERIODIC_ELAPSED = metrics.REGISTRY.counter(
+    'ironic_conductor_periodic_elapsed_seconds_total',
+    'Total time spent running a periodic task.')
+
 
 def _check_enabled_interfaces():
     """Sanity-check enabled_*_interfaces configs.
@@ -75,6 +111,9 @@ class BaseConductorManager(object):
         self.sensors_notifier = rpc.get_sensors_notifier()
         self._started = False
         self._shutdown = None
+        self._metrics_exporter = None
+        self._node_snapshot = node_snapshot.NodeSnapshot(self)
+        self._deadlines = None
 
     def init_host(self, admin_context=None):
         """Initialize the conductor host.
@@ -99,12 +138,7 @@ class BaseConductorManager(object):
         self._keepalive_evt = threading.Event()
         """Event for the keepalive thread."""
 
-        # TODO(dtantsur): make the threshold configurable?
-        rejection_func = rejection.reject_when_reached(
-            CONF.conductor.workers_pool_size)
-        self._executor = futurist.GreenThreadPoolExecutor(
-            max_workers=CONF.conductor.workers_pool_size,
-            check_and_reject=rejection_func)
+        self._executor = self._start_executor()
         """Executor for performing tasks async."""
 
         self.ring_manager = hash_ring.HashRingManager()
@@ -155,6 +189,7 @@ class BaseConductorManager(object):
         # we'll have several instances of the same task.
         LOG.debug('Collecting periodic tasks')
         self._periodic_task_callables = []
+        self._node_snapshot = node_snapshot.NodeSnapshot(self)
         periodic_task_classes = set()
         self._collect_periodic_tasks(self, (admin_context,))
         for driver_obj in drivers.values():
@@ -172,9 +207,8 @@ class BaseConductorManager(object):
                         {'tasks': len(self._periodic_task_callables),
                          'workers': CONF.conductor.workers_pool_size})
 
-        self._periodic_tasks = periodics.PeriodicWorker(
-            self._periodic_task_callables,
-            executor_factory=periodics.ExistingExecutor(self._executor))
+        self._periodic_tasks = periodic_scheduler.PeriodicScheduler(
+            self._periodic_task_callables, self._executor)
 
         # Check for required config options if object_store_endpoint_type is
         # radosgw
@@ -223,6 +257,8 @@ class BaseConductorManager(object):
         self._periodic_tasks_worker.add_done_callback(
             self._on_periodic_tasks_stop)
 
+        self._start_metrics()
+
         # NOTE(lucasagomes): If the conductor server dies abruptly
         # mid deployment (OMM Killer, power outage, etc...) we
         # can not resume the deployment even if the conductor
@@ -239,6 +275,9 @@ class BaseConductorManager(object):
                                states.DEPLOYING, 'provision_updated_at',
                                last_error=last_error)
 
+        self._start_deadline_tracker()
+        self._start_power_events()
+
         # Start consoles if it set enabled in a greenthread.
         try:
             self._spawn_worker(self._start_consoles,
@@ -259,6 +298,53 @@ class BaseConductorManager(object):
 
         self._started = True
 
+    def _start_executor(self):
+        """Create the executor of the workers of the conductor.
+
+        :raises: ConfigInvalid if more workers are reserved than available.
+        :returns: a GreenThreadPoolExecutor which tracks its backlog.
+        """
+        if (CONF.conductor.workers_pool_reserved >=
+                CONF.conductor.workers_pool_size):
+            raise exception.ConfigInvalid(
+                _('The [conductor]workers_pool_reserved option must be less '
+                  'than [conductor]workers_pool_size'))
+
+        # TODO(dtantsur): make the threshold configurable?
+        reject_when_reached = rejection.reject_when_reached(
+            CONF.conductor.workers_pool_size)
+
+        self._workers_submitted = 0
+        """Number of tasks accepted by the executor, including periodic."""
+
+        def rejection_func(executor, backlog):
+            _WORKERS_BACKLOG.set(backlog)
+            reject_when_reached(executor, backlog)
+            self._workers_submitted += 1
+
+        return futurist.GreenThreadPoolExecutor(
+            max_workers=CONF.conductor.workers_pool_size,
+            check_and_reject=rejection_func)
+
+    def _start_metrics(self):
+        """Collect the metrics of the conductor and expose them if enabled."""
+        metrics.REGISTRY.add_collector(self._collect_metrics)
+        if CONF.metrics.expose_registry:
+            self._metrics_exporter = metrics.Exporter(
+                CONF.metrics.conductor_exporter_host,
+                CONF.metrics.conductor_exporter_port)
+            self._metrics_exporter.start()
+
+    def _start_deadline_tracker(self):
+        """Start tracking the provisioning timeouts if enabled."""
+        if CONF.conductor.track_provision_timeouts:
+            self._deadlines = deadlines.DeadlineTracker(self)
+            self._deadlines.start()
+
+    def _start_power_events(self):
+        """Sync the power state of nodes notified out-of-band by drivers."""
+        power_events.set_handler(self._handle_power_event)
+
     def del_host(self, deregister=True):
         # Conductor deregistration fails if called on non-initialized
         # conductor (e.g. when rpc server is unreachable).
@@ -280,12 +366,22 @@ class BaseConductorManager(object):
         else:
             LOG.info('Not deregistering conductor with hostname %(hostname)s.',
                      {'hostname': self.host})
+        power_events.stop()
+        if self._deadlines is not None:
+            self._deadlines.stop()
+            self._deadlines = None
         # Waiting here to give workers the chance to finish. This has the
         # benefit of releasing locks workers placed on nodes, as well as
         # having work complete normally.
         self._periodic_tasks.stop()
         self._periodic_tasks.wait()
         self._executor.shutdown(wait=True)
+        # Send the notifications emitted by the finished workers
+        notification_queue.flush()
+        metrics.REGISTRY.remove_collector(self._collect_metrics)
+        if self._metrics_exporter is not None:
+            self._metrics_exporter.stop()
+            self._metrics_exporter = None
         self._started = False
 
     def _register_and_validate_hardware_interfaces(self, hardware_types):
@@ -327,10 +423,12 @@ class BaseConductorManager(object):
         """Collect periodic tasks from a given object.
 
         Populates self._periodic_task_callables with tuples
-        (callable, args, kwargs).
+        (callable, args, kwargs) and registers consumers of the node
+        snapshot in self._node_snapshot.
 
         :param obj: object containing periodic tasks as methods
-        :param args: tuple with arguments to pass to every task
+        :param args: tuple with arguments to pass to every task, ending with
+                     the context
         """
         for name, member in inspect.getmembers(obj):
             if periodics.is_periodic(member):
@@ -338,6 +436,12 @@ class BaseConductorManager(object):
                           {'owner': obj.__class__.__name__,
                            'member': name})
                 self._periodic_task_callables.append((member, args, {}))
+            elif node_snapshot.is_consumer(member):
+                LOG.debug('Found node snapshot consumer %(owner)s.%(member)s',
+                          {'owner': obj.__class__.__name__,
+                           'member': name})
+                # NOTE: the context is passed by the snapshot task
+                self._node_snapshot.register(member, args[:-1])
 
     def _on_periodic_tasks_stop(self, fut):
         try:
@@ -376,20 +480,82 @@ class BaseConductorManager(object):
 
         Spawns a greenthread if there are free slots in pool, otherwise raises
         exception. Execution control returns immediately to the caller.
+        The workers reserved by the [conductor]workers_pool_reserved option
+        are not considered free.
 
         :returns: Future object.
         :raises: NoFreeConductorWorker if worker pool is currently full.
 
         """
+        reserved = CONF.conductor.workers_pool_reserved
+        if (reserved and self._workers_in_use() + reserved >=
+                CONF.conductor.workers_pool_size):
+            _WORKERS_REJECTED.inc(priority='normal')
+            raise exception.NoFreeConductorWorker()
+        return self._submit_worker('normal', func, *args, **kwargs)
+
+    def _spawn_priority_worker(self, func, *args, **kwargs):
+        """Create a greenthread to run a high-priority func(*args, **kwargs).
+
+        Same as :meth:`_spawn_worker`, but may use the workers reserved by
+        the [conductor]workers_pool_reserved option. Use it for operations
+        which must not wait behind bulk and periodic work, like powering
+        nodes off, tearing them down or handling heartbeats.
+
+        :returns: Future object.
+        :raises: NoFreeConductorWorker if worker pool is currently full.
+        """
+        return self._submit_worker('high', func, *args, **kwargs)
+
+    def _submit_worker(self, _priority, func, *args, **kwargs):
         try:
-            return self._executor.submit(func, *args, **kwargs)
+            return self._executor.submit(self._run_worker, func,
+                                         *args, **kwargs)
         except futurist.RejectedSubmission:
+            _WORKERS_REJECTED.inc(priority=_priority)
             raise exception.NoFreeConductorWorker()
 
+    @staticmethod
+    def _run_worker(func, *args, **kwargs):
+        timer = timeutils.StopWatch().start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _WORKER_DURATION.observe(
+                timer.elapsed(), task=getattr(func, '__name__', 'unknown'))
+
+    def _workers_in_use(self):
+        """Get the number of tasks submitted and not finished yet.
+
+        Includes the periodic tasks and the tasks waiting for a free worker.
+        """
+        statistics = self._executor.statistics
+        return (self._workers_submitted - statistics.executed -
+                statistics.cancelled)
+
+    def _saturation(self):
+        """Get the ratio of busy workers, including waiting tasks."""
+        return (self._workers_in_use() /
+                float(CONF.conductor.workers_pool_size))
+
+    def _collect_metrics(self):
+        """Update the metrics which are only computed on rendering."""
+        _WORKERS_SATURATION.set(self._saturation())
+        statistics = self._executor.statistics
+        _TASKS_EXECUTED.set(statistics.executed)
+        _TASKS_FAILED.set(statistics.failures)
+        for watcher in self._periodic_tasks.iter_watchers():
+            task = watcher.work.name
+            _PERIODIC_RUNS.set(watcher.runs, task=task)
+            _PERIODIC_FAILURES.set(watcher.failures, task=task)
+            _PERIODIC_ELAPSED.set(watcher.elapsed, task=task)
+
     def _conductor_service_record_keepalive(self):
         while not self._keepalive_evt.is_set():
             try:
-                self.conductor.touch()
+                saturation = self._saturation()
+                _WORKERS_SATURATION.set(saturation)
+                self.conductor.touch(saturation=saturation)
             except db_exception.DBConnectionError:
                 LOG.warning('Conductor could not connect to database '
                             'while heartbeating.')
@@ -450,14 +616,43 @@ class BaseConductorManager(object):
         node_iter = self.iter_nodes(filters=filters,
                                     sort_key=sort_key,
                                     sort_dir='asc')
+        self._fail_nodes_in_state(
+            context, (node_uuid for node_uuid, driver in node_iter),
+            provision_state, callback_method=callback_method,
+            err_handler=err_handler, last_error=last_error,
+            keep_target_state=keep_target_state)
+
+    def _fail_nodes_in_state(self, context, node_uuids, provision_state,
+                             callback_method=None, err_handler=None,
+                             last_error=None, keep_target_state=False,
+                             predicate=None):
+        """Fail the given nodes if they are in specified state.
+
+        Same as :meth:`_fail_if_in_state`, but processes the given nodes,
+        e.g. selected from a snapshot of nodes, instead of querying them.
 
+        :param: context: request context
+        :param: node_uuids: iterable of UUIDs of the nodes to process, in the
+                            order of processing.
+        :param: provision_state: provision_state that the node is in,
+                                 for the provisioning activity to have failed.
+        :param: callback_method: see :meth:`_fail_if_in_state`.
+        :param: err_handler: see :meth:`_fail_if_in_state`.
+        :param: last_error: see :meth:`_fail_if_in_state`.
+        :param: keep_target_state: see :meth:`_fail_if_in_state`.
+        :param: predicate: callable accepting a locked node and returning
+                           whether it has still failed, e.g. to re-check a
+                           timeout against up-to-date fields of the node.
+        """
         workers_count = 0
-        for node_uuid, driver in node_iter:
+        for node_uuid in node_uuids:
             try:
                 with task_manager.acquire(context, node_uuid,
                                           purpose='node state check') as task:
                     if (task.node.maintenance or
-                            task.node.provision_state != provision_state):
+                            task.node.provision_state != provision_state or
+                            (predicate is not None and
+                             not predicate(task.node))):
                         continue
 
                     target_state = (None if not keep_target_state else
@@ -0,0 +1,226 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""In-memory tracking of provisioning timeouts.
+
+A conductor keeps the deadlines of the nodes mapped to it which wait for a
+deploy or clean callback, or for inspection, in a heap. The heap is fed by
+provision state transitions and rebuilt from the database on start up and
+when the hash ring changes, so that timeouts are processed as soon as they
+are reached instead of on the next periodic check.
+
+Heart beats moving a deadline later are not tracked: when a deadline is
+reached, the node is loaded again and its deadline is rescheduled if it has
+moved.
+"""
+
+import datetime
+import heapq
+import threading
+
+import eventlet
+from oslo_log import log
+from oslo_utils import timeutils
+
+from ironic.common import metrics
+from ironic.common import states
+from ironic.conf import CONF
+
+LOG = log.getLogger(__name__)
+
+TRACKED_STATES = {
+    states.DEPLOYWAIT: ('deploy_callback_timeout', 'provision_updated_at'),
+    states.CLEANWAIT: ('clean_callback_timeout', 'provision_updated_at'),
+    states.INSPECTING: ('inspect_timeout', 'inspection_started_at'),
+}
+"""Tracked provision states, with their timeout option and start field."""
+
+_TRACKED = metrics.REGISTRY.gauge(
+    'ironic_conductor_provision_deadlines',
+    'Number of provisioning deadlines tracked by the conductor.')
+_REACHED = metrics.REGISTRY.counter(
+    'ironic_conductor_provision_deadlines_reached_total',
+    'Number of tracked provisioning deadlines which were reached.')
+
+_TRACKER = None
+
+
+def get_deadline(provision_state, started_at):
+    """Get the deadline of a node in a tracked provision state.
+
+    :param provision_state: provision state of the node.
+    :param started_at: value of the field holding the start of the timeout
+        for this provision state, see :data:`TRACKED_STATES`.
+    :returns: the deadline as a naive UTC datetime, or None if the state is
+        not tracked or its timeout is disabled.
+    """
+    try:
+        option, field = TRACKED_STATES[provision_state]
+    except KeyError:
+        return None
+    timeout = getattr(CONF.conductor, option)
+    if not timeout or started_at is None:
+        return None
+    return (timeutils.normalize_time(started_at) +
+            datetime.timedelta(seconds=timeout))
+
+
+def node_updated(node):
+    """Update the deadline of a node after a provision state change.
+
+    Does nothing unless a tracker is running in this process.
+
+    :param node: a Node object.
+    """
+    tracker = _TRACKER
+    if tracker is None:
+        return
+    provision_state = node.provision_state
+    field = TRACKED_STATES.get(provision_state, (None, None))[1]
+    tracker.schedule(node.uuid, get_deadline(
+        provision_state, getattr(node, field) if field else None))
+
+
+class DeadlineTracker(object):
+    """A heap of provisioning deadlines with a green thread processing them.
+
+    :param manager: the conductor manager. Deadlines of nodes mapped to it
+        are loaded with its ``iter_nodes`` method, and are passed to its
+        ``_handle_provision_deadline`` method when reached.
+    """
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._heap = []
+        # Current deadline by node UUID, other entries of the heap are stale
+        self._deadlines = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopped = False
+        self._ring_hosts = None
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def schedule(self, node_uuid, deadline):
+        """Schedule, move or cancel the deadline of a node.
+
+        :param node_uuid: UUID of the node.
+        :param deadline: the new deadline as a naive UTC datetime, None to
+            stop tracking the node.
+        """
+        with self._lock:
+            if deadline is None:
+                self._deadlines.pop(node_uuid, None)
+            else:
+                earliest = self._heap[0][0] if self._heap else None
+                self._deadlines[node_uuid] = deadline
+                heapq.heappush(self._heap, (deadline, node_uuid))
+                if earliest is None or deadline < earliest:
+                    self._wakeup.set()
+            _TRACKED.set(len(self._deadlines))
+
+    def rebuild(self):
+        """Reload the deadlines of the nodes mapped to the conductor."""
+        columns = ['provision_state', 'provision_updated_at',
+                   'inspection_started_at']
+        deadlines = {}
+        node_iter = self._manager.iter_nodes(
+            fields=columns,
+            filters={'maintenance': False,
+                     'provision_state_in': list(TRACKED_STATES)})
+        for result in node_iter:
+            node = dict(zip(['uuid', 'driver'] + columns, result))
+            field = TRACKED_STATES[node['provision_state']][1]
+            deadline = get_deadline(node['provision_state'], node[field])
+            if deadline is not None:
+                deadlines[node['uuid']] = deadline
+
+        with self._lock:
+            self._deadlines = deadlines
+            self._heap = [(deadline, node_uuid)
+                          for node_uuid, deadline in deadlines.items()]
+            heapq.heapify(self._heap)
+            _TRACKED.set(len(self._deadlines))
+        self._wakeup.set()
+        LOG.debug('Tracking %d provisioning deadlines', len(deadlines))
+
+    def _pop_reached(self):
+        now = timeutils.utcnow()
+        reached = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, node_uuid = heapq.heappop(self._heap)
+                if self._deadlines.get(node_uuid) == deadline:
+                    del self._deadlines[node_uuid]
+                    reached.append(node_uuid)
+            _TRACKED.set(len(self._deadlines))
+            if self._heap:
+                wait = (self._heap[0][0] - now).total_seconds()
+            else:
+                wait = None
+        return reached, wait
+
+    def _ring_changed(self):
+        rings = self._manager.ring_manager.ring
+        hosts = {name: frozenset(ring.nodes) for name, ring in rings.items()}
+        changed = self._ring_hosts is not None and hosts != self._ring_hosts
+        self._ring_hosts = hosts
+        return changed
+
+    def _run(self):
+        while not self._stopped:
+            # NOTE: cleared before looking at the heap, so that deadlines
+            # scheduled meanwhile are not missed
+            self._wakeup.clear()
+            try:
+                if self._ring_changed():
+                    LOG.debug('The hash ring has changed, reloading '
+                              'provisioning deadlines')
+                    self.rebuild()
+
+                reached, wait = self._pop_reached()
+                for node_uuid in reached:
+                    _REACHED.inc()
+                    try:
+                        self._manager._handle_provision_deadline(node_uuid)
+                    except Exception:
+                        LOG.exception('Failed to process the provisioning '
+                                      'deadline of node %s', node_uuid)
+            except Exception:
+                LOG.exception('Failed to process provisioning deadlines')
+                wait = None
+
+            # Wake up when the hash ring may have changed at the latest
+            if wait is None or wait > CONF.hash_ring_reset_interval:
+                wait = CONF.hash_ring_reset_interval
+            self._wakeup.wait(max(wait, 0))
+
+    def start(self):
+        """Load the deadlines and start processing them."""
+        global _TRACKER
+        self._ring_changed()
+        self.rebuild()
+        self._thread = eventlet.spawn(self._run)
+        _TRACKER = self
+
+    def stop(self):
+        """Stop processing the deadlines."""
+        global _TRACKER
+        if _TRACKER is self:
+            _TRACKER = None
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.wait()
+            self._thread = None
@@ -49,22 +49,30 @@ import tempfile
 import eventlet
 from futurist import periodics
 from futurist import waiters
-from ironic_lib import metrics_utils
 from oslo_log import log
 import oslo_messaging as messaging
 from oslo_utils import excutils
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
+import six
 from six.moves import queue
 
+from ironic.common import context as ironic_context
 from ironic.common import driver_factory
 from ironic.common import exception
 from ironic.common.glance_service import service_utils as glance_utils
 from ironic.common.i18n import _
 from ironic.common import images
+from ironic.common import metrics_utils
 from ironic.common import states
 from ironic.common import swift
 from ironic.conductor import base_manager
+from ironic.conductor import deadlines
+from ironic.conductor import node_snapshot
 from ironic.conductor import notification_utils as notify_utils
+from ironic.conductor import periodic_scheduler
+from ironic.conductor import power_events
+from ironic.conductor import sensors
 from ironic.conductor import task_manager
 from ironic.conductor import utils
 from ironic.conf import CONF
@@ -83,13 +91,26 @@ METRICS = metrics_utils.get_metrics_logger(__name__)
 SYNC_EXCLUDED_STATES = (states.DEPLOYWAIT, states.CLEANWAIT, states.ENROLL)
 
 
+def _unreserved_in_state(provision_state):
+    """Node snapshot predicate for unreserved nodes in provision_state."""
+    def predicate(node):
+        return (node['reservation'] is None and
+                node['provision_state'] == provision_state)
+    return predicate
+
+
+def _timed_out(timestamp, timeout):
+    return (timestamp is not None and
+            timeutils.is_older_than(timestamp, timeout))
+
+
 class ConductorManager(base_manager.BaseConductorManager):
     """Ironic Conductor manager main class."""
 
     # NOTE(rloo): This must be in sync with rpcapi.ConductorAPI's.
     # NOTE(pas-ha): This also must be in sync with
     #               ironic.common.release_mappings.RELEASE_MAPPING['master']
-    RPC_API_VERSION = '1.41'
+    RPC_API_VERSION = '1.43'
 
     target = messaging.Target(version=RPC_API_VERSION)
 
@@ -258,7 +279,13 @@ class ConductorManager(base_manager.BaseConductorManager):
             task.node.save()
             task.set_spawn_error_hook(utils.power_state_error_handler,
                                       task.node, task.node.power_state)
-            task.spawn_after(self._spawn_worker, utils.node_power_action,
+            # NOTE: powering off may be urgent, e.g. for a misbehaving node,
+            # so it is allowed to use the workers reserved for such cases.
+            if new_state in (states.POWER_OFF, states.SOFT_POWER_OFF):
+                spawn_method = self._spawn_priority_worker
+            else:
+                spawn_method = self._spawn_worker
+            task.spawn_after(spawn_method, utils.node_power_action,
                              task, new_state, timeout=power_timeout)
 
     @METRICS.timer('ConductorManager.vendor_passthru')
@@ -640,7 +667,7 @@ class ConductorManager(base_manager.BaseConductorManager):
             try:
                 task.process_event(
                     'delete',
-                    callback=self._spawn_worker,
+                    callback=self._spawn_priority_worker,
                     call_args=(self._do_node_tear_down, task),
                     err_handler=utils.provisioning_error_handler)
             except exception.InvalidState:
@@ -1207,6 +1234,227 @@ class ConductorManager(base_manager.BaseConductorManager):
                     action=action, node=node.uuid,
                     state=node.provision_state)
 
+    @METRICS.timer('ConductorManager.bulk_node_action')
+    @messaging.expected_exceptions(exception.InvalidParameterValue)
+    def bulk_node_action(self, context, node_ids, action, target,
+                         timeout=None, reason=None):
+        """RPC method to perform the same action on a batch of nodes.
+
+        The batch is put into a queue which is drained by up to
+        [conductor]bulk_action_workers workers, so that validation and lock
+        acquisition for the nodes happen in parallel. Every node is handled
+        exactly like the corresponding single-node RPC method would do it;
+        long-running parts are spawned in their own workers as usual.
+
+        :param context: an admin context.
+        :param node_ids: a list of node UUIDs.
+        :param action: the action to perform, one of
+            :data:`ironic.conductor.utils.BULK_NODE_ACTIONS`.
+        :param target: the target of the action: a power state for 'power',
+            a provision state or verb for 'provision' and a boolean for
+            'maintenance'.
+        :param timeout: timeout (in seconds) of a power action. ``None``
+            indicates to use default timeout.
+        :param reason: reason for putting nodes into maintenance mode.
+        :raises: InvalidParameterValue if the action is not supported.
+        :returns: a dictionary mapping every node UUID to ``None`` on success
+            or to a dictionary with 'error' and 'code' keys on failure.
+        """
+        LOG.debug("RPC bulk_node_action called for %(count)d nodes. "
+                  "The action is %(action)s, the target is %(target)s.",
+                  {'count': len(node_ids), 'action': action,
+                   'target': target})
+        if action == 'power':
+            handler = self._bulk_change_power_state
+            args = (target, timeout)
+        elif action == 'provision':
+            handler = self._bulk_do_provisioning_action
+            args = (target,)
+        elif action == 'maintenance':
+            handler = self._bulk_set_maintenance
+            args = (target, reason)
+        else:
+            raise exception.InvalidParameterValue(
+                _('Unsupported bulk action %(action)s, supported actions '
+                  'are %(actions)s') %
+                {'action': action,
+                 'actions': ', '.join(utils.BULK_NODE_ACTIONS)})
+
+        nodes = queue.Queue()
+        for node_id in node_ids:
+            nodes.put_nowait(node_id)
+
+        results = {}
+        number_of_threads = min(CONF.conductor.bulk_action_workers,
+                                nodes.qsize())
+        futures = []
+        for thread_number in range(number_of_threads):
+            try:
+                futures.append(
+                    self._spawn_worker(self._bulk_action_nodes_task,
+                                       context, nodes, results, handler,
+                                       *args))
+            except exception.NoFreeConductorWorker:
+                LOG.warning("There is no more conductor workers for "
+                            "bulk action %(action)s. %(workers)d workers "
+                            "has been already spawned.",
+                            {'action': action, 'workers': thread_number})
+                break
+
+        waiters.wait_for_all(futures)
+
+        # Nodes left in the queue could not be processed because no worker
+        # was available to pick them up.
+        while True:
+            try:
+                node_id = nodes.get_nowait()
+            except queue.Empty:
+                break
+            results[node_id] = _bulk_error(exception.NoFreeConductorWorker())
+        return results
+
+    def _bulk_action_nodes_task(self, context, nodes, results, handler,
+                                *args):
+        """Runs a bulk action handler for nodes from synchronized queue."""
+        while not self._shutdown:
+            try:
+                node_id = nodes.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                handler(context, node_id, *args)
+            except messaging.ExpectedException as e:
+                results[node_id] = _bulk_error(e.exc_info[1])
+            except exception.IronicException as e:
+                results[node_id] = _bulk_error(e)
+            except Exception as e:
+                LOG.exception("Unexpected error during bulk action on "
+                              "node %(node)s: %(err)s",
+                              {'node': node_id, 'err': e})
+                results[node_id] = _bulk_error(e)
+            else:
+                results[node_id] = None
+            finally:
+                # Yield on every iteration
+                eventlet.sleep(0)
+
+    def _bulk_change_power_state(self, context, node_id, new_state,
+                                 timeout=None):
+        self.change_node_power_state(context, node_id, new_state,
+                                     timeout=timeout)
+
+    def _bulk_do_provisioning_action(self, context, node_id, target):
+        if target == states.ACTIVE:
+            self.do_node_deploy(context, node_id, rebuild=False)
+        elif target == states.REBUILD:
+            self.do_node_deploy(context, node_id, rebuild=True)
+        elif target == states.DELETED:
+            self.do_node_tear_down(context, node_id)
+        elif target == states.VERBS['inspect']:
+            self.inspect_hardware(context, node_id)
+        else:
+            self.do_provisioning_action(context, node_id, target)
+
+    def _bulk_set_maintenance(self, context, node_id, maintenance,
+                              reason=None):
+        with task_manager.acquire(context, node_id, shared=False,
+                                  purpose='setting maintenance mode') as task:
+            node = task.node
+            node.maintenance = maintenance
+            node.maintenance_reason = reason if maintenance else None
+            node.save()
+
+    @METRICS.timer('ConductorManager.run_job')
+    def run_job(self, context, job_id):
+        """RPC method to run an asynchronous job.
+
+        The action stored in the job is run in a worker by calling the
+        conductor method of the same name, its outcome is recorded in
+        the job. This is an RPC cast, the API service polls the job.
+
+        :param context: request context.
+        :param job_id: job id or uuid.
+        """
+        LOG.debug('RPC run_job called for job %s.', job_id)
+        try:
+            job = objects.Job.get(context, job_id)
+        except exception.JobNotFound:
+            LOG.warning('Job %s was not found, it was probably deleted '
+                        'before it could run.', job_id)
+            return
+
+        if job.status != states.JOB_PENDING:
+            LOG.warning('Job %(job)s is in state %(state)s and will not be '
+                        'run again.', {'job': job.uuid, 'state': job.status})
+            return
+
+        try:
+            self._spawn_worker(self._do_run_job, context, job)
+        except exception.NoFreeConductorWorker as e:
+            job.status = states.JOB_ERROR
+            job.error = six.text_type(e)
+            job.save()
+
+    def _do_run_job(self, context, job):
+        """Run the action of a job and record its outcome."""
+        job.status = states.JOB_RUNNING
+        job.save()
+
+        try:
+            if job.action not in utils.JOB_ACTIONS:
+                raise exception.InvalidParameterValue(
+                    _('Unsupported job action %(action)s, supported actions '
+                      'are %(actions)s') %
+                    {'action': job.action,
+                     'actions': ', '.join(utils.JOB_ACTIONS)})
+            node = objects.Node.get_by_id(context, job.node_id)
+            result = getattr(self, job.action)(context, node.uuid, **job.args)
+        except Exception as e:
+            if isinstance(e, messaging.ExpectedException):
+                e = e.exc_info[1]
+            if not isinstance(e, exception.IronicException):
+                LOG.exception('Unexpected error while running job %(job)s '
+                              'for action %(action)s: %(err)s',
+                              {'job': job.uuid, 'action': job.action,
+                               'err': e})
+            job.status = states.JOB_ERROR
+            job.error = six.text_type(e)
+        else:
+            job.status = states.JOB_SUCCESS
+            job.result = result or {}
+        job.save()
+
+    @METRICS.timer('ConductorManager._clean_up_jobs')
+    @periodics.periodic(spacing=CONF.conductor.check_provision_state_interval)
+    def _clean_up_jobs(self, context):
+        """Periodically fails stale pending jobs and deletes expired ones.
+
+        A job stays pending forever when the request to run it is lost, for
+        example if its conductor stopped before receiving it.
+
+        :param context: request context.
+        """
+        timeout = CONF.conductor.job_pending_timeout
+        if timeout:
+            older_than = (timeutils.utcnow() -
+                          datetime.timedelta(seconds=timeout))
+            count = self.dbapi.expire_pending_jobs(
+                older_than, _('Timed out waiting for a conductor to run '
+                              'the job'))
+            if count:
+                LOG.warning('%d asynchronous jobs were not run by any '
+                            'conductor for %d seconds and were marked as '
+                            'failed.', count, timeout)
+
+        retention = CONF.conductor.job_retention_period
+        if retention:
+            older_than = (timeutils.utcnow() -
+                          datetime.timedelta(seconds=retention))
+            count = self.dbapi.destroy_finished_jobs(older_than)
+            if count:
+                LOG.debug('Deleted %d expired finished jobs.', count)
+
     @METRICS.timer('ConductorManager._sync_power_states')
     @periodics.periodic(spacing=CONF.conductor.sync_power_state_interval)
     def _sync_power_states(self, context):
@@ -1241,68 +1489,320 @@ class ConductorManager(base_manager.BaseConductorManager):
 
         filters = {'maintenance': False}
         node_iter = self.iter_nodes(fields=['id'], filters=filters)
+        bulk_size = CONF.conductor.sync_power_state_bulk_size
+        # Power interface and bulk key -> list of tasks
+        bulk_tasks = collections.OrderedDict()
+        bulk_count = 0
         for (node_uuid, driver, node_id) in node_iter:
+            # NOTE: nodes whose power state changes are notified
+            # out-of-band are polled less often
+            if not power_events.needs_sync(node_uuid):
+                continue
             try:
-                # NOTE(dtantsur): start with a shared lock, upgrade if needed
-                with task_manager.acquire(context, node_uuid,
-                                          purpose='power state sync',
-                                          shared=True) as task:
-                    # NOTE(deva): we should not acquire a lock on a node in
-                    #             DEPLOYWAIT/CLEANWAIT, as this could cause
-                    #             an error within a deploy ramdisk POSTing back
-                    #             at the same time.
-                    # NOTE(dtantsur): it's also pointless (and dangerous) to
-                    # sync power state when a power action is in progress
-                    if (task.node.provision_state in SYNC_EXCLUDED_STATES or
-                            task.node.maintenance or
-                            task.node.target_power_state or
-                            task.node.reservation):
-                        continue
-                    count = do_sync_power_state(
-                        task, self.power_state_sync_count[node_uuid])
-                    if count:
-                        self.power_state_sync_count[node_uuid] = count
-                    else:
-                        # don't bloat the dict with non-failing nodes
-                        del self.power_state_sync_count[node_uuid]
-            except exception.NodeNotFound:
-                LOG.info("During sync_power_state, node %(node)s was not "
-                         "found and presumed deleted by another process.",
-                         {'node': node_uuid})
-            except exception.NodeLocked:
-                LOG.info("During sync_power_state, node %(node)s was "
-                         "already locked by another process. Skip.",
-                         {'node': node_uuid})
+                if not bulk_size:
+                    self._sync_node_power_state(context, node_uuid)
+                    continue
+
+                task = self._acquire_for_power_sync(context, node_uuid)
+                if task is None:
+                    continue
+                key = self._power_state_bulk_key(task)
+                if key is None:
+                    try:
+                        self._sync_task_power_state(task)
+                    finally:
+                        task.release_resources()
+                    continue
+
+                bulk_tasks.setdefault(key, []).append(task)
+                bulk_count += 1
+                if bulk_count >= bulk_size:
+                    self._sync_power_state_bulk(bulk_tasks)
+                    bulk_tasks.clear()
+                    bulk_count = 0
             finally:
                 # Yield on every iteration
                 eventlet.sleep(0)
 
-    @METRICS.timer('ConductorManager._check_deploy_timeouts')
+        if bulk_tasks:
+            self._sync_power_state_bulk(bulk_tasks)
+
+    @staticmethod
+    def _power_sync_excluded(node):
+        """Whether the power state of a node must not be synced."""
+        # NOTE(deva): we should not acquire a lock on a node in
+        #             DEPLOYWAIT/CLEANWAIT, as this could cause
+        #             an error within a deploy ramdisk POSTing back
+        #             at the same time.
+        # NOTE(dtantsur): it's also pointless (and dangerous) to
+        # sync power state when a power action is in progress
+        return bool(node.provision_state in SYNC_EXCLUDED_STATES or
+                    node.maintenance or
+                    node.target_power_state or
+                    node.reservation)
+
+    def _sync_node_power_state(self, context, node_uuid):
+        """Sync the power state of a node, see _sync_power_states."""
+        try:
+            # NOTE(dtantsur): start with a shared lock, upgrade if needed
+            with task_manager.acquire(context, node_uuid,
+                                      purpose='power state sync',
+                                      shared=True) as task:
+                if self._power_sync_excluded(task.node):
+                    return
+                self._sync_task_power_state(task)
+        except (exception.NodeNotFound, exception.NodeLocked) as e:
+            self._log_power_sync_skipped(node_uuid, e)
+
+    @staticmethod
+    def _log_power_sync_skipped(node_uuid, error):
+        if isinstance(error, exception.NodeNotFound):
+            LOG.info("During sync_power_state, node %(node)s was not "
+                     "found and presumed deleted by another process.",
+                     {'node': node_uuid})
+        else:
+            LOG.info("During sync_power_state, node %(node)s was "
+                     "already locked by another process. Skip.",
+                     {'node': node_uuid})
+
+    def _sync_task_power_state(self, task, power_state=None):
+        """Sync the power state of the node of a task.
+
+        :param task: a TaskManager instance with a shared lock.
+        :param power_state: the power state of the node if already known.
+        """
+        node_uuid = task.node.uuid
+        try:
+            if power_state is None:
+                count = do_sync_power_state(
+                    task, self.power_state_sync_count[node_uuid])
+            else:
+                count = do_sync_power_state(
+                    task, self.power_state_sync_count[node_uuid],
+                    power_state=power_state)
+        except (exception.NodeNotFound, exception.NodeLocked) as e:
+            self._log_power_sync_skipped(node_uuid, e)
+            return
+
+        if count:
+            self.power_state_sync_count[node_uuid] = count
+        else:
+            # don't bloat the dict with non-failing nodes
+            del self.power_state_sync_count[node_uuid]
+            power_events.synced(node_uuid)
+
+    def _acquire_for_power_sync(self, context, node_uuid):
+        """Acquire a shared lock on a node whose power state can be synced.
+
+        :param context: request context.
+        :param node_uuid: UUID of the node.
+        :returns: a TaskManager instance, to be released by the caller, or
+            None if the power state of the node is not to be synced.
+        """
+        try:
+            task = task_manager.acquire(context, node_uuid,
+                                        purpose='power state sync',
+                                        shared=True)
+        except (exception.NodeNotFound, exception.NodeLocked) as e:
+            self._log_power_sync_skipped(node_uuid, e)
+            return
+        if self._power_sync_excluded(task.node):
+            task.release_resources()
+            return
+        return task
+
+    @staticmethod
+    def _power_state_bulk_key(task):
+        """Get the key grouping the nodes whose power states are got at once.
+
+        :returns: a tuple of the power interface and its bulk key, or None.
+        """
+        power = task.driver.power
+        try:
+            key = power.get_power_state_bulk_key(task)
+        except Exception as e:
+            LOG.debug("During sync_power_state, could not get the bulk "
+                      "power state key of node %(node)s: %(err)s",
+                      {'node': task.node.uuid, 'err': e})
+            return
+        if key is not None:
+            return (type(power), key)
+
+    def _sync_power_state_bulk(self, bulk_tasks):
+        """Sync the power states of groups of nodes.
+
+        The power states of the nodes of each group are retrieved with a
+        single call, then synced one node at a time. The tasks are released.
+
+        :param bulk_tasks: a dictionary mapping bulk keys to lists of
+            TaskManager instances with shared locks.
+        """
+        for tasks in bulk_tasks.values():
+            try:
+                power_states = {}
+                try:
+                    power_states = tasks[0].driver.power.get_power_state_bulk(
+                        tasks)
+                except Exception as e:
+                    LOG.warning("During sync_power_state, could not get the "
+                                "power states of nodes %(nodes)s at once, "
+                                "getting them separately. Error: %(err)s",
+                                {'nodes': ', '.join(task.node.uuid
+                                                    for task in tasks),
+                                 'err': e})
+
+                for task in tasks:
+                    try:
+                        self._sync_task_power_state(
+                            task, power_states.get(task.node.uuid))
+                    finally:
+                        # Yield on every iteration
+                        eventlet.sleep(0)
+            finally:
+                for task in tasks:
+                    task.release_resources()
+
+    def _handle_power_event(self, node_uuid):
+        """Sync the power state of a node after an out-of-band event.
+
+        Called by :mod:`ironic.conductor.power_events`.
+
+        :param node_uuid: UUID of the node.
+        """
+        LOG.debug('Power state change notified for node %s', node_uuid)
+        try:
+            self._spawn_worker(self._sync_node_power_state,
+                               ironic_context.get_admin_context(), node_uuid)
+        except exception.NoFreeConductorWorker:
+            LOG.warning('No free conductor workers to sync the power state '
+                        'of node %s after a power event, it will be synced '
+                        'by the periodic task', node_uuid)
+
+    @METRICS.timer('ConductorManager._process_node_snapshot')
+    @periodics.periodic(spacing=CONF.conductor.check_provision_state_interval)
+    def _process_node_snapshot(self, context):
+        """Periodically passes a snapshot of nodes to periodic checks.
+
+        Deadline-sensitive checks are passed a snapshot by
+        :meth:`_process_deadline_node_snapshot` instead. See
+        :mod:`ironic.conductor.node_snapshot` for details.
+
+        :param context: request context.
+        """
+        self._node_snapshot.process(context)
+
+    @METRICS.timer('ConductorManager._process_deadline_node_snapshot')
+    @periodic_scheduler.deadline_sensitive
     @periodics.periodic(spacing=CONF.conductor.check_provision_state_interval)
-    def _check_deploy_timeouts(self, context):
+    def _process_deadline_node_snapshot(self, context):
+        """Periodically passes a snapshot of nodes to deadline checks.
+
+        See :mod:`ironic.conductor.node_snapshot` for details.
+
+        :param context: request context.
+        """
+        self._node_snapshot.process(context,
+                                    lane=periodic_scheduler.DEADLINE_LANE)
+
+    def _fail_timed_out_nodes(self, context, nodes, field, timeout,
+                              provision_state, **kwargs):
+        """Fail the nodes of a snapshot for which a timeout has been reached.
+
+        :param context: request context.
+        :param nodes: rows of the node snapshot.
+        :param field: the node field holding the start of the timeout.
+        :param timeout: the timeout in seconds.
+        :param provision_state: provision_state that the node is in,
+                                for the provisioning activity to have failed.
+        :param kwargs: additional arguments for :meth:`_fail_nodes_in_state`.
+        """
+        expired = sorted((node for node in nodes
+                          if _timed_out(node[field], timeout)),
+                         key=lambda node: node[field])
+        self._fail_nodes_in_state(
+            context, [node['uuid'] for node in expired], provision_state,
+            predicate=lambda node: _timed_out(getattr(node, field), timeout),
+            **kwargs)
+
+    def _handle_provision_deadline(self, node_uuid):
+        """Process a provisioning deadline reached by a node.
+
+        Called by the tracker of provisioning deadlines. The node is loaded
+        again, since its deadline may have moved meanwhile, e.g. on heart
+        beats, in which case it is rescheduled.
+
+        :param node_uuid: UUID of the node.
+        """
+        try:
+            node = self.dbapi.get_node_by_uuid(node_uuid)
+        except exception.NodeNotFound:
+            return
+
+        checks = {states.DEPLOYWAIT: self._check_deploy_timeouts,
+                  states.CLEANWAIT: self._check_cleanwait_timeouts,
+                  states.INSPECTING: self._check_inspect_timeouts}
+        check = checks.get(node.provision_state)
+        if check is None or node.maintenance:
+            return
+
+        field = deadlines.TRACKED_STATES[node.provision_state][1]
+        deadline = deadlines.get_deadline(node.provision_state,
+                                          getattr(node, field))
+        if deadline is None:
+            return
+        if deadline > timeutils.utcnow():
+            if self._deadlines is not None:
+                self._deadlines.schedule(node_uuid, deadline)
+            return
+
+        LOG.debug('Provisioning deadline of node %(node)s in state '
+                  '%(state)s has been reached',
+                  {'node': node_uuid, 'state': node.provision_state})
+        check(ironic_context.get_admin_context(),
+              nodes=[{'uuid': node.uuid, 'driver': node.driver,
+                      field: getattr(node, field)}])
+
+    @METRICS.timer('ConductorManager._check_deploy_timeouts')
+    @periodic_scheduler.deadline_sensitive
+    @node_snapshot.consumer(
+        columns=['provision_state', 'provision_updated_at', 'reservation'],
+        predicate=_unreserved_in_state(states.DEPLOYWAIT))
+    def _check_deploy_timeouts(self, context, nodes=None):
         """Periodically checks whether a deploy RPC call has timed out.
 
         If a deploy call has timed out, the deploy failed and we clean up.
 
         :param context: request context.
+        :param nodes: rows of the node snapshot to check. Nodes are queried
+            from the database if not provided.
         """
         callback_timeout = CONF.conductor.deploy_callback_timeout
         if not callback_timeout:
             return
 
+        sort_key = 'provision_updated_at'
+        callback_method = utils.cleanup_after_timeout
+        err_handler = utils.provisioning_error_handler
+        if nodes is not None:
+            self._fail_timed_out_nodes(context, nodes, sort_key,
+                                       callback_timeout, states.DEPLOYWAIT,
+                                       callback_method=callback_method,
+                                       err_handler=err_handler)
+            return
+
         filters = {'reserved': False,
                    'provision_state': states.DEPLOYWAIT,
                    'maintenance': False,
                    'provisioned_before': callback_timeout}
-        sort_key = 'provision_updated_at'
-        callback_method = utils.cleanup_after_timeout
-        err_handler = utils.provisioning_error_handler
         self._fail_if_in_state(context, filters, states.DEPLOYWAIT,
                                sort_key, callback_method, err_handler)
 
     @METRICS.timer('ConductorManager._check_deploying_status')
-    @periodics.periodic(spacing=CONF.conductor.check_provision_state_interval)
-    def _check_deploying_status(self, context):
+    @node_snapshot.consumer(
+        columns=['id', 'reservation', 'provision_state'],
+        predicate=lambda node: (node['provision_state'] == states.DEPLOYING and
+                                node['reservation'] is not None))
+    def _check_deploying_status(self, context, nodes=None):
         """Periodically checks the status of nodes in DEPLOYING state.
 
         Periodically checks the nodes in DEPLOYING and the state of the
@@ -1311,16 +1811,23 @@ class ConductorManager(base_manager.BaseConductorManager):
         node and gracefully mark the deployment as failed.
 
         :param context: request context.
+        :param nodes: rows of the node snapshot to check. Nodes are queried
+            from the database if not provided.
         """
         offline_conductors = self.dbapi.get_offline_conductors()
         if not offline_conductors:
             return
 
-        node_iter = self.iter_nodes(
-            fields=['id', 'reservation'],
-            filters={'provision_state': states.DEPLOYING,
-                     'maintenance': False,
-                     'reserved_by_any_of': offline_conductors})
+        if nodes is None:
+            node_iter = self.iter_nodes(
+                fields=['id', 'reservation'],
+                filters={'provision_state': states.DEPLOYING,
+                         'maintenance': False,
+                         'reserved_by_any_of': offline_conductors})
+        else:
+            node_iter = ((node['uuid'], node['driver'], node['id'],
+                          node['reservation']) for node in nodes
+                         if node['reservation'] in offline_conductors)
 
         for node_uuid, driver, node_id, conductor_hostname in node_iter:
             # NOTE(lucasagomes): Although very rare, this may lead to a
@@ -1445,19 +1952,31 @@ class ConductorManager(base_manager.BaseConductorManager):
                 task, 'console_restore', fields.NotificationStatus.ERROR)
 
     @METRICS.timer('ConductorManager._check_cleanwait_timeouts')
-    @periodics.periodic(spacing=CONF.conductor.check_provision_state_interval)
-    def _check_cleanwait_timeouts(self, context):
+    @periodic_scheduler.deadline_sensitive
+    @node_snapshot.consumer(
+        columns=['provision_state', 'provision_updated_at', 'reservation'],
+        predicate=_unreserved_in_state(states.CLEANWAIT))
+    def _check_cleanwait_timeouts(self, context, nodes=None):
         """Periodically checks for nodes being cleaned.
 
         If a node doing cleaning is unresponsive (detected when it stops
         heart beating), the operation should be aborted.
 
         :param context: request context.
+        :param nodes: rows of the node snapshot to check. Nodes are queried
+            from the database if not provided.
         """
         callback_timeout = CONF.conductor.clean_callback_timeout
         if not callback_timeout:
             return
 
+        if nodes is not None:
+            self._fail_timed_out_nodes(
+                context, nodes, 'provision_updated_at', callback_timeout,
+                states.CLEANWAIT, keep_target_state=True,
+                callback_method=utils.cleanup_cleanwait_timeout)
+            return
+
         filters = {'reserved': False,
                    'provision_state': states.CLEANWAIT,
                    'maintenance': False,
@@ -1468,8 +1987,13 @@ class ConductorManager(base_manager.BaseConductorManager):
                                callback_method=utils.cleanup_cleanwait_timeout)
 
     @METRICS.timer('ConductorManager._sync_local_state')
-    @periodics.periodic(spacing=CONF.conductor.sync_local_state_interval)
-    def _sync_local_state(self, context):
+    @node_snapshot.consumer(
+        columns=['id', 'conductor_affinity', 'provision_state',
+                 'reservation'],
+        predicate=_unreserved_in_state(states.ACTIVE),
+        spacing=CONF.conductor.sync_local_state_interval,
+        enabled=CONF.conductor.sync_local_state_interval > 0)
+    def _sync_local_state(self, context, nodes=None):
         """Perform any actions necessary to sync local state.
 
         This is called periodically to refresh the conductor's copy of the
@@ -1477,12 +2001,20 @@ class ConductorManager(base_manager.BaseConductorManager):
         determines which, if any, nodes need to be "taken over".
         The ensuing actions could include preparing a PXE environment,
         updating the DHCP server, and so on.
+
+        :param context: request context.
+        :param nodes: rows of the node snapshot to check. Nodes are queried
+            from the database if not provided.
         """
-        filters = {'reserved': False,
-                   'maintenance': False,
-                   'provision_state': states.ACTIVE}
-        node_iter = self.iter_nodes(fields=['id', 'conductor_affinity'],
-                                    filters=filters)
+        if nodes is None:
+            filters = {'reserved': False,
+                       'maintenance': False,
+                       'provision_state': states.ACTIVE}
+            node_iter = self.iter_nodes(fields=['id', 'conductor_affinity'],
+                                        filters=filters)
+        else:
+            node_iter = ((node['uuid'], node['driver'], node['id'],
+                          node['conductor_affinity']) for node in nodes)
 
         workers_count = 0
         for node_uuid, driver, node_id, conductor_affinity in node_iter:
@@ -2145,20 +2677,28 @@ class ConductorManager(base_manager.BaseConductorManager):
         return driver.get_properties()
 
     @METRICS.timer('ConductorManager._sensors_nodes_task')
-    def _sensors_nodes_task(self, context, nodes):
-        """Sends sensors data for nodes from synchronized queue."""
+    def _sensors_nodes_task(self, context, nodes, batcher):
+        """Sends sensors data for nodes from a sensor queue.
+
+        :param context: request context.
+        :param nodes: a :class:`ironic.conductor.sensors.SensorQueue`.
+        :param batcher: a
+            :class:`ironic.conductor.sensors.NotificationBatcher`.
+        """
         while not self._shutdown:
-            try:
-                node_uuid, driver, instance_uuid = nodes.get_nowait()
-            except queue.Empty:
+            node = nodes.get()
+            if node is None:
                 break
+            node_uuid = node['uuid']
+            driver = node['driver']
             # populate the message which will be sent to ceilometer
             message = {'message_id': uuidutils.generate_uuid(),
-                       'instance_uuid': instance_uuid,
+                       'instance_uuid': node['instance_uuid'],
                        'node_uuid': node_uuid,
                        'timestamp': datetime.datetime.utcnow(),
                        'event_type': 'hardware.ipmi.metrics.update'}
 
+            result = 'failure'
             try:
                 lock_purpose = 'getting sensors data'
                 with task_manager.acquire(context,
@@ -2166,11 +2706,13 @@ class ConductorManager(base_manager.BaseConductorManager):
                                           shared=True,
                                           purpose=lock_purpose) as task:
                     if not getattr(task.driver, 'management', None):
+                        result = 'unsupported'
                         continue
                     task.driver.management.validate(task)
                     sensors_data = task.driver.management.get_sensors_data(
                         task)
             except NotImplementedError:
+                result = 'unsupported'
                 LOG.warning(
                     'get_sensors_data is not implemented for driver'
                     ' %(driver)s, node_uuid is %(node)s',
@@ -2195,12 +2737,14 @@ class ConductorManager(base_manager.BaseConductorManager):
                     "Failed to get sensor data for node %(node)s. "
                     "Error: %(error)s", {'node': node_uuid, 'error': e})
             else:
+                result = 'success'
                 message['payload'] = (
                     self._filter_out_unsupported_types(sensors_data))
                 if message['payload']:
-                    self.sensors_notifier.info(
-                        context, "hardware.ipmi.metrics", message)
+                    batcher.add(message)
             finally:
+                sensors.record_result(result)
+                nodes.done(node)
                 # Yield on every iteration
                 eventlet.sleep(0)
 
@@ -2214,10 +2758,14 @@ class ConductorManager(base_manager.BaseConductorManager):
             return
 
         filters = {'associated': True}
-        nodes = queue.Queue()
-        for node_info in self.iter_nodes(fields=['instance_uuid'],
-                                         filters=filters):
-            nodes.put_nowait(node_info)
+        columns = ('uuid', 'driver') + sensors.COLUMNS
+        nodes = sensors.get_queue(
+            [dict(zip(columns, node_info))
+             for node_info in self.iter_nodes(fields=list(sensors.COLUMNS),
+                                              filters=filters)])
+        batcher = sensors.NotificationBatcher(
+            self.sensors_notifier, context,
+            CONF.conductor.send_sensor_data_batch_size)
 
         number_of_threads = min(CONF.conductor.send_sensor_data_workers,
                                 nodes.qsize())
@@ -2226,7 +2774,7 @@ class ConductorManager(base_manager.BaseConductorManager):
             try:
                 futures.append(
                     self._spawn_worker(self._sensors_nodes_task,
-                                       context, nodes))
+                                       context, nodes, batcher))
             except exception.NoFreeConductorWorker:
                 LOG.warning("There is no more conductor workers for "
                             "task of sending sensors data. %(workers)d "
@@ -2239,6 +2787,9 @@ class ConductorManager(base_manager.BaseConductorManager):
         if not_done:
             LOG.warning("%d workers for send sensors data did not complete",
                         len(not_done))
+            # Let the late workers finish their current node only
+            nodes.stop()
+        batcher.close()
 
     def _filter_out_unsupported_types(self, sensors_data):
         """Filters out sensor data types that aren't specified in the config.
@@ -2437,22 +2988,33 @@ class ConductorManager(base_manager.BaseConductorManager):
                     state=task.node.provision_state)
 
     @METRICS.timer('ConductorManager._check_inspect_timeouts')
-    @periodics.periodic(spacing=CONF.conductor.check_provision_state_interval)
-    def _check_inspect_timeouts(self, context):
+    @periodic_scheduler.deadline_sensitive
+    @node_snapshot.consumer(
+        columns=['provision_state', 'inspection_started_at', 'reservation'],
+        predicate=_unreserved_in_state(states.INSPECTING))
+    def _check_inspect_timeouts(self, context, nodes=None):
         """Periodically checks inspect_timeout and fails upon reaching it.
 
         :param: context: request context
+        :param: nodes: rows of the node snapshot to check. Nodes are queried
+                       from the database if not provided.
 
         """
         callback_timeout = CONF.conductor.inspect_timeout
         if not callback_timeout:
             return
 
+        sort_key = 'inspection_started_at'
+        last_error = _("timeout reached while inspecting the node")
+        if nodes is not None:
+            self._fail_timed_out_nodes(context, nodes, sort_key,
+                                       callback_timeout, states.INSPECTING,
+                                       last_error=last_error)
+            return
+
         filters = {'reserved': False,
                    'provision_state': states.INSPECTING,
                    'inspection_started_before': callback_timeout}
-        sort_key = 'inspection_started_at'
-        last_error = _("timeout reached while inspecting the node")
         self._fail_if_in_state(context, filters, states.INSPECTING,
                                sort_key, last_error=last_error)
 
@@ -2553,8 +3115,8 @@ class ConductorManager(base_manager.BaseConductorManager):
         # free to promote it to an exclusive one.
         with task_manager.acquire(context, node_id, shared=True,
                                   purpose='heartbeat') as task:
-            task.spawn_after(self._spawn_worker, task.driver.deploy.heartbeat,
-                             task, callback_url)
+            task.spawn_after(self._spawn_priority_worker,
+                             task.driver.deploy.heartbeat, task, callback_url)
 
     @METRICS.timer('ConductorManager.vif_list')
     @messaging.expected_exceptions(exception.NetworkError,
@@ -2747,6 +3309,16 @@ class ConductorManager(base_manager.BaseConductorManager):
                                         version_manifest=object_versions)
 
 
+def _bulk_error(exc):
+    """Convert an exception into a bulk action result entry.
+
+    :param exc: the exception raised while handling a node.
+    :returns: a dictionary with 'error' and 'code' keys.
+    """
+    return {'error': six.text_type(exc),
+            'code': getattr(exc, 'code', 500)}
+
+
 @METRICS.timer('get_vendor_passthru_metadata')
 def get_vendor_passthru_metadata(route_dict):
     d = {}
@@ -2906,8 +3478,45 @@ def handle_sync_power_state_max_retries_exceeded(task, actual_power_state,
     LOG.error(msg)
 
 
+def _get_node_power_state(task, count, max_retries, power_state=None):
+    """Get the power state of a node during a power state sync.
+
+    On failure, the node is put into maintenance mode once the limit of
+    power_state_sync_max_retries is reached.
+
+    :param task: a TaskManager instance
+    :param count: number of the current sync attempt of this node
+    :param max_retries: maximum number of sync attempts.
+    :param power_state: the power state of the node if already known.
+    :returns: the power state of the node, None if it could not be got.
+    """
+    try:
+        # The driver may raise an exception, or may return ERROR.
+        # Handle both the same way.
+        if power_state is None:
+            power_state = task.driver.power.get_power_state(task)
+        if power_state == states.ERROR:
+            raise exception.PowerStateFailure(
+                _("Power driver returned ERROR state "
+                  "while trying to sync power state."))
+    except Exception as e:
+        # Stop if any exception is raised when getting the power state
+        if count > max_retries:
+            task.upgrade_lock()
+            handle_sync_power_state_max_retries_exceeded(task, power_state,
+                                                         exception=e)
+        else:
+            LOG.warning("During sync_power_state, could not get power "
+                        "state for node %(node)s, attempt %(attempt)s of "
+                        "%(retries)s. Error: %(err)s.",
+                        {'node': task.node.uuid, 'attempt': count,
+                         'retries': max_retries, 'err': e})
+        return None
+    return power_state
+
+
 @METRICS.timer('do_sync_power_state')
-def do_sync_power_state(task, count):
+def do_sync_power_state(task, count, power_state=None):
     """Sync the power state for this node, incrementing the counter on failure.
 
     When the limit of power_state_sync_max_retries is reached, the node is put
@@ -2915,6 +3524,8 @@ def do_sync_power_state(task, count):
 
     :param task: a TaskManager instance
     :param count: number of times this node has previously failed a sync
+    :param power_state: the power state of the node if already known, e.g.
+        from the get_power_state_bulk call of its power interface.
     :raises: NodeLocked if unable to upgrade task lock to an exclusive one
     :returns: Count of failed attempts.
               On success, the counter is set to 0.
@@ -2922,7 +3533,7 @@ def do_sync_power_state(task, count):
     """
     node = task.node
     old_power_state = node.power_state
-    power_state = None
+    known_power_state = power_state
     count += 1
 
     max_retries = CONF.conductor.power_state_sync_max_retries
@@ -2934,26 +3545,9 @@ def do_sync_power_state(task, count):
         except exception.InvalidParameterValue:
             return 0
 
-    try:
-        # The driver may raise an exception, or may return ERROR.
-        # Handle both the same way.
-        power_state = task.driver.power.get_power_state(task)
-        if power_state == states.ERROR:
-            raise exception.PowerStateFailure(
-                _("Power driver returned ERROR state "
-                  "while trying to sync power state."))
-    except Exception as e:
-        # Stop if any exception is raised when getting the power state
-        if count > max_retries:
-            task.upgrade_lock()
-            handle_sync_power_state_max_retries_exceeded(task, power_state,
-                                                         exception=e)
-        else:
-            LOG.warning("During sync_power_state, could not get power "
-                        "state for node %(node)s, attempt %(attempt)s of "
-                        "%(retries)s. Error: %(err)s.",
-                        {'node': node.uuid, 'attempt': count,
-                         'retries': max_retries, 'err': e})
+    power_state = _get_node_power_state(task, count, max_retries,
+                                        known_power_state)
+    if power_state is None:
         return count
 
     if node.power_state and node.power_state == power_state:
@@ -2969,10 +3563,22 @@ def do_sync_power_state(task, count):
     if node.power_state and node.power_state == power_state:
         # Node power state was updated to the correct value
         return 0
-    elif node.provision_state in SYNC_EXCLUDED_STATES or node.maintenance:
+    elif (node.provision_state in SYNC_EXCLUDED_STATES or node.maintenance or
+          node.target_power_state):
         # Something was done to a node while a shared lock was held
         return 0
-    elif node.power_state is None:
+
+    if known_power_state is not None:
+        # NOTE: the power state known beforehand may predate a power action
+        # done while a shared lock was held, get the actual one before
+        # acting on the mismatch
+        power_state = _get_node_power_state(task, count, max_retries)
+        if power_state is None:
+            return count
+        if node.power_state == power_state:
+            return 0
+
+    if node.power_state is None:
         # If node has no prior state AND we successfully got a state,
         # simply record that and send a notification.
         LOG.info("During sync_power_state, node %(node)s has no "
@@ -0,0 +1,173 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Shared snapshot of the nodes of a conductor for periodic checks.
+
+Several periodic checks of a conductor walk over the same nodes, e.g. the
+checks for provisioning timeouts. Instead of querying the database on their
+own, such checks are marked with :func:`consumer`. A single periodic task of
+the conductor then loads the mapped nodes which are not in maintenance once,
+with the union of the columns needed by the consumers, and passes every
+consumer the rows matching its predicate.
+
+Like periodic tasks, consumers marked with
+:func:`ironic.conductor.periodic_scheduler.deadline_sensitive`, e.g. the
+checks for provisioning timeouts, are passed a separate snapshot from a
+periodic task of the deadline lane, so that they are not delayed by slow
+consumers, e.g. consumers querying BMCs.
+"""
+
+import time
+
+from oslo_log import log
+from oslo_utils import reflection
+
+from ironic.common import metrics
+from ironic.conductor import periodic_scheduler
+
+LOG = log.getLogger(__name__)
+
+BASE_COLUMNS = ('uuid', 'driver')
+"""Columns loaded for every node of a snapshot."""
+
+_CONSUMER_ATTRIBUTE = '_ironic_node_snapshot_consumer'
+
+_SNAPSHOTS = metrics.REGISTRY.counter(
+    'ironic_conductor_node_snapshots_total',
+    'Number of snapshots of nodes loaded for periodic checks.')
+_SNAPSHOT_NODES = metrics.REGISTRY.gauge(
+    'ironic_conductor_node_snapshot_nodes',
+    'Number of nodes in the last snapshot of nodes.')
+
+
+class _ConsumerSpec(object):
+    """Requirements of a consumer of the node snapshot."""
+
+    def __init__(self, columns, predicate, spacing, enabled):
+        self.columns = tuple(columns)
+        self.predicate = predicate
+        self.spacing = spacing
+        self.enabled = enabled
+
+
+def consumer(columns=(), predicate=None, spacing=None, enabled=True):
+    """Decorator marking a method as a consumer of the node snapshot.
+
+    Consumers are called with the arguments of periodic tasks, followed by
+    a ``nodes`` keyword argument with the list of the matching rows of the
+    snapshot. Each row is a dictionary with the loaded columns.
+
+    :param columns: node columns needed in addition to ``uuid`` and
+        ``driver``.
+    :param predicate: callable accepting a row and returning whether it is
+        passed to the consumer. All rows are passed if not provided.
+    :param spacing: minimum interval between two calls of the consumer in
+        seconds. The consumer is called on every snapshot if not provided.
+    :param enabled: whether the consumer is enabled.
+    """
+    def decorator(func):
+        setattr(func, _CONSUMER_ATTRIBUTE,
+                _ConsumerSpec(columns, predicate, spacing, enabled))
+        return func
+    return decorator
+
+
+def is_consumer(func):
+    """Whether a callable is an enabled consumer of the node snapshot."""
+    spec = getattr(func, _CONSUMER_ATTRIBUTE, None)
+    return isinstance(spec, _ConsumerSpec) and spec.enabled
+
+
+class _Consumer(object):
+
+    def __init__(self, func, args):
+        self.func = func
+        self.args = tuple(args)
+        self.spec = getattr(func, _CONSUMER_ATTRIBUTE)
+        self.name = reflection.get_callable_name(func)
+        self.lane = periodic_scheduler.get_lane(func)
+        self.last_run = None
+
+    def is_due(self, now):
+        return (self.last_run is None or not self.spec.spacing or
+                now - self.last_run >= self.spec.spacing)
+
+    def accepts(self, row):
+        return self.spec.predicate is None or self.spec.predicate(row)
+
+
+class NodeSnapshot(object):
+    """Loads the nodes of a conductor once and fans them out to consumers.
+
+    :param manager: the conductor manager, used to load the nodes mapped to
+        it.
+    """
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._consumers = []
+
+    def __len__(self):
+        return len(self._consumers)
+
+    def register(self, func, args=()):
+        """Register a consumer.
+
+        :param func: a callable marked with :func:`consumer`.
+        :param args: tuple with arguments to pass to the consumer before
+            the context.
+        """
+        self._consumers.append(_Consumer(func, args))
+
+    @staticmethod
+    def _columns(consumers):
+        columns = list(BASE_COLUMNS)
+        for item in consumers:
+            for column in item.spec.columns:
+                if column not in columns:
+                    columns.append(column)
+        return columns
+
+    def _load(self, columns):
+        node_iter = self._manager.iter_nodes(
+            fields=columns[len(BASE_COLUMNS):],
+            filters={'maintenance': False})
+        rows = [dict(zip(columns, result)) for result in node_iter]
+        _SNAPSHOTS.inc()
+        _SNAPSHOT_NODES.set(len(rows))
+        return rows
+
+    def process(self, context, lane=periodic_scheduler.DEFAULT_LANE):
+        """Load a snapshot of nodes and pass it to the due consumers.
+
+        Consumers are called in the order of registration. An exception in
+        a consumer is logged and does not prevent calling the next ones.
+
+        :param context: request context, passed to the consumers after their
+            arguments.
+        :param lane: the lane of the consumers to call, see
+            :mod:`ironic.conductor.periodic_scheduler`.
+        """
+        now = time.time()
+        consumers = [item for item in self._consumers
+                     if item.lane == lane and item.is_due(now)]
+        if not consumers:
+            return
+
+        rows = self._load(self._columns(consumers))
+        for item in consumers:
+            item.last_run = now
+            nodes = [row for row in rows if item.accepts(row)]
+            try:
+                item.func(*(item.args + (context,)), nodes=nodes)
+            except Exception:
+                LOG.exception('Node snapshot consumer %s failed', item.name)
@@ -42,6 +42,10 @@ def _emit_conductor_node_notification(task, notification_method,
     :param **kwargs: kwargs to use when creating the notification payload.
                      Passed to the payload_method.
     """
+    # NOTE: avoid building and masking the payload if it won't be sent
+    if not notification.should_notify(level):
+        return
+
     try:
         # Prepare our exception message just in case
         exception_values = {"node": task.node.uuid,
@@ -0,0 +1,165 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Scheduling of the periodic tasks of a conductor.
+
+Periodic tasks are run by futurist periodic workers, with a few additions:
+
+* the first run of every task is delayed by a random fraction of its interval
+  (see the ``[conductor]periodic_max_jitter`` option), so that conductors
+  started at the same time do not run their tasks in the same phase;
+
+* a run which takes longer than the interval of its task is counted as an
+  overrun, and the runs missed meanwhile are skipped instead of being run
+  back to back;
+
+* tasks marked with :func:`deadline_sensitive`, e.g. the checks for provision
+  timeouts, run in a separate lane with dedicated workers, so that they are
+  not delayed by slow tasks or by a busy pool of workers.
+"""
+
+import itertools
+import math
+import random
+
+import futurist
+from futurist import periodics
+from oslo_log import log
+from oslo_utils import reflection
+
+from ironic.common import metrics
+from ironic.conf import CONF
+
+LOG = log.getLogger(__name__)
+
+DEFAULT_LANE = 'default'
+"""Lane of the periodic tasks, which run on the pool of conductor workers."""
+
+DEADLINE_LANE = 'deadline'
+"""Lane of the deadline-sensitive periodic tasks, with dedicated workers."""
+
+_LANE_ATTRIBUTE = '_ironic_periodic_lane'
+
+_OVERRUNS = metrics.REGISTRY.counter(
+    'ironic_conductor_periodic_overruns_total',
+    'Number of runs of a periodic task which took longer than its interval.')
+_SKIPPED = metrics.REGISTRY.counter(
+    'ironic_conductor_periodic_skipped_total',
+    'Number of runs of a periodic task skipped because of overruns.')
+
+_random = random.SystemRandom()
+
+
+def deadline_sensitive(func):
+    """Decorator marking a periodic task as deadline-sensitive.
+
+    Must be applied on top of :func:`futurist.periodics.periodic`.
+    Deadline-sensitive tasks run in the :data:`DEADLINE_LANE`. Also applies
+    to consumers of the node snapshot, see
+    :mod:`ironic.conductor.node_snapshot`.
+    """
+    setattr(func, _LANE_ATTRIBUTE, DEADLINE_LANE)
+    return func
+
+
+def get_lane(func):
+    """Get the lane of a periodic task."""
+    if getattr(func, _LANE_ATTRIBUTE, None) == DEADLINE_LANE:
+        return DEADLINE_LANE
+    return DEFAULT_LANE
+
+
+def _first_run(cb, now):
+    spacing = cb._periodic_spacing
+    jitter = CONF.conductor.periodic_max_jitter
+    # Never later than without jitter, so that the first run is not delayed
+    return now + spacing * (1 - jitter * _random.random())
+
+
+def _next_run(cb, started_at, finished_at, metrics):
+    spacing = cb._periodic_spacing
+    next_run = started_at + spacing
+    if next_run >= finished_at:
+        return next_run
+
+    # Keep the phase of the task, skipping the runs missed during this one
+    skipped = int(math.ceil((finished_at - next_run) / spacing))
+    name = reflection.get_callable_name(cb)
+    _OVERRUNS.inc(task=name)
+    _SKIPPED.inc(skipped, task=name)
+    LOG.warning('Periodic task %(task)s took %(elapsed).2f seconds, which '
+                'is longer than its interval of %(spacing)s seconds. '
+                'Skipping %(skipped)d run(s) of it.',
+                {'task': name, 'elapsed': finished_at - started_at,
+                 'spacing': spacing, 'skipped': skipped})
+    return next_run + skipped * spacing
+
+
+class _PeriodicWorker(periodics.PeriodicWorker):
+    """Periodic worker supporting the ironic scheduling strategy."""
+
+    BUILT_IN_STRATEGIES = dict(periodics.PeriodicWorker.BUILT_IN_STRATEGIES,
+                               ironic=(_next_run, _first_run))
+
+
+class PeriodicScheduler(object):
+    """Runs the periodic tasks of a conductor in lanes.
+
+    :param callables: a list of tuples (callable, args, kwargs).
+    :param executor: the executor of the conductor, running the tasks of
+        the :data:`DEFAULT_LANE`.
+    """
+
+    def __init__(self, callables, executor):
+        lanes = {DEFAULT_LANE: [], DEADLINE_LANE: []}
+        for item in callables:
+            lanes[get_lane(item[0])].append(item)
+
+        self._default = _PeriodicWorker(
+            lanes[DEFAULT_LANE],
+            executor_factory=periodics.ExistingExecutor(executor),
+            schedule_strategy='ironic')
+
+        # NOTE: one more worker runs the loop of the lane itself
+        self._deadline_executor = futurist.GreenThreadPoolExecutor(
+            max_workers=len(lanes[DEADLINE_LANE]) + 1)
+        self._deadline = _PeriodicWorker(
+            lanes[DEADLINE_LANE],
+            executor_factory=periodics.ExistingExecutor(
+                self._deadline_executor),
+            schedule_strategy='ironic')
+
+    def start(self, allow_empty=False):
+        """Run the periodic tasks until stopped.
+
+        Blocks the caller, which runs the loop of the default lane, while
+        the deadline lane runs on its own workers.
+        """
+        self._deadline_executor.submit(self._deadline.start,
+                                       allow_empty=True)
+        self._default.start(allow_empty=allow_empty)
+
+    def stop(self):
+        """Ask all lanes to stop."""
+        self._default.stop()
+        self._deadline.stop()
+
+    def wait(self, timeout=None):
+        """Wait for the running periodic tasks to finish."""
+        self._default.wait(timeout=timeout)
+        self._deadline.wait(timeout=timeout)
+        self._deadline_executor.shutdown(wait=True)
+
+    def iter_watchers(self):
+        """Iterate over the watchers of the tasks of all lanes."""
+        return itertools.chain(self._default.iter_watchers(),
+                               self._deadline.iter_watchers())
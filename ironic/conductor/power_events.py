@@ -0,0 +1,130 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Out-of-band notifications of power state changes.
+
+Drivers which are notified by the hardware of the power state changes of a
+node, e.g. through Redfish event subscriptions, mark the node with
+:func:`subscribe`. The periodic power state sync of the conductor then polls
+such a node at most once per the given interval instead of on every run,
+polling remaining the fallback for missed events. Drivers report the
+changes with :func:`power_event`, which makes the conductor sync the power
+state of the node right away. Drivers register with
+:func:`add_stop_callback` what to clean up, e.g. the subscriptions, when the
+conductor stops.
+"""
+
+import time
+
+from oslo_log import log
+
+from ironic.common import metrics
+
+LOG = log.getLogger(__name__)
+
+_EVENTS = metrics.REGISTRY.counter(
+    'ironic_conductor_power_events_total',
+    'Number of out-of-band power state change notifications received.')
+_SUBSCRIBED = metrics.REGISTRY.gauge(
+    'ironic_conductor_power_event_subscriptions',
+    'Number of nodes whose power state changes are notified out-of-band.')
+
+# Node UUID -> minimum interval between two power state syncs
+_SUBSCRIPTIONS = {}
+# Node UUID -> time of the last power state sync of a subscribed node
+_LAST_SYNC = {}
+_HANDLER = None
+_STOP_CALLBACKS = []
+
+
+def set_handler(handler):
+    """Set the callable syncing the power state of a node after an event.
+
+    :param handler: a callable accepting a node UUID, None to ignore the
+        events.
+    """
+    global _HANDLER
+    _HANDLER = handler
+
+
+def add_stop_callback(callback):
+    """Register a callable to call when the conductor stops.
+
+    :param callback: a callable without arguments, called once.
+    """
+    _STOP_CALLBACKS.append(callback)
+
+
+def stop():
+    """Stop handling the events and call the registered stop callbacks."""
+    set_handler(None)
+    while _STOP_CALLBACKS:
+        callback = _STOP_CALLBACKS.pop(0)
+        try:
+            callback()
+        except Exception:
+            LOG.exception('Failed to stop the power event source %s',
+                          callback)
+
+
+def subscribe(node_uuid, poll_interval):
+    """Mark a node as having its power state changes notified.
+
+    :param node_uuid: UUID of the node.
+    :param poll_interval: minimum interval between two periodic power state
+        syncs of the node, in seconds.
+    """
+    _SUBSCRIPTIONS[node_uuid] = poll_interval
+    _SUBSCRIBED.set(len(_SUBSCRIPTIONS))
+
+
+def unsubscribe(node_uuid):
+    """Mark a node as no longer having its power state changes notified."""
+    _SUBSCRIPTIONS.pop(node_uuid, None)
+    _LAST_SYNC.pop(node_uuid, None)
+    _SUBSCRIBED.set(len(_SUBSCRIPTIONS))
+
+
+def is_subscribed(node_uuid):
+    """Whether the power state changes of a node are notified."""
+    return node_uuid in _SUBSCRIPTIONS
+
+
+def needs_sync(node_uuid):
+    """Whether the periodic power state sync should poll a node."""
+    interval = _SUBSCRIPTIONS.get(node_uuid)
+    if interval is None:
+        return True
+    last_sync = _LAST_SYNC.get(node_uuid)
+    return last_sync is None or time.time() - last_sync >= interval
+
+
+def synced(node_uuid):
+    """Record that the power state of a node was synced."""
+    if node_uuid in _SUBSCRIPTIONS:
+        _LAST_SYNC[node_uuid] = time.time()
+
+
+def power_event(node_uuid):
+    """Report a power state change of a node.
+
+    :param node_uuid: UUID of the node.
+    :returns: whether the conductor handles the event.
+    """
+    handler = _HANDLER
+    if handler is None:
+        LOG.debug('Ignoring a power event for node %s, no handler is set',
+                  node_uuid)
+        return False
+    _EVENTS.inc()
+    handler(node_uuid)
+    return True
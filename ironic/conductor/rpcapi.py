@@ -90,13 +90,15 @@ class ConductorAPI(object):
     |    1.39 - Added timeout optional parameter to change_node_power_state
     |    1.40 - Added inject_nmi
     |    1.41 - Added create_port
+    |    1.42 - Added bulk_node_action
+    |    1.43 - Added run_job
 
     """
 
     # NOTE(rloo): This must be in sync with manager.ConductorManager's.
     # NOTE(pas-ha): This also must be in sync with
     #               ironic.common.release_mappings.RELEASE_MAPPING['master']
-    RPC_API_VERSION = '1.41'
+    RPC_API_VERSION = '1.43'
 
     def __init__(self, topic=None):
         super(ConductorAPI, self).__init__()
@@ -129,7 +131,7 @@ class ConductorAPI(object):
             ring = self.ring_manager[node.driver]
             dest = ring.get_nodes(node.uuid.encode('utf-8'),
                                   replicas=CONF.hash_distribution_replicas)
-            return '%s.%s' % (self.topic, dest.pop())
+            return '%s.%s' % (self.topic, self._choose_host(dest))
         except exception.DriverNotFound:
             reason = (_('No conductor service registered which supports '
                         'driver %s.') % node.driver)
@@ -150,9 +152,29 @@ class ConductorAPI(object):
         self.ring_manager.reset()
 
         ring = self.ring_manager[driver_name]
-        host = random.choice(list(ring.nodes))
+        host = self._choose_host(ring.nodes)
         return self.topic + "." + host
 
+    def _choose_host(self, hosts):
+        """Choose a conductor at random, avoiding saturated ones.
+
+        A conductor is saturated when the ratio of its busy workers reported
+        in its last heart beat reaches [conductor]saturation_threshold.
+        Saturated conductors are only chosen if all conductors are saturated.
+
+        :param hosts: a collection of conductor hostnames.
+        :returns: a hostname.
+        """
+        hosts = list(hosts)
+        if len(hosts) > 1:
+            saturation = self.ring_manager.saturation
+            threshold = CONF.conductor.saturation_threshold
+            available = [host for host in hosts
+                         if saturation.get(host, 0) < threshold]
+            if available:
+                hosts = available
+        return random.choice(hosts)
+
     def create_node(self, context, node_obj, topic=None):
         """Synchronously, have a conductor validate and create a node.
 
@@ -963,3 +985,63 @@ class ConductorAPI(object):
         """
         cctxt = self.client.prepare(topic=topic or self.topic, version='1.38')
         return cctxt.call(context, 'vif_list', node_id=node_id)
+
+    def bulk_node_action(self, context, node_ids, action, target,
+                         timeout=None, reason=None, topic=None):
+        """Perform the same action on a batch of nodes.
+
+        All nodes in the batch are expected to be mapped to the conductor
+        serving ``topic``. The conductor spreads the batch across its worker
+        pool and reports the outcome for every node.
+
+        :param context: request context.
+        :param node_ids: a list of node UUIDs.
+        :param action: the action to perform, one of
+            :data:`ironic.conductor.utils.BULK_NODE_ACTIONS`.
+        :param target: the target of the action: a power state for 'power',
+            a provision state or verb for 'provision' and a boolean for
+            'maintenance'.
+        :param timeout: timeout (in seconds) of a power action. ``None``
+            indicates to use default timeout.
+        :param reason: reason for putting nodes into maintenance mode.
+        :param topic: RPC topic. Defaults to self.topic.
+        :returns: a dictionary mapping every node UUID to ``None`` on success
+            or to a dictionary with 'error' and 'code' keys on failure.
+        :raises: InvalidParameterValue if the action is not supported.
+        """
+        cctxt = self.client.prepare(topic=topic or self.topic, version='1.42')
+        return cctxt.call(context, 'bulk_node_action', node_ids=node_ids,
+                          action=action, target=target, timeout=timeout,
+                          reason=reason)
+
+    def can_run_bulk_node_actions(self):
+        """Check whether all conductors are able to run bulk node actions.
+
+        :returns: False if the RPC API is pinned to a version older than
+            the one which added bulk_node_action, True otherwise.
+        """
+        return self.client.can_send_version('1.42')
+
+    def can_run_jobs(self):
+        """Check whether all conductors are able to run asynchronous jobs.
+
+        :returns: False if the RPC API is pinned to a version older than
+            the one which added run_job, True otherwise.
+        """
+        return self.client.can_send_version('1.43')
+
+    def run_job(self, context, job_id, topic=None):
+        """Signal to conductor service to run an asynchronous job.
+
+        The job must have been stored in the database beforehand. The
+        conductor records the outcome of the requested action in the job.
+
+        NOTE: this is an RPC cast, there will be no response or exception
+        raised by the conductor for this RPC.
+
+        :param context: request context.
+        :param job_id: job id or uuid.
+        :param topic: RPC topic. Defaults to self.topic.
+        """
+        cctxt = self.client.prepare(topic=topic or self.topic, version='1.43')
+        return cctxt.cast(context, 'run_job', job_id=job_id)
@@ -0,0 +1,215 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Pipeline collecting sensor data from the nodes of a conductor.
+
+The workers sending sensor data take nodes from a :class:`SensorQueue`,
+which does not hand out more nodes sharing a BMC address, or a rack, than
+allowed at a time. The collected data is sent through a
+:class:`NotificationBatcher`, grouping the data of several nodes in one
+notification if configured.
+"""
+
+import collections
+import datetime
+import threading
+
+from oslo_log import log
+from oslo_utils import uuidutils
+
+from ironic.common import metrics
+from ironic.conf import CONF
+
+LOG = log.getLogger(__name__)
+
+COLUMNS = ('instance_uuid', 'driver_info', 'extra')
+"""Node columns needed in addition to ``uuid`` and ``driver``."""
+
+RACK_KEY = 'rack'
+"""Key of the node ``extra`` field holding the rack of a node."""
+
+EVENT_TYPE = 'hardware.ipmi.metrics'
+BATCH_EVENT_TYPE = 'hardware.ipmi.metrics.batch'
+
+_NODES = metrics.REGISTRY.counter(
+    'ironic_conductor_sensor_data_nodes_total',
+    'Number of nodes sensor data was collected from, by result.')
+_NOTIFICATIONS = metrics.REGISTRY.counter(
+    'ironic_conductor_sensor_data_notifications_total',
+    'Number of sensor data notifications sent.')
+
+
+def bmc_address(node):
+    """Get the address of the BMC of a node.
+
+    :param node: a row dictionary with the ``uuid`` and ``driver_info``
+        columns.
+    :returns: the value of the first ``*_address`` field of the driver
+        information, or the node UUID when there is none, so that such
+        nodes do not share a limit.
+    """
+    driver_info = node.get('driver_info') or {}
+    for key in sorted(driver_info):
+        if key.endswith('_address') and driver_info[key]:
+            return str(driver_info[key])
+    return node['uuid']
+
+
+def rack(node):
+    """Get the rack of a node from its ``extra`` field, None if unknown."""
+    return (node.get('extra') or {}).get(RACK_KEY)
+
+
+def record_result(result):
+    """Count a node processed by a sensor data worker.
+
+    :param result: 'success', 'failure' or 'unsupported'.
+    """
+    _NODES.inc(result=result)
+
+
+class SensorQueue(object):
+    """Queue of nodes to collect sensor data from, with concurrency limits.
+
+    Nodes are handed out in order, skipping the ones whose BMC or rack
+    already have the maximum number of nodes in progress.
+
+    :param nodes: list of row dictionaries, see :data:`COLUMNS`.
+    :param bmc_limit: maximum number of nodes in progress per BMC address.
+    :param rack_limit: maximum number of nodes in progress per rack, 0 for
+        no limit. Nodes without a rack are not limited.
+    """
+
+    def __init__(self, nodes, bmc_limit, rack_limit=0):
+        self._pending = collections.deque(nodes)
+        self._bmc_limit = bmc_limit
+        self._rack_limit = rack_limit
+        self._bmcs = collections.Counter()
+        self._racks = collections.Counter()
+        self._cond = threading.Condition()
+        self._stopped = False
+
+    def qsize(self):
+        return len(self._pending)
+
+    def _allowed(self, node):
+        if self._bmcs[bmc_address(node)] >= self._bmc_limit:
+            return False
+        node_rack = rack(node)
+        return (not self._rack_limit or node_rack is None or
+                self._racks[node_rack] < self._rack_limit)
+
+    def get(self):
+        """Get the next node which can be processed.
+
+        Blocks while all the pending nodes are held back by the limits.
+
+        :returns: a row dictionary, or None when there are no more nodes or
+            the queue was stopped.
+        """
+        with self._cond:
+            while self._pending and not self._stopped:
+                for node in self._pending:
+                    if self._allowed(node):
+                        self._pending.remove(node)
+                        self._bmcs[bmc_address(node)] += 1
+                        node_rack = rack(node)
+                        if node_rack is not None:
+                            self._racks[node_rack] += 1
+                        return node
+                # NOTE: nodes are only held back while others sharing their
+                # limits are in progress, done() wakes us up
+                self._cond.wait()
+            return None
+
+    def done(self, node):
+        """Mark a node returned by :meth:`get` as processed."""
+        with self._cond:
+            self._bmcs[bmc_address(node)] -= 1
+            node_rack = rack(node)
+            if node_rack is not None:
+                self._racks[node_rack] -= 1
+            self._cond.notify_all()
+
+    def stop(self):
+        """Stop handing out nodes, waking up the waiting workers."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+
+class NotificationBatcher(object):
+    """Sends sensor data messages, in batches if configured.
+
+    With a batch size of 1 every message is sent in its own
+    ``hardware.ipmi.metrics`` notification. Otherwise messages are grouped
+    in the ``payload`` list of ``hardware.ipmi.metrics.batch``
+    notifications.
+
+    :param notifier: the sensors notifier.
+    :param context: request context.
+    :param batch_size: maximum number of messages per notification.
+    """
+
+    def __init__(self, notifier, context, batch_size=1):
+        self._notifier = notifier
+        self._context = context
+        self._batch_size = batch_size
+        self._messages = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def add(self, message):
+        """Add a message, sending a notification when a batch is full."""
+        if self._batch_size <= 1:
+            self._send(EVENT_TYPE, message)
+            return
+
+        with self._lock:
+            self._messages.append(message)
+            if len(self._messages) < self._batch_size and not self._closed:
+                return
+            messages, self._messages = self._messages, []
+        self._send_batch(messages)
+
+    def close(self):
+        """Send the pending messages.
+
+        Messages added afterwards, e.g. by workers which did not complete
+        in time, are sent right away.
+        """
+        with self._lock:
+            self._closed = True
+            messages, self._messages = self._messages, []
+        if messages:
+            self._send_batch(messages)
+
+    def _send_batch(self, messages):
+        self._send(BATCH_EVENT_TYPE,
+                   {'message_id': uuidutils.generate_uuid(),
+                    'timestamp': datetime.datetime.utcnow(),
+                    'event_type': BATCH_EVENT_TYPE,
+                    'payload': messages})
+
+    def _send(self, event_type, payload):
+        try:
+            self._notifier.info(self._context, event_type, payload)
+        except Exception:
+            LOG.exception('Failed to send sensor data notification')
+        else:
+            _NOTIFICATIONS.inc()
+
+
+def get_queue(nodes):
+    """Create a :class:`SensorQueue` with the configured limits."""
+    return SensorQueue(nodes, CONF.conductor.send_sensor_data_bmc_concurrency,
+                       CONF.conductor.send_sensor_data_rack_concurrency)
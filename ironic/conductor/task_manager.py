@@ -113,7 +113,9 @@ import six
 from ironic.common import driver_factory
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics
 from ironic.common import states
+from ironic.conductor import deadlines
 from ironic.conductor import notification_utils as notify
 from ironic import objects
 from ironic.objects import fields
@@ -122,6 +124,16 @@ LOG = logging.getLogger(__name__)
 
 CONF = cfg.CONF
 
+_LOCKS_HELD = metrics.REGISTRY.gauge(
+    'ironic_conductor_node_locks_held',
+    'Number of exclusive node locks held by the conductor.')
+_LOCKS_ACQUIRED = metrics.REGISTRY.counter(
+    'ironic_conductor_node_locks_acquired_total',
+    'Number of exclusive node locks acquired by the conductor.')
+_LOCK_WAIT = metrics.REGISTRY.histogram(
+    'ironic_conductor_node_lock_wait_seconds',
+    'Time spent acquiring exclusive node locks, including retries.')
+
 
 def require_exclusive_lock(f):
     """Decorator to require an exclusive lock.
@@ -207,7 +219,7 @@ class TaskManager(object):
         self.node_id = node_id
         self.shared = shared
 
-        self.fsm = states.machine.copy()
+        self.fsm = states.frozen_machine.cursor()
         self._purpose = purpose
         self._debug_timer = timeutils.StopWatch()
 
@@ -256,6 +268,7 @@ class TaskManager(object):
 
     def _lock(self):
         self._debug_timer.restart()
+        wait_timer = timeutils.StopWatch().start()
 
         # NodeLocked exceptions can be annoying. Let's try to alleviate
         # some of that pain by retrying our lock attempts. The retrying
@@ -274,6 +287,9 @@ class TaskManager(object):
             self._debug_timer.restart()
 
         reserve_node()
+        _LOCK_WAIT.observe(wait_timer.elapsed())
+        _LOCKS_ACQUIRED.inc()
+        _LOCKS_HELD.inc()
 
     def upgrade_lock(self, purpose=None):
         """Upgrade a shared lock to an exclusive lock.
@@ -344,6 +360,9 @@ class TaskManager(object):
                 # squelch the exception if the node was deleted
                 # within the task's context.
                 pass
+            finally:
+                if self.node:
+                    _LOCKS_HELD.dec()
         if self.node:
             LOG.debug("Successfully released %(type)s lock for %(purpose)s "
                       "on node %(node)s (lock was held %(time).2f sec)",
@@ -389,7 +408,7 @@ class TaskManager(object):
         if self.node is None:
             # Rare case if resource released before notification
             task = copy.copy(self)
-            task.fsm = states.machine.copy()
+            task.fsm = states.frozen_machine.cursor()
             task.node = self._saved_node
         else:
             task = self
@@ -482,6 +501,7 @@ class TaskManager(object):
 
         # publish the state transition by saving the Node
         self.node.save()
+        deadlines.node_updated(self.node)
         LOG.info('Node %(node)s moved to provision state "%(state)s" from '
                  'state "%(previous)s"; target provision state is '
                  '"%(target)s"',
@@ -40,6 +40,16 @@ CLEANING_INTERFACE_PRIORITY = {
     'raid': 1,
 }
 
+# Actions that can be requested for a batch of nodes with a single
+# bulk_node_action RPC call.
+BULK_NODE_ACTIONS = ('power', 'provision', 'maintenance')
+
+# Conductor methods that can be run asynchronously through a job with the
+# run_job RPC call.
+JOB_ACTIONS = ('validate_driver_interfaces', 'vendor_passthru',
+               'set_boot_device', 'get_boot_device', 'inject_nmi',
+               'vif_attach')
+
 
 @task_manager.require_exclusive_lock
 def node_set_boot_device(task, device, persistent=False):
@@ -38,6 +38,11 @@ opts = [
                default=5,
                help=_('Retry interval in seconds in the case of a failed '
                       'action (only specific actions are retried).')),
+    cfg.IntOpt('request_concurrency',
+               default=4,
+               min=1,
+               help=_('Maximum number of volumes of a node attached or '
+                      'detached at once.')),
 ]
 
 
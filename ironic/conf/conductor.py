@@ -25,6 +25,31 @@ opts = [
                help=_('The size of the workers greenthread pool. '
                       'Note that 2 threads will be reserved by the conductor '
                       'itself for handling heart beats and periodic tasks.')),
+    cfg.IntOpt('workers_pool_reserved',
+               default=0, min=0,
+               help=_('Number of workers of the pool reserved for '
+                      'high-priority operations: powering nodes off, '
+                      'tearing them down and handling heartbeats from the '
+                      'ramdisk. Other operations are rejected with '
+                      'NoFreeConductorWorker unless that many workers are '
+                      'free. Periodic tasks are not subject to this limit. '
+                      'Must be less than workers_pool_size. The default of '
+                      '0 disables the reservation.')),
+    cfg.FloatOpt('periodic_max_jitter',
+                 default=1.0, min=0, max=1,
+                 help=_('Maximum fraction of the interval of a periodic '
+                        'task, by which its first run is randomly brought '
+                        'forward. Spreads the periodic tasks of conductors '
+                        'started at the same time, to avoid load spikes on '
+                        'the database. Set to 0 to run every periodic task '
+                        'exactly one interval after the conductor starts.')),
+    cfg.FloatOpt('saturation_threshold',
+                 default=0.9, min=0,
+                 help=_('Ratio of busy workers of the pool, at which a '
+                        'conductor is considered saturated. The API avoids '
+                        'routing requests to saturated conductors, when '
+                        'another conductor can handle them. Conductors '
+                        'report the ratio in their heart beats.')),
     cfg.IntOpt('heartbeat_interval',
                default=10,
                help=_('Seconds between conductor heart beats.')),
@@ -63,11 +88,40 @@ opts = [
                       'number of times Ironic should try syncing the '
                       'hardware node power state with the node power state '
                       'in DB')),
+    cfg.IntOpt('sync_power_state_bulk_size',
+               default=100,
+               min=0,
+               help=_('During sync_power_state, maximum number of nodes '
+                      'whose power states are retrieved together, for '
+                      'power interfaces able to get the power states of '
+                      'the nodes sharing a management endpoint at once, '
+                      'e.g. the VMs of a hypervisor or the outlets of a '
+                      'PDU. Set to 0 to get the power state of every node '
+                      'separately.')),
     cfg.IntOpt('periodic_max_workers',
                default=8,
                help=_('Maximum number of worker threads that can be started '
                       'simultaneously by a periodic task. Should be less '
                       'than RPC thread pool size.')),
+    cfg.IntOpt('bulk_action_workers',
+               default=8, min=1,
+               help=_('The maximum number of workers that can be started '
+                      'simultaneously to validate and start the actions '
+                      'requested for a batch of nodes by a single bulk '
+                      'node action request.')),
+    cfg.IntOpt('job_retention_period',
+               default=86400, min=0,
+               help=_('Number of seconds to keep finished asynchronous '
+                      'jobs in the database after their last update. '
+                      'Older jobs are periodically deleted. Set to 0 to '
+                      'keep finished jobs forever.')),
+    cfg.IntOpt('job_pending_timeout',
+               default=600, min=0,
+               help=_('Number of seconds an asynchronous job may wait for '
+                      'a conductor to start running it. Older pending jobs, '
+                      'for example when the request to run them was lost, '
+                      'are periodically marked as failed. Set to 0 to '
+                      'disable.')),
     cfg.IntOpt('node_locked_retry_attempts',
                default=3,
                help=_('Number of attempts to grab a node lock.')),
@@ -97,7 +151,28 @@ opts = [
                 default=['ALL'],
                 help=_('List of comma separated meter types which need to be'
                        ' sent to Ceilometer. The default value, "ALL", is a '
-                       'special value meaning send all the sensor data.')),
+                       'special value meaning send all the sensor data. '
+                       'Drivers supporting it only query the BMC for these '
+                       'types.')),
+    cfg.IntOpt('send_sensor_data_bmc_concurrency',
+               default=1, min=1,
+               help=_('The maximum number of nodes sharing a BMC address '
+                      'whose sensor data is collected simultaneously.')),
+    cfg.IntOpt('send_sensor_data_rack_concurrency',
+               default=0, min=0,
+               help=_('The maximum number of nodes of a rack whose sensor '
+                      'data is collected simultaneously. The rack of a node '
+                      'is read from the "rack" key of its "extra" field. '
+                      'Set to 0 for no limit.')),
+    cfg.IntOpt('send_sensor_data_batch_size',
+               default=1, min=1,
+               help=_('The maximum number of nodes whose sensor data is '
+                      'sent in one notification. With the default value of '
+                      '1, the data of every node is sent in its own '
+                      '"hardware.ipmi.metrics" notification. Otherwise the '
+                      'messages of several nodes are sent in the "payload" '
+                      'list of "hardware.ipmi.metrics.batch" '
+                      'notifications.')),
     cfg.IntOpt('sync_local_state_interval',
                default=180,
                help=_('When conductors join or leave the cluster, existing '
@@ -116,6 +191,14 @@ opts = [
                default=1800,
                help=_('Timeout (seconds) for waiting for node inspection. '
                       '0 - unlimited.')),
+    cfg.BoolOpt('track_provision_timeouts',
+                default=True,
+                help=_('Whether to track the deploy, clean and inspection '
+                       'timeouts of the nodes mapped to this conductor in '
+                       'memory, so that they are processed as soon as they '
+                       'are reached. The periodic checks run every '
+                       '[conductor]check_provision_state_interval catch the '
+                       'timeouts which are not tracked.')),
     cfg.BoolOpt('automated_clean',
                 default=True,
                 help=_('Enables or disables automated cleaning. Automated '
@@ -231,7 +231,22 @@ notification_opts = [
                choices=['debug', 'info', 'warning', 'error', 'critical'],
                help=_('Specifies the minimum level for which to send '
                       'notifications. If not set, no notifications will '
-                      'be sent. The default is for this option to be unset.'))
+                      'be sent. The default is for this option to be unset.')),
+    cfg.IntOpt('notification_queue_size',
+               default=0,
+               min=0,
+               help=_('Maximum number of versioned notifications queued '
+                      'for asynchronous publishing. When set, notifications '
+                      'are sent by a background publisher instead of the '
+                      'thread emitting them, and notifications not fitting '
+                      'into the queue are dropped. The default value of 0 '
+                      'means that notifications are sent synchronously.')),
+    cfg.IntOpt('notification_batch_size',
+               default=100,
+               min=1,
+               help=_('Maximum number of queued versioned notifications '
+                      'sent by the background publisher in one batch. '
+                      'Only used when notification_queue_size is set.')),
 ]
 
 path_opts = [
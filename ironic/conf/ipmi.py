@@ -53,6 +53,18 @@ opts = [
                       'sent to a server. There is a risk with some hardware '
                       'that setting this too low may cause the BMC to crash. '
                       'Recommended setting is 5 seconds.')),
+    cfg.StrOpt('sdr_cache_dir',
+               help=_('Directory where the SDR repositories of the BMCs '
+                      'are cached when reading sensor data, so that '
+                      'ipmitool does not download them on every read. '
+                      'Caching is disabled if not set.')),
+    cfg.IntOpt('sdr_cache_check_interval',
+               default=600, min=0,
+               help=_('Minimum time, in seconds, between two checks of the '
+                      'SDR repository timestamp of a BMC with a cached SDR '
+                      'repository. The repository is dumped again when the '
+                      'timestamp has changed. Set to 0 to check it on every '
+                      'read of sensor data.')),
 ]
 
 
@@ -47,7 +47,26 @@ opts = [
                help=_('Prefix all metric names sent by the agent ramdisk '
                       'with this value. The format of metric names is '
                       '[global_prefix.][uuid.][host_name.]prefix.'
-                      'metric_name.'))
+                      'metric_name.')),
+    # Options of the in-process registry of metrics
+    cfg.BoolOpt('expose_registry',
+                default=False,
+                help=_('Expose the in-process registry of metrics in the '
+                       'Prometheus text format. The ironic-api service '
+                       'exposes it at the /metrics endpoint, the '
+                       'ironic-conductor service runs an HTTP server on '
+                       'conductor_exporter_host and '
+                       'conductor_exporter_port for it.')),
+    cfg.StrOpt('conductor_exporter_host',
+               default='127.0.0.1',
+               help=_('The IP address on which ironic-conductor exposes '
+                      'its metrics, if expose_registry is enabled. The '
+                      'metrics are not authenticated, the address should '
+                      'only be reachable from the monitoring network.')),
+    cfg.PortOpt('conductor_exporter_port',
+                default=9608,
+                help=_('The TCP port on which ironic-conductor exposes its '
+                       'metrics, if expose_registry is enabled.')),
 ]
 
 
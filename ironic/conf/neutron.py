@@ -32,11 +32,31 @@ opts = [
     cfg.IntOpt('port_setup_delay',
                default=0,
                min=0,
-               help=_('Delay value to wait for Neutron agents to setup '
-                      'sufficient DHCP configuration for port.')),
+               help=_('Maximum time, in seconds, to wait for Neutron agents '
+                      'to setup sufficient DHCP configuration for the ports '
+                      'of a node after updating their DHCP options. The '
+                      'wait ends as soon as all the ports are ACTIVE, '
+                      'unless some of them were already ACTIVE before the '
+                      'update, the whole delay is then waited. Set to 0 to '
+                      'not wait.')),
     cfg.IntOpt('retries',
                default=3,
                help=_('Client retries in the case of a failed request.')),
+    cfg.IntOpt('request_concurrency',
+               default=4,
+               min=1,
+               help=_('Maximum number of requests sent to neutron at once '
+                      'for the ports of a node, when updating their DHCP '
+                      'options or deleting them.')),
+    cfg.IntOpt('lookup_cache_ttl',
+               default=60,
+               min=0,
+               help=_('Time, in seconds, for which the results of the '
+                      'lookups of networks and security groups in neutron '
+                      'are cached by the conductor and shared by all its '
+                      'tasks. A cached result is dropped as soon as neutron '
+                      'reports a network or security group missing. Set to '
+                      '0 to disable the cache.')),
     cfg.StrOpt('auth_strategy',
                default='keystone',
                choices=['keystone', 'noauth'],
@@ -77,6 +77,16 @@ opts = [
                help=_('On ironic-conductor node, directory where master TFTP '
                       'images are stored on disk. '
                       'Setting to <None> disables image caching.')),
+    cfg.BoolOpt('shared_boot_images',
+                default=False,
+                help=_('Whether the kernels and ramdisks booted with PXE or '
+                       'iPXE are placed once in the "images" directory of '
+                       'the TFTP or HTTP root, named after their image and '
+                       'shared by all nodes booting them, instead of being '
+                       'linked into the directory of every node. The '
+                       'directories of the nodes then only hold their boot '
+                       'configuration. Ignored when image caching is '
+                       'disabled by setting "tftp_master_path" to <None>.')),
     cfg.IntOpt('dir_permission',
                help=_("The permission that will be applied to the TFTP "
                       "folders upon creation. This should be set to the "
@@ -27,7 +27,64 @@ opts = [
                min=1,
                default=4,
                help=_('Number of seconds to wait between attempts to '
-                      'connect to Redfish'))
+                      'connect to Redfish')),
+    cfg.IntOpt('connection_cache_size',
+               min=0,
+               default=1000,
+               help=_('Maximum number of Redfish connections cached by a '
+                      'conductor. Connections are shared by the nodes with '
+                      'the same Redfish address, user name and CA '
+                      'verification. The least recently used connection is '
+                      'dropped when the cache is full. Set to 0 to disable '
+                      'caching.')),
+    cfg.IntOpt('connection_cache_idle_timeout',
+               min=1,
+               default=300,
+               help=_('Number of seconds after which an unused cached '
+                      'Redfish connection is dropped.')),
+    cfg.IntOpt('system_cache_ttl',
+               min=0,
+               default=0,
+               help=_('Number of seconds a Redfish System fetched through a '
+                      'cached connection is reused for before being fetched '
+                      'again. Systems are fetched again after the driver '
+                      'changes them. Set to 0 to fetch the System on every '
+                      'operation.')),
+    cfg.StrOpt('event_destination_url',
+               help=_('URL under which the BMCs can reach the Redfish event '
+                      'receiver of this conductor, for example '
+                      'http://conductor1.example.com:6388. When set, the '
+                      'conductor subscribes to the events of the Systems '
+                      'of its nodes using the redfish power interface, and '
+                      'syncs their power state when they change. Event '
+                      'subscriptions are disabled if not set.')),
+    cfg.StrOpt('event_listen_host',
+               default='127.0.0.1',
+               help=_('The IP address on which the conductor receives '
+                      'Redfish events. It must be reachable by the BMCs '
+                      'of the nodes and should only be reachable from the '
+                      'BMC network, the events are not authenticated '
+                      'beyond the token in their URL. A warning is logged '
+                      'when event_destination_url is set and this is a '
+                      'loopback address.')),
+    cfg.PortOpt('event_listen_port',
+                default=6388,
+                help=_('The TCP port on which the conductor receives '
+                       'Redfish events.')),
+    cfg.IntOpt('event_subscription_interval',
+               min=1,
+               default=300,
+               help=_('Number of seconds between two checks that the event '
+                      'subscription of a node still exists on its BMC.')),
+    cfg.IntOpt('event_poll_interval',
+               min=0,
+               default=3600,
+               help=_('Minimum number of seconds between two periodic power '
+                      'state syncs of a node with a healthy event '
+                      'subscription, i.e. once the conductor received an '
+                      'event of the subscription. A test event is '
+                      'requested after subscribing. Other nodes are synced '
+                      'every [conductor]sync_power_state_interval.')),
 ]
 
 
@@ -31,6 +31,31 @@ opts = [
                help=_("Number of seconds to wait between attempts to get "
                       "VM name used by the host that corresponds to a "
                       "node's MAC address.")),
+    cfg.IntOpt('connection_idle_timeout',
+               default=300,
+               min=0,
+               help=_('Number of seconds an SSH connection to a hypervisor '
+                      'is kept open for reuse by the operations on its '
+                      'nodes after it was last used. Set to 0 to open a '
+                      'new connection for every operation.')),
+    cfg.IntOpt('vm_inventory_ttl',
+               default=60,
+               min=0,
+               help=_('Number of seconds the list of the VMs of a '
+                      'hypervisor and their MAC addresses is reused to '
+                      'find the VMs of its nodes. The list is refreshed '
+                      'earlier when a node matches none of the VMs. Set to '
+                      '0 to list the VMs on every operation.')),
+    cfg.IntOpt('power_state_cache_ttl',
+               default=10,
+               min=0,
+               help=_('Number of seconds the list of the running VMs of a '
+                      'hypervisor is reused to get the power state of its '
+                      'nodes, so that syncing the power state of all the '
+                      'nodes of a hypervisor runs a single command. The '
+                      'list is refreshed after every power state change '
+                      'made by ironic. Set to 0 to list the running VMs on '
+                      'every power state check.')),
 ]
 
 
@@ -61,6 +61,7 @@ class Connection(object):
                         :chassis_uuid: uuid of chassis
                         :driver: driver's name
                         :provision_state: provision state of node
+                        :provision_state_in: list of provision states
                         :provisioned_before:
                             nodes with provision_updated_at field before this
                             interval in seconds
@@ -86,6 +87,7 @@ class Connection(object):
                         :chassis_uuid: uuid of chassis
                         :driver: driver's name
                         :provision_state: provision state of node
+                        :provision_state_in: list of provision states
                         :provisioned_before:
                             nodes with provision_updated_at field before this
                             interval in seconds
@@ -186,7 +188,7 @@ class Connection(object):
         """Destroy a node and its associated resources.
 
         Destroy a node, including any associated ports, port groups,
-        tags, volume connectors, and volume targets.
+        tags, volume connectors, volume targets and jobs.
 
         :param node_id: The ID or UUID of a node.
         """
@@ -509,10 +511,12 @@ class Connection(object):
         """
 
     @abc.abstractmethod
-    def touch_conductor(self, hostname):
+    def touch_conductor(self, hostname, saturation=None):
         """Mark a conductor as active by updating its 'updated_at' property.
 
         :param hostname: The hostname of this conductor service.
+        :param saturation: Ratio of busy workers of the conductor, not
+                           updated if None.
         :raises: ConductorNotFound
         """
 
@@ -543,6 +547,15 @@ class Connection(object):
                      hardware-type-b: set([host2, host3])}
         """
 
+    @abc.abstractmethod
+    def get_active_conductor_saturation(self):
+        """Retrieve the saturation of the registered and active conductors.
+
+        :returns: A dict which maps hostnames to the ratio of busy workers
+                  reported by the conductors in their last heart beat.
+                  Conductors which did not report it are omitted.
+        """
+
     @abc.abstractmethod
     def get_offline_conductors(self):
         """Get a list conductor hostnames that are offline (dead).
@@ -884,3 +897,72 @@ class Connection(object):
         :raises: VolumeTargetNotFound if a volume target with the specified
                  ident does not exist.
         """
+
+    @abc.abstractmethod
+    def get_job_by_id(self, db_id):
+        """Return a job representation.
+
+        :param db_id: The integer database ID of a job.
+        :returns: A job with the specified ID.
+        :raises: JobNotFound If a job with the specified ID is not found.
+        """
+
+    @abc.abstractmethod
+    def get_job_by_uuid(self, job_uuid):
+        """Return a job representation.
+
+        :param job_uuid: The UUID of a job.
+        :returns: A job with the specified UUID.
+        :raises: JobNotFound If a job with the specified UUID is not found.
+        """
+
+    @abc.abstractmethod
+    def create_job(self, job_info):
+        """Create a new job.
+
+        :param job_info: Dictionary containing information about the job.
+                         For example:
+
+                         ::
+
+                          {
+                              'uuid': '000000-..',
+                              'node_id': 2,
+                              'action': 'get_boot_device',
+                              'args': {},
+                              'status': 'pending',
+                          }
+        :returns: A job.
+        :raises: JobAlreadyExists If a job with the same UUID already exists.
+        """
+
+    @abc.abstractmethod
+    def update_job(self, ident, job_info):
+        """Update information for a job.
+
+        :param ident: The UUID or integer ID of a job.
+        :param job_info: Dictionary containing the information about the job
+                         to update.
+        :returns: A job.
+        :raises: InvalidParameterValue if a UUID is included in job_info.
+        :raises: JobNotFound If a job with the specified ident is not found.
+        """
+
+    @abc.abstractmethod
+    def expire_pending_jobs(self, older_than, error):
+        """Mark as failed the pending jobs which were created long ago.
+
+        :param older_than: A datetime, pending jobs created before it are
+                           marked as failed.
+        :param error: The error message to record in the expired jobs.
+        :returns: The number of expired jobs.
+        """
+
+    @abc.abstractmethod
+    def destroy_finished_jobs(self, older_than):
+        """Destroy finished jobs which were not updated for some time.
+
+        :param older_than: A datetime, finished jobs last updated before it
+                           are destroyed.
+        :returns: The number of destroyed jobs.
+        """
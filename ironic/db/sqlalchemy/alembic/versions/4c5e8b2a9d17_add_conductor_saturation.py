@@ -0,0 +1,31 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add saturation to conductors
+
+Revision ID: 4c5e8b2a9d17
+Revises: 9ec8e3b3095a
+Create Date: 2017-08-28 10:41:09.328741
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '4c5e8b2a9d17'
+down_revision = '9ec8e3b3095a'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('conductors', sa.Column('saturation', sa.Float(),
+                                          nullable=True))
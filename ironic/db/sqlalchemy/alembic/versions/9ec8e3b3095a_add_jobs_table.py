@@ -0,0 +1,48 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add jobs table
+
+Revision ID: 9ec8e3b3095a
+Revises: 868cb606a74a
+Create Date: 2017-08-21 14:02:37.512364
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '9ec8e3b3095a'
+down_revision = '868cb606a74a'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table('jobs',
+                    sa.Column('created_at', sa.DateTime(), nullable=True),
+                    sa.Column('updated_at', sa.DateTime(), nullable=True),
+                    sa.Column('version', sa.String(length=15), nullable=True),
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('uuid', sa.String(length=36), nullable=True),
+                    sa.Column('node_id', sa.Integer(), nullable=True),
+                    sa.Column('action', sa.String(length=255),
+                              nullable=True),
+                    sa.Column('args', sa.Text(), nullable=True),
+                    sa.Column('status', sa.String(length=15), nullable=True),
+                    sa.Column('result', sa.Text(), nullable=True),
+                    sa.Column('error', sa.Text(), nullable=True),
+                    sa.ForeignKeyConstraint(['node_id'], ['nodes.id'], ),
+                    sa.PrimaryKeyConstraint('id'),
+                    sa.UniqueConstraint('uuid', name='uniq_jobs0uuid'),
+                    mysql_charset='utf8',
+                    mysql_engine='InnoDB')
+    op.create_index('jobs_node_id_idx', 'jobs', ['node_id'], unique=False)
@@ -227,6 +227,9 @@ class Connection(api.Connection):
             query = query.filter_by(resource_class=filters['resource_class'])
         if 'provision_state' in filters:
             query = query.filter_by(provision_state=filters['provision_state'])
+        if 'provision_state_in' in filters:
+            query = query.filter(models.Node.provision_state.in_(
+                filters['provision_state_in']))
         if 'provisioned_before' in filters:
             limit = (timeutils.utcnow() -
                      datetime.timedelta(seconds=filters['provisioned_before']))
@@ -408,6 +411,9 @@ class Connection(api.Connection):
                 models.VolumeTarget).filter_by(node_id=node_id)
             volume_target_query.delete()
 
+            job_query = model_query(models.Job).filter_by(node_id=node_id)
+            job_query.delete()
+
             query.delete()
 
     def update_node(self, node_id, values):
@@ -760,14 +766,16 @@ class Connection(api.Connection):
                 raise exception.ConductorNotFound(conductor=hostname)
 
     @oslo_db_api.retry_on_deadlock
-    def touch_conductor(self, hostname):
+    def touch_conductor(self, hostname, saturation=None):
+        values = {'updated_at': timeutils.utcnow(), 'online': True}
+        if saturation is not None:
+            values['saturation'] = saturation
         with _session_for_write():
             query = (model_query(models.Conductor)
                      .filter_by(hostname=hostname))
             # since we're not changing any other field, manually set updated_at
             # and since we're heartbeating, make sure that online=True
-            count = query.update({'updated_at': timeutils.utcnow(),
-                                  'online': True})
+            count = query.update(values)
             if count == 0:
                 raise exception.ConductorNotFound(conductor=hostname)
 
@@ -828,6 +836,13 @@ class Connection(api.Connection):
             d2c[iface_row['hardware_type']].add(cdr_row['hostname'])
         return d2c
 
+    def get_active_conductor_saturation(self):
+        query = model_query(models.Conductor.hostname,
+                            models.Conductor.saturation)
+        result = _filter_active_conductors(query)
+        return {hostname: saturation for hostname, saturation in result
+                if saturation is not None}
+
     def get_offline_conductors(self):
         interval = CONF.conductor.heartbeat_timeout
         limit = timeutils.utcnow() - datetime.timedelta(seconds=interval)
@@ -1122,3 +1137,71 @@ class Connection(api.Connection):
             count = query.delete()
             if count == 0:
                 raise exception.VolumeTargetNotFound(target=ident)
+
+    def get_job_by_id(self, db_id):
+        query = model_query(models.Job).filter_by(id=db_id)
+        try:
+            return query.one()
+        except NoResultFound:
+            raise exception.JobNotFound(job=db_id)
+
+    def get_job_by_uuid(self, job_uuid):
+        query = model_query(models.Job).filter_by(uuid=job_uuid)
+        try:
+            return query.one()
+        except NoResultFound:
+            raise exception.JobNotFound(job=job_uuid)
+
+    @oslo_db_api.retry_on_deadlock
+    def create_job(self, job_info):
+        if 'uuid' not in job_info:
+            job_info['uuid'] = uuidutils.generate_uuid()
+        if 'status' not in job_info:
+            job_info['status'] = states.JOB_PENDING
+
+        job = models.Job()
+        job.update(job_info)
+        with _session_for_write() as session:
+            try:
+                session.add(job)
+                session.flush()
+            except db_exc.DBDuplicateEntry:
+                raise exception.JobAlreadyExists(uuid=job_info['uuid'])
+            return job
+
+    @oslo_db_api.retry_on_deadlock
+    def update_job(self, ident, job_info):
+        if 'uuid' in job_info:
+            msg = _("Cannot overwrite UUID for an existing Job.")
+            raise exception.InvalidParameterValue(err=msg)
+
+        try:
+            with _session_for_write() as session:
+                query = model_query(models.Job)
+                query = add_identity_filter(query, ident)
+                ref = query.one()
+                ref.update(job_info)
+                session.flush()
+        except NoResultFound:
+            raise exception.JobNotFound(job=ident)
+        return ref
+
+    @oslo_db_api.retry_on_deadlock
+    def expire_pending_jobs(self, older_than, error):
+        with _session_for_write():
+            query = model_query(models.Job)
+            query = query.filter(models.Job.status == states.JOB_PENDING,
+                                 models.Job.created_at < older_than)
+            return query.update({'status': states.JOB_ERROR,
+                                 'error': error,
+                                 'updated_at': timeutils.utcnow()},
+                                synchronize_session=False)
+
+    @oslo_db_api.retry_on_deadlock
+    def destroy_finished_jobs(self, older_than):
+        with _session_for_write():
+            query = model_query(models.Job)
+            query = query.filter(
+                models.Job.status.in_(states.JOB_FINISHED_STATES),
+                models.Job.updated_at < older_than)
+            return query.delete(synchronize_session=False)
@@ -24,7 +24,7 @@ from oslo_db import options as db_options
 from oslo_db.sqlalchemy import models
 from oslo_db.sqlalchemy import types as db_types
 import six.moves.urllib.parse as urlparse
-from sqlalchemy import Boolean, Column, DateTime, Index
+from sqlalchemy import Boolean, Column, DateTime, Float, Index
 from sqlalchemy import ForeignKey, Integer
 from sqlalchemy import schema, String, Text
 from sqlalchemy.ext.declarative import declarative_base
@@ -90,6 +90,7 @@ class Conductor(Base):
     hostname = Column(String(255), nullable=False)
     drivers = Column(db_types.JsonEncodedList)
     online = Column(Boolean, default=True)
+    saturation = Column(Float, nullable=True)
 
 
 class ConductorHardwareInterfaces(Base):
@@ -277,3 +278,21 @@ class VolumeTarget(Base):
     boot_index = Column(Integer)
     volume_id = Column(String(36))
     extra = Column(db_types.JsonEncodedDict)
+
+
+class Job(Base):
+    """Represents an asynchronous request against a bare metal node."""
+
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        schema.UniqueConstraint('uuid', name='uniq_jobs0uuid'),
+        Index('jobs_node_id_idx', 'node_id'),
+        table_args())
+    id = Column(Integer, primary_key=True)
+    uuid = Column(String(36))
+    node_id = Column(Integer, ForeignKey('nodes.id'), nullable=True)
+    action = Column(String(255))
+    args = Column(db_types.JsonEncodedDict)
+    status = Column(String(15))
+    result = Column(db_types.JsonEncodedDict)
+    error = Column(Text, nullable=True)
@@ -19,6 +19,7 @@ import time
 from neutronclient.common import exceptions as neutron_client_exc
 from oslo_log import log as logging
 from oslo_utils import netutils
+from oslo_utils import timeutils
 
 from ironic.common import exception
 from ironic.common.i18n import _
@@ -30,6 +31,9 @@ from ironic import objects
 
 LOG = logging.getLogger(__name__)
 
+PORT_STATUS_POLL_INTERVAL = 1
+"""Interval between two checks of the status of the ports, in seconds."""
+
 
 class NeutronDHCPApi(base.BaseDHCP):
     """API for communicating to neutron 2.x API."""
@@ -99,13 +103,23 @@ class NeutronDHCPApi(base.BaseDHCP):
                   "to update DHCP BOOT options.") %
                 {'node': task.node.uuid})
 
-        failures = []
         vif_list = [vif for pdict in vifs.values() for vif in pdict.values()]
-        for vif in vif_list:
+
+        # NOTE: the status of the ports which are already ACTIVE does not
+        # change when their DHCP options are updated, so it is read before
+        # updating them.
+        active_vifs = None
+        if CONF.neutron.port_setup_delay != 0:
+            active_vifs = self._get_active_ports(task, vif_list)
+
+        def _update(vif):
             try:
                 self.update_port_dhcp_opts(vif, options)
             except exception.FailedToUpdateDHCPOptOnPort:
-                failures.append(vif)
+                return vif
+
+        failures = [vif for vif in neutron.map_requests(_update, vif_list)
+                    if vif]
 
         if failures:
             if len(failures) == len(vif_list):
@@ -119,14 +133,89 @@ class NeutronDHCPApi(base.BaseDHCP):
                             {'node': task.node.uuid, 'ports': failures})
 
         # TODO(adam_g): Hack to workaround bug 1334447 until we have a
-        # mechanism for synchronizing events with Neutron. We need to sleep
+        # mechanism for synchronizing events with Neutron. We need to wait
         # only if server gets to PXE faster than Neutron agents have setup
         # sufficient DHCP config for netboot. It may occur when we are using
         # VMs or hardware server with fast boot enabled.
+        if CONF.neutron.port_setup_delay != 0:
+            self._wait_for_ports(task, [vif for vif in vif_list
+                                        if vif not in failures],
+                                 active_vifs)
+
+    def _get_active_ports(self, task, vif_list):
+        """Get the Neutron ports which are ACTIVE.
+
+        :param task: A TaskManager instance.
+        :param vif_list: A list of Neutron port UUIDs.
+        :returns: the set of the UUIDs of the ACTIVE ports, None if their
+            status could not be read.
+        """
+        try:
+            ports = neutron.get_client().list_ports(id=vif_list,
+                                                    fields=['id', 'status'])
+        except neutron_client_exc.NeutronClientException as e:
+            LOG.warning("Could not get the status of the Neutron ports "
+                        "of node %(node)s, waiting %(delay)d seconds after "
+                        "updating their DHCP options. Error: %(error)s",
+                        {'node': task.node.uuid, 'error': e,
+                         'delay': CONF.neutron.port_setup_delay})
+            return None
+        return set(port['id'] for port in ports.get('ports', [])
+                   if port.get('status') == 'ACTIVE')
+
+    def _wait_for_ports(self, task, vif_list, active_vifs):
+        """Wait for Neutron ports to become ACTIVE.
+
+        Neutron marks a port ACTIVE once its agents, including the DHCP
+        agent, have set it up. Waits up to [neutron]port_setup_delay
+        seconds. Ports which were ACTIVE before their DHCP options were
+        updated give no sign of the DHCP agent applying the new options,
+        the whole delay is waited for them.
+
+        :param task: A TaskManager instance.
+        :param vif_list: A list of Neutron port UUIDs.
+        :param active_vifs: the set of the UUIDs of the ports which were
+            ACTIVE before their DHCP options were updated, None if unknown.
+        """
         port_delay = CONF.neutron.port_setup_delay
-        if port_delay != 0:
-            LOG.debug("Waiting %d seconds for Neutron.", port_delay)
+        if active_vifs is None or active_vifs.intersection(vif_list):
+            LOG.debug("Waiting %(delay)d seconds for the DHCP options of "
+                      "the Neutron ports %(ports)s of node %(node)s to be "
+                      "applied.", {'delay': port_delay, 'ports': vif_list,
+                                   'node': task.node.uuid})
             time.sleep(port_delay)
+            return
+
+        LOG.debug("Waiting up to %(delay)d seconds for the Neutron ports "
+                  "%(ports)s of node %(node)s to become ACTIVE.",
+                  {'delay': port_delay, 'ports': vif_list,
+                   'node': task.node.uuid})
+        timer = timeutils.StopWatch(duration=port_delay).start()
+        client = neutron.get_client()
+        while True:
+            try:
+                ports = client.list_ports(id=vif_list,
+                                          fields=['id', 'status'])
+            except neutron_client_exc.NeutronClientException as e:
+                LOG.warning("Could not get the status of the Neutron ports "
+                            "of node %(node)s, waiting %(delay)d seconds. "
+                            "Error: %(error)s",
+                            {'node': task.node.uuid, 'error': e,
+                             'delay': port_delay})
+                time.sleep(timer.leftover())
+                return
+
+            not_ready = [port['id'] for port in ports.get('ports', [])
+                         if port.get('status') != 'ACTIVE']
+            if not not_ready:
+                return
+            if timer.expired():
+                LOG.debug("The Neutron ports %(ports)s of node %(node)s are "
+                          "not ACTIVE after %(delay)d seconds, continuing.",
+                          {'ports': not_ready, 'node': task.node.uuid,
+                           'delay': port_delay})
+                return
+            time.sleep(min(PORT_STATUS_POLL_INTERVAL, timer.leftover()))
 
     def _get_fixed_ip_address(self, port_uuid, client):
         """Get a Neutron port's fixed ip address.
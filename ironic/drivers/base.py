@@ -519,6 +519,35 @@ class PowerInterface(BaseInterface):
         """
         return [states.POWER_ON, states.POWER_OFF, states.REBOOT]
 
+    def get_power_state_bulk_key(self, task):
+        """Get the key of the endpoint reporting the power state of a node.
+
+        Interfaces able to get the power states of several nodes at once,
+        e.g. of all the VMs of a hypervisor or all the outlets of a PDU,
+        return the same key for the nodes whose power states are returned
+        by a single :meth:`get_power_state_bulk` call.
+
+        :param task: A TaskManager instance containing the node to act on.
+        :returns: a hashable key, or None if the power state of the node
+            can only be retrieved with :meth:`get_power_state`.
+        """
+        return None
+
+    def get_power_state_bulk(self, tasks):
+        """Return the power states of several nodes at once.
+
+        Only called with nodes having the same, not None, key returned by
+        :meth:`get_power_state_bulk_key`.
+
+        :param tasks: A list of TaskManager instances containing the nodes
+            to act on.
+        :raises: NotImplementedError if not supported by the interface.
+        :returns: A dictionary mapping node UUIDs to power states. The power
+            state of the nodes which are not in it is retrieved with
+            :meth:`get_power_state`.
+        """
+        raise NotImplementedError()
+
 
 class ConsoleInterface(BaseInterface):
     """Interface for console-related actions."""
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from ironic_lib import metrics_utils
 from ironic_lib import utils as il_utils
 from oslo_log import log
 from oslo_utils import units
@@ -23,6 +22,7 @@ from ironic.common import exception
 from ironic.common.glance_service import service_utils
 from ironic.common.i18n import _
 from ironic.common import images
+from ironic.common import metrics_utils
 from ironic.common import raid
 from ironic.common import states
 from ironic.common import utils
@@ -18,7 +18,6 @@
 
 import collections
 
-from ironic_lib import metrics_utils
 from oslo_log import log
 from oslo_utils import strutils
 from oslo_utils import timeutils
@@ -27,6 +26,7 @@ import retrying
 from ironic.common import boot_devices
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics_utils
 from ironic.common import states
 from ironic.conductor import rpcapi
 from ironic.conductor import utils as manager_utils
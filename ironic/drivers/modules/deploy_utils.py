@@ -21,7 +21,6 @@ import re
 import time
 
 from ironic_lib import disk_utils
-from ironic_lib import metrics_utils
 from oslo_concurrency import processutils
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
@@ -35,6 +34,7 @@ from ironic.common.glance_service import service_utils
 from ironic.common.i18n import _
 from ironic.common import image_service
 from ironic.common import keystone
+from ironic.common import metrics_utils
 from ironic.common import states
 from ironic.common import utils
 from ironic.conductor import utils as manager_utils
@@ -251,25 +251,34 @@ def delete_iscsi(portal_address, portal_port, target_iqn):
                   delay_on_retry=True)
 
 
-def _replace_lines_in_file(path, regex_pattern, replacement):
+def _replace_lines_in_file(path, replacements):
+    """Replace the lines of a file matching regular expressions, atomically.
+
+    :param path: path to the file.
+    :param replacements: a list of (regex pattern, replacement) tuples,
+        applied in order to each line of the file.
+    """
     with open(path) as f:
         lines = f.readlines()
 
-    compiled_pattern = re.compile(regex_pattern)
-    with open(path, 'w') as f:
-        for line in lines:
+    compiled_replacements = [(re.compile(pattern), replacement)
+                             for pattern, replacement in replacements]
+    new_lines = []
+    for line in lines:
+        for compiled_pattern, replacement in compiled_replacements:
             line = compiled_pattern.sub(replacement, line)
-            f.write(line)
+        new_lines.append(line)
+    utils.replace_file(path, ''.join(new_lines))
 
 
-def _replace_root_uuid(path, root_uuid):
+def _root_uuid_replacement(root_uuid):
     root = 'UUID=%s' % root_uuid
     pattern = r'(\(\(|\{\{) ROOT (\)\)|\}\})'
-    _replace_lines_in_file(path, pattern, root)
+    return pattern, root
 
 
-def _replace_boot_line(path, boot_mode, is_whole_disk_image,
-                       trusted_boot=False, iscsi_boot=False):
+def _boot_line_replacement(boot_mode, is_whole_disk_image,
+                           trusted_boot=False, iscsi_boot=False):
     if is_whole_disk_image:
         boot_disk_type = 'boot_whole_disk'
     elif trusted_boot:
@@ -287,12 +296,12 @@ def _replace_boot_line(path, boot_mode, is_whole_disk_image,
         pattern = '^%s .*$' % pxe_cmd
         boot_line = '%s %s' % (pxe_cmd, boot_disk_type)
 
-    _replace_lines_in_file(path, pattern, boot_line)
+    return pattern, boot_line
 
 
-def _replace_disk_identifier(path, disk_identifier):
+def _disk_identifier_replacement(disk_identifier):
     pattern = r'(\(\(|\{\{) DISK_IDENTIFIER (\)\)|\}\})'
-    _replace_lines_in_file(path, pattern, disk_identifier)
+    return pattern, disk_identifier
 
 
 def switch_pxe_config(path, root_uuid_or_disk_id, boot_mode,
@@ -311,12 +320,13 @@ def switch_pxe_config(path, root_uuid_or_disk_id, boot_mode,
     :param iscsi_boot: if boot is from an iSCSI volume or not.
     """
     if not is_whole_disk_image:
-        _replace_root_uuid(path, root_uuid_or_disk_id)
+        replacements = [_root_uuid_replacement(root_uuid_or_disk_id)]
     else:
-        _replace_disk_identifier(path, root_uuid_or_disk_id)
+        replacements = [_disk_identifier_replacement(root_uuid_or_disk_id)]
 
-    _replace_boot_line(path, boot_mode, is_whole_disk_image, trusted_boot,
-                       iscsi_boot)
+    replacements.append(_boot_line_replacement(
+        boot_mode, is_whole_disk_image, trusted_boot, iscsi_boot))
+    _replace_lines_in_file(path, replacements)
 
 
 def get_dev(address, port, iqn, lun):
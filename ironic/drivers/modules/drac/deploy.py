@@ -15,8 +15,7 @@
 DRAC deploy interface
 """
 
-from ironic_lib import metrics_utils
-
+from ironic.common import metrics_utils
 from ironic.drivers.modules import deploy_utils
 from ironic.drivers.modules import iscsi_deploy
 
@@ -15,13 +15,13 @@
 DRAC inspection interface
 """
 
-from ironic_lib import metrics_utils
 from oslo_log import log as logging
 from oslo_utils import importutils
 from oslo_utils import units
 
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics_utils
 from ironic.common import states
 from ironic.drivers import base
 from ironic.drivers.modules.drac import common as drac_common
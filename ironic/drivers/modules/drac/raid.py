@@ -17,16 +17,16 @@ DRAC RAID specific methods
 
 import math
 
-from futurist import periodics
-from ironic_lib import metrics_utils
 from oslo_log import log as logging
 from oslo_utils import importutils
 from oslo_utils import units
 
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics_utils
 from ironic.common import raid as raid_common
 from ironic.common import states
+from ironic.conductor import node_snapshot
 from ironic.conductor import task_manager
 from ironic.conf import CONF
 from ironic.drivers import base
@@ -800,15 +800,21 @@ class DracRAID(base.RAIDInterface):
         return {'logical_disks': logical_disks}
 
     @METRICS.timer('DracRAID._query_raid_config_job_status')
-    @periodics.periodic(
+    @node_snapshot.consumer(
+        columns=['driver_internal_info', 'reservation'],
+        predicate=lambda node: node['reservation'] is None,
         spacing=CONF.drac.query_raid_config_job_status_interval)
-    def _query_raid_config_job_status(self, manager, context):
+    def _query_raid_config_job_status(self, manager, context, nodes=None):
         """Periodic task to check the progress of running RAID config jobs."""
 
-        filters = {'reserved': False, 'maintenance': False}
-        fields = ['driver_internal_info']
+        if nodes is None:
+            filters = {'reserved': False, 'maintenance': False}
+            fields = ['driver_internal_info']
+            node_list = manager.iter_nodes(fields=fields, filters=filters)
+        else:
+            node_list = ((node['uuid'], node['driver'],
+                          node['driver_internal_info']) for node in nodes)
 
-        node_list = manager.iter_nodes(fields=fields, filters=filters)
         for (node_uuid, driver, driver_internal_info) in node_list:
             try:
                 lock_purpose = 'checking async raid configuration jobs'
@@ -15,9 +15,8 @@
 DRAC vendor-passthru interface
 """
 
-from ironic_lib import metrics_utils
-
 from ironic.common.i18n import _
+from ironic.common import metrics_utils
 from ironic.conductor import task_manager
 from ironic.drivers import base
 from ironic.drivers.modules.drac import bios as drac_bios
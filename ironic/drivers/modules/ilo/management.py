@@ -15,7 +15,6 @@
 iLO Management Interface
 """
 
-from ironic_lib import metrics_utils
 from oslo_log import log as logging
 from oslo_utils import excutils
 from oslo_utils import importutils
@@ -24,6 +23,7 @@ import six
 from ironic.common import boot_devices
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics_utils
 from ironic.conductor import task_manager
 from ironic.conf import CONF
 from ironic.drivers import base
@@ -89,16 +89,7 @@ class ImageCache(object):
 
         # TODO(ghe): have hard links and counts the same behaviour in all fs
 
-        # NOTE(vdrok): File name is converted to UUID if it's not UUID already,
-        # so that two images with same file names do not collide
-        if service_utils.is_glance_image(href):
-            master_file_name = service_utils.parse_image_ref(href)[0]
-        else:
-            # NOTE(vdrok): Doing conversion of href in case it's unicode
-            # string, UUID cannot be generated for unicode strings on python 2.
-            href_encoded = href.encode('utf-8') if six.PY2 else href
-            master_file_name = str(uuid.uuid5(uuid.NAMESPACE_URL,
-                                              href_encoded))
+        master_file_name = get_master_file_name(href)
         master_path = os.path.join(self.master_dir, master_file_name)
 
         if CONF.parallel_image_downloads:
@@ -271,6 +262,23 @@ class ImageCache(object):
         return max(amount, 0) if amount is not None else 0
 
 
+def get_master_file_name(href):
+    """Get the name of the master file of an image in the cache.
+
+    :param href: image UUID or href
+    :returns: the UUID of the image for glance images, a UUID derived from
+        the href otherwise.
+    """
+    # NOTE(vdrok): File name is converted to UUID if it's not UUID already,
+    # so that two images with same file names do not collide
+    if service_utils.is_glance_image(href):
+        return service_utils.parse_image_id(href)
+    # NOTE(vdrok): Doing conversion of href in case it's unicode
+    # string, UUID cannot be generated for unicode strings on python 2.
+    href_encoded = href.encode('utf-8') if six.PY2 else href
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, href_encoded))
+
+
 def _find_candidates_for_deletion(master_dir):
     """Find files eligible for deletion i.e. with link count ==1.
 
@@ -30,23 +30,28 @@ DRIVER.
 """
 
 import contextlib
+import hashlib
+import itertools
+import json
 import os
 import re
 import subprocess
 import tempfile
 import time
 
-from ironic_lib import metrics_utils
 from ironic_lib import utils as ironic_utils
 from oslo_concurrency import processutils
 from oslo_log import log as logging
 from oslo_utils import excutils
+from oslo_utils import fileutils
 from oslo_utils import strutils
+from oslo_utils import uuidutils
 import six
 
 from ironic.common import boot_devices
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics_utils
 from ironic.common import states
 from ironic.common import utils
 from ironic.conductor import task_manager
@@ -360,12 +365,16 @@ def _parse_driver_info(node):
     }
 
 
-def _exec_ipmitool(driver_info, command, check_exit_code=None):
+@METRICS.timer('_exec_ipmitool')
+def _exec_ipmitool(driver_info, command, check_exit_code=None,
+                   sdr_cache=None):
     """Execute the ipmitool command.
 
     :param driver_info: the ipmitool parameters for accessing a node.
     :param command: the ipmitool command to be executed.
     :param check_exit_code: Single bool, int, or list of allowed exit codes.
+    :param sdr_cache: path to a dump of the SDR repository of the BMC, to
+        use instead of downloading the repository.
     :returns: (stdout, stderr) from executing the command.
     :raises: PasswordFileFailedToCreate from creating or writing to the
              temporary file.
@@ -396,6 +405,10 @@ def _exec_ipmitool(driver_info, command, check_exit_code=None):
             args.append(option)
             args.append(driver_info[name])
 
+    if sdr_cache:
+        args.append('-S')
+        args.append(sdr_cache)
+
     # TODO(sambetts) Remove usage of ipmi.retry_timeout in Queens
     timeout = CONF.ipmi.retry_timeout or CONF.ipmi.command_retry_timeout
 
@@ -571,26 +584,30 @@ def _power_status(driver_info):
         return states.ERROR
 
 
-def _process_sensor(sensor_data):
-    sensor_data_fields = sensor_data.split('\n')
-    sensor_data_dict = {}
-    for field in sensor_data_fields:
-        if not field:
-            continue
-        kv_value = field.split(':')
-        if len(kv_value) != 2:
-            continue
-        sensor_data_dict[kv_value[0].strip()] = kv_value[1].strip()
+_SENSOR_TYPE_KEYS = ('Sensor Type (Analog)', 'Sensor Type (Discrete)',
+                     'Sensor Type (Threshold)')
 
-    return sensor_data_dict
+# Sensor types accepted by "ipmitool sdr type"
+_IPMITOOL_SENSOR_TYPES = (
+    'Temperature', 'Voltage', 'Current', 'Fan', 'Physical Security',
+    'Platform Security', 'Processor', 'Power Supply', 'Power Unit',
+    'Cooling Device', 'Other', 'Memory', 'Drive Slot / Bay',
+    'POST Memory Resize', 'System Firmwares', 'Event Logging Disabled',
+    'Watchdog1', 'System Event', 'Critical Interrupt', 'Button',
+    'Module / Board', 'Microcontroller', 'Add-in Card', 'Chassis',
+    'Chip Set', 'Other FRU', 'Cable / Interconnect', 'Terminator',
+    'System Boot Initiated', 'Boot Error', 'OS Boot', 'OS Critical Stop',
+    'Slot / Connector', 'System ACPI Power State', 'Watchdog2',
+    'Platform Alert', 'Entity Presence', 'Monitor ASIC', 'LAN',
+    'Management Subsys Health', 'Battery', 'Session Audit',
+    'Version Change', 'FRU State')
 
 
 def _get_sensor_type(node, sensor_data_dict):
     # Have only three sensor type name IDs: 'Sensor Type (Analog)'
     # 'Sensor Type (Discrete)' and 'Sensor Type (Threshold)'
 
-    for key in ('Sensor Type (Analog)', 'Sensor Type (Discrete)',
-                'Sensor Type (Threshold)'):
+    for key in _SENSOR_TYPE_KEYS:
         try:
             return sensor_data_dict[key].split(' ', 1)[0]
         except KeyError:
@@ -603,7 +620,53 @@ def _get_sensor_type(node, sensor_data_dict):
                {'sensors_data': sensor_data_dict}))
 
 
-def _parse_ipmi_sensors_data(node, sensors_data):
+def _iter_ipmi_sensors(node, sensors_data, sensor_types=None):
+    """Parse the IPMI sensors data one line at a time.
+
+    The rest of a sensor record is skipped as soon as its type is known to
+    be filtered out.
+
+    :param sensors_data: the sensor data returned by ipmitool command.
+    :param sensor_types: set of lower case sensor types to keep, None to
+        keep all of them.
+    :returns: a generator of tuples (sensor type, sensor data dict), for
+        the sensors which have a current 'Sensor Reading', the sensor data
+        dict being None for the sensors filtered out.
+    :raises: FailedToParseSensorData when a sensor has no type.
+    """
+    sensor_data_dict = {}
+    # type of the current sensor when it is filtered out
+    skip = None
+    # NOTE: an empty line ends a record, so is added after the last one
+    for line in itertools.chain(six.StringIO(sensors_data), ('',)):
+        line = line.rstrip('\n')
+        if not line:
+            if skip:
+                yield skip, None
+            elif sensor_data_dict:
+                sensor_type = _get_sensor_type(node, sensor_data_dict)
+                # ignore the sensors which has no current 'Sensor Reading'
+                # data
+                if 'Sensor Reading' in sensor_data_dict:
+                    yield sensor_type, sensor_data_dict
+            sensor_data_dict = {}
+            skip = None
+            continue
+        if skip:
+            continue
+
+        kv_value = line.split(':')
+        if len(kv_value) != 2:
+            continue
+        key = kv_value[0].strip()
+        sensor_data_dict[key] = kv_value[1].strip()
+        if sensor_types is not None and key in _SENSOR_TYPE_KEYS:
+            sensor_type = _get_sensor_type(node, sensor_data_dict)
+            if sensor_type.lower() not in sensor_types:
+                skip = sensor_type
+
+
+def _parse_ipmi_sensors_data(node, sensors_data, sensor_types=None):
     """Parse the IPMI sensors data and format to the dict grouping by type.
 
     We run 'ipmitool' command with 'sdr -v' options, which can return sensor
@@ -612,6 +675,8 @@ def _parse_ipmi_sensors_data(node, sensors_data):
     out via notification bus and consumed by Ceilometer Collector.
 
     :param sensors_data: the sensor data returned by ipmitool command.
+    :param sensor_types: set of lower case sensor types to keep, None to
+        keep all of them.
     :returns: the sensor data with JSON format, grouped by sensor type.
     :raises: FailedToParseSensorData when error encountered during parsing.
 
@@ -620,22 +685,17 @@ def _parse_ipmi_sensors_data(node, sensors_data):
     if not sensors_data:
         return sensors_data_dict
 
-    sensors_data_array = sensors_data.split('\n\n')
-    for sensor_data in sensors_data_array:
-        sensor_data_dict = _process_sensor(sensor_data)
-        if not sensor_data_dict:
-            continue
-
-        sensor_type = _get_sensor_type(node, sensor_data_dict)
-
-        # ignore the sensors which has no current 'Sensor Reading' data
-        if 'Sensor Reading' in sensor_data_dict:
+    found = False
+    for sensor_type, sensor_data_dict in _iter_ipmi_sensors(
+            node, sensors_data, sensor_types):
+        found = True
+        if sensor_data_dict is not None:
             sensors_data_dict.setdefault(
                 sensor_type,
                 {})[sensor_data_dict['Sensor ID']] = sensor_data_dict
 
     # get nothing, no valid sensor data
-    if not sensors_data_dict:
+    if not found:
         raise exception.FailedToParseSensorData(
             node=node.uuid,
             error=(_("parse ipmi sensor data failed, get nothing with input"
@@ -644,6 +704,46 @@ def _parse_ipmi_sensors_data(node, sensors_data):
     return sensors_data_dict
 
 
+def _get_sensor_types():
+    """Get the sensor types to keep, None to keep all of them.
+
+    Sensor types are taken from [conductor]send_sensor_data_types, they are
+    compared with the first word of the type of the sensors. All of them
+    are kept if the option contains 'ALL', or a type which cannot match
+    a first word.
+    """
+    sensor_types = set(
+        x.lower() for x in CONF.conductor.send_sensor_data_types)
+    if 'all' in sensor_types or any(' ' in x for x in sensor_types):
+        return None
+    return sensor_types
+
+
+def _get_sdr_command(sensor_types):
+    """Get the ipmitool command reading the sensors of the given types.
+
+    ipmitool only reads the sensors of a type given with its full name, so
+    the type is only passed to ipmitool when a single type is kept and it
+    is the full name of the only ipmitool type starting with this word,
+    e.g. "Fan" but not "Power" (Power Supply and Power Unit). Otherwise
+    all the sensors are read at once and filtered when parsed.
+
+    :param sensor_types: set of lower case sensor types to keep, None to
+        keep all of them.
+    :returns: the ipmitool command.
+    """
+    # with '-v' option, we can get the entire sensor data including the
+    # extended sensor informations.
+    if sensor_types is None or len(sensor_types) != 1:
+        return 'sdr -v'
+    sensor_type = next(iter(sensor_types))
+    matches = [name for name in _IPMITOOL_SENSOR_TYPES
+               if name.split(' ', 1)[0].lower() == sensor_type]
+    if len(matches) != 1 or matches[0].lower() != sensor_type:
+        return 'sdr -v'
+    return 'sdr -v type %s' % matches[0]
+
+
 @METRICS.timer('send_raw')
 @task_manager.require_exclusive_lock
 def send_raw(task, raw_bytes):
@@ -706,6 +806,113 @@ def dump_sdr(task, file_path):
         raise exception.IPMIFailure(cmd=cmd)
 
 
+# Fields of the output of 'ipmitool sdr info' which change when the SDR
+# repository of the BMC is modified
+_SDR_STAMP_FIELDS = ('Record Count', 'Most recent Addition',
+                     'Most recent Erase')
+
+
+def _sdr_cache_path(driver_info):
+    """Get the path of the SDR cache of a BMC.
+
+    Nodes behind the same BMC share the cache, unless they are reached
+    through bridging.
+
+    :param driver_info: the ipmitool parameters for accessing a node.
+    :returns: the path of the SDR dump, or None if caching is disabled.
+    """
+    if not CONF.ipmi.sdr_cache_dir:
+        return None
+    key = [driver_info['address'], driver_info['dest_port']]
+    key.extend(driver_info[name] for name, _option in BRIDGING_OPTIONS)
+    name = hashlib.sha256(
+        '|'.join(str(x) for x in key).encode('utf-8')).hexdigest()
+    return os.path.join(CONF.ipmi.sdr_cache_dir, '%s.sdr' % name)
+
+
+def _get_sdr_repository_stamp(driver_info):
+    """Get a value changing when the SDR repository of a BMC changes.
+
+    :param driver_info: the ipmitool parameters for accessing a node.
+    :returns: a string, or None if the BMC does not report it.
+    :raises: PasswordFileFailedToCreate from creating or writing to the
+             temporary file.
+    :raises: processutils.ProcessExecutionError from executing the command.
+    """
+    out, err = _exec_ipmitool(driver_info, 'sdr info')
+    stamp = []
+    for line in out.splitlines():
+        key, sep, value = line.partition(':')
+        if sep and key.strip() in _SDR_STAMP_FIELDS:
+            stamp.append(value.strip())
+    return '|'.join(stamp) or None
+
+
+def _invalidate_sdr_cache(path):
+    for file_path in (path, path + '.json'):
+        ironic_utils.unlink_without_raise(file_path)
+
+
+def _get_sdr_cache(task, driver_info):
+    """Get an up to date SDR cache for the BMC of a node.
+
+    The SDR repository timestamp is checked at most once per
+    [ipmi]sdr_cache_check_interval; the repository is dumped again when it
+    has changed.
+
+    :param task: a TaskManager instance.
+    :param driver_info: the ipmitool parameters for accessing the node.
+    :returns: the path of the SDR dump, or None if caching is disabled or
+        the cache could not be updated.
+    """
+    path = _sdr_cache_path(driver_info)
+    if path is None:
+        return None
+
+    meta_path = path + '.json'
+    try:
+        with open(meta_path) as meta_file:
+            meta = json.load(meta_file)
+    except (IOError, OSError, ValueError):
+        meta = None
+    if meta is not None and not os.path.exists(path):
+        meta = None
+
+    now = time.time()
+    if (meta is not None and
+            now - meta['checked_at'] < CONF.ipmi.sdr_cache_check_interval):
+        return path
+
+    try:
+        stamp = _get_sdr_repository_stamp(driver_info)
+        if meta is None or stamp is None or stamp != meta['stamp']:
+            LOG.debug('Updating the SDR cache %(path)s for node %(node)s',
+                      {'path': path, 'node': task.node.uuid})
+            fileutils.ensure_tree(CONF.ipmi.sdr_cache_dir)
+            # NOTE: dumped next to the cache and renamed, so that the
+            # cache is replaced atomically
+            tmp_path = '%s.%s.tmp' % (path, uuidutils.generate_uuid())
+            try:
+                dump_sdr(task, tmp_path)
+                os.rename(tmp_path, path)
+            finally:
+                ironic_utils.unlink_without_raise(tmp_path)
+
+        meta = {'stamp': stamp, 'checked_at': now}
+        with tempfile.NamedTemporaryFile(
+                'w', dir=CONF.ipmi.sdr_cache_dir, delete=False) as meta_file:
+            json.dump(meta, meta_file)
+        os.rename(meta_file.name, meta_path)
+    except Exception as e:
+        LOG.warning('Could not update the SDR cache %(path)s for node '
+                    '%(node)s, the SDR repository will be downloaded. '
+                    'Error: %(error)s',
+                    {'path': path, 'node': task.node.uuid, 'error': e})
+        _invalidate_sdr_cache(path)
+        return None
+    return path
+
+
 def _check_temp_dir():
     """Check for Valid temp directory."""
     global TMP_DIR_CHECKED
@@ -1032,17 +1239,20 @@ class IPMIManagement(base.ManagementInterface):
 
         """
         driver_info = _parse_driver_info(task.node)
-        # with '-v' option, we can get the entire sensor data including the
-        # extended sensor informations
-        cmd = "sdr -v"
+        sensor_types = _get_sensor_types()
+        cmd = _get_sdr_command(sensor_types)
+
+        sdr_cache = _get_sdr_cache(task, driver_info)
         try:
-            out, err = _exec_ipmitool(driver_info, cmd)
+            out, err = _exec_ipmitool(driver_info, cmd, sdr_cache=sdr_cache)
         except (exception.PasswordFileFailedToCreate,
                 processutils.ProcessExecutionError) as e:
+            if sdr_cache:
+                # The cache may be broken, it is dumped again next time
+                _invalidate_sdr_cache(sdr_cache)
             raise exception.FailedToGetSensorData(node=task.node.uuid,
                                                   error=e)
-
-        return _parse_ipmi_sensors_data(task.node, out)
+        return _parse_ipmi_sensors_data(task.node, out, sensor_types)
 
     @METRICS.timer('IPMIManagement.inject_nmi')
     @task_manager.require_exclusive_lock
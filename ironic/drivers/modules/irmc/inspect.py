@@ -14,12 +14,12 @@
 """
 iRMC Inspect Interface
 """
-from ironic_lib import metrics_utils
 from oslo_log import log as logging
 from oslo_utils import importutils
 
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics_utils
 from ironic.common import states
 from ironic.drivers import base
 from ironic.drivers.modules.irmc import common as irmc_common
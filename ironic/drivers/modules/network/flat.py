@@ -115,11 +115,11 @@ class FlatNetwork(common.VIFPortIDMixin, neutron.NeutronNetworkInterfaceMixin,
         :returns: a dictionary in the form {port.uuid: neutron_port['id']}
         :raises: NetworkError, InvalidParameterValue
         """
+        network_uuid = self.get_cleaning_network_uuid()
         # If we have left over ports from a previous cleaning, remove them
-        neutron.rollback_ports(task, self.get_cleaning_network_uuid())
+        neutron.rollback_ports(task, network_uuid)
         LOG.info('Adding cleaning network to node %s', task.node.uuid)
-        vifs = neutron.add_ports_to_network(
-            task, self.get_cleaning_network_uuid())
+        vifs = neutron.add_ports_to_network(task, network_uuid)
         for port in task.ports:
             if port.uuid in vifs:
                 internal_info = port.internal_info
@@ -66,13 +66,14 @@ class NeutronNetwork(common.VIFPortIDMixin,
         :param task: A TaskManager instance.
         :raises: NetworkError
         """
+        network_uuid = self.get_provisioning_network_uuid()
         # If we have left over ports from a previous provision attempt, remove
         # them
-        neutron.rollback_ports(task, self.get_provisioning_network_uuid())
+        neutron.rollback_ports(task, network_uuid)
         LOG.info('Adding provisioning network to node %s',
                  task.node.uuid)
         vifs = neutron.add_ports_to_network(
-            task, self.get_provisioning_network_uuid(),
+            task, network_uuid,
             security_groups=CONF.neutron.provisioning_network_security_groups)
         for port in task.ports:
             if port.uuid in vifs:
@@ -105,12 +106,12 @@ class NeutronNetwork(common.VIFPortIDMixin,
         :raises: NetworkError
         :returns: a dictionary in the form {port.uuid: neutron_port['id']}
         """
+        network_uuid = self.get_cleaning_network_uuid()
         # If we have left over ports from a previous cleaning, remove them
-        neutron.rollback_ports(task, self.get_cleaning_network_uuid())
+        neutron.rollback_ports(task, network_uuid)
         LOG.info('Adding cleaning network to node %s', task.node.uuid)
         security_groups = CONF.neutron.cleaning_network_security_groups
-        vifs = neutron.add_ports_to_network(task,
-                                            self.get_cleaning_network_uuid(),
+        vifs = neutron.add_ports_to_network(task, network_uuid,
                                             security_groups=security_groups)
         for port in task.ports:
             if port.uuid in vifs:
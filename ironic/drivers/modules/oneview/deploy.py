@@ -17,13 +17,13 @@
 import abc
 
 from futurist import periodics
-from ironic_lib import metrics_utils
 from oslo_log import log as logging
 import retrying
 import six
 
 from ironic.common import exception
 from ironic.common.i18n import _
+from ironic.common import metrics_utils
 from ironic.common import states
 from ironic.conductor import utils as manager_utils
 from ironic.conf import CONF
@@ -15,10 +15,10 @@
 #    under the License.
 
 from futurist import periodics
-from ironic_lib import metrics_utils
 from oslo_utils import importutils
 
 from ironic.common import exception
+from ironic.common import metrics_utils
 from ironic.common import states
 from ironic.conductor import task_manager
 from ironic.drivers.modules import inspector
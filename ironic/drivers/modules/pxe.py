@@ -15,10 +15,12 @@
 PXE Boot Interface
 """
 
+import errno
+import json
 import os
 
-from ironic_lib import metrics_utils
 from ironic_lib import utils as ironic_utils
+from oslo_concurrency import lockutils
 from oslo_log import log as logging
 from oslo_utils import fileutils
 
@@ -29,6 +31,7 @@ from ironic.common.glance_service import service_utils
 from ironic.common.i18n import _
 from ironic.common import image_service as service
 from ironic.common import images
+from ironic.common import metrics_utils
 from ironic.common import pxe_utils
 from ironic.common import states
 from ironic.common import utils
@@ -51,6 +54,13 @@ REQUIRED_PROPERTIES = {
 }
 COMMON_PROPERTIES = REQUIRED_PROPERTIES
 
+# Directory of the TFTP or HTTP root holding the kernels and ramdisks shared
+# by the nodes, see the [pxe]shared_boot_images option
+SHARED_IMAGES_DIR_NAME = 'images'
+
+# File of the shared images directory recording the nodes using every image
+_SHARED_IMAGES_INDEX_NAME = '.index.json'
+
 
 def _parse_driver_info(node):
     """Gets the driver specific Node deployment info.
@@ -111,6 +121,8 @@ def _get_instance_image_info(node, ctx):
             os.path.join(root_dir, node.uuid, label)
         )
 
+    if _use_shared_images():
+        image_info = _get_shared_image_info(image_info)
     return image_info
 
 
@@ -128,7 +140,40 @@ def _get_deploy_image_info(node):
         missing in node's driver_info.
     """
     d_info = _parse_driver_info(node)
-    return pxe_utils.get_deploy_kr_info(node.uuid, d_info)
+    image_info = pxe_utils.get_deploy_kr_info(node.uuid, d_info)
+    if _use_shared_images():
+        image_info = _get_shared_image_info(image_info)
+    return image_info
+
+
+def _use_shared_images():
+    """Whether the nodes share their kernels and ramdisks."""
+    return bool(CONF.pxe.shared_boot_images and CONF.pxe.tftp_master_path)
+
+
+def _get_shared_images_dir():
+    return os.path.join(pxe_utils.get_root_dir(), SHARED_IMAGES_DIR_NAME)
+
+
+def _get_shared_image_info(image_info):
+    """Replace the paths of images by the paths of the shared images.
+
+    Shared images are named after their master file in the image cache,
+    so that all the nodes booting an image use the same file.
+
+    :param image_info: a dictionary whose keys are the names of the images
+        and values are tuples of the image href and its path in the
+        directory of the node.
+    :returns: a dictionary whose keys are the names of the images and
+        values are tuples of the image href and its shared path.
+    """
+    shared_dir = _get_shared_images_dir()
+    shared_info = {}
+    for label, (href, path) in image_info.items():
+        shared_path = os.path.join(shared_dir,
+                                   image_cache.get_master_file_name(href))
+        shared_info[label] = (href, shared_path)
+    return shared_info
 
 
 def _build_deploy_pxe_options(task, pxe_info):
@@ -144,8 +189,8 @@ def _build_deploy_pxe_options(task, pxe_info):
                     pxe_opts[option] = images.get_temp_url_for_glance_image(
                         task.context, image_href)
             else:
-                pxe_opts[option] = '/'.join([CONF.deploy.http_url, node.uuid,
-                                            label])
+                pxe_opts[option] = _get_http_url(node, label,
+                                                 pxe_info[label][1])
         else:
             pxe_opts[option] = pxe_utils.get_path_relative_to_tftp_root(
                 pxe_info[label][1])
@@ -164,8 +209,8 @@ def _build_instance_pxe_options(task, pxe_info):
                 # ramdisk of user image when boot_option is not local,
                 # as this breaks instance reboot later when temp urls
                 # have timed out.
-                pxe_opts[option] = '/'.join(
-                    [CONF.deploy.http_url, node.uuid, label])
+                pxe_opts[option] = _get_http_url(node, label,
+                                                 pxe_info[label][1])
             else:
                 # It is possible that we don't have kernel/ramdisk or even
                 # image_source to determine if it's a whole disk image or not.
@@ -182,6 +227,14 @@ def _build_instance_pxe_options(task, pxe_info):
     return pxe_opts
 
 
+def _get_http_url(node, label, path):
+    """Get the URL of an image served by the HTTP server of iPXE."""
+    if _use_shared_images():
+        return '/'.join([CONF.deploy.http_url, SHARED_IMAGES_DIR_NAME,
+                         os.path.basename(path)])
+    return '/'.join([CONF.deploy.http_url, node.uuid, label])
+
+
 def _build_extra_pxe_options():
     # Enable debug in IPA according to CONF.debug if it was not
     # specified yet
@@ -343,10 +396,83 @@ class TFTPImageCache(image_cache.ImageCache):
             cache_ttl=CONF.pxe.image_cache_ttl * 60)
 
 
+def _update_shared_images_index(node_uuid, images_info, release=False):
+    """Record which shared images a node uses.
+
+    The index of the shared images directory maps the name of every shared
+    image to the images of the nodes using it, e.g. "<node uuid>/kernel".
+    Once the last node using a shared image releases it, the shared image
+    is removed, which lets the image cache evict its master file. The
+    index is updated under an external lock, as the conductors sharing the
+    TFTP or HTTP root may run in several processes.
+
+    :param node_uuid: the UUID of the node.
+    :param images_info: a dictionary whose keys are the names of the images
+        and values are tuples of the image href and its shared path.
+    :param release: whether the node stops using the images, instead of
+        starting to use them.
+    :returns: the list of the paths of the shared images removed.
+    """
+    # NOTE: the lock file lives in the master images directory, which is
+    # local to the conductors sharing the images and always set when they
+    # are shared
+    with lockutils.lock('shared-boot-images', external=True,
+                        lock_path=CONF.pxe.tftp_master_path):
+        index_path = os.path.join(_get_shared_images_dir(),
+                                  _SHARED_IMAGES_INDEX_NAME)
+        try:
+            with open(index_path) as index_file:
+                index = json.load(index_file)
+        except IOError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            index = {}
+        except ValueError as e:
+            LOG.warning('Ignoring the invalid index %(path)s of the shared '
+                        'boot images: %(err)s',
+                        {'path': index_path, 'err': e})
+            index = {}
+
+        changed = False
+        removed = []
+        for label, (href, path) in images_info.items():
+            name = os.path.basename(path)
+            user = '%s/%s' % (node_uuid, label)
+            users = set(index.get(name, ()))
+            # NOTE: images unknown to the index are never removed, as other
+            # nodes may use them
+            if release == (user not in users):
+                continue
+            changed = True
+            if not release:
+                users.add(user)
+            else:
+                users.remove(user)
+            if users:
+                index[name] = sorted(users)
+            else:
+                del index[name]
+                LOG.debug('Removing shared boot image %(path)s, last used '
+                          'by node %(node)s',
+                          {'path': path, 'node': node_uuid})
+                ironic_utils.unlink_without_raise(path)
+                removed.append(path)
+
+        if changed:
+            utils.replace_file(index_path, json.dumps(index, sort_keys=True))
+        return removed
+
+
 def _cache_ramdisk_kernel(ctx, node, pxe_info):
     """Fetch the necessary kernels and ramdisks for the instance."""
-    fileutils.ensure_tree(
-        os.path.join(pxe_utils.get_root_dir(), node.uuid))
+    if _use_shared_images():
+        fileutils.ensure_tree(_get_shared_images_dir())
+        # NOTE: record the node first, so that the images are not removed
+        # by other nodes once fetched
+        _update_shared_images_index(node.uuid, pxe_info)
+    else:
+        fileutils.ensure_tree(
+            os.path.join(pxe_utils.get_root_dir(), node.uuid))
     LOG.debug("Fetching necessary kernel and ramdisk for node %s",
               node.uuid)
     deploy_utils.fetch_images(ctx, TFTPImageCache(), list(pxe_info.values()),
@@ -364,9 +490,13 @@ def _clean_up_pxe_env(task, images_info):
         to be cleaned up (kernel, ramdisk, etc) and values are a tuple of
         identifier and absolute path.
     """
-    for label in images_info:
-        path = images_info[label][1]
-        ironic_utils.unlink_without_raise(path)
+    if _use_shared_images():
+        _update_shared_images_index(task.node.uuid, images_info,
+                                    release=True)
+    else:
+        for label in images_info:
+            path = images_info[label][1]
+            ironic_utils.unlink_without_raise(path)
 
     pxe_utils.clean_up_pxe_config(task)
     TFTPImageCache().clean_up()
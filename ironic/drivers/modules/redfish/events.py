@@ -0,0 +1,320 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Redfish event subscriptions tracking the power state of nodes.
+
+A conductor subscribes to the events of the Systems of its Redfish nodes
+through the EventService of their BMCs, with a destination URL pointing to
+an HTTP server running in the conductor. Every subscription has a random
+token in its destination URL, events for a node are only accepted with the
+token of its subscription.
+
+Events are not trusted to carry the new power state: an event makes the
+conductor sync the power state of the node right away, see
+:mod:`ironic.conductor.power_events`. A test event is submitted after
+subscribing, nodes are only polled by the periodic power state sync once
+per [redfish]event_poll_interval after an event of their subscription
+was received.
+"""
+
+import hmac
+import time
+
+import eventlet
+from eventlet import wsgi
+from oslo_log import log
+from oslo_utils import uuidutils
+import requests
+from six.moves.urllib import parse as urlparse
+
+from ironic.common import exception
+from ironic.conductor import power_events
+from ironic.conductor import task_manager
+from ironic.conf import CONF
+from ironic.drivers.modules.redfish import utils as redfish_utils
+
+LOG = log.getLogger(__name__)
+
+SUBSCRIPTIONS_PATH = '/redfish/v1/EventService/Subscriptions'
+SUBMIT_TEST_EVENT_PATH = ('/redfish/v1/EventService/Actions/'
+                          'EventService.SubmitTestEvent')
+
+EVENT_TYPES = ['StatusChange', 'ResourceUpdated', 'Alert']
+"""Types of the events subscribed to."""
+
+REQUEST_TIMEOUT = 30
+"""Timeout of the requests to the BMCs, in seconds."""
+
+_SUBSCRIBER = None
+
+
+def _is_loopback(host):
+    return host == 'localhost' or host == '::1' or host.startswith('127.')
+
+
+class _Subscription(object):
+    """An event subscription of a node."""
+
+    def __init__(self, url, token, driver_info, checked_at):
+        self.url = url
+        self.token = token
+        self.driver_info = driver_info
+        self.checked_at = checked_at
+        # Whether an event of this subscription was received
+        self.received = False
+
+
+def _request(method, driver_info, url, **kwargs):
+    """Send a request to the BMC of a node.
+
+    :raises: requests.RequestException on errors, including HTTP errors.
+    """
+    auth = None
+    if driver_info['username']:
+        auth = (driver_info['username'], driver_info['password'])
+    response = requests.request(method, url, auth=auth,
+                                verify=driver_info['verify_ca'],
+                                timeout=REQUEST_TIMEOUT, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+class EventSubscriber(object):
+    """Manages the event subscriptions of the Redfish nodes of a conductor.
+
+    Also runs the HTTP server receiving the events.
+    """
+
+    def __init__(self):
+        # Node UUID -> _Subscription
+        self._subscriptions = {}
+        self._socket = None
+        self._thread = None
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def start(self):
+        """Start receiving events in a green thread."""
+        if self._thread is not None:
+            return
+        self._socket = eventlet.listen((CONF.redfish.event_listen_host,
+                                        CONF.redfish.event_listen_port))
+        self._thread = eventlet.spawn(wsgi.server, self._socket, self.app,
+                                      log_output=False)
+        LOG.info('Receiving Redfish events on %(host)s:%(port)s',
+                 {'host': CONF.redfish.event_listen_host,
+                  'port': CONF.redfish.event_listen_port})
+        if _is_loopback(CONF.redfish.event_listen_host):
+            LOG.warning('Receiving Redfish events on the loopback address '
+                        '%(host)s while [redfish]event_destination_url is '
+                        'set to %(url)s, only a BMC running on this host can '
+                        'send events. Set [redfish]event_listen_host to an '
+                        'address of the BMC network. The power state of '
+                        'nodes whose events are not received keeps being '
+                        'polled.',
+                        {'host': CONF.redfish.event_listen_host,
+                         'url': CONF.redfish.event_destination_url})
+
+    def stop(self):
+        """Stop receiving events."""
+        if self._thread is not None:
+            self._thread.kill()
+            self._thread = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def shutdown(self):
+        """Delete all event subscriptions and stop receiving events."""
+        for node_uuid in list(self._subscriptions):
+            self._unsubscribe(node_uuid)
+        self.stop()
+
+    def app(self, environ, start_response):
+        """WSGI application receiving the events.
+
+        Events are posted to ``/<node UUID>/<token>``.
+        """
+        if environ.get('REQUEST_METHOD') != 'POST':
+            start_response('405 Method Not Allowed',
+                           [('Content-Type', 'text/plain'),
+                            ('Allow', 'POST')])
+            return [b'']
+
+        node_uuid, _sep, token = (
+            environ.get('PATH_INFO', '').strip('/').partition('/'))
+        subscription = self._subscriptions.get(node_uuid)
+        if (subscription is None or
+                not hmac.compare_digest(str(subscription.token),
+                                        str(token))):
+            start_response('404 Not Found', [('Content-Type', 'text/plain')])
+            return [b'']
+
+        if not subscription.received:
+            # Events reach the conductor, the node no longer has to be
+            # polled as often
+            subscription.received = True
+            power_events.subscribe(node_uuid,
+                                   CONF.redfish.event_poll_interval)
+        power_events.power_event(node_uuid)
+        start_response('204 No Content', [])
+        return [b'']
+
+    def _destination(self, node_uuid, token):
+        return '%s/%s/%s' % (CONF.redfish.event_destination_url.rstrip('/'),
+                             node_uuid, token)
+
+    def _subscribe(self, node_uuid, driver_info):
+        token = uuidutils.generate_uuid(dashed=False)
+        body = {'Destination': self._destination(node_uuid, token),
+                'EventTypes': EVENT_TYPES,
+                'Context': node_uuid,
+                'Protocol': 'Redfish',
+                'OriginResources': [
+                    {'@odata.id': driver_info['system_id']}]}
+        response = _request('POST', driver_info,
+                            driver_info['address'] + SUBSCRIPTIONS_PATH,
+                            json=body)
+        location = response.headers.get('Location')
+        if not location:
+            location = response.json()['@odata.id']
+        url = urlparse.urljoin(driver_info['address'], location)
+        LOG.info('Subscribed to the Redfish events of node %(node)s at '
+                 '%(url)s', {'node': node_uuid, 'url': url})
+        return _Subscription(url, token, driver_info, time.time())
+
+    def _submit_test_event(self, node_uuid, subscription):
+        body = {'EventType': 'StatusChange',
+                'Message': 'Test event of the Bare Metal service',
+                'OriginOfCondition': subscription.driver_info['system_id']}
+        try:
+            _request('POST', subscription.driver_info,
+                     subscription.driver_info['address'] +
+                     SUBMIT_TEST_EVENT_PATH, json=body)
+        except requests.RequestException as e:
+            LOG.warning('Could not submit a Redfish test event for node '
+                        '%(node)s, its power state is polled until an event '
+                        'is received. Error: %(error)s',
+                        {'node': node_uuid, 'error': e})
+
+    def _check(self, node_uuid, subscription):
+        try:
+            _request('GET', subscription.driver_info, subscription.url)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                LOG.info('The Redfish event subscription of node %s has '
+                         'disappeared', node_uuid)
+                return False
+            raise
+        subscription.checked_at = time.time()
+        return True
+
+    def _unsubscribe(self, node_uuid):
+        subscription = self._subscriptions.pop(node_uuid, None)
+        power_events.unsubscribe(node_uuid)
+        if subscription is None:
+            return
+        try:
+            _request('DELETE', subscription.driver_info, subscription.url)
+        except requests.RequestException as e:
+            LOG.debug('Could not delete the Redfish event subscription of '
+                      'node %(node)s: %(error)s',
+                      {'node': node_uuid, 'error': e})
+
+    def _update(self, context, node_uuid):
+        subscription = self._subscriptions.get(node_uuid)
+        if (subscription is not None and time.time() - subscription.checked_at
+                < CONF.redfish.event_subscription_interval):
+            return
+
+        try:
+            if subscription is not None:
+                if self._check(node_uuid, subscription):
+                    if subscription.received:
+                        power_events.subscribe(
+                            node_uuid, CONF.redfish.event_poll_interval)
+                    else:
+                        self._submit_test_event(node_uuid, subscription)
+                    return
+                # Only subscribe again once the BMC confirmed the loss of
+                # the subscription, not to pile up subscriptions on it.
+                self._subscriptions.pop(node_uuid, None)
+                power_events.unsubscribe(node_uuid)
+                subscription = None
+
+            with task_manager.acquire(context, node_uuid, shared=True,
+                                      purpose='redfish event subscription'
+                                      ) as task:
+                driver_info = redfish_utils.parse_driver_info(task.node)
+            subscription = self._subscribe(node_uuid, driver_info)
+            self._subscriptions[node_uuid] = subscription
+            # The node is only polled less often once an event is received
+            self._submit_test_event(node_uuid, subscription)
+        except (exception.NodeNotFound, exception.NodeLocked) as e:
+            LOG.debug('Not updating the Redfish event subscription of node '
+                      '%(node)s: %(error)s', {'node': node_uuid, 'error': e})
+        except Exception as e:
+            if subscription is not None:
+                # Keep the subscription, it is checked again on the next
+                # pass.
+                LOG.warning('Could not check the Redfish event subscription '
+                            'of node %(node)s, its power state is polled. '
+                            'Error: %(error)s',
+                            {'node': node_uuid, 'error': e})
+            else:
+                LOG.warning('Could not subscribe to the Redfish events of '
+                            'node %(node)s, its power state is polled. '
+                            'Error: %(error)s',
+                            {'node': node_uuid, 'error': e})
+            power_events.unsubscribe(node_uuid)
+
+    def sync(self, manager, context):
+        """Subscribe to the events of the Redfish nodes of a conductor.
+
+        Subscriptions of nodes no longer mapped to the conductor, in
+        maintenance or using another power interface are deleted.
+
+        :param manager: the conductor manager.
+        :param context: request context.
+        """
+        self.start()
+        node_uuids = set()
+        for (node_uuid, driver, power_interface) in manager.iter_nodes(
+                fields=['power_interface'], filters={'maintenance': False}):
+            if power_interface != 'redfish':
+                continue
+            node_uuids.add(node_uuid)
+            self._update(context, node_uuid)
+            # Yield on every iteration
+            eventlet.sleep(0)
+
+        for node_uuid in set(self._subscriptions) - node_uuids:
+            self._unsubscribe(node_uuid)
+
+
+def get_subscriber():
+    """Get the event subscriber of this process."""
+    global _SUBSCRIBER
+    if _SUBSCRIBER is None:
+        _SUBSCRIBER = EventSubscriber()
+        power_events.add_stop_callback(shutdown)
+    return _SUBSCRIBER
+
+
+def shutdown():
+    """Delete the event subscriptions of this process and stop the server."""
+    global _SUBSCRIBER
+    subscriber = _SUBSCRIBER
+    _SUBSCRIBER = None
+    if subscriber is not None:
+        subscriber.shutdown()
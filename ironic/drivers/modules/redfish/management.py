@@ -116,6 +116,8 @@ class RedfishManagement(base.ManagementInterface):
                          {'node': task.node.uuid, 'error': e})
             LOG.error(error_msg)
             raise exception.RedfishError(error=error_msg)
+        finally:
+            redfish_utils.invalidate_system(task.node)
 
     def get_boot_device(self, task):
         """Get the current boot device for a node.
@@ -171,3 +173,5 @@ class RedfishManagement(base.ManagementInterface):
                                                   'error': e})
             LOG.error(error_msg)
             raise exception.RedfishError(error=error_msg)
+        finally:
+            redfish_utils.invalidate_system(task.node)
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from futurist import periodics
 from oslo_log import log
 from oslo_utils import importutils
 
@@ -21,7 +22,9 @@ from ironic.common.i18n import _
 from ironic.common import states
 from ironic.conductor import task_manager
 from ironic.conductor import utils as cond_utils
+from ironic.conf import CONF
 from ironic.drivers import base
+from ironic.drivers.modules.redfish import events
 from ironic.drivers.modules.redfish import utils as redfish_utils
 
 LOG = log.getLogger(__name__)
@@ -114,6 +117,8 @@ class RedfishPower(base.PowerInterface):
                          {'node': task.node.uuid, 'error': e})
             LOG.error(error_msg)
             raise exception.RedfishError(error=error_msg)
+        finally:
+            redfish_utils.invalidate_system(task.node)
 
         target_state = TARGET_STATE_MAP.get(power_state, power_state)
         cond_utils.node_wait_for_power_state(task, target_state,
@@ -143,10 +148,19 @@ class RedfishPower(base.PowerInterface):
                                                   'error': e})
             LOG.error(error_msg)
             raise exception.RedfishError(error=error_msg)
+        finally:
+            redfish_utils.invalidate_system(task.node)
 
         cond_utils.node_wait_for_power_state(task, states.POWER_ON,
                                              timeout=timeout)
 
+    @periodics.periodic(
+        spacing=CONF.redfish.event_subscription_interval,
+        enabled=bool(CONF.redfish.event_destination_url))
+    def _sync_event_subscriptions(self, manager, context):
+        """Periodically subscribes to the events of the Redfish nodes."""
+        events.get_subscriber().sync(manager, context)
+
     def get_supported_power_states(self, task):
         """Get a list of the supported power states.
 
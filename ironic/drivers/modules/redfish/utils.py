@@ -13,7 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import os
+import threading
+import time
 
 from oslo_log import log
 from oslo_utils import excutils
@@ -148,6 +151,127 @@ def parse_driver_info(node):
             'node_uuid': node.uuid}
 
 
+class _Session(object):
+    """A cached Redfish connection, with the Systems fetched through it."""
+
+    def __init__(self, conn, password, now):
+        self.conn = conn
+        self.password = password
+        self.last_used = now
+        # System ID -> (System, time it was fetched at)
+        self.systems = {}
+
+
+class SessionCache(object):
+    """Cache of Redfish connections of a conductor.
+
+    Connections are keyed by address, user name and CA verification, and
+    shared by the nodes they give access to, so that the service root is
+    fetched and the user authenticated once per BMC. The cache is bounded
+    by [redfish]connection_cache_size, evicting the least recently used
+    connection, and connections unused for
+    [redfish]connection_cache_idle_timeout seconds are dropped.
+
+    Systems fetched through a connection are kept for
+    [redfish]system_cache_ttl seconds if it is set, and fetched again
+    afterwards.
+    """
+
+    def __init__(self):
+        self._sessions = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    @staticmethod
+    def _key(driver_info):
+        return (driver_info['address'], driver_info['username'],
+                str(driver_info['verify_ca']))
+
+    def _expire(self, now):
+        timeout = CONF.redfish.connection_cache_idle_timeout
+        # NOTE: sessions are kept from the least to the most recently used
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if now - session.last_used < timeout:
+                break
+            del self._sessions[key]
+
+    def _lookup(self, key, driver_info, now):
+        self._expire(now)
+        session = self._sessions.pop(key, None)
+        if session is None:
+            return None
+        if session.password != driver_info['password']:
+            return None
+        session.last_used = now
+        self._sessions[key] = session
+        return session
+
+    def _connect(self, key, driver_info, now):
+        conn = sushy.Sushy(driver_info['address'],
+                           username=driver_info['username'],
+                           password=driver_info['password'],
+                           verify=driver_info['verify_ca'])
+        session = _Session(conn, driver_info['password'], now)
+        if CONF.redfish.connection_cache_size:
+            with self._lock:
+                self._sessions.pop(key, None)
+                self._sessions[key] = session
+                while len(self._sessions) > CONF.redfish.connection_cache_size:
+                    self._sessions.popitem(last=False)
+        return session
+
+    def get_system(self, driver_info):
+        """Get a System through a cached connection.
+
+        :param driver_info: the parsed driver information of a node.
+        :returns: a sushy System.
+        :raises: sushy exceptions when connecting or fetching the System.
+        """
+        key = self._key(driver_info)
+        system_id = driver_info['system_id']
+        ttl = CONF.redfish.system_cache_ttl
+        now = time.time()
+        with self._lock:
+            session = self._lookup(key, driver_info, now)
+            if session is not None and ttl:
+                system, fetched_at = session.systems.get(system_id,
+                                                         (None, None))
+                if system is not None and now - fetched_at < ttl:
+                    return system
+
+        if session is None:
+            session = self._connect(key, driver_info, now)
+
+        system = session.conn.get_system(system_id)
+        if ttl:
+            with self._lock:
+                session.systems[system_id] = (system, now)
+        return system
+
+    def invalidate_system(self, driver_info):
+        """Drop the cached System of a node, e.g. after changing it."""
+        with self._lock:
+            session = self._sessions.get(self._key(driver_info))
+            if session is not None:
+                session.systems.pop(driver_info['system_id'], None)
+
+    def evict(self, driver_info):
+        """Drop the connection of a node, e.g. after a connection error."""
+        with self._lock:
+            self._sessions.pop(self._key(driver_info), None)
+
+    def clear(self):
+        """Drop all the cached connections."""
+        with self._lock:
+            self._sessions.clear()
+
+
+_SESSION_CACHE = SessionCache()
+
+
 def get_system(node):
     """Get a Redfish System that represents a node.
 
@@ -166,13 +290,7 @@ def get_system(node):
         wait_fixed=CONF.redfish.connection_retry_interval * 1000)
     def _get_system():
         try:
-            # TODO(lucasagomes): We should look into a mechanism to
-            # cache the connections (and maybe even system's instances)
-            # to avoid unnecessary requests to the Redfish controller
-            conn = sushy.Sushy(address, username=driver_info['username'],
-                               password=driver_info['password'],
-                               verify=driver_info['verify_ca'])
-            return conn.get_system(system_id)
+            return _SESSION_CACHE.get_system(driver_info)
         except sushy.exceptions.ResourceNotFoundError as e:
             LOG.error('The Redfish System "%(system)s" was not found for '
                       'node %(node)s. Error %(error)s',
@@ -182,6 +300,8 @@ def get_system(node):
         # ConnectionError such as AuthenticationError or SSLError and stop
         # retrying on them
         except sushy.exceptions.ConnectionError as e:
+            # The cached connection may be broken, connect again
+            _SESSION_CACHE.evict(driver_info)
             LOG.warning('For node %(node)s, got a connection error from '
                         'Redfish at address "%(address)s" when fetching '
                         'System "%(system)s". Error: %(error)s',
@@ -196,3 +316,16 @@ def get_system(node):
             LOG.error('Failed to connect to Redfish at %(address)s for '
                       'node %(node)s. Error: %(error)s',
                       {'address': address, 'node': node.uuid, 'error': e})
+
+
+def invalidate_system(node):
+    """Drop the cached System representing a node.
+
+    To be called after changing the System, so that the next call to
+    :func:`get_system` fetches it again.
+
+    :param node: an Ironic node object
+    :raises: InvalidParameterValue on malformed parameter(s)
+    :raises: MissingParameterValue on missing parameter(s)
+    """
+    _SESSION_CACHE.invalidate_system(parse_driver_info(node))
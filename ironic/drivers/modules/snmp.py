@@ -24,6 +24,7 @@ models.
 """
 
 import abc
+import threading
 import time
 
 from oslo_log import log as logging
@@ -43,10 +44,12 @@ pysnmp = importutils.try_import('pysnmp')
 if pysnmp:
     from pysnmp.entity.rfc3413.oneliner import cmdgen
     from pysnmp import error as snmp_error
+    from pysnmp.hlapi import asyncore as snmp_asyncore
     from pysnmp.proto import rfc1902
 else:
     cmdgen = None
     snmp_error = None
+    snmp_asyncore = None
     rfc1902 = None
 
 LOG = logging.getLogger(__name__)
@@ -57,6 +60,14 @@ SNMP_V2C = '2c'
 SNMP_V3 = '3'
 SNMP_PORT = 161
 
+# Maximum number of objects requested at once, keeping the messages below
+# the 484 octets every SNMP agent must accept.
+MAX_OIDS_PER_REQUEST = 10
+
+# (address, port, version, community, security) -> SNMPClient
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
 REQUIRED_PROPERTIES = {
     'snmp_driver': _("PDU manufacturer driver.  Required."),
     'snmp_address': _("PDU IPv4 address or hostname.  Required."),
@@ -85,6 +96,9 @@ class SNMPClient(object):
 
     Performs low level SNMP get and set operations. Encapsulates all
     interaction with PySNMP to simplify dynamic importing and unit testing.
+
+    The SNMP engine, authorization data and transport target of a client
+    are reused by all its requests, which are executed one at a time.
     """
 
     def __init__(self, address, port, version, community=None, security=None):
@@ -96,6 +110,10 @@ class SNMPClient(object):
         else:
             self.community = community
         self.cmd_gen = cmdgen.CommandGenerator()
+        self._auth = None
+        self._transport = None
+        # The dispatcher of the SNMP engine runs one request at a time
+        self._lock = threading.Lock()
 
     def _get_auth(self):
         """Return the authorization data for an SNMP request.
@@ -104,13 +122,17 @@ class SNMPClient(object):
             :class:`pysnmp.entity.rfc3413.oneliner.cmdgen.CommunityData`
             object.
         """
-        if self.version == SNMP_V3:
-            # Handling auth/encryption credentials is not (yet) supported.
-            # This version supports a security name analogous to community.
-            return cmdgen.UsmUserData(self.security)
-        else:
-            mp_model = 1 if self.version == SNMP_V2C else 0
-            return cmdgen.CommunityData(self.community, mpModel=mp_model)
+        if self._auth is None:
+            if self.version == SNMP_V3:
+                # Handling auth/encryption credentials is not (yet)
+                # supported. This version supports a security name analogous
+                # to community.
+                self._auth = cmdgen.UsmUserData(self.security)
+            else:
+                mp_model = 1 if self.version == SNMP_V2C else 0
+                self._auth = cmdgen.CommunityData(self.community,
+                                                  mpModel=mp_model)
+        return self._auth
 
     def _get_transport(self):
         """Return the transport target for an SNMP request.
@@ -122,38 +144,107 @@ class SNMPClient(object):
         # The transport target accepts timeout and retries parameters, which
         # default to 1 (second) and 5 respectively. These are deemed sensible
         # enough to allow for an unreliable network or slow device.
-        return cmdgen.UdpTransportTarget((self.address, self.port))
-
-    def get(self, oid):
-        """Use PySNMP to perform an SNMP GET operation on a single object.
-
-        :param oid: The OID of the object to get.
-        :raises: SNMPFailure if an SNMP request fails.
-        :returns: The value of the requested object.
+        if self._transport is None:
+            self._transport = cmdgen.UdpTransportTarget((self.address,
+                                                         self.port))
+        return self._transport
+
+    def _execute(self, operation, command, *args, **kwargs):
+        """Execute an SNMP request and check its result.
+
+        :param operation: The name of the operation, for error messages.
+        :param command: The method of the command generator executing the
+            request.
+        :raises: SNMPFailure if the SNMP request fails.
+        :returns: The variable bindings of the response.
         """
-        try:
-            results = self.cmd_gen.getCmd(self._get_auth(),
-                                          self._get_transport(),
-                                          oid)
-        except snmp_error.PySnmpError as e:
-            raise exception.SNMPFailure(operation="GET", error=e)
+        with self._lock:
+            try:
+                results = command(self._get_auth(), self._get_transport(),
+                                  *args, **kwargs)
+            except snmp_error.PySnmpError as e:
+                raise exception.SNMPFailure(operation=operation, error=e)
+
+        return self._check_results(operation, results)
 
+    @staticmethod
+    def _check_results(operation, results):
         error_indication, error_status, error_index, var_binds = results
 
         if error_indication:
             # SNMP engine-level error.
-            raise exception.SNMPFailure(operation="GET",
+            raise exception.SNMPFailure(operation=operation,
                                         error=error_indication)
 
         if error_status:
             # SNMP PDU error.
-            raise exception.SNMPFailure(operation="GET",
+            raise exception.SNMPFailure(operation=operation,
                                         error=error_status.prettyPrint())
 
+        return var_binds
+
+    def get(self, oid):
+        """Use PySNMP to perform an SNMP GET operation on a single object.
+
+        :param oid: The OID of the object to get.
+        :raises: SNMPFailure if an SNMP request fails.
+        :returns: The value of the requested object.
+        """
+        var_binds = self._execute("GET", self.cmd_gen.getCmd, oid)
+
         # We only expect a single value back
         name, val = var_binds[0]
         return val
 
+    def get_many(self, oids):
+        """Use PySNMP to perform an SNMP GET operation on several objects.
+
+        The objects are requested MAX_OIDS_PER_REQUEST at a time. When
+        several requests are needed, they are all sent before waiting for
+        their responses.
+
+        :param oids: A list of the OIDs of the objects to get.
+        :raises: SNMPFailure if an SNMP request fails.
+        :returns: A list of the values of the requested objects, in the
+            order of the OIDs.
+        """
+        if len(oids) <= MAX_OIDS_PER_REQUEST:
+            var_binds = self._execute("GET", self.cmd_gen.getCmd, *oids)
+            return [val for name, val in var_binds]
+
+        chunks = [oids[i:i + MAX_OIDS_PER_REQUEST]
+                  for i in range(0, len(oids), MAX_OIDS_PER_REQUEST)]
+        results = [None] * len(chunks)
+
+        def _response(snmp_engine, send_request_handle, error_indication,
+                      error_status, error_index, var_binds, index):
+            results[index] = (error_indication, error_status, error_index,
+                              var_binds)
+
+        snmp_engine = self.cmd_gen.snmpEngine
+        with self._lock:
+            try:
+                for index, chunk in enumerate(chunks):
+                    snmp_asyncore.getCmd(
+                        snmp_engine, self._get_auth(), self._get_transport(),
+                        snmp_asyncore.ContextData(),
+                        *[snmp_asyncore.ObjectType(
+                            snmp_asyncore.ObjectIdentity(oid))
+                          for oid in chunk],
+                        cbFun=_response, cbCtx=index, lookupMib=False)
+                snmp_engine.transportDispatcher.runDispatcher()
+            except snmp_error.PySnmpError as e:
+                raise exception.SNMPFailure(operation="GET", error=e)
+
+        values = []
+        for result in results:
+            if result is None:
+                raise exception.SNMPFailure(operation="GET",
+                                            error=_("no response"))
+            var_binds = self._check_results("GET", result)
+            values.extend(val for name, val in var_binds)
+        return values
+
     def get_next(self, oid):
         """Use PySNMP to perform an SNMP GET NEXT operation on a table object.
 
@@ -161,26 +252,27 @@ class SNMPClient(object):
         :raises: SNMPFailure if an SNMP request fails.
         :returns: A list of values of the requested table object.
         """
-        try:
-            results = self.cmd_gen.nextCmd(self._get_auth(),
-                                           self._get_transport(),
-                                           oid)
-        except snmp_error.PySnmpError as e:
-            raise exception.SNMPFailure(operation="GET_NEXT", error=e)
+        var_bind_table = self._execute("GET_NEXT", self.cmd_gen.nextCmd, oid)
+        return [val for row in var_bind_table for name, val in row]
 
-        error_indication, error_status, error_index, var_bind_table = results
+    def get_bulk(self, oid, max_rows):
+        """Use PySNMP to perform SNMP GET BULK operations on a table column.
 
-        if error_indication:
-            # SNMP engine-level error.
-            raise exception.SNMPFailure(operation="GET_NEXT",
-                                        error=error_indication)
+        Up to max_rows objects of the column are requested with a single
+        GETBULK request, the agent may however return fewer objects per
+        response, in which case more requests follow. Not supported by
+        SNMP version 1.
 
-        if error_status:
-            # SNMP PDU error.
-            raise exception.SNMPFailure(operation="GET_NEXT",
-                                        error=error_status.prettyPrint())
-
-        return [val for row in var_bind_table for name, val in row]
+        :param oid: The OID of the table column.
+        :param max_rows: The maximum number of objects to get.
+        :raises: SNMPFailure if an SNMP request fails.
+        :returns: A dictionary mapping the OIDs of the objects, as tuples of
+            integers, to their values.
+        """
+        var_bind_table = self._execute("GET_BULK", self.cmd_gen.bulkCmd,
+                                       0, max_rows, oid, maxRows=max_rows)
+        return {tuple(name): val for row in var_bind_table
+                for name, val in row}
 
     def set(self, oid, value):
         """Use PySNMP to perform an SNMP SET operation on a single object.
@@ -189,37 +281,25 @@ class SNMPClient(object):
         :param value: The value of the object to set.
         :raises: SNMPFailure if an SNMP request fails.
         """
-        try:
-            results = self.cmd_gen.setCmd(self._get_auth(),
-                                          self._get_transport(),
-                                          (oid, value))
-        except snmp_error.PySnmpError as e:
-            raise exception.SNMPFailure(operation="SET", error=e)
-
-        error_indication, error_status, error_index, var_binds = results
-
-        if error_indication:
-            # SNMP engine-level error.
-            raise exception.SNMPFailure(operation="SET",
-                                        error=error_indication)
-
-        if error_status:
-            # SNMP PDU error.
-            raise exception.SNMPFailure(operation="SET",
-                                        error=error_status.prettyPrint())
+        self._execute("SET", self.cmd_gen.setCmd, (oid, value))
 
 
 def _get_client(snmp_info):
-    """Create and return an SNMP client object.
+    """Return the SNMP client object of a PDU.
+
+    A client is created on the first use of a PDU with given parameters,
+    then reused by all the nodes of the PDU.
 
     :param snmp_info: SNMP driver info.
     :returns: A :class:`SNMPClient` object.
     """
-    return SNMPClient(snmp_info["address"],
-                      snmp_info["port"],
-                      snmp_info["version"],
-                      snmp_info.get("community"),
-                      snmp_info.get("security"))
+    key = (snmp_info["address"], snmp_info["port"], snmp_info["version"],
+           snmp_info.get("community"), snmp_info.get("security"))
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = _CLIENTS[key] = SNMPClient(*key)
+    return client
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -238,12 +318,39 @@ class SNMPDriverBase(object):
         self.client = _get_client(snmp_info)
 
     @abc.abstractmethod
+    def _snmp_power_state_oid(self):
+        """Return the OID of the power state object of the outlet.
+
+        :returns: Power state object OID as a tuple of integers.
+        """
+
+    def _snmp_power_state_column(self):
+        """Return the OID of the table column of the power state objects.
+
+        The power state objects of all the outlets of the PDU are read at
+        once from this column by SNMP versions supporting GETBULK.
+
+        :returns: Table column OID as a tuple of integers, or None if the
+            power state objects are not in a table column.
+        """
+        return None
+
+    @abc.abstractmethod
+    def _parse_power_state(self, state):
+        """Translate the value of the power state object of the outlet.
+
+        :param state: The value of the power state object.
+        :returns: power state. One of :class:`ironic.common.states`.
+        """
+
     def _snmp_power_state(self):
         """Perform the SNMP request required to get the current power state.
 
         :raises: SNMPFailure if an SNMP request fails.
         :returns: power state. One of :class:`ironic.common.states`.
         """
+        return self._parse_power_state(
+            self.client.get(self._snmp_power_state_oid()))
 
     @abc.abstractmethod
     def _snmp_power_on(self):
@@ -368,9 +475,13 @@ class SNMPDriverSimple(SNMPDriverBase):
         outlet = self.snmp_info['outlet']
         return self.oid_enterprise + self.oid_device + (outlet,)
 
-    def _snmp_power_state(self):
-        state = self.client.get(self.oid)
+    def _snmp_power_state_oid(self):
+        return self.oid
 
+    def _snmp_power_state_column(self):
+        return self.oid_enterprise + self.oid_device
+
+    def _parse_power_state(self, state):
         # Translate the state to an Ironic power state.
         if state == self.value_power_on:
             power_state = states.POWER_ON
@@ -533,10 +644,13 @@ class SNMPDriverEatonPower(SNMPDriverBase):
         outlet = self.snmp_info['outlet']
         return self.oid_base + oid + (outlet,)
 
-    def _snmp_power_state(self):
-        oid = self._snmp_oid(self.oid_status)
-        state = self.client.get(oid)
+    def _snmp_power_state_oid(self):
+        return self._snmp_oid(self.oid_status)
+
+    def _snmp_power_state_column(self):
+        return self.oid_base + self.oid_status
 
+    def _parse_power_state(self, state):
         # Translate the state to an Ironic power state.
         if state in (self.status_on, self.status_pending_off):
             power_state = states.POWER_ON
@@ -645,6 +759,36 @@ def _parse_driver_info(node):
     return snmp_info
 
 
+def _get_power_states(drivers):
+    """Get the power states of several outlets of a PDU at once.
+
+    With SNMP versions 2c and 3, the power state objects of the outlets are
+    read from their table column with GETBULK requests, usually a single
+    one. The objects missing from the column, and all of them with SNMP
+    version 1, are requested with GET requests of up to
+    MAX_OIDS_PER_REQUEST objects, sent without waiting for each other.
+
+    :param drivers: A list of SNMP driver objects for outlets of the same
+        PDU, accessed with the same parameters.
+    :raises: SNMPFailure if an SNMP request fails.
+    :returns: A list of power states, in the order of the drivers.
+    """
+    client = drivers[0].client
+    oids = [driver._snmp_power_state_oid() for driver in drivers]
+    column = drivers[0]._snmp_power_state_column()
+    values = {}
+    if client.version != SNMP_V1 and column is not None:
+        # Rows are usually indexed by outlet from 1
+        max_rows = max(driver.snmp_info['outlet'] for driver in drivers)
+        values = client.get_bulk(column, max_rows)
+
+    missing = [oid for oid in oids if oid not in values]
+    if missing:
+        values.update(zip(missing, client.get_many(missing)))
+    return [driver._parse_power_state(values[oid])
+            for driver, oid in zip(drivers, oids)]
+
+
 def _get_driver(node):
     """Return a new SNMP driver object of the correct type for `node`.
 
@@ -740,3 +884,30 @@ class SNMPPower(base.PowerInterface):
         state = driver.power_reset()
         if state != states.POWER_ON:
             raise exception.PowerStateFailure(pstate=states.POWER_ON)
+
+    def get_power_state_bulk_key(self, task):
+        """Get the key of the PDU of the task's node.
+
+        :param task: A instance of `ironic.manager.task_manager.TaskManager`.
+        :raises: MissingParameterValue if required SNMP parameters are missing.
+        :raises: InvalidParameterValue if SNMP parameters are invalid.
+        :returns: A tuple identifying the PDU and the parameters to access it.
+        """
+        snmp_info = _parse_driver_info(task.node)
+        return (snmp_info['address'], snmp_info['port'],
+                snmp_info['version'], snmp_info.get('community'),
+                snmp_info.get('security'), snmp_info['driver'])
+
+    def get_power_state_bulk(self, tasks):
+        """Get the power states of nodes sharing a PDU at once.
+
+        :param tasks: A list of instances of
+            `ironic.manager.task_manager.TaskManager`.
+        :raises: MissingParameterValue if required SNMP parameters are missing.
+        :raises: InvalidParameterValue if SNMP parameters are invalid.
+        :raises: SNMPFailure if an SNMP request fails.
+        :returns: A dictionary mapping node UUIDs to power states.
+        """
+        drivers = [_get_driver(task.node) for task in tasks]
+        return dict(zip((task.node.uuid for task in tasks),
+                        _get_power_states(drivers)))
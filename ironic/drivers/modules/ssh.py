@@ -29,6 +29,8 @@ Currently supported environments are:
 """
 
 import os
+import threading
+import time
 
 from oslo_concurrency import processutils
 from oslo_log import log as logging
@@ -94,6 +96,33 @@ _BOOT_DEVICES_MAP = {
 }
 
 
+# Connection key -> [paramiko.SSHClient, time it was last used at]
+_CONNECTIONS = {}
+_CONNECTIONS_LOCK = threading.Lock()
+_CONNECTION_KEYS = ('host', 'port', 'username', 'password', 'key_contents',
+                    'key_filename')
+
+# Hypervisor key -> _VMInventory
+_INVENTORIES = {}
+_INVENTORIES_LOCK = threading.Lock()
+
+
+class _VMInventory(object):
+    """The VMs of a hypervisor, shared by all its nodes."""
+
+    def __init__(self):
+        # Serializes the refreshes of the VM list
+        self.lock = threading.Lock()
+        # List of (VM name, list of MACs) in the order of list_all
+        self.vms = None
+        self.vms_at = 0
+        # Incremented on every refresh of the VM list
+        self.generation = 0
+        # Output of list_running
+        self.running = None
+        self.running_at = 0
+
+
 def _get_boot_device_map(virt_type):
     if virt_type in ('virsh', 'vmware'):
         return _BOOT_DEVICES_MAP
@@ -276,6 +305,62 @@ def _get_command_sets(virt_type, use_headless=False):
             {'virt_type': virt_type})
 
 
+def _get_host_key(driver_info):
+    """Get the key identifying the hypervisor of a node.
+
+    :param driver_info: information for accessing the node.
+    :returns: a tuple.
+    """
+    return (driver_info['host'], driver_info['port'],
+            driver_info['username'], driver_info['cmd_set']['base_cmd'])
+
+
+def _get_inventory(driver_info):
+    """Get the VM inventory of the hypervisor of a node.
+
+    :param driver_info: information for accessing the node.
+    :returns: a _VMInventory.
+    """
+    key = _get_host_key(driver_info)
+    with _INVENTORIES_LOCK:
+        inventory = _INVENTORIES.get(key)
+        if inventory is None:
+            inventory = _INVENTORIES[key] = _VMInventory()
+    return inventory
+
+
+def _invalidate_inventory(driver_info):
+    """Make the next operations list the VMs of a hypervisor again."""
+    inventory = _get_inventory(driver_info)
+    inventory.vms = None
+    inventory.running = None
+
+
+def _invalidate_running(driver_info):
+    """Make the next power state check list the running VMs again."""
+    _get_inventory(driver_info).running = None
+
+
+def _run_on_vm(ssh_obj, driver_info, cmd_to_exec):
+    """Executes a command on the VM of a node via ssh.
+
+    The VM inventory of the hypervisor is invalidated if the command fails,
+    as it may be caused by the VM having been renamed or removed.
+
+    :param ssh_obj: paramiko.SSHClient, an active ssh connection.
+    :param driver_info: information for accessing the node.
+    :param cmd_to_exec: command to execute.
+    :returns: list of the lines of output from the command.
+    :raises: SSHCommandFailed on an error from ssh.
+
+    """
+    try:
+        return _ssh_execute(ssh_obj, cmd_to_exec)
+    except exception.SSHCommandFailed:
+        with excutils.save_and_reraise_exception():
+            _invalidate_inventory(driver_info)
+
+
 def _get_boot_device(ssh_obj, driver_info):
     """Get the current boot device.
 
@@ -295,7 +380,7 @@ def _get_boot_device(ssh_obj, driver_info):
         base_cmd = driver_info['cmd_set']['base_cmd']
         cmd_to_exec = cmd_to_exec.replace('{_NodeName_}', node_name)
         cmd_to_exec = cmd_to_exec.replace('{_BaseCmd_}', base_cmd)
-        stdout, stderr = _ssh_execute(ssh_obj, cmd_to_exec)
+        stdout, stderr = _run_on_vm(ssh_obj, driver_info, cmd_to_exec)
         return next((dev for dev, hdev in boot_device_map.items()
                      if hdev == stdout), None)
     else:
@@ -322,7 +407,7 @@ def _set_boot_device(ssh_obj, driver_info, device):
         cmd_to_exec = cmd_to_exec.replace('{_NodeName_}', node_name)
         cmd_to_exec = cmd_to_exec.replace('{_BootDevice_}', device)
         cmd_to_exec = cmd_to_exec.replace('{_BaseCmd_}', base_cmd)
-        _ssh_execute(ssh_obj, cmd_to_exec)
+        _run_on_vm(ssh_obj, driver_info, cmd_to_exec)
     else:
         raise NotImplementedError()
 
@@ -433,15 +518,38 @@ def _get_power_status(ssh_obj, driver_info):
         of the provided MACs.
 
     """
-    power_state = None
     node_name = _get_hosts_name_for_node(ssh_obj, driver_info)
-    # Get a list of vms running on the host. If the command supports
-    # it, explicitly specify the desired node."
-    cmd_to_exec = "%s %s" % (driver_info['cmd_set']['base_cmd'],
-                             driver_info['cmd_set']['list_running'])
-    cmd_to_exec = cmd_to_exec.replace('{_NodeName_}', node_name)
-    running_list = _ssh_execute(ssh_obj, cmd_to_exec)
+    list_running = driver_info['cmd_set']['list_running']
+    # NOTE: the list of running VMs is shared by the nodes of the
+    # hypervisor for [ssh]power_state_cache_ttl seconds, unless the command
+    # is specific to the node.
+    cache_ttl = (CONF.ssh.power_state_cache_ttl
+                 if '{_NodeName_}' not in list_running else 0)
+    inventory = _get_inventory(driver_info)
+    running_list = inventory.running
+    if (not cache_ttl or running_list is None
+            or time.time() - inventory.running_at >= cache_ttl):
+        # Get a list of vms running on the host. If the command supports
+        # it, explicitly specify the desired node."
+        cmd_to_exec = "%s %s" % (driver_info['cmd_set']['base_cmd'],
+                                 list_running)
+        cmd_to_exec = cmd_to_exec.replace('{_NodeName_}', node_name)
+        running_list = _ssh_execute(ssh_obj, cmd_to_exec)
+        if cache_ttl:
+            inventory.running = running_list
+            inventory.running_at = time.time()
+
+    return _get_vm_power_state(running_list, node_name)
 
+
+def _get_vm_power_state(running_list, node_name):
+    """Returns the power state of a VM given the list of running VMs.
+
+    :param running_list: list of the lines of output of list_running.
+    :param node_name: the name of the VM.
+    :returns: one of ironic.common.states POWER_OFF, POWER_ON.
+
+    """
     # Command should return a list of running vms. If the current node is
     # not listed then we can assume it is not powered on.
     quoted_node_name = '"%s"' % node_name
@@ -452,34 +560,119 @@ def _get_power_status(ssh_obj, driver_info):
         # node name is either an exact match or quoted (optionally with
         # other information, e.g. vbox returns '"NodeName" {<uuid>}')
         if (quoted_node_name in node) or (node_name == node):
-            power_state = states.POWER_ON
-            break
-    if not power_state:
-        power_state = states.POWER_OFF
-
-    return power_state
+            return states.POWER_ON
+    return states.POWER_OFF
 
 
 def _get_connection(node):
     """Returns an SSH client connected to a node.
 
+    Connections are reused by the nodes of a hypervisor until they are
+    unused for [ssh]connection_idle_timeout seconds.
+
     :param node: the Node.
     :returns: paramiko.SSHClient, an active ssh connection.
 
     """
-    return utils.ssh_connect(_parse_driver_info(node))
+    driver_info = _parse_driver_info(node)
+    idle_timeout = CONF.ssh.connection_idle_timeout
+    if not idle_timeout:
+        return utils.ssh_connect(driver_info)
+
+    key = tuple(driver_info.get(k) for k in _CONNECTION_KEYS)
+    now = time.time()
+    with _CONNECTIONS_LOCK:
+        for other_key, (client, last_used) in list(_CONNECTIONS.items()):
+            if now - last_used >= idle_timeout:
+                del _CONNECTIONS[other_key]
+                client.close()
+
+        entry = _CONNECTIONS.get(key)
+        if entry is not None:
+            transport = entry[0].get_transport()
+            if transport is not None and transport.is_active():
+                entry[1] = now
+                return entry[0]
+            del _CONNECTIONS[key]
+            entry[0].close()
+
+    client = utils.ssh_connect(driver_info)
+    with _CONNECTIONS_LOCK:
+        _CONNECTIONS[key] = [client, now]
+    return client
+
+
+def _iter_vms(ssh_obj, driver_info):
+    """Iterate over the VMs of the hypervisor of a node.
+
+    :param ssh_obj: paramiko.SSHClient, an active ssh connection.
+    :param driver_info: information for accessing the node.
+    :returns: generator of tuples (VM name, list of MACs of the VM).
+    :raises: SSHCommandFailed on an error from ssh.
+
+    """
+    cmd_to_exec = "%s %s" % (driver_info['cmd_set']['base_cmd'],
+                             driver_info['cmd_set']['list_all'])
+    full_node_list = _ssh_execute(ssh_obj, cmd_to_exec)
+    LOG.debug("Retrieved Node List: %s", repr(full_node_list))
+    for node in full_node_list:
+        if not node:
+            continue
+        LOG.debug("Checking Node: %s's Mac address.", node)
+        cmd_to_exec = "%s %s" % (driver_info['cmd_set']['base_cmd'],
+                                 driver_info['cmd_set']['get_node_macs'])
+        cmd_to_exec = cmd_to_exec.replace('{_NodeName_}', node)
+        hosts_node_mac_list = _ssh_execute(ssh_obj, cmd_to_exec)
+        yield node, [mac for mac in hosts_node_mac_list if mac]
+
+
+def _find_vm_name(vms, node_macs):
+    """Find the VM having one of the MACs of a node.
+
+    :param vms: iterable of tuples (VM name, list of MACs of the VM).
+    :param node_macs: list of the MACs of the node.
+    :returns: the name of the VM or None.
+
+    """
+    for name, host_macs in vms:
+        for host_mac in host_macs:
+            for node_mac in node_macs:
+                if (driver_utils.normalize_mac(host_mac)
+                        in driver_utils.normalize_mac(node_mac)):
+                    LOG.debug("Found Mac address: %s", node_mac)
+                    return name
 
 
 def _get_hosts_name_for_node(ssh_obj, driver_info):
     """Get the name the host uses to reference the node.
 
+    The VMs of the host and their MACs are listed once per
+    [ssh]vm_inventory_ttl seconds for all its nodes, and listed again when
+    none of them has any of the MACs of the node.
+
     :param ssh_obj: paramiko.SSHClient, an active ssh connection.
     :param driver_info: information for accessing the node.
     :returns: the name of the node.
     :raises: NodeNotFound if could not find a VM corresponding to any of
         the provided MACs
+    :raises: SSHCommandFailed on an error from ssh.
 
     """
+    inventory = _get_inventory(driver_info)
+    inventory_ttl = CONF.ssh.vm_inventory_ttl
+    vms = inventory.vms
+    if (inventory_ttl and vms is not None
+            and time.time() - inventory.vms_at < inventory_ttl):
+        matched_name = _find_vm_name(vms, driver_info['macs'])
+        if matched_name is not None:
+            return matched_name
+        LOG.debug("No VM in the inventory of host %(host)s has any of the "
+                  "MACs of node %(node)s, listing the VMs again",
+                  {'host': driver_info['host'], 'node': driver_info['uuid']})
+
+    # Generation of the inventory last looked at, a VM list refreshed by
+    # another thread while waiting for the lock is not refreshed again.
+    generation = [inventory.generation]
 
     @retrying.retry(
         retry_on_result=lambda v: v is None,
@@ -487,37 +680,17 @@ def _get_hosts_name_for_node(ssh_obj, driver_info):
         stop_max_attempt_number=CONF.ssh.get_vm_name_attempts,
         wait_fixed=CONF.ssh.get_vm_name_retry_interval * 1000)
     def _with_retries():
-        matched_name = None
-        cmd_to_exec = "%s %s" % (driver_info['cmd_set']['base_cmd'],
-                                 driver_info['cmd_set']['list_all'])
-        full_node_list = _ssh_execute(ssh_obj, cmd_to_exec)
-        LOG.debug("Retrieved Node List: %s", repr(full_node_list))
-        # for each node check Mac Addresses
-        for node in full_node_list:
-            if not node:
-                continue
-            LOG.debug("Checking Node: %s's Mac address.", node)
-            cmd_to_exec = "%s %s" % (driver_info['cmd_set']['base_cmd'],
-                                     driver_info['cmd_set']['get_node_macs'])
-            cmd_to_exec = cmd_to_exec.replace('{_NodeName_}', node)
-            hosts_node_mac_list = _ssh_execute(ssh_obj, cmd_to_exec)
-
-            for host_mac in hosts_node_mac_list:
-                if not host_mac:
-                    continue
-                for node_mac in driver_info['macs']:
-                    if (driver_utils.normalize_mac(host_mac)
-                            in driver_utils.normalize_mac(node_mac)):
-                        LOG.debug("Found Mac address: %s", node_mac)
-                        matched_name = node
-                        break
-
-                if matched_name:
-                    break
-            if matched_name:
-                break
-
-        return matched_name
+        if not inventory_ttl:
+            return _find_vm_name(_iter_vms(ssh_obj, driver_info),
+                                 driver_info['macs'])
+
+        with inventory.lock:
+            if inventory.generation == generation[0]:
+                inventory.vms = list(_iter_vms(ssh_obj, driver_info))
+                inventory.vms_at = time.time()
+                inventory.generation += 1
+            generation[0] = inventory.generation
+            return _find_vm_name(inventory.vms, driver_info['macs'])
 
     try:
         return _with_retries()
@@ -536,6 +709,7 @@ def _power_on(ssh_obj, driver_info):
     :returns: one of ironic.common.states POWER_ON or ERROR.
 
     """
+    _invalidate_running(driver_info)
     current_pstate = _get_power_status(ssh_obj, driver_info)
     if current_pstate == states.POWER_ON:
         _power_off(ssh_obj, driver_info)
@@ -545,7 +719,8 @@ def _power_on(ssh_obj, driver_info):
                                  driver_info['cmd_set']['start_cmd'])
     cmd_to_power_on = cmd_to_power_on.replace('{_NodeName_}', node_name)
 
-    _ssh_execute(ssh_obj, cmd_to_power_on)
+    _run_on_vm(ssh_obj, driver_info, cmd_to_power_on)
+    _invalidate_running(driver_info)
 
     current_pstate = _get_power_status(ssh_obj, driver_info)
     if current_pstate == states.POWER_ON:
@@ -562,6 +737,7 @@ def _power_off(ssh_obj, driver_info):
     :returns: one of ironic.common.states POWER_OFF or ERROR.
 
     """
+    _invalidate_running(driver_info)
     current_pstate = _get_power_status(ssh_obj, driver_info)
     if current_pstate == states.POWER_OFF:
         return current_pstate
@@ -571,7 +747,8 @@ def _power_off(ssh_obj, driver_info):
                                   driver_info['cmd_set']['stop_cmd'])
     cmd_to_power_off = cmd_to_power_off.replace('{_NodeName_}', node_name)
 
-    _ssh_execute(ssh_obj, cmd_to_power_off)
+    _run_on_vm(ssh_obj, driver_info, cmd_to_power_off)
+    _invalidate_running(driver_info)
 
     current_pstate = _get_power_status(ssh_obj, driver_info)
     if current_pstate == states.POWER_OFF:
@@ -695,6 +872,60 @@ class SSHPower(base.PowerInterface):
         if state != states.POWER_ON:
             raise exception.PowerStateFailure(pstate=states.POWER_ON)
 
+    def get_power_state_bulk_key(self, task):
+        """Get the key of the hypervisor of the task's node.
+
+        :param task: a TaskManager instance containing the node to act on.
+        :raises: InvalidParameterValue if any connection parameters are
+            incorrect.
+        :raises: MissingParameterValue when a required parameter is missing
+        :returns: a key identifying the hypervisor, or None if its command
+            listing the running VMs is specific to a VM.
+        """
+        driver_info = _parse_driver_info(task.node)
+        if '{_NodeName_}' in driver_info['cmd_set']['list_running']:
+            return None
+        return _get_host_key(driver_info)
+
+    def get_power_state_bulk(self, tasks):
+        """Get the power states of nodes sharing a hypervisor at once.
+
+        The running VMs of the hypervisor are listed once for all the nodes.
+
+        :param tasks: a list of TaskManager instances containing the nodes
+            to act on.
+        :raises: InvalidParameterValue if any connection parameters are
+            incorrect.
+        :raises: MissingParameterValue when a required parameter is missing
+        :raises: SSHCommandFailed on an error from ssh.
+        :raises: SSHConnectFailed if ssh failed to connect to the node.
+        :returns: a dictionary mapping node UUIDs to power states, without
+            the nodes whose VM could not be found.
+        """
+        driver_info = _parse_driver_info(tasks[0].node)
+        ssh_obj = _get_connection(tasks[0].node)
+        cmd_to_exec = "%s %s" % (driver_info['cmd_set']['base_cmd'],
+                                 driver_info['cmd_set']['list_running'])
+        running_list = _ssh_execute(ssh_obj, cmd_to_exec)
+        inventory = _get_inventory(driver_info)
+        inventory.running = running_list
+        inventory.running_at = time.time()
+
+        power_states = {}
+        for task in tasks:
+            driver_info = _parse_driver_info(task.node)
+            driver_info['macs'] = driver_utils.get_node_mac_addresses(task)
+            try:
+                node_name = _get_hosts_name_for_node(ssh_obj, driver_info)
+            except exception.NodeNotFound as e:
+                LOG.debug("Not getting the power state of node %(node)s "
+                          "in bulk: %(error)s",
+                          {'node': task.node.uuid, 'error': e})
+                continue
+            power_states[task.node.uuid] = _get_vm_power_state(running_list,
+                                                               node_name)
+        return power_states
+
 
 class SSHManagement(base.ManagementInterface):
 
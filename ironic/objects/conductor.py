@@ -29,7 +29,8 @@ class Conductor(base.IronicObject, object_base.VersionedObjectDictCompat):
     #              to touch() optional.
     # Version 1.2: Add register_hardware_interfaces() and
     #              unregister_all_hardware_interfaces()
-    VERSION = '1.2'
+    # Version 1.3: Add saturation parameter to touch()
+    VERSION = '1.3'
 
     dbapi = db_api.get_instance()
 
@@ -86,9 +87,14 @@ class Conductor(base.IronicObject, object_base.VersionedObjectDictCompat):
     # methods can be used in the future to replace current explicit RPC calls.
     # Implications of calling new remote procedures should be thought through.
     # @object_base.remotable
-    def touch(self, context=None):
-        """Touch this conductor's DB record, marking it as up-to-date."""
-        self.dbapi.touch_conductor(self.hostname)
+    def touch(self, context=None, saturation=None):
+        """Touch this conductor's DB record, marking it as up-to-date.
+
+        :param context: Security context. Unused.
+        :param saturation: Ratio of busy workers of this conductor, kept
+                           unchanged if None.
+        """
+        self.dbapi.touch_conductor(self.hostname, saturation=saturation)
 
     # NOTE(xek): We don't want to enable RPC on this call just yet. Remotable
     # methods can be used in the future to replace current explicit RPC calls.
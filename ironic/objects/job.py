@@ -0,0 +1,152 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_utils import strutils
+from oslo_utils import uuidutils
+from oslo_versionedobjects import base as object_base
+
+from ironic.common import exception
+from ironic.db import api as db_api
+from ironic.objects import base
+from ironic.objects import fields as object_fields
+
+
+@base.IronicObjectRegistry.register
+class Job(base.IronicObject, object_base.VersionedObjectDictCompat):
+    # Version 1.0: Initial version
+    VERSION = '1.0'
+
+    dbapi = db_api.get_instance()
+
+    fields = {
+        'id': object_fields.IntegerField(),
+        'uuid': object_fields.UUIDField(nullable=True),
+        'node_id': object_fields.IntegerField(nullable=True),
+        'action': object_fields.StringField(nullable=True),
+        'args': object_fields.FlexibleDictField(nullable=True),
+        'status': object_fields.StringField(nullable=True),
+        'result': object_fields.FlexibleDictField(nullable=True),
+        'error': object_fields.StringField(nullable=True),
+    }
+
+    # NOTE(xek): We don't want to enable RPC on this call just yet. Remotable
+    # methods can be used in the future to replace current explicit RPC calls.
+    # Implications of calling new remote procedures should be thought through.
+    # @object_base.remotable_classmethod
+    @classmethod
+    def get(cls, context, ident):
+        """Find a job based on its ID or UUID.
+
+        :param context: security context
+        :param ident: the database primary key ID *or* the UUID of a job
+        :returns: a :class:`Job` object
+        :raises: InvalidIdentity if ident is neither an integer ID nor a UUID
+        :raises: JobNotFound if no job exists with the specified ident
+        """
+        if strutils.is_int_like(ident):
+            return cls.get_by_id(context, ident)
+        elif uuidutils.is_uuid_like(ident):
+            return cls.get_by_uuid(context, ident)
+        else:
+            raise exception.InvalidIdentity(identity=ident)
+
+    # NOTE(xek): We don't want to enable RPC on this call just yet. Remotable
+    # methods can be used in the future to replace current explicit RPC calls.
+    # Implications of calling new remote procedures should be thought through.
+    # @object_base.remotable_classmethod
+    @classmethod
+    def get_by_id(cls, context, db_id):
+        """Find a job based on its integer ID.
+
+        :param context: security context
+        :param db_id: the integer (database primary key) ID of a job
+        :returns: a :class:`Job` object
+        :raises: JobNotFound if no job exists with the specified ID
+        """
+        db_job = cls.dbapi.get_job_by_id(db_id)
+        return cls._from_db_object(context, cls(), db_job)
+
+    # NOTE(xek): We don't want to enable RPC on this call just yet. Remotable
+    # methods can be used in the future to replace current explicit RPC calls.
+    # Implications of calling new remote procedures should be thought through.
+    # @object_base.remotable_classmethod
+    @classmethod
+    def get_by_uuid(cls, context, uuid):
+        """Find a job based on its UUID.
+
+        :param context: security context
+        :param uuid: the UUID of a job
+        :returns: a :class:`Job` object
+        :raises: JobNotFound if no job exists with the specified UUID
+        """
+        db_job = cls.dbapi.get_job_by_uuid(uuid)
+        return cls._from_db_object(context, cls(), db_job)
+
+    # NOTE(xek): We don't want to enable RPC on this call just yet. Remotable
+    # methods can be used in the future to replace current explicit RPC calls.
+    # Implications of calling new remote procedures should be thought through.
+    # @object_base.remotable
+    def create(self, context=None):
+        """Create a Job record in the DB.
+
+        :param context: security context. NOTE: This should only
+                        be used internally by the indirection_api.
+                        Unfortunately, RPC requires context as the first
+                        argument, even though we don't use it.
+                        A context should be set when instantiating the
+                        object, e.g.: Job(context).
+        :raises: JobAlreadyExists if a job with the same UUID already exists
+        """
+        values = self.do_version_changes_for_db()
+        db_job = self.dbapi.create_job(values)
+        self._from_db_object(self._context, self, db_job)
+
+    # NOTE(xek): We don't want to enable RPC on this call just yet. Remotable
+    # methods can be used in the future to replace current explicit RPC calls.
+    # Implications of calling new remote procedures should be thought through.
+    # @object_base.remotable
+    def save(self, context=None):
+        """Save updates to this Job.
+
+        Updates will be made column by column based on the result
+        of self.do_version_changes_for_db().
+
+        :param context: security context. NOTE: This should only
+                        be used internally by the indirection_api.
+                        Unfortunately, RPC requires context as the first
+                        argument, even though we don't use it.
+                        A context should be set when instantiating the
+                        object, e.g.: Job(context).
+        :raises: JobNotFound if the job cannot be found
+        :raises: InvalidParameterValue when the UUID is being changed
+        """
+        updates = self.do_version_changes_for_db()
+        updated_job = self.dbapi.update_job(self.uuid, updates)
+        self._from_db_object(self._context, self, updated_job)
+
+    # NOTE(xek): We don't want to enable RPC on this call just yet. Remotable
+    # methods can be used in the future to replace current explicit RPC calls.
+    # Implications of calling new remote procedures should be thought through.
+    # @object_base.remotable
+    def refresh(self, context=None):
+        """Load updates for this Job.
+
+        :param context: security context. NOTE: This should only
+                        be used internally by the indirection_api.
+                        Unfortunately, RPC requires context as the first
+                        argument, even though we don't use it.
+                        A context should be set when instantiating the
+                        object, e.g.: Job(context).
+        """
+        current = self.get_by_uuid(self._context, uuid=self.uuid)
+        self.obj_refresh(current)
+        self.obj_reset_changes()
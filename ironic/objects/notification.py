@@ -13,6 +13,7 @@ from oslo_config import cfg
 from oslo_utils import strutils
 
 from ironic.common import exception
+from ironic.common import notification_queue
 from ironic.common import rpc
 from ironic.objects import base
 from ironic.objects import fields
@@ -31,6 +32,21 @@ NOTIFY_LEVELS = {
 }
 
 
+def should_notify(level):
+    """Determine whether notifications of a given level should be sent.
+
+    Allows checking the level before building a notification and its payload.
+
+    :param level: notification level, one of
+                  `ironic.objects.fields.NotificationLevel.ALL`.
+    :return: True if notifications of this level should be sent, False
+             otherwise.
+    """
+    if CONF.notification_level is None:
+        return False
+    return NOTIFY_LEVELS[level] >= NOTIFY_LEVELS[CONF.notification_level]
+
+
 @base.IronicObjectRegistry.register
 class EventType(base.IronicObject):
     """Defines the event_type to be sent on the wire.
@@ -92,10 +108,7 @@ class NotificationBase(base.IronicObject):
 
         :return: True if notification should be sent, False otherwise.
         """
-        if CONF.notification_level is None:
-            return False
-        return (NOTIFY_LEVELS[self.level] >=
-                NOTIFY_LEVELS[CONF.notification_level])
+        return should_notify(self.level)
 
     def emit(self, context):
         """Send the notification.
@@ -118,6 +131,11 @@ class NotificationBase(base.IronicObject):
         publisher_id = '%s.%s' % (self.publisher.service, self.publisher.host)
         payload = self.payload.obj_to_primitive()
 
+        if notification_queue.enabled():
+            notification_queue.put(context, publisher_id, self.level,
+                                   event_type, payload)
+            return
+
         notifier = rpc.get_versioned_notifier(publisher_id)
         notify = getattr(notifier, self.level)
         notify(context, event_type=event_type, payload=payload)
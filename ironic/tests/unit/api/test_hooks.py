@@ -19,15 +19,19 @@ import json
 import mock
 from oslo_config import cfg
 import oslo_messaging as messaging
+from oslo_utils import uuidutils
 import six
 from six.moves import http_client
 
+from ironic.api.controllers import base as api_base
 from ironic.api.controllers import root
+from ironic.api.controllers.v1 import utils as api_utils
 from ironic.api import hooks
 from ironic.common import context
 from ironic.common import policy
 from ironic.tests import base as tests_base
 from ironic.tests.unit.api import base
+from ironic.tests.unit.objects import utils as obj_utils
 
 
 class FakeRequest(object):
@@ -244,6 +248,17 @@ class TestContextHook(base.BaseApiTest):
     def test_context_hook_noauth_token_removed(self):
         self._test_context_hook(auth_strategy='noauth')
 
+    @mock.patch.object(policy, 'enable_request_cache', autospec=True)
+    def test_context_hook_enables_policy_cache(self, mock_enable):
+        self._test_context_hook()
+        mock_enable.assert_called_once_with()
+
+    @mock.patch.object(policy, 'disable_request_cache', autospec=True)
+    def test_context_hook_after_disables_policy_cache(self, mock_disable):
+        context_hook, reqstate = self._test_context_hook()
+        context_hook.after(reqstate)
+        mock_disable.assert_called_once_with()
+
     def test_context_hook_after_add_request_id(self):
         context_hook, reqstate = self._test_context_hook(is_admin=True,
                                                          request_id='fake-id')
@@ -271,6 +286,39 @@ class TestPolicyDeprecation(tests_base.TestCase):
         self.assertEqual(1, warning_mock.call_count)
 
 
+class TestFeaturesHook(base.BaseApiTest):
+
+    @mock.patch.object(api_utils, 'compute_features', autospec=True)
+    def test_before(self, mock_compute):
+        reqstate = FakeRequestState(headers=fake_headers())
+        reqstate.request.version = mock.Mock(minor=32)
+        hooks.FeaturesHook().before(reqstate)
+        mock_compute.assert_called_once_with(reqstate.request.version)
+        self.assertEqual(mock_compute.return_value,
+                         reqstate.request.features)
+
+    @mock.patch.object(api_utils, 'compute_features', autospec=True)
+    def test_before_no_version(self, mock_compute):
+        reqstate = FakeRequestState(headers=fake_headers())
+        del reqstate.request.version
+        hooks.FeaturesHook().before(reqstate)
+        self.assertFalse(mock_compute.called)
+        self.assertFalse(hasattr(reqstate.request, 'features'))
+
+    @mock.patch.object(api_utils, 'compute_features', autospec=True,
+                       side_effect=api_utils.compute_features)
+    def test_computed_once_per_request(self, mock_compute):
+        for i in range(3):
+            obj_utils.create_test_node(self.context,
+                                       uuid=uuidutils.generate_uuid())
+        data = self.get_json('/nodes/detail',
+                             headers={api_base.Version.string: '1.33'})
+        self.assertEqual(3, len(data['nodes']))
+        self.assertIn('storage_interface', data['nodes'][0])
+        mock_compute.assert_called_once_with(mock.ANY)
+        self.assertEqual(33, mock_compute.call_args[0][0].minor)
+
+
 class TestPublicUrlHook(base.BaseApiTest):
 
     def test_before_host_url(self):
@@ -288,3 +336,8 @@ class TestPublicUrlHook(base.BaseApiTest):
         trusted_call_hook = hooks.PublicUrlHook()
         trusted_call_hook.before(reqstate)
         self.assertEqual('http://foo', reqstate.request.public_url)
+
+    def test_before_link_templates(self):
+        reqstate = FakeRequestState(headers=fake_headers())
+        hooks.PublicUrlHook().before(reqstate)
+        self.assertEqual({}, reqstate.request.link_templates)
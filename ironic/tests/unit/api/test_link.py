@@ -0,0 +1,68 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import pecan
+
+from ironic.api.controllers import link
+from ironic.tests import base
+
+
+class TestLinkTemplates(base.TestCase):
+
+    def setUp(self):
+        super(TestLinkTemplates, self).setUp()
+        self.url = 'http://foo:6385'
+        self.templates = link.LinkTemplates(self.url)
+
+    def test_build_url(self):
+        for args, bookmark in (('abc', False), ('abc', True),
+                               ('abc/ports', False), ('?limit=1', False),
+                               ('?limit=1', True)):
+            self.assertEqual(
+                link.build_url('nodes', args, bookmark=bookmark,
+                               base_url=self.url),
+                self.templates.build_url('nodes', args, bookmark=bookmark))
+
+    @mock.patch.object(link, 'build_url', autospec=True,
+                       side_effect=link.build_url)
+    def test_build_url_cached(self, mock_build):
+        self.assertEqual('http://foo:6385/v1/nodes/a',
+                         self.templates.build_url('nodes', 'a'))
+        self.assertEqual('http://foo:6385/v1/nodes/b',
+                         self.templates.build_url('nodes', 'b'))
+        self.assertEqual('http://foo:6385/nodes/b',
+                         self.templates.build_url('nodes', 'b',
+                                                  bookmark=True))
+        self.assertEqual(2, mock_build.call_count)
+
+    def test_make_links(self):
+        links = self.templates.make_links('ports', 'abc')
+        self.assertEqual(['self', 'bookmark'], [l.rel for l in links])
+        self.assertEqual(['http://foo:6385/v1/ports/abc',
+                          'http://foo:6385/ports/abc'],
+                         [l.href for l in links])
+
+    @mock.patch.object(pecan, 'request', spec_set=['link_templates'])
+    def test_get_templates_cached(self, mock_request):
+        mock_request.link_templates = {}
+        templates = link.get_templates(self.url)
+        self.assertIs(templates, link.get_templates(self.url))
+        self.assertIsNot(templates, link.get_templates('http://bar'))
+        self.assertEqual({self.url, 'http://bar'},
+                         set(mock_request.link_templates))
+
+    @mock.patch.object(pecan, 'request', spec_set=[])
+    def test_get_templates_no_cache(self, mock_request):
+        templates = link.get_templates(self.url)
+        self.assertEqual(self.url, templates.base_url)
+        self.assertIsNot(templates, link.get_templates(self.url))
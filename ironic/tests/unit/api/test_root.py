@@ -13,7 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+from six.moves import http_client
+
 from ironic.api.controllers.v1 import versions
+from ironic.common import exception
+from ironic.common import metrics
+from ironic.common import policy
 from ironic.tests.unit.api import base
 
 
@@ -76,3 +82,42 @@ class TestV1Root(base.BaseApiTest):
                                                            'lookup',
                                                            'portgroups',
                                                            'volume'])
+
+    def test_get_v1_36_root(self):
+        self._test_get_root(headers={'X-OpenStack-Ironic-API-Version': '1.36'},
+                            additional_expected_resources=['heartbeat',
+                                                           'jobs',
+                                                           'lookup',
+                                                           'portgroups',
+                                                           'volume'])
+
+
+class TestMetrics(base.BaseApiTest):
+
+    def setUp(self):
+        super(TestMetrics, self).setUp()
+        self.config(expose_registry=True, group='metrics')
+        metrics.REGISTRY.counter('ironic_test_total').inc()
+        self.addCleanup(metrics.REGISTRY.reset)
+
+    def test_get_metrics(self):
+        response = self.app.get('/metrics')
+        self.assertEqual(http_client.OK, response.status_int)
+        self.assertEqual(metrics.CONTENT_TYPE,
+                         response.headers['Content-Type'])
+        self.assertIn('# TYPE ironic_test_total counter\n', response.text)
+        self.assertIn('ironic_test_total 1.0\n', response.text)
+
+    def test_get_metrics_disabled(self):
+        self.config(expose_registry=False, group='metrics')
+        response = self.app.get('/metrics', expect_errors=True)
+        self.assertEqual(http_client.NOT_FOUND, response.status_int)
+
+    @mock.patch.object(policy, 'authorize', autospec=True)
+    def test_get_metrics_forbidden(self, mock_authorize):
+        mock_authorize.side_effect = exception.HTTPForbidden(
+            resource='baremetal:metrics:get')
+        response = self.app.get('/metrics', expect_errors=True)
+        self.assertEqual(http_client.FORBIDDEN, response.status_int)
+        mock_authorize.assert_called_once_with('baremetal:metrics:get',
+                                               mock.ANY, mock.ANY)
@@ -0,0 +1,72 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+Tests for the API /jobs/ methods.
+"""
+
+from oslo_utils import uuidutils
+from six.moves import http_client
+
+from ironic.api.controllers import base as api_base
+from ironic.api.controllers import v1 as api_v1
+from ironic.common import states
+from ironic.tests.unit.api import base as test_api_base
+from ironic.tests.unit.objects import utils as obj_utils
+
+
+class TestGetJob(test_api_base.BaseApiTest):
+    headers = {api_base.Version.string: str(api_v1.MAX_VER)}
+
+    def setUp(self):
+        super(TestGetJob, self).setUp()
+        self.node = obj_utils.create_test_node(self.context)
+        self.job = obj_utils.create_test_job(
+            self.context, node_id=self.node.id, action='get_boot_device')
+
+    def test_get_one(self):
+        data = self.get_json('/jobs/%s' % self.job.uuid,
+                             headers=self.headers)
+        self.assertEqual(self.job.uuid, data['uuid'])
+        self.assertEqual(self.node.uuid, data['node_uuid'])
+        self.assertEqual('get_boot_device', data['action'])
+        self.assertEqual(states.JOB_PENDING, data['status'])
+        self.assertIn('result', data)
+        self.assertIn('error', data)
+        self.assertNotIn('args', data)
+        self.assertNotIn('node_id', data)
+        self.assertIn('links', data)
+        self.assertEqual(2, len(data['links']))
+        self.assertIn(self.job.uuid, data['links'][0]['href'])
+        for l in data['links']:
+            bookmark = l['rel'] == 'bookmark'
+            self.assertTrue(self.validate_link(l['href'], bookmark=bookmark,
+                                               headers=self.headers))
+
+    def test_get_one_old_version(self):
+        response = self.get_json(
+            '/jobs/%s' % self.job.uuid, expect_errors=True,
+            headers={api_base.Version.string: '1.35'})
+        self.assertEqual(http_client.NOT_FOUND, response.status_int)
+
+    def test_get_one_not_found(self):
+        response = self.get_json('/jobs/%s' % uuidutils.generate_uuid(),
+                                 expect_errors=True, headers=self.headers)
+        self.assertEqual(http_client.NOT_FOUND, response.status_int)
+        self.assertEqual('application/json', response.content_type)
+        self.assertTrue(response.json['error_message'])
+
+    def test_get_one_wait_not_supported(self):
+        # Clients poll jobs, the API does not hold a worker to wait for them
+        response = self.get_json('/jobs/%s?wait=10' % self.job.uuid,
+                                 expect_errors=True, headers=self.headers)
+        self.assertEqual(http_client.BAD_REQUEST, response.status_int)
+        self.assertTrue(response.json['error_message'])
@@ -333,6 +333,44 @@ class TestListNodes(test_api_base.BaseApiTest):
                                  expect_errors=True)
         self.assertEqual(http_client.NOT_FOUND, response.status_int)
 
+    def test_detail_links(self):
+        node = obj_utils.create_test_node(self.context)
+        data = self.get_json(
+            '/nodes/detail?links=true',
+            headers={api_base.Version.string: str(api_v1.MAX_VER)})
+        self.assertEqual(node.uuid, data['nodes'][0]['uuid'])
+        for field in ('ports', 'states', 'portgroups', 'volume', 'links'):
+            self.assertIn(field, data['nodes'][0])
+
+    def test_detail_no_links(self):
+        node = obj_utils.create_test_node(self.context)
+        data = self.get_json(
+            '/nodes/detail?links=false',
+            headers={api_base.Version.string: str(api_v1.MAX_VER)})
+        self.assertEqual(node.uuid, data['nodes'][0]['uuid'])
+        self.assertIn('driver_info', data['nodes'][0])
+        for field in ('ports', 'states', 'portgroups', 'volume'):
+            self.assertNotIn(field, data['nodes'][0])
+        self.assertEqual(2, len(data['nodes'][0]['links']))
+
+    def test_detail_no_links_next(self):
+        for i in range(3):
+            obj_utils.create_test_node(self.context,
+                                       uuid=uuidutils.generate_uuid())
+        data = self.get_json(
+            '/nodes/detail?links=false&limit=2',
+            headers={api_base.Version.string: str(api_v1.MAX_VER)})
+        self.assertIn('links=False', data['next'])
+        self.assertNotIn('ports', data['nodes'][0])
+
+    def test_detail_links_old_version(self):
+        obj_utils.create_test_node(self.context)
+        response = self.get_json(
+            '/nodes/detail?links=false',
+            headers={api_base.Version.string: '1.36'},
+            expect_errors=True)
+        self.assertEqual(http_client.NOT_ACCEPTABLE, response.status_int)
+
     def test_mask_available_state(self):
         node = obj_utils.create_test_node(self.context,
                                           provision_state=states.AVAILABLE)
@@ -3659,6 +3697,288 @@ class TestPut(test_api_base.BaseApiTest):
                                      obj_fields.NotificationStatus.ERROR)])
 
 
+class TestBulk(test_api_base.BaseApiTest):
+
+    def setUp(self):
+        super(TestBulk, self).setUp()
+        self.node = obj_utils.create_test_node(
+            self.context, provision_state=states.AVAILABLE, name='node-39')
+        self.node2 = obj_utils.create_test_node(
+            self.context, uuid=uuidutils.generate_uuid(),
+            provision_state=states.AVAILABLE, name='node-40')
+        self.version = {api_base.Version.string:
+                        str(api_v1.MAX_VER)}
+        p = mock.patch.object(rpcapi.ConductorAPI, 'get_topic_for')
+        self.mock_gtf = p.start()
+        self.mock_gtf.return_value = 'test-topic'
+        self.addCleanup(p.stop)
+        p = mock.patch.object(rpcapi.ConductorAPI, 'bulk_node_action')
+        self.mock_bulk = p.start()
+        self.mock_bulk.side_effect = lambda ctx, ids, *a, **kw: dict.fromkeys(
+            ids)
+        self.addCleanup(p.stop)
+
+    def test_power(self):
+        body = {'action': 'power', 'target': states.POWER_OFF,
+                'nodes': [self.node.uuid, self.node2.name]}
+        response = self.post_json('/nodes/bulk', body, headers=self.version)
+        self.assertEqual(http_client.ACCEPTED, response.status_code)
+        self.assertEqual({self.node.uuid: {'success': True},
+                          self.node2.name: {'success': True}},
+                         response.json['nodes'])
+        self.mock_bulk.assert_called_once_with(
+            mock.ANY, [self.node.uuid, self.node2.uuid], 'power',
+            states.POWER_OFF, timeout=None, reason=None, topic='test-topic')
+
+    def test_grouped_by_topic(self):
+        self.mock_gtf.side_effect = ['topic-1', 'topic-2']
+        body = {'action': 'power', 'target': states.POWER_ON,
+                'nodes': [self.node.uuid, self.node2.uuid], 'timeout': 10}
+        response = self.post_json('/nodes/bulk', body, headers=self.version)
+        self.assertEqual(http_client.ACCEPTED, response.status_code)
+        self.mock_bulk.assert_has_calls([
+            mock.call(mock.ANY, [self.node.uuid], 'power', states.POWER_ON,
+                      timeout=10, reason=None, topic='topic-1'),
+            mock.call(mock.ANY, [self.node2.uuid], 'power', states.POWER_ON,
+                      timeout=10, reason=None, topic='topic-2')])
+
+    def test_power_partial_failure(self):
+        self.mock_bulk.side_effect = None
+        self.mock_bulk.return_value = {
+            self.node.uuid: None,
+            self.node2.uuid: {'error': 'locked', 'code': 409}}
+        missing = uuidutils.generate_uuid()
+        body = {'action': 'power', 'target': states.POWER_OFF,
+                'nodes': [self.node.uuid, self.node2.uuid, missing]}
+        response = self.post_json('/nodes/bulk', body, headers=self.version)
+        self.assertEqual(http_client.ACCEPTED, response.status_code)
+        result = response.json['nodes']
+        self.assertEqual({'success': True}, result[self.node.uuid])
+        self.assertEqual({'success': False, 'error': 'locked', 'code': 409},
+                         result[self.node2.uuid])
+        self.assertFalse(result[missing]['success'])
+        self.assertEqual(http_client.NOT_FOUND, result[missing]['code'])
+        self.mock_bulk.assert_called_once_with(
+            mock.ANY, [self.node.uuid, self.node2.uuid], 'power',
+            states.POWER_OFF, timeout=None, reason=None, topic='test-topic')
+
+    def test_power_invalid_state_for_one_node(self):
+        self.node2.provision_state = states.CLEANING
+        self.node2.save()
+        body = {'action': 'power', 'target': states.POWER_OFF,
+                'nodes': [self.node.uuid, self.node2.uuid]}
+        response = self.post_json('/nodes/bulk', body, headers=self.version)
+        result = response.json['nodes']
+        self.assertTrue(result[self.node.uuid]['success'])
+        self.assertEqual(http_client.BAD_REQUEST,
+                         result[self.node2.uuid]['code'])
+        self.mock_bulk.assert_called_once_with(
+            mock.ANY, [self.node.uuid], 'power', states.POWER_OFF,
+            timeout=None, reason=None, topic='test-topic')
+
+    def test_rpc_failure(self):
+        self.mock_bulk.side_effect = exception.NoFreeConductorWorker()
+        body = {'action': 'power', 'target': states.POWER_OFF,
+                'nodes': [self.node.uuid]}
+        response = self.post_json('/nodes/bulk', body, headers=self.version)
+        result = response.json['nodes'][self.node.uuid]
+        self.assertFalse(result['success'])
+        self.assertEqual(http_client.SERVICE_UNAVAILABLE, result['code'])
+
+    @mock.patch.object(rpcapi.ConductorAPI, 'can_run_bulk_node_actions',
+                       autospec=True, return_value=False)
+    def test_rpc_pinned(self, mock_can_run):
+        body = {'action': 'power', 'target': states.POWER_OFF,
+                'nodes': [self.node.uuid]}
+        response = self.post_json('/nodes/bulk', body, headers=self.version,
+                                  expect_errors=True)
+        self.assertEqual(http_client.NOT_ACCEPTABLE, response.status_code)
+        self.assertFalse(self.mock_bulk.called)
+
+    def test_provision(self):
+        body = {'action': 'provision', 'target': states.ACTIVE,
+                'nodes': [self.node.uuid]}
+        response = self.post_json('/nodes/bulk', body, headers=self.version)
+        self.assertEqual(http_client.ACCEPTED, response.status_code)
+        self.assertTrue(response.json['nodes'][self.node.uuid]['success'])
+        self.mock_bulk.assert_called_once_with(
+            mock.ANY, [self.node.uuid], 'provision', states.ACTIVE,
+            timeout=None, reason=None, topic='test-topic')
+
+    def test_provision_clean_not_allowed(self):
+        body = {'action': 'provision', 'target': 'clean',
+                'nodes': [self.node.uuid]}
+        response = self.post_json('/nodes/bulk', body, headers=self.version,
+                                  expect_errors=True)
+        self.assertEqual(http_client.BAD_REQUEST, response.status_code)
+        self.assertFalse(self.mock_bulk.called)
+
+    @mock.patch.object(notification_utils, '_emit_api_notification')
+    def test_maintenance(self, mock_notify):
+        body = {'action': 'maintenance', 'target': True,
+                'nodes': [self.node.uuid], 'reason': 'broken'}
+        response = self.post_json('/nodes/bulk', body, headers=self.version)
+        self.assertEqual(http_client.ACCEPTED, response.status_code)
+        self.mock_bulk.assert_called_once_with(
+            mock.ANY, [self.node.uuid], 'maintenance', True, timeout=None,
+            reason='broken', topic='test-topic')
+        mock_notify.assert_has_calls([
+            mock.call(mock.ANY, mock.ANY, 'maintenance_set',
+                      obj_fields.NotificationLevel.INFO,
+                      obj_fields.NotificationStatus.START),
+            mock.call(mock.ANY, mock.ANY, 'maintenance_set',
+                      obj_fields.NotificationLevel.INFO,
+                      obj_fields.NotificationStatus.END)])
+
+    def test_maintenance_target_not_boolean(self):
+        body = {'action': 'maintenance', 'target': 'on',
+                'nodes': [self.node.uuid]}
+        response = self.post_json('/nodes/bulk', body, headers=self.version,
+                                  expect_errors=True)
+        self.assertEqual(http_client.BAD_REQUEST, response.status_code)
+
+    def test_invalid_action(self):
+        body = {'action': 'destroy', 'target': 'now',
+                'nodes': [self.node.uuid]}
+        response = self.post_json('/nodes/bulk', body, headers=self.version,
+                                  expect_errors=True)
+        self.assertEqual(http_client.BAD_REQUEST, response.status_code)
+
+    def test_too_many_nodes(self):
+        self.config(max_limit=1, group='api')
+        body = {'action': 'power', 'target': states.POWER_OFF,
+                'nodes': [self.node.uuid, self.node2.uuid]}
+        response = self.post_json('/nodes/bulk', body, headers=self.version,
+                                  expect_errors=True)
+        self.assertEqual(http_client.BAD_REQUEST, response.status_code)
+        self.assertFalse(self.mock_bulk.called)
+
+    def test_old_version(self):
+        body = {'action': 'power', 'target': states.POWER_OFF,
+                'nodes': [self.node.uuid]}
+        response = self.post_json('/nodes/bulk', body,
+                                  headers={api_base.Version.string: '1.34'},
+                                  expect_errors=True)
+        self.assertEqual(http_client.NOT_FOUND, response.status_code)
+
+
+class TestAsyncJobs(test_api_base.BaseApiTest):
+
+    def setUp(self):
+        super(TestAsyncJobs, self).setUp()
+        self.node = obj_utils.create_test_node(self.context)
+        self.headers = {api_base.Version.string: str(api_v1.MAX_VER),
+                        'Prefer': 'respond-async'}
+        p = mock.patch.object(rpcapi.ConductorAPI, 'get_topic_for')
+        self.mock_gtf = p.start()
+        self.mock_gtf.return_value = 'test-topic'
+        self.addCleanup(p.stop)
+        p = mock.patch.object(rpcapi.ConductorAPI, 'run_job')
+        self.mock_run_job = p.start()
+        self.addCleanup(p.stop)
+
+    def _check_job(self, response, action, args):
+        self.assertEqual(http_client.ACCEPTED, response.status_code)
+        job_uuid = response.json['uuid']
+        self.assertEqual(self.node.uuid, response.json['node_uuid'])
+        self.assertEqual(action, response.json['action'])
+        self.assertEqual(states.JOB_PENDING, response.json['status'])
+        self.assertNotIn('args', response.json)
+        self.assertEqual('http://localhost/v1/jobs/%s' % job_uuid,
+                         response.location)
+        self.mock_run_job.assert_called_once_with(mock.ANY, job_uuid,
+                                                  topic='test-topic')
+        job = objects.Job.get_by_uuid(self.context, job_uuid)
+        self.assertEqual(self.node.id, job.node_id)
+        self.assertEqual(action, job.action)
+        self.assertEqual(args, job.args)
+
+    @mock.patch.object(rpcapi.ConductorAPI, 'set_boot_device')
+    def test_set_boot_device(self, mock_sbd):
+        response = self.put_json(
+            '/nodes/%s/management/boot_device' % self.node.uuid,
+            {'boot_device': boot_devices.PXE, 'persistent': True},
+            headers=self.headers)
+        self._check_job(response, 'set_boot_device',
+                        {'device': boot_devices.PXE, 'persistent': True})
+        self.assertFalse(mock_sbd.called)
+
+    @mock.patch.object(rpcapi.ConductorAPI, 'get_boot_device')
+    def test_get_boot_device(self, mock_gbd):
+        response = self.get_json(
+            '/nodes/%s/management/boot_device' % self.node.uuid,
+            headers=self.headers, expect_errors=True)
+        self._check_job(response, 'get_boot_device', {})
+        self.assertFalse(mock_gbd.called)
+
+    @mock.patch.object(rpcapi.ConductorAPI, 'inject_nmi')
+    def test_inject_nmi(self, mock_nmi):
+        response = self.put_json(
+            '/nodes/%s/management/inject_nmi' % self.node.uuid, {},
+            headers=self.headers)
+        self._check_job(response, 'inject_nmi', {})
+        self.assertFalse(mock_nmi.called)
+
+    @mock.patch.object(rpcapi.ConductorAPI, 'validate_driver_interfaces')
+    def test_validate(self, mock_vdi):
+        response = self.get_json('/nodes/validate?node=%s' % self.node.uuid,
+                                 headers=self.headers, expect_errors=True)
+        self._check_job(response, 'validate_driver_interfaces', {})
+        self.assertFalse(mock_vdi.called)
+
+    @mock.patch.object(rpcapi.ConductorAPI, 'vif_attach')
+    def test_vif_attach(self, mock_attach):
+        vif = {'id': uuidutils.generate_uuid()}
+        response = self.post_json('/nodes/%s/vifs' % self.node.uuid, vif,
+                                  headers=self.headers)
+        self._check_job(response, 'vif_attach', {'vif_info': vif})
+        self.assertFalse(mock_attach.called)
+
+    @mock.patch.object(rpcapi.ConductorAPI, 'vendor_passthru')
+    def test_vendor_passthru(self, mock_vendor):
+        response = self.post_json(
+            '/nodes/%s/vendor_passthru/test' % self.node.uuid,
+            {'foo': 'bar'}, headers=self.headers)
+        self._check_job(response, 'vendor_passthru',
+                        {'driver_method': 'test', 'http_method': 'POST',
+                         'info': {'foo': 'bar'}})
+        self.assertFalse(mock_vendor.called)
+
+    @mock.patch.object(rpcapi.ConductorAPI, 'get_boot_device')
+    def test_not_requested(self, mock_gbd):
+        mock_gbd.return_value = {'boot_device': boot_devices.PXE,
+                                 'persistent': False}
+        del self.headers['Prefer']
+        data = self.get_json(
+            '/nodes/%s/management/boot_device' % self.node.uuid,
+            headers=self.headers)
+        self.assertEqual(mock_gbd.return_value, data)
+        self.assertFalse(self.mock_run_job.called)
+
+    @mock.patch.object(rpcapi.ConductorAPI, 'get_boot_device')
+    def test_old_version(self, mock_gbd):
+        mock_gbd.return_value = {'boot_device': boot_devices.PXE,
+                                 'persistent': False}
+        self.headers[api_base.Version.string] = '1.35'
+        data = self.get_json(
+            '/nodes/%s/management/boot_device' % self.node.uuid,
+            headers=self.headers)
+        self.assertEqual(mock_gbd.return_value, data)
+        self.assertFalse(self.mock_run_job.called)
+
+    @mock.patch.object(rpcapi.ConductorAPI, 'can_run_jobs')
+    @mock.patch.object(rpcapi.ConductorAPI, 'get_boot_device')
+    def test_conductors_not_upgraded(self, mock_gbd, mock_can_run):
+        mock_can_run.return_value = False
+        mock_gbd.return_value = {'boot_device': boot_devices.PXE,
+                                 'persistent': False}
+        data = self.get_json(
+            '/nodes/%s/management/boot_device' % self.node.uuid,
+            headers=self.headers)
+        self.assertEqual(mock_gbd.return_value, data)
+        self.assertFalse(self.mock_run_job.called)
+
+
 class TestCheckCleanSteps(base.TestCase):
     def test__check_clean_steps_not_list(self):
         clean_steps = {"step": "upgrade_firmware", "interface": "deploy"}
@@ -27,6 +27,7 @@ class APINotifyTestCase(tests_base.TestCase):
 
     def setUp(self):
         super(APINotifyTestCase, self).setUp()
+        self.config(notification_level='debug')
         self.node_notify_mock = mock.Mock()
         self.port_notify_mock = mock.Mock()
         self.chassis_notify_mock = mock.Mock()
@@ -88,6 +89,17 @@ class APINotifyTestCase(tests_base.TestCase):
         self.assertEqual({'param': 104}, payload.driver_info)
         self.assertEqual(chassis_uuid, payload.chassis_uuid)
 
+    @mock.patch.object(notification, 'mask_secrets', autospec=True)
+    def test_notification_level_not_enabled(self, mock_secrets):
+        self.config(notification_level='error')
+        node = obj_utils.get_test_node(self.context)
+        notif_utils._emit_api_notification(self.context, node, 'create',
+                                           fields.NotificationLevel.INFO,
+                                           fields.NotificationStatus.SUCCESS,
+                                           chassis_uuid=None)
+        self.assertFalse(mock_secrets.called)
+        self.assertFalse(self.node_notify_mock.called)
+
     def test_node_notification_mask_secrets(self):
         test_info = {'password': 'secret123', 'some_value': 'fake-value'}
         node = obj_utils.get_test_node(self.context,
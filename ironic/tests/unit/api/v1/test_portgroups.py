@@ -181,6 +181,22 @@ class TestListPortgroups(test_api_base.BaseApiTest):
                                  expect_errors=True, headers=self.headers)
         self.assertEqual(http_client.NOT_FOUND, response.status_int)
 
+    def test_detail_no_links(self):
+        portgroup = obj_utils.create_test_portgroup(self.context,
+                                                    node_id=self.node.id)
+        data = self.get_json('/portgroups/detail?links=false',
+                             headers=self.headers)
+        self.assertEqual(portgroup.uuid, data['portgroups'][0]['uuid'])
+        self.assertIn('extra', data['portgroups'][0])
+        self.assertNotIn('ports', data['portgroups'][0])
+        self.assertEqual(2, len(data['portgroups'][0]['links']))
+
+    def test_detail_links_old_version(self):
+        response = self.get_json('/portgroups/detail?links=false',
+                                 headers={api_base.Version.string: '1.36'},
+                                 expect_errors=True)
+        self.assertEqual(http_client.NOT_ACCEPTABLE, response.status_int)
+
     def test_many(self):
         portgroups = []
         for id_ in range(5):
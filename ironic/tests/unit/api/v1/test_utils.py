@@ -258,6 +258,22 @@ class TestApiUtils(base.TestCase):
         self.assertRaises(exception.NotAcceptable,
                           utils.check_allow_driver_detail, True)
 
+    @mock.patch.object(pecan, 'request', spec_set=['version'])
+    def test_check_allow_links_parameter(self, mock_request):
+        mock_request.version.minor = 37
+        self.assertIsNone(utils.check_allow_links_parameter(False))
+
+    @mock.patch.object(pecan, 'request', spec_set=['version'])
+    def test_check_allow_links_parameter_none(self, mock_request):
+        mock_request.version.minor = 36
+        self.assertIsNone(utils.check_allow_links_parameter(None))
+
+    @mock.patch.object(pecan, 'request', spec_set=['version'])
+    def test_check_allow_links_parameter_fail(self, mock_request):
+        mock_request.version.minor = 36
+        self.assertRaises(exception.NotAcceptable,
+                          utils.check_allow_links_parameter, False)
+
     @mock.patch.object(pecan, 'request', spec_set=['version'])
     def test_check_allow_manage_verbs(self, mock_request):
         mock_request.version.minor = 4
@@ -444,6 +460,70 @@ class TestApiUtils(base.TestCase):
         mock_request.version.minor = 33
         self.assertFalse(utils.allow_port_physical_network())
 
+    @mock.patch.object(objects.Port, 'supports_physical_network')
+    def test_compute_features(self, mock_spn):
+        mock_spn.return_value = True
+        version = mock.Mock(minor=1)
+        self.assertEqual(0, utils.compute_features(version))
+        version.minor = 14
+        features = utils.compute_features(version)
+        self.assertTrue(features & utils.FEATURE_LINKS_NODE_STATES)
+        self.assertTrue(features & utils.FEATURE_RAID_CONFIG)
+        self.assertFalse(features & utils.FEATURE_PORT_INTERNAL_INFO)
+        version.minor = 34
+        features = utils.compute_features(version)
+        self.assertTrue(features & utils.FEATURE_STORAGE_INTERFACE)
+        self.assertTrue(features & utils.FEATURE_PORT_PHYSICAL_NETWORK)
+
+    @mock.patch.object(objects.Port, 'supports_physical_network')
+    def test_compute_features_port_physical_network_pin(self, mock_spn):
+        mock_spn.return_value = False
+        version = mock.Mock(minor=34)
+        features = utils.compute_features(version)
+        self.assertTrue(features & utils.FEATURE_STORAGE_INTERFACE)
+        self.assertFalse(features & utils.FEATURE_PORT_PHYSICAL_NETWORK)
+
+    def test_compute_features_matches_allow(self):
+        allow_funcs = {
+            utils.FEATURE_NODE_LOGICAL_NAMES: utils.allow_node_logical_names,
+            utils.FEATURE_RAID_CONFIG: utils.allow_raid_config,
+            utils.FEATURE_LINKS_NODE_STATES:
+                utils.allow_links_node_states_and_driver_properties,
+            utils.FEATURE_PORT_INTERNAL_INFO: utils.allow_port_internal_info,
+            utils.FEATURE_PORT_ADVANCED_NET_FIELDS:
+                utils.allow_port_advanced_net_fields,
+            utils.FEATURE_NETWORK_INTERFACE: utils.allow_network_interface,
+            utils.FEATURE_RESOURCE_CLASS: utils.allow_resource_class,
+            utils.FEATURE_PORTGROUPS_SUBCONTROLLERS:
+                utils.allow_portgroups_subcontrollers,
+            utils.FEATURE_DYNAMIC_INTERFACES: utils.allow_dynamic_interfaces,
+            utils.FEATURE_VOLUME: utils.allow_volume,
+            utils.FEATURE_STORAGE_INTERFACE: utils.allow_storage_interface,
+            utils.FEATURE_PORT_PHYSICAL_NETWORK:
+                utils.allow_port_physical_network,
+        }
+        with mock.patch.object(pecan, 'request',
+                               spec_set=['version']) as mock_request:
+            for minor in range(1, 37):
+                mock_request.version.minor = minor
+                features = utils.compute_features(mock_request.version)
+                for feature, allow in allow_funcs.items():
+                    self.assertEqual(allow(), bool(features & feature))
+
+    @mock.patch.object(utils, 'compute_features', autospec=True)
+    @mock.patch.object(pecan, 'request', spec_set=['version', 'features'])
+    def test_get_request_features(self, mock_request, mock_compute):
+        mock_request.features = utils.FEATURE_VOLUME
+        self.assertEqual(utils.FEATURE_VOLUME, utils.get_request_features())
+        self.assertFalse(mock_compute.called)
+
+    @mock.patch.object(utils, 'compute_features', autospec=True)
+    @mock.patch.object(pecan, 'request', spec_set=['version'])
+    def test_get_request_features_no_hook(self, mock_request, mock_compute):
+        mock_compute.return_value = utils.FEATURE_VOLUME
+        self.assertEqual(utils.FEATURE_VOLUME, utils.get_request_features())
+        mock_compute.assert_called_once_with(mock_request.version)
+
 
 class TestNodeIdent(base.TestCase):
 
@@ -622,7 +702,7 @@ class TestVendorPassthru(base.TestCase):
 
     def test_get_controller_reserved_names(self):
         expected = ['maintenance', 'management', 'states',
-                    'vendor_passthru', 'validate', 'detail']
+                    'vendor_passthru', 'validate', 'detail', 'bulk']
         self.assertEqual(sorted(expected),
                          sorted(utils.get_controller_reserved_names(
                                 api_node.NodesController)))
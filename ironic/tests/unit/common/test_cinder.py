@@ -16,6 +16,7 @@ import json
 
 from cinderclient import exceptions as cinder_exceptions
 import cinderclient.v3 as cinderclient
+import eventlet
 import mock
 from oslo_utils import uuidutils
 from six.moves import http_client
@@ -66,6 +67,9 @@ class TestCinderClient(base.TestCase):
         self.config(timeout=1,
                     retries=2,
                     group='cinder')
+        patcher = mock.patch.object(cinder, '_CINDER_CLIENT', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_get_client(self, mock_client_init, mock_session):
         mock_session_obj = mock.Mock()
@@ -90,6 +94,14 @@ class TestCinderClient(base.TestCase):
         mock_client_init.assert_called_once_with(mock.ANY, **expected)
         mock_session.assert_called_once_with()
 
+    def test_get_client_shared(self, mock_client_init, mock_session):
+        mock_client_init.return_value = None
+        client = cinder.get_client()
+        self.assertIs(client, cinder.get_client())
+        mock_client_init.assert_called_once_with(mock.ANY, connect_retries=2,
+                                                 session=mock.ANY)
+        mock_session.assert_called_once_with()
+
     def test_get_client_with_region(self, mock_client_init, mock_session):
         mock_session_obj = mock.Mock()
         expected = {'connect_retries': 2,
@@ -190,6 +202,9 @@ class TestCinderActions(db_base.DbTestCase):
         self.node = object_utils.create_test_node(
             self.context,
             instance_uuid=uuidutils.generate_uuid())
+        patcher = mock.patch.object(cinder, '_CINDER_CLIENT', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     @mock.patch.object(cinderclient.volumes.VolumeManager, 'attach',
                        autospec=True)
@@ -329,7 +344,7 @@ class TestCinderActions(db_base.DbTestCase):
 
         volumes = ['111111111-0000-0000-0000-000000000003',
                    'not_found',
-                   'not_reached']
+                   'other']
         connector = {'foo': 'bar'}
         mock_get.side_effect = __mock_get_side_effect
         mock_create_meta.return_value = {'bar': 'baz'}
@@ -343,16 +358,17 @@ class TestCinderActions(db_base.DbTestCase):
         mock_get.assert_any_call(mock.ANY,
                                  '111111111-0000-0000-0000-000000000003')
         mock_get.assert_any_call(mock.ANY, 'not_found')
-        self.assertEqual(2, mock_get.call_count)
-        mock_reserve.assert_called_once_with(
-            mock.ANY, '111111111-0000-0000-0000-000000000003')
-        mock_init.assert_called_once_with(
-            mock.ANY, '111111111-0000-0000-0000-000000000003', connector)
-        mock_attach.assert_called_once_with(
-            mock.ANY, '111111111-0000-0000-0000-000000000003',
-            self.node.instance_uuid, None)
-        mock_set_meta.assert_called_once_with(
-            mock.ANY, '111111111-0000-0000-0000-000000000003', {'bar': 'baz'})
+        mock_get.assert_any_call(mock.ANY, 'other')
+        self.assertEqual(3, mock_get.call_count)
+        # The other volumes are attached, for the caller to detach them
+        for volume_id in ('111111111-0000-0000-0000-000000000003', 'other'):
+            mock_reserve.assert_any_call(mock.ANY, volume_id)
+            mock_init.assert_any_call(mock.ANY, volume_id, connector)
+            mock_attach.assert_any_call(mock.ANY, volume_id,
+                                        self.node.instance_uuid, None)
+            mock_set_meta.assert_any_call(mock.ANY, volume_id,
+                                          {'bar': 'baz'})
+        self.assertEqual(2, mock_reserve.call_count)
 
     @mock.patch.object(cinderclient.volumes.VolumeManager, 'reserve',
                        autospec=True)
@@ -376,6 +392,8 @@ class TestCinderActions(db_base.DbTestCase):
                               connector)
         mock_is_attached.assert_called_once_with(mock.ANY, volume)
 
+    @mock.patch.object(cinderclient.volumes.VolumeManager, 'unreserve',
+                       autospec=True)
     @mock.patch.object(cinderclient.volumes.VolumeManager,
                        'initialize_connection', autospec=True)
     @mock.patch.object(cinderclient.volumes.VolumeManager, 'reserve',
@@ -384,7 +402,7 @@ class TestCinderActions(db_base.DbTestCase):
     @mock.patch.object(cinder, '_create_metadata_dictionary', autospec=True)
     def test_attach_volumes_initialize_connection_failure(
             self, mock_create_meta, mock_is_attached, mock_reserve, mock_init,
-            mock_get, mock_set_meta, mock_session):
+            mock_unreserve, mock_get, mock_set_meta, mock_session):
         """Fail attachment upon an initialization failure."""
 
         volume_id = '111111111-0000-0000-0000-000000000003'
@@ -406,7 +424,12 @@ class TestCinderActions(db_base.DbTestCase):
         mock_get.assert_called_once_with(mock.ANY, volume_id)
         mock_reserve.assert_called_once_with(mock.ANY, volume_id)
         mock_init.assert_called_once_with(mock.ANY, volume_id, connector)
+        mock_unreserve.assert_called_once_with(mock.ANY, volume_id)
 
+    @mock.patch.object(cinderclient.volumes.VolumeManager, 'unreserve',
+                       autospec=True)
+    @mock.patch.object(cinderclient.volumes.VolumeManager,
+                       'terminate_connection', autospec=True)
     @mock.patch.object(cinderclient.volumes.VolumeManager, 'attach',
                        autospec=True)
     @mock.patch.object(cinderclient.volumes.VolumeManager,
@@ -417,7 +440,8 @@ class TestCinderActions(db_base.DbTestCase):
     @mock.patch.object(cinder, '_create_metadata_dictionary', autospec=True)
     def test_attach_volumes_attach_record_failure(
             self, mock_create_meta, mock_is_attached, mock_reserve,
-            mock_init, mock_attach, mock_get, mock_set_meta, mock_session):
+            mock_init, mock_attach, mock_term, mock_unreserve, mock_get,
+            mock_set_meta, mock_session):
         """Attach a volume and fail if final record failure occurs"""
         volume_id = '111111111-0000-0000-0000-000000000003'
         volumes = [volume_id]
@@ -445,6 +469,8 @@ class TestCinderActions(db_base.DbTestCase):
         mock_get.assert_called_once_with(mock.ANY, volume_id)
         mock_is_attached.assert_called_once_with(mock.ANY,
                                                  mock_get.return_value)
+        mock_term.assert_called_once_with(mock.ANY, volume_id, connector)
+        mock_unreserve.assert_called_once_with(mock.ANY, volume_id)
 
     @mock.patch.object(cinderclient.volumes.VolumeManager, 'attach',
                        autospec=True)
@@ -762,3 +788,158 @@ class TestCinderActions(db_base.DbTestCase):
             mock_detach.assert_called_once_with(mock.ANY, volume_id, 'qux')
             mock_set_meta.assert_called_once_with(mock.ANY, volume_id,
                                                   {'bar': 'baz'})
+
+
+class FakeVolumeManager(object):
+    """A fake of the volume manager of a cinder client.
+
+    Each request yields to the other green threads, so that the requests
+    for several volumes interleave as they do with a real client.
+    """
+
+    def __init__(self, attachments=None):
+        # Attachments of the volumes, by volume ID
+        self.attachments = attachments or {}
+        # Exceptions raised by the requests, by (method, volume ID)
+        self.failures = {}
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _request(self, method, volume_id, result=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            eventlet.sleep(0)
+            self.calls.append((method, volume_id))
+            if (method, volume_id) in self.failures:
+                raise self.failures[method, volume_id]
+            return result
+        finally:
+            self.in_flight -= 1
+
+    def get(self, volume_id):
+        return self._request('get', volume_id, mock.Mock(
+            id=volume_id, attachments=self.attachments.get(volume_id, [])))
+
+    def reserve(self, volume_id):
+        return self._request('reserve', volume_id)
+
+    def unreserve(self, volume_id):
+        return self._request('unreserve', volume_id)
+
+    def initialize_connection(self, volume_id, connector):
+        return self._request('initialize_connection', volume_id, {
+            'driver_volume_type': 'iscsi',
+            'data': {'target_iqn': 'iqn.2010-10.org.openstack:%s' %
+                     volume_id}})
+
+    def attach(self, volume_id, instance_uuid, mountpoint):
+        return self._request('attach', volume_id)
+
+    def set_metadata(self, volume_id, metadata):
+        return self._request('set_metadata', volume_id)
+
+    def begin_detaching(self, volume_id):
+        return self._request('begin_detaching', volume_id)
+
+    def terminate_connection(self, volume_id, connector):
+        return self._request('terminate_connection', volume_id)
+
+    def detach(self, volume_id, attachment_id):
+        return self._request('detach', volume_id)
+
+
+@mock.patch.object(cinder, 'get_client', autospec=True)
+class TestCinderConcurrentActions(db_base.DbTestCase):
+
+    def setUp(self):
+        super(TestCinderConcurrentActions, self).setUp()
+        mgr_utils.mock_the_extension_manager(driver='fake')
+        self.config(enabled_drivers=['fake'])
+        self.node = object_utils.create_test_node(
+            self.context,
+            instance_uuid=uuidutils.generate_uuid())
+        self.connector = {'foo': 'bar'}
+        self.volumes = ['vol-%d' % i for i in range(6)]
+
+    def _calls(self, volumes, method):
+        return [volume_id for called, volume_id in volumes.calls
+                if called == method]
+
+    def test_attach_volumes(self, mock_client):
+        self.config(request_concurrency=2, group='cinder')
+        volumes = FakeVolumeManager()
+        mock_client.return_value.volumes = volumes
+
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            connected = cinder.attach_volumes(task, self.volumes,
+                                              self.connector)
+
+        self.assertEqual(self.volumes,
+                         [c['data']['volume_id'] for c in connected])
+        self.assertEqual(self.volumes,
+                         [c['data']['ironic_volume_uuid'] for c in connected])
+        self.assertEqual(2, volumes.max_in_flight)
+        self.assertEqual(set(self.volumes),
+                         set(self._calls(volumes, 'attach')))
+        # The requests for the volumes interleave
+        self.assertNotEqual(
+            [('get', 'vol-0'), ('reserve', 'vol-0')], volumes.calls[:2])
+
+    def test_attach_volumes_partial_failure(self, mock_client):
+        volumes = FakeVolumeManager(
+            attachments={'vol-1': [{'server_id': self.node.uuid}]})
+        volumes.failures[('attach', 'vol-2')] = (
+            cinder_exceptions.ClientException(http_client.NOT_ACCEPTABLE))
+        volumes.failures[('initialize_connection', 'vol-3')] = (
+            cinder_exceptions.ClientException(http_client.NOT_ACCEPTABLE))
+        mock_client.return_value.volumes = volumes
+
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.assertRaisesRegex(exception.StorageError,
+                                   'attachment for volume vol-2',
+                                   cinder.attach_volumes, task, self.volumes,
+                                   self.connector)
+
+        # The failed volumes are rolled back, the others are left attached
+        self.assertEqual(['vol-2'],
+                         self._calls(volumes, 'terminate_connection'))
+        self.assertEqual({'vol-2', 'vol-3'},
+                         set(self._calls(volumes, 'unreserve')))
+        self.assertEqual({'vol-0', 'vol-4', 'vol-5'},
+                         set(self._calls(volumes, 'set_metadata')))
+        self.assertNotIn('vol-1', self._calls(volumes, 'reserve'))
+
+    def test_detach_volumes(self, mock_client):
+        self.config(request_concurrency=3, group='cinder')
+        volumes = FakeVolumeManager(attachments={
+            volume_id: [{'server_id': self.node.uuid,
+                         'attachment_id': 'att-%s' % volume_id}]
+            for volume_id in self.volumes})
+        mock_client.return_value.volumes = volumes
+
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            cinder.detach_volumes(task, self.volumes, self.connector)
+
+        self.assertEqual(3, volumes.max_in_flight)
+        self.assertEqual(set(self.volumes),
+                         set(self._calls(volumes, 'detach')))
+
+    def test_detach_volumes_partial_failure(self, mock_client):
+        volumes = FakeVolumeManager(attachments={
+            volume_id: [{'server_id': self.node.uuid}]
+            for volume_id in self.volumes})
+        volumes.failures[('terminate_connection', 'vol-1')] = (
+            cinder_exceptions.ClientException(http_client.NOT_ACCEPTABLE))
+        mock_client.return_value.volumes = volumes
+
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.assertRaisesRegex(exception.StorageError,
+                                   'Failed to detach volume vol-1',
+                                   cinder.detach_volumes, task, self.volumes,
+                                   self.connector)
+
+        # The other volumes are detached anyway
+        self.assertEqual(set(self.volumes) - {'vol-1'},
+                         set(self._calls(volumes, 'detach')))
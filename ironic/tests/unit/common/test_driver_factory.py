@@ -24,6 +24,7 @@ from ironic.drivers import fake_hardware
 from ironic.drivers import hardware_type
 from ironic.drivers.modules import fake
 from ironic.drivers.modules import noop
+from ironic import objects
 from ironic.tests import base
 from ironic.tests.unit.db import base as db_base
 from ironic.tests.unit.objects import utils as obj_utils
@@ -768,3 +769,85 @@ class HardwareTypeLoadTestCase(db_base.DbTestCase):
 
     def test_enabled_supported_interfaces_non_default(self):
         self._test_enabled_supported_interfaces(True)
+
+
+@mock.patch.object(driver_factory, 'check_and_update_node_interfaces',
+                   autospec=True,
+                   side_effect=driver_factory.check_and_update_node_interfaces)
+class DriverCompositionCacheTestCase(db_base.DbTestCase):
+
+    def setUp(self):
+        super(DriverCompositionCacheTestCase, self).setUp()
+        self.config(dhcp_provider=None, group='dhcp')
+        for iface in drivers_base.ALL_INTERFACES - {'network', 'storage'}:
+            enabled = ['fake']
+            if iface in OPTIONAL_INTERFACES:
+                enabled.append('no-%s' % iface)
+            self.config(**{'enabled_%s_interfaces' % iface: enabled})
+        self.node = obj_utils.create_test_node(self.context,
+                                               driver='fake-hardware')
+
+    def _build(self, node=None):
+        if node is None:
+            node = objects.Node.get(self.context, self.node.id)
+        task = mock.Mock(spec=task_manager.TaskManager, node=node)
+        return driver_factory.build_driver_for_task(task)
+
+    def test_cached(self, mock_check):
+        first = self._build()
+        node = objects.Node.get(self.context, self.node.id)
+        second = self._build(node)
+        self.assertEqual(1, mock_check.call_count)
+        self.assertIsNot(first, second)
+        for iface in drivers_base.ALL_INTERFACES:
+            self.assertIsNotNone(getattr(second, iface))
+            self.assertIs(getattr(first, iface), getattr(second, iface))
+        # Calculated defaults are set on cache hits as well
+        self.assertEqual('fake', node.power_interface)
+        self.assertEqual('noop', node.network_interface)
+
+    def test_different_interfaces(self, mock_check):
+        self._build()
+        node = obj_utils.create_test_node(self.context,
+                                          uuid=uuidutils.generate_uuid(),
+                                          driver='fake-hardware',
+                                          raid_interface='no-raid')
+        driver = self._build(node)
+        self.assertEqual(2, mock_check.call_count)
+        self.assertIsInstance(driver.raid, noop.NoRAID)
+
+    def test_invalidated_on_reload(self, mock_check):
+        self._build()
+        driver_factory._INTERFACE_LOADERS['power']._extension_manager = None
+        self._build()
+        self.assertEqual(2, mock_check.call_count)
+        self._build()
+        self.assertEqual(2, mock_check.call_count)
+
+    def test_driver_changed(self, mock_check):
+        node = objects.Node.get(self.context, self.node.id)
+        self._build(node)
+        node.driver = 'fake-hardware'
+        self._build(node)
+        self.assertEqual(2, mock_check.call_count)
+
+    def test_errors_not_cached(self, mock_check):
+        self.node.power_interface = 'foobar'
+        self.node.save()
+        for i in range(2):
+            self.assertRaises(exception.InterfaceNotFoundInEntrypoint,
+                              self._build)
+        self.assertEqual(2, mock_check.call_count)
+
+    @mock.patch.object(driver_factory.LOG, 'warning', autospec=True)
+    def test_must_be_none_not_cached(self, mock_warn, mock_check):
+        node = obj_utils.create_test_node(self.context,
+                                          uuid=uuidutils.generate_uuid(),
+                                          driver='fake',
+                                          power_interface='fake',
+                                          network_interface='noop',
+                                          storage_interface='noop')
+        for i in range(2):
+            self._build(objects.Node.get(self.context, node.id))
+        self.assertEqual(2, mock_check.call_count)
+        self.assertEqual(2, mock_warn.call_count)
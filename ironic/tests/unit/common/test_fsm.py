@@ -12,8 +12,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from ironic.common import exception as excp
 from ironic.common import fsm
+from ironic.common import states
 from ironic.tests import base
 
 
@@ -96,3 +99,133 @@ class FSMTest(base.TestCase):
         self.fsm.initialize('wakeup')
         self.assertRaises(excp.InvalidState, self.fsm.process_event,
                           'walk', 'daydream')
+
+
+class FrozenFSMTest(base.TestCase):
+    def setUp(self):
+        super(FrozenFSMTest, self).setUp()
+        self.on_enter = mock.Mock()
+        self.on_exit = mock.Mock()
+        m = fsm.FSM()
+        m.add_state('working', stable=True, on_enter=self.on_enter,
+                    on_exit=self.on_exit)
+        m.add_state('daydream')
+        m.add_state('wakeup', target='working', on_enter=self.on_enter,
+                    on_exit=self.on_exit)
+        m.add_state('play', stable=True)
+        m.add_state('sleep', terminal=True)
+        m.add_transition('wakeup', 'working', 'walk')
+        m.add_transition('working', 'wakeup', 'rest')
+        self.machine = m
+        self.table = fsm.FrozenFSM(m)
+        self.cursor = self.table.cursor()
+
+    def test_source_frozen(self):
+        self.assertTrue(self.machine.frozen)
+        self.assertRaises(excp.InvalidState, self.machine.add_transition,
+                          'working', 'play', 'jump')
+
+    def test_states(self):
+        self.assertIn('working', self.table)
+        self.assertNotIn('foo', self.table)
+        self.assertEqual(sorted(self.machine.states),
+                         sorted(self.table.states))
+
+    def test_is_stable(self):
+        self.assertTrue(self.cursor.is_stable('working'))
+        self.assertFalse(self.cursor.is_stable('daydream'))
+        self.assertRaises(excp.InvalidState, self.cursor.is_stable, 'foo')
+
+    def test_cursors_independent(self):
+        other = self.table.cursor()
+        self.cursor.initialize('wakeup')
+        other.initialize('working')
+        self.cursor.process_event('walk')
+        self.assertEqual('working', self.cursor.current_state)
+        other.process_event('rest')
+        self.assertEqual('wakeup', other.current_state)
+        self.assertEqual('working', self.cursor.current_state)
+
+    def test_initialize(self):
+        # no start state
+        self.assertRaises(excp.InvalidState, self.cursor.initialize)
+        self.assertRaises(excp.InvalidState, self.cursor.initialize, 'foo')
+        self.assertRaises(excp.InvalidState, self.cursor.initialize, 'sleep')
+
+        self.cursor.initialize('working')
+        self.assertEqual('working', self.cursor.current_state)
+        self.assertIsNone(self.cursor.target_state)
+
+        # default target state
+        self.cursor.initialize('wakeup')
+        self.assertEqual('wakeup', self.cursor.current_state)
+        self.assertEqual('working', self.cursor.target_state)
+
+        # specify (it overrides default) target state
+        self.cursor.initialize('wakeup', 'play')
+        self.assertEqual('play', self.cursor.target_state)
+
+        # specify an invalid target state
+        self.assertRaises(excp.InvalidState, self.cursor.initialize,
+                          'wakeup', 'daydream')
+
+    def test_initialize_default_start_state(self):
+        m = fsm.FSM()
+        m.add_state('working', stable=True)
+        m.default_start_state = 'working'
+        cursor = fsm.FrozenFSM(m).cursor()
+        cursor.initialize()
+        self.assertEqual('working', cursor.current_state)
+
+    def test_process_event(self):
+        # default target state
+        self.cursor.initialize('wakeup')
+        self.cursor.process_event('walk')
+        self.assertEqual('working', self.cursor.current_state)
+        self.assertIsNone(self.cursor.target_state)
+        self.on_exit.assert_called_once_with('wakeup', 'walk')
+        self.on_enter.assert_called_once_with('working', 'walk')
+
+        # specify (it overrides default) target state
+        self.cursor.initialize('wakeup')
+        self.cursor.process_event('walk', 'play')
+        self.assertEqual('working', self.cursor.current_state)
+        self.assertEqual('play', self.cursor.target_state)
+
+        # new state has a default target
+        self.cursor.process_event('rest')
+        self.assertEqual('wakeup', self.cursor.current_state)
+        self.assertEqual('working', self.cursor.target_state)
+
+        # specify an invalid target state
+        self.cursor.initialize('wakeup')
+        self.assertRaises(excp.InvalidState, self.cursor.process_event,
+                          'walk', 'daydream')
+
+    def test_process_event_invalid(self):
+        self.assertRaises(excp.InvalidState, self.cursor.process_event,
+                          'walk')
+        self.cursor.initialize('working')
+        self.assertRaisesRegex(excp.InvalidState, 'no defined transition',
+                               self.cursor.process_event, 'walk')
+        self.assertEqual('working', self.cursor.current_state)
+        self.assertFalse(self.on_exit.called)
+
+    def test_is_actionable_event(self):
+        self.assertFalse(self.cursor.is_actionable_event('walk'))
+        self.cursor.initialize('wakeup')
+        self.assertTrue(self.cursor.is_actionable_event('walk'))
+        self.assertFalse(self.cursor.is_actionable_event('rest'))
+
+    def test_matches_fsm(self):
+        # The shared table of ironic states behaves like copies of the machine
+        for state in states.machine.states:
+            for event in states.machine._transitions[state]:
+                m = states.machine.copy()
+                m.initialize(state)
+                m.process_event(event)
+                cursor = states.frozen_machine.cursor()
+                cursor.initialize(state)
+                cursor.process_event(event)
+                self.assertEqual((m.current_state, m.target_state),
+                                 (cursor.current_state, cursor.target_state))
@@ -823,6 +823,12 @@ class TestServiceUtils(base.TestCase):
         self.assertEqual((u'image_\u00F9\u00FA\u00EE\u0111',
                           'https://127.0.0.1:9292', True), parsed_href)
 
+    def test_parse_image_id(self):
+        for image_href in ('image_uuid', 'glance://image_uuid',
+                           'https://127.0.0.1:9292/v2/images/image_uuid'):
+            self.assertEqual('image_uuid',
+                             service_utils.parse_image_id(image_href))
+
     def test_is_glance_image(self):
         image_href = u'uui\u0111'
         self.assertFalse(service_utils.is_glance_image(image_href))
@@ -81,3 +81,22 @@ class HashRingManagerTestCase(db_base.DbTestCase):
         self.register_conductors()
         self.ring_manager.updated_at = time.time() - 31
         self.ring_manager.__getitem__('driver1')
+
+    def test_hash_ring_manager_saturation(self):
+        self.register_conductors()
+        self.dbapi.touch_conductor('host1', saturation=0.5)
+        self.assertEqual({'host1': 0.5}, self.ring_manager.saturation)
+        # Cached until the reset interval is exceeded
+        self.dbapi.touch_conductor('host2', saturation=1.0)
+        self.assertEqual({'host1': 0.5}, self.ring_manager.saturation)
+        self.ring_manager.saturation_updated_at = (
+            time.time() - CONF.hash_ring_reset_interval - 1)
+        self.assertEqual({'host1': 0.5, 'host2': 1.0},
+                         self.ring_manager.saturation)
+
+    def test_hash_ring_manager_reset_saturation(self):
+        self.register_conductors()
+        self.assertEqual({}, self.ring_manager.saturation)
+        self.dbapi.touch_conductor('host1', saturation=0.5)
+        self.ring_manager.reset()
+        self.assertEqual({'host1': 0.5}, self.ring_manager.saturation)
@@ -0,0 +1,179 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+import mock
+
+from ironic.common import metrics
+from ironic.tests import base
+
+
+class SanitizeNameTestCase(base.TestCase):
+
+    def test_valid(self):
+        self.assertEqual('ironic_foo:bar', metrics.sanitize_name(
+            'ironic_foo:bar'))
+
+    def test_invalid_chars(self):
+        self.assertEqual('ironic_conductor_manager_do_sync',
+                         metrics.sanitize_name(
+                             'ironic.conductor.manager.do-sync'))
+
+    def test_leading_digit(self):
+        self.assertEqual('_1foo', metrics.sanitize_name('1foo'))
+
+
+class MetricsTestCase(base.TestCase):
+
+    def test_counter(self):
+        counter = metrics.Counter('foo')
+        counter.inc()
+        counter.inc(2)
+        counter.inc(result='hit')
+        self.assertEqual(3, counter.get())
+        self.assertEqual(1, counter.get(result='hit'))
+        self.assertEqual(0, counter.get(result='miss'))
+        self.assertEqual([('foo', (), 3), ('foo', (('result', 'hit'),), 1)],
+                         counter.samples())
+
+    def test_counter_set(self):
+        counter = metrics.Counter('foo')
+        counter.set(5, task='sync')
+        counter.inc(task='sync')
+        self.assertEqual(6, counter.get(task='sync'))
+        self.assertEqual(0, counter.get())
+
+    def test_counter_negative(self):
+        counter = metrics.Counter('foo')
+        self.assertRaises(ValueError, counter.inc, -1)
+
+    def test_gauge(self):
+        gauge = metrics.Gauge('foo')
+        gauge.set(5, driver='ipmi')
+        gauge.inc(driver='ipmi')
+        gauge.dec(3, driver='ipmi')
+        self.assertEqual(3, gauge.get(driver='ipmi'))
+        self.assertEqual(0, gauge.get())
+
+    def test_histogram(self):
+        histogram = metrics.Histogram('foo', buckets=(1, 0.1))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+        self.assertEqual((3, 5.55), histogram.get())
+        self.assertEqual([('foo_bucket', (('le', '0.1'),), 1),
+                          ('foo_bucket', (('le', '1.0'),), 2),
+                          ('foo_bucket', (('le', '+Inf'),), 3),
+                          ('foo_count', (), 3),
+                          ('foo_sum', (), 5.55)],
+                         histogram.samples())
+
+    def test_reset(self):
+        counter = metrics.Counter('foo')
+        counter.inc()
+        counter.reset()
+        self.assertEqual(0, counter.get())
+        self.assertEqual([], counter.samples())
+
+
+class RegistryTestCase(base.TestCase):
+
+    def setUp(self):
+        super(RegistryTestCase, self).setUp()
+        self.registry = metrics.Registry()
+
+    def test_get_or_create(self):
+        counter = self.registry.counter('ironic.foo', 'Foo')
+        self.assertIs(counter, self.registry.counter('ironic.foo'))
+        self.assertEqual('ironic_foo', counter.name)
+        self.assertEqual('Foo', counter.documentation)
+
+    def test_type_mismatch(self):
+        self.registry.counter('foo')
+        self.assertRaises(ValueError, self.registry.gauge, 'foo')
+
+    def test_render(self):
+        self.registry.counter('foo_total', 'Number of foos').inc(
+            result='a "b"')
+        self.registry.gauge('bar').set(2)
+        self.registry.histogram('baz', buckets=(1,)).observe(0.5)
+        expected = ('# HELP foo_total Number of foos\n'
+                    '# TYPE foo_total counter\n'
+                    'foo_total{result="a \\"b\\""} 1.0\n'
+                    '# TYPE bar gauge\n'
+                    'bar 2.0\n'
+                    '# TYPE baz histogram\n'
+                    'baz_bucket{le="1.0"} 1.0\n'
+                    'baz_bucket{le="+Inf"} 1.0\n'
+                    'baz_count 1.0\n'
+                    'baz_sum 0.5\n')
+        self.assertEqual(expected, self.registry.render())
+
+    def test_render_collectors(self):
+        gauge = self.registry.gauge('foo')
+        collector = mock.Mock(side_effect=lambda: gauge.set(42))
+        failing = mock.Mock(side_effect=RuntimeError('boom'))
+        self.registry.add_collector(failing)
+        self.registry.add_collector(collector)
+        self.assertIn('foo 42.0\n', self.registry.render())
+        failing.assert_called_once_with()
+
+        self.registry.remove_collector(collector)
+        self.registry.remove_collector(collector)
+        gauge.set(0)
+        self.assertIn('foo 0.0\n', self.registry.render())
+        collector.assert_called_once_with()
+
+    def test_reset(self):
+        counter = self.registry.counter('foo')
+        counter.inc()
+        self.registry.reset()
+        self.assertEqual(0, counter.get())
+        self.assertIs(counter, self.registry.counter('foo'))
+
+
+class ExporterTestCase(base.TestCase):
+
+    def setUp(self):
+        super(ExporterTestCase, self).setUp()
+        self.start_response = mock.Mock()
+
+    @mock.patch.object(metrics.REGISTRY, 'render', autospec=True)
+    def test_app(self, mock_render):
+        mock_render.return_value = 'foo 1.0\n'
+        result = metrics._exporter_app({'REQUEST_METHOD': 'GET'},
+                                       self.start_response)
+        self.assertEqual([b'foo 1.0\n'], result)
+        self.start_response.assert_called_once_with(
+            '200 OK', [('Content-Type', metrics.CONTENT_TYPE),
+                       ('Content-Length', '8')])
+
+    def test_app_wrong_method(self):
+        metrics._exporter_app({'REQUEST_METHOD': 'POST'}, self.start_response)
+        self.start_response.assert_called_once_with(
+            '405 Method Not Allowed', mock.ANY)
+
+    @mock.patch.object(eventlet, 'spawn', autospec=True)
+    @mock.patch.object(eventlet, 'listen', autospec=True)
+    def test_start_stop(self, mock_listen, mock_spawn):
+        exporter = metrics.Exporter('127.0.0.1', 9608)
+        exporter.start()
+        mock_listen.assert_called_once_with(('127.0.0.1', 9608))
+        mock_spawn.assert_called_once_with(
+            metrics.wsgi.server, mock_listen.return_value,
+            metrics._exporter_app, log_output=False)
+
+        exporter.stop()
+        mock_spawn.return_value.kill.assert_called_once_with()
+        mock_listen.return_value.close.assert_called_once_with()
+        # Stopping again is a no-op
+        exporter.stop()
@@ -0,0 +1,70 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from ironic_lib import metrics as ironic_lib_metrics
+import mock
+
+from ironic.common import metrics
+from ironic.common import metrics_utils
+from ironic.tests import base
+
+
+class RegistryMetricLoggerTestCase(base.TestCase):
+
+    def setUp(self):
+        super(RegistryMetricLoggerTestCase, self).setUp()
+        self.registry = metrics.Registry()
+        self.backend = mock.Mock(spec=ironic_lib_metrics.NoopMetricLogger,
+                                 _prefix='ironic.foo', _delimiter='.')
+        self.logger = metrics_utils.RegistryMetricLogger(self.backend,
+                                                         self.registry)
+
+    def test_gauge(self):
+        self.logger.send_gauge('ironic.foo.bar', 10)
+        self.backend._gauge.assert_called_once_with('ironic.foo.bar', 10)
+        self.assertEqual(10, self.registry.gauge('ironic_foo_bar').get())
+
+    def test_counter(self):
+        self.logger.send_counter('ironic.foo.bar', 2)
+        self.logger.send_counter('ironic.foo.bar', 1)
+        self.backend._counter.assert_called_with('ironic.foo.bar', 1,
+                                                 sample_rate=None)
+        self.assertEqual(3,
+                         self.registry.counter('ironic_foo_bar_total').get())
+
+    def test_timer(self):
+        self.logger.send_timer('ironic.foo.bar', 250)
+        self.backend._timer.assert_called_once_with('ironic.foo.bar', 250)
+        self.assertEqual(
+            (1, 0.25), self.registry.histogram('ironic_foo_bar_seconds').get())
+
+    def test_timer_decorator(self):
+        @self.logger.timer('bar')
+        def func():
+            return 42
+
+        self.assertEqual(42, func())
+        self.assertEqual(
+            1, self.registry.histogram('ironic_foo_bar_seconds').get()[0])
+
+
+class GetMetricsLoggerTestCase(base.TestCase):
+
+    def test_get_metrics_logger(self):
+        self.config(global_prefix='global', group='metrics')
+        logger = metrics_utils.get_metrics_logger('ironic.foo')
+        self.assertIsInstance(logger, metrics_utils.RegistryMetricLogger)
+        self.assertIsInstance(logger._backend,
+                              ironic_lib_metrics.NoopMetricLogger)
+        self.assertIs(metrics.REGISTRY, logger._registry)
+        self.assertEqual('global.ironic.foo.bar',
+                         logger.get_metric_name('bar'))
@@ -10,6 +10,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import eventlet
 import mock
 from neutronclient.common import exceptions as neutron_client_exc
 from neutronclient.v2_0 import client
@@ -43,6 +44,9 @@ class TestNeutronClient(base.TestCase):
         self.config(insecure=False,
                     cafile='test-file',
                     group='neutron')
+        patcher = mock.patch.object(neutron, '_NEUTRON_CLIENT', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_get_neutron_client_with_token(self, mock_client_init,
                                            mock_session):
@@ -74,6 +78,17 @@ class TestNeutronClient(base.TestCase):
         neutron.get_client(token=None)
         mock_client_init.assert_called_once_with(**expected)
 
+    def test_get_neutron_client_shared(self, mock_client_init,
+                                       mock_session):
+        mock_client_init.return_value = None
+        client = neutron.get_client()
+        self.assertIs(client, neutron.get_client())
+        self.assertEqual(1, mock_client_init.call_count)
+        # A client with a token is not shared
+        mock_session.return_value.get_endpoint.return_value = 'fake-url'
+        self.assertIsNot(client, neutron.get_client(token='test-token'))
+        self.assertEqual(2, mock_client_init.call_count)
+
     def test_get_neutron_client_with_region(self, mock_client_init,
                                             mock_session):
         self.config(region_name='fake_region',
@@ -253,6 +268,41 @@ class TestNeutronNetworkActions(db_base.DbTestCase):
             neutron._verify_security_groups, sg_ids, client)
         client.list_security_groups.assert_called_once_with()
 
+    def test_verify_sec_groups_cached(self):
+        sg_ids = [uuidutils.generate_uuid() for i in range(2)]
+        client = mock.MagicMock()
+        client.list_security_groups.return_value = {
+            'security_groups': [{'id': sg} for sg in sg_ids]}
+
+        neutron._verify_security_groups(sg_ids, client)
+        neutron._verify_security_groups(sg_ids[:1], client)
+        client.list_security_groups.assert_called_once_with()
+
+    def test_verify_sec_groups_cached_new_group(self):
+        sg_ids = [uuidutils.generate_uuid() for i in range(2)]
+        client = mock.MagicMock()
+        client.list_security_groups.side_effect = [
+            {'security_groups': [{'id': sg_ids[0]}]},
+            {'security_groups': [{'id': sg} for sg in sg_ids]}]
+
+        neutron._verify_security_groups(sg_ids[:1], client)
+        # The group created since the previous lookup is looked up again
+        neutron._verify_security_groups(sg_ids, client)
+        self.assertEqual(2, client.list_security_groups.call_count)
+        neutron._verify_security_groups(sg_ids, client)
+        self.assertEqual(2, client.list_security_groups.call_count)
+
+    def test_verify_sec_groups_cache_disabled(self):
+        self.config(lookup_cache_ttl=0, group='neutron')
+        sg_ids = [uuidutils.generate_uuid()]
+        client = mock.MagicMock()
+        client.list_security_groups.return_value = {
+            'security_groups': [{'id': sg_ids[0]}]}
+
+        neutron._verify_security_groups(sg_ids, client)
+        neutron._verify_security_groups(sg_ids, client)
+        self.assertEqual(2, client.list_security_groups.call_count)
+
     def test_verify_sec_groups_exception_by_neutronclient(self):
         sg_ids = []
         for i in range(2):
@@ -313,6 +363,18 @@ class TestNeutronNetworkActions(db_base.DbTestCase):
                 self.network_uuid)
             rollback_mock.assert_called_once_with(task, self.network_uuid)
 
+    @mock.patch.object(neutron, 'rollback_ports')
+    @mock.patch.object(neutron, 'invalidate_lookup_cache', autospec=True)
+    def test_add_network_not_found(self, invalidate_mock, rollback_mock):
+        self.client_mock.create_port.side_effect = \
+            neutron_client_exc.NetworkNotFoundClient
+
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.assertRaises(
+                exception.NetworkError, neutron.add_ports_to_network, task,
+                self.network_uuid)
+        invalidate_mock.assert_called_once_with()
+
     @mock.patch.object(neutron, 'LOG')
     def test_add_network_create_some_ports_fail(self, log_mock):
         object_utils.create_test_port(
@@ -321,14 +383,45 @@ class TestNeutronNetworkActions(db_base.DbTestCase):
             address='52:54:55:cf:2d:32',
             extra={'vif_port_id': uuidutils.generate_uuid()}
         )
+        # The bulk creation fails, then the ports are created one by one
         self.client_mock.create_port.side_effect = [
+            neutron_client_exc.ConnectionFailed,
             {'port': self.neutron_port}, neutron_client_exc.ConnectionFailed]
         with task_manager.acquire(self.context, self.node.uuid) as task:
-            neutron.add_ports_to_network(task, self.network_uuid)
-            self.assertIn("Could not create neutron port for node's",
+            ports = neutron.add_ports_to_network(task, self.network_uuid)
+            self.assertEqual(1, len(ports))
+            self.assertIn("at once, creating them one by one",
                           log_mock.warning.call_args_list[0][0][0])
-            self.assertIn("Some errors were encountered when updating",
+            self.assertIn("Could not create neutron port for node's",
                           log_mock.warning.call_args_list[1][0][0])
+            self.assertIn("Some errors were encountered when updating",
+                          log_mock.warning.call_args_list[2][0][0])
+        self.assertEqual(3, self.client_mock.create_port.call_count)
+        self.assertEqual(2, len(self.client_mock.create_port.call_args_list[
+            0][0][0]['ports']))
+
+    def test_add_network_create_ports_bulk(self):
+        port2 = object_utils.create_test_port(
+            self.context, node_id=self.node.id,
+            uuid=uuidutils.generate_uuid(),
+            address='52:54:55:cf:2d:32',
+            extra={'vif_port_id': uuidutils.generate_uuid(),
+                   'client-id': self._CLIENT_ID})
+        self.client_mock.create_port.return_value = {
+            'ports': [{'id': 'neutron-port-1'}, {'id': 'neutron-port-2'}]}
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            ports = neutron.add_ports_to_network(task, self.network_uuid)
+            self.assertEqual({self.ports[0].uuid: 'neutron-port-1',
+                              port2.uuid: 'neutron-port-2'}, ports)
+        body = self.client_mock.create_port.call_args[0][0]
+        self.assertEqual([self.ports[0].address, port2.address],
+                         [p['mac_address'] for p in body['ports']])
+        # The DHCP options of a port are not shared with the others
+        self.assertNotIn('extra_dhcp_opts', body['ports'][0])
+        self.assertEqual(
+            [{'opt_name': 'client-id', 'opt_value': self._CLIENT_ID}],
+            body['ports'][1]['extra_dhcp_opts'])
+        self.client_mock.create_port.assert_called_once_with(mock.ANY)
 
     @mock.patch.object(neutron, 'remove_neutron_ports')
     def test_remove_ports_from_network(self, remove_mock):
@@ -390,6 +483,20 @@ class TestNeutronNetworkActions(db_base.DbTestCase):
         self.client_mock.delete_port.assert_called_once_with(
             self.neutron_port['id'])
 
+    def test_remove_neutron_ports_some_delete_fail(self):
+        ports = [{'id': 'port%d' % i} for i in range(3)]
+        self.client_mock.list_ports.return_value = {'ports': ports}
+        self.client_mock.delete_port.side_effect = [
+            None, neutron_client_exc.ConnectionFailed, None]
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.assertRaisesRegex(
+                exception.NetworkError, 'Could not remove VIF port1',
+                neutron.remove_neutron_ports, task, {'param': 'value'})
+        # The other ports are deleted anyway
+        self.assertEqual([mock.call('port0'), mock.call('port1'),
+                          mock.call('port2')],
+                         self.client_mock.delete_port.call_args_list)
+
     def test_get_node_portmap(self):
         with task_manager.acquire(self.context, self.node.uuid) as task:
             portmap = neutron.get_node_portmap(task)
@@ -448,6 +555,31 @@ class TestNeutronNetworkActions(db_base.DbTestCase):
         self.assertFalse(log_mock.warning.called)
 
 
+class TestMapRequests(base.TestCase):
+
+    def test_map_requests(self):
+        self.config(request_concurrency=2, group='neutron')
+        running = []
+        max_running = []
+
+        def _request(item):
+            running.append(item)
+            max_running.append(len(running))
+            eventlet.sleep(0)
+            running.remove(item)
+            return item * 2
+
+        self.assertEqual([2, 4, 6, 8], neutron.map_requests(_request,
+                                                            [1, 2, 3, 4]))
+        self.assertEqual(2, max(max_running))
+
+    @mock.patch.object(neutron.eventlet, 'GreenPool', autospec=True)
+    def test_map_requests_one(self, pool_mock):
+        self.assertEqual([2], neutron.map_requests(lambda x: x * 2, [1]))
+        self.assertEqual([], neutron.map_requests(lambda x: x * 2, []))
+        self.assertFalse(pool_mock.called)
+
+
 @mock.patch.object(neutron, 'get_client', autospec=True)
 class TestValidateNetwork(base.TestCase):
     def setUp(self):
@@ -513,6 +645,57 @@ class TestValidateNetwork(base.TestCase):
         net_mock.assert_called_once_with(fields=['id'],
                                          name='name')
 
+    def test_cached(self, client_mock):
+        net_mock = client_mock.return_value.list_networks
+        net_mock.return_value = {'networks': [{'id': self.uuid}]}
+
+        self.assertEqual(self.uuid, neutron.validate_network('name'))
+        self.assertEqual(self.uuid, neutron.validate_network('name'))
+        net_mock.assert_called_once_with(fields=['id'], name='name')
+
+    @mock.patch.object(neutron.time, 'time', autospec=True)
+    def test_cache_expired(self, time_mock, client_mock):
+        self.config(lookup_cache_ttl=60, group='neutron')
+        net_mock = client_mock.return_value.list_networks
+        net_mock.return_value = {'networks': [{'id': self.uuid}]}
+
+        time_mock.return_value = 1000
+        neutron.validate_network('name')
+        time_mock.return_value = 1059
+        neutron.validate_network('name')
+        self.assertEqual(1, net_mock.call_count)
+        time_mock.return_value = 1060
+        neutron.validate_network('name')
+        self.assertEqual(2, net_mock.call_count)
+
+    def test_cache_invalidated(self, client_mock):
+        net_mock = client_mock.return_value.list_networks
+        net_mock.return_value = {'networks': [{'id': self.uuid}]}
+
+        neutron.validate_network('name')
+        neutron.invalidate_lookup_cache()
+        neutron.validate_network('name')
+        self.assertEqual(2, net_mock.call_count)
+
+    def test_cache_disabled(self, client_mock):
+        self.config(lookup_cache_ttl=0, group='neutron')
+        net_mock = client_mock.return_value.list_networks
+        net_mock.return_value = {'networks': [{'id': self.uuid}]}
+
+        neutron.validate_network('name')
+        neutron.validate_network('name')
+        self.assertEqual(2, net_mock.call_count)
+
+    def test_not_found_not_cached(self, client_mock):
+        net_mock = client_mock.return_value.list_networks
+        net_mock.side_effect = [{'networks': []},
+                                {'networks': [{'id': self.uuid}]}]
+
+        self.assertRaises(exception.InvalidParameterValue,
+                          neutron.validate_network, 'name')
+        self.assertEqual(self.uuid, neutron.validate_network('name'))
+        self.assertEqual(2, net_mock.call_count)
+
 
 @mock.patch.object(neutron, 'get_client', autospec=True)
 class TestUpdatePortAddress(base.TestCase):
@@ -730,6 +913,23 @@ class TestGetNetworkByUUIDOrName(base.TestCase):
                           self.client, network_name)
         self.client.list_networks.assert_called_once_with(name=network_name)
 
+    def test__get_network_by_uuid_or_name_cached_by_fields(self):
+        network_uuid = '9acb0256-2c1b-420a-b9d7-62bee90b6ed7'
+        self.client.list_networks.side_effect = [
+            {'networks': [{'id': network_uuid}]},
+            {'networks': [{'segments': []}]}]
+
+        self.assertEqual({'id': network_uuid},
+                         neutron._get_network_by_uuid_or_name(
+                             self.client, network_uuid, fields=['id']))
+        self.assertEqual({'segments': []},
+                         neutron._get_network_by_uuid_or_name(
+                             self.client, network_uuid, fields=['segments']))
+        self.assertEqual({'id': network_uuid},
+                         neutron._get_network_by_uuid_or_name(
+                             self.client, network_uuid, fields=['id']))
+        self.assertEqual(2, self.client.list_networks.call_count)
+
 
 @mock.patch.object(neutron, '_get_network_by_uuid_or_name', autospec=True)
 @mock.patch.object(neutron, '_get_port_by_uuid', autospec=True)
@@ -0,0 +1,124 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from ironic.common import notification_queue
+from ironic.common import rpc
+from ironic.tests import base
+
+
+@mock.patch.object(rpc, 'get_versioned_notifier', autospec=True)
+class NotificationQueueTestCase(base.TestCase):
+
+    def setUp(self):
+        super(NotificationQueueTestCase, self).setUp()
+        self.queue = notification_queue.NotificationQueue(3, 2)
+        self.context = mock.Mock()
+        self.addCleanup(self.queue.flush)
+
+    def _put(self, event_type, level='info', publisher_id='ironic.host'):
+        return self.queue.put(self.context, publisher_id, level, event_type,
+                              {'event': event_type})
+
+    def test_put_and_flush(self, mock_get_notifier):
+        self.assertTrue(self._put('event1'))
+        self.assertTrue(self._put('event2', level='error'))
+        self.queue.flush()
+        notifier = mock_get_notifier.return_value
+        notifier.info.assert_called_once_with(
+            self.context, event_type='event1', payload={'event': 'event1'})
+        notifier.error.assert_called_once_with(
+            self.context, event_type='event2', payload={'event': 'event2'})
+        self.assertEqual(2, self.queue.queued)
+        self.assertEqual(2, self.queue.sent)
+        self.assertEqual(0, self.queue.dropped)
+        self.assertIsNone(self.queue._thread)
+
+    def test_batch_notifier_reused(self, mock_get_notifier):
+        self.queue._ensure_publisher = mock.Mock()
+        self._put('event1')
+        self._put('event2')
+        self._put('event-other', publisher_id='ironic.other')
+        self.queue.flush()
+        self.assertEqual(2, mock_get_notifier.call_count)
+        mock_get_notifier.assert_any_call('ironic.host')
+        mock_get_notifier.assert_any_call('ironic.other')
+        self.assertEqual(3, self.queue.sent)
+
+    @mock.patch.object(notification_queue.LOG, 'warning', autospec=True)
+    def test_overflow(self, mock_warn, mock_get_notifier):
+        self.queue._ensure_publisher = mock.Mock()
+        for i in range(3):
+            self.assertTrue(self._put('event%d' % i))
+        self.assertFalse(self._put('event3'))
+        self.assertFalse(self._put('event4'))
+        self.assertEqual(3, self.queue.queued)
+        self.assertEqual(2, self.queue.dropped)
+        # Only warn once per overflow
+        self.assertEqual(1, mock_warn.call_count)
+
+        self.queue.flush()
+        self.assertEqual(3, self.queue.sent)
+        self.assertTrue(self._put('event5'))
+
+    @mock.patch.object(notification_queue.LOG, 'exception', autospec=True)
+    def test_publish_failure(self, mock_log, mock_get_notifier):
+        notifier = mock_get_notifier.return_value
+        notifier.info.side_effect = [Exception('boom'), None]
+        self._put('event1')
+        self._put('event2')
+        self.queue.flush()
+        self.assertEqual(1, self.queue.failed)
+        self.assertEqual(1, self.queue.sent)
+        self.assertTrue(mock_log.called)
+
+    def test_publisher_restarted(self, mock_get_notifier):
+        self._put('event1')
+        self.queue.flush()
+        self._put('event2')
+        self.assertIsNotNone(self.queue._thread)
+        self.queue.flush()
+        self.assertEqual(2, self.queue.sent)
+
+
+class NotificationQueueModuleTestCase(base.TestCase):
+
+    def setUp(self):
+        super(NotificationQueueModuleTestCase, self).setUp()
+        self.addCleanup(setattr, notification_queue, '_QUEUE', None)
+
+    def test_enabled(self):
+        self.assertFalse(notification_queue.enabled())
+        self.config(notification_queue_size=10)
+        self.assertTrue(notification_queue.enabled())
+
+    @mock.patch.object(notification_queue.NotificationQueue, 'put',
+                       autospec=True)
+    def test_put(self, mock_put):
+        self.config(notification_queue_size=10, notification_batch_size=5)
+        notification_queue.put('ctx', 'ironic.host', 'info', 'event', {})
+        queue = notification_queue._QUEUE
+        self.assertEqual(10, queue._queue.maxsize)
+        self.assertEqual(5, queue._batch_size)
+        mock_put.assert_called_once_with(queue, 'ctx', 'ironic.host', 'info',
+                                         'event', {})
+
+    @mock.patch.object(notification_queue.NotificationQueue, 'flush',
+                       autospec=True)
+    def test_flush(self, mock_flush):
+        notification_queue.flush()
+        self.assertFalse(mock_flush.called)
+        self.config(notification_queue_size=10)
+        queue = notification_queue._get_queue()
+        notification_queue.flush()
+        mock_flush.assert_called_once_with(queue)
@@ -167,3 +167,95 @@ class PolicyTestCase(base.TestCase):
         mock_cfg.assert_called_once_with(['--config-file', 'my.cfg'],
                                          project='ironic')
         self.assertEqual(1, mock_gpe.call_count)
+
+
+class PolicyRequestCacheTestCase(base.TestCase):
+    """Tests the caching of policy decisions within a request."""
+
+    def setUp(self):
+        super(PolicyRequestCacheTestCase, self).setUp()
+        rule = oslo_policy.RuleDefault('has_foo_role', "role:foo")
+        self.enforcer = policy.get_enforcer()
+        self.enforcer.register_default(rule)
+        policy.enable_request_cache()
+
+    def test_check_cached(self):
+        creds = {'roles': ['foo'], 'user_id': 'me'}
+        with mock.patch.object(self.enforcer, 'enforce',
+                               autospec=True) as mock_enforce:
+            mock_enforce.return_value = True
+            self.assertTrue(policy.check('has_foo_role', creds, creds))
+            self.assertTrue(policy.check('has_foo_role', dict(creds),
+                                         dict(creds)))
+        mock_enforce.assert_called_once_with('has_foo_role', creds, creds)
+
+    def test_check_cache_keys(self):
+        creds = {'roles': ['foo']}
+        other_creds = {'roles': ['bar']}
+        with mock.patch.object(self.enforcer, 'enforce',
+                               autospec=True) as mock_enforce:
+            policy.check('has_foo_role', creds, creds)
+            policy.check('has_foo_role', other_creds, other_creds)
+            policy.check('has_foo_role', creds, other_creds)
+            policy.check('is_admin', creds, creds)
+        self.assertEqual(4, mock_enforce.call_count)
+
+    def test_check_not_cached_with_extra_args(self):
+        creds = {'roles': ['foo']}
+        with mock.patch.object(self.enforcer, 'enforce',
+                               autospec=True) as mock_enforce:
+            policy.check('has_foo_role', creds, creds, True)
+            policy.check('has_foo_role', creds, creds, True)
+        self.assertEqual(2, mock_enforce.call_count)
+
+    def test_check_not_cached_unhashable(self):
+        creds = {'roles': ['foo'], 'extra': {'a': 'b'}}
+        with mock.patch.object(self.enforcer, 'enforce',
+                               autospec=True) as mock_enforce:
+            policy.check('has_foo_role', creds, creds)
+            policy.check('has_foo_role', creds, creds)
+        self.assertEqual(2, mock_enforce.call_count)
+
+    def test_check_cache_disabled(self):
+        policy.disable_request_cache()
+        creds = {'roles': ['foo']}
+        with mock.patch.object(self.enforcer, 'enforce',
+                               autospec=True) as mock_enforce:
+            policy.check('has_foo_role', creds, creds)
+            policy.check('has_foo_role', creds, creds)
+        self.assertEqual(2, mock_enforce.call_count)
+
+    def test_check_cache_reset(self):
+        creds = {'roles': ['foo']}
+        with mock.patch.object(self.enforcer, 'enforce',
+                               autospec=True) as mock_enforce:
+            policy.check('has_foo_role', creds, creds)
+            policy.enable_request_cache()
+            policy.check('has_foo_role', creds, creds)
+        self.assertEqual(2, mock_enforce.call_count)
+
+    def test_authorize_cached(self):
+        creds = {'roles': ['foo']}
+        with mock.patch.object(self.enforcer, 'authorize',
+                               wraps=self.enforcer.authorize) as mock_auth:
+            self.assertTrue(policy.authorize('has_foo_role', creds, creds))
+            self.assertTrue(policy.authorize('has_foo_role', creds, creds))
+        mock_auth.assert_called_once_with('has_foo_role', creds, creds,
+                                          do_raise=False)
+
+    def test_authorize_forbidden_cached(self):
+        creds = {'roles': ['bar']}
+        with mock.patch.object(self.enforcer, 'authorize',
+                               wraps=self.enforcer.authorize) as mock_auth:
+            for i in range(2):
+                self.assertRaises(
+                    exception.HTTPForbidden,
+                    policy.authorize, 'has_foo_role', creds, creds)
+        self.assertEqual(1, mock_auth.call_count)
+
+    def test_authorize_policy_not_registered(self):
+        creds = {'roles': ['foo']}
+        for i in range(2):
+            self.assertRaises(
+                oslo_policy.PolicyNotRegistered,
+                policy.authorize, 'has_bar_role', creds, creds)
@@ -222,9 +222,9 @@ class TestPXEUtils(db_base.DbTestCase):
 
         self.assertEqual(six.text_type(expected_template), rendered_template)
 
-    @mock.patch('ironic.common.utils.create_link_without_raise', autospec=True)
-    @mock.patch('ironic_lib.utils.unlink_without_raise', autospec=True)
-    def test__write_mac_pxe_configs(self, unlink_mock, create_link_mock):
+    @mock.patch('ironic.common.utils.replace_link_without_raise',
+                autospec=True)
+    def test__write_mac_pxe_configs(self, create_link_mock):
         port_1 = object_utils.create_test_port(
             self.context, node_id=self.node.id,
             address='11:22:33:44:55:66', uuid=uuidutils.generate_uuid())
@@ -237,21 +237,15 @@ class TestPXEUtils(db_base.DbTestCase):
             mock.call(u'../1be26c0b-03f2-4d2e-ae87-c02d7f33c123/config',
                       '/tftpboot/pxelinux.cfg/01-11-22-33-44-55-67')
         ]
-        unlink_calls = [
-            mock.call('/tftpboot/pxelinux.cfg/01-11-22-33-44-55-66'),
-            mock.call('/tftpboot/pxelinux.cfg/01-11-22-33-44-55-67'),
-        ]
         with task_manager.acquire(self.context, self.node.uuid) as task:
             task.ports = [port_1, port_2]
             pxe_utils._link_mac_pxe_configs(task)
 
-        unlink_mock.assert_has_calls(unlink_calls)
         create_link_mock.assert_has_calls(create_link_calls)
 
-    @mock.patch('ironic.common.utils.create_link_without_raise', autospec=True)
-    @mock.patch('ironic_lib.utils.unlink_without_raise', autospec=True)
-    def test__write_infiniband_mac_pxe_configs(
-            self, unlink_mock, create_link_mock):
+    @mock.patch('ironic.common.utils.replace_link_without_raise',
+                autospec=True)
+    def test__write_infiniband_mac_pxe_configs(self, create_link_mock):
         client_id1 = (
             '20:00:55:04:01:fe:80:00:00:00:00:00:00:00:02:c9:02:00:23:13:92')
         port_1 = object_utils.create_test_port(
@@ -270,20 +264,15 @@ class TestPXEUtils(db_base.DbTestCase):
             mock.call(u'../1be26c0b-03f2-4d2e-ae87-c02d7f33c123/config',
                       '/tftpboot/pxelinux.cfg/20-11-22-33-44-55-67')
         ]
-        unlink_calls = [
-            mock.call('/tftpboot/pxelinux.cfg/20-11-22-33-44-55-66'),
-            mock.call('/tftpboot/pxelinux.cfg/20-11-22-33-44-55-67'),
-        ]
         with task_manager.acquire(self.context, self.node.uuid) as task:
             task.ports = [port_1, port_2]
             pxe_utils._link_mac_pxe_configs(task)
 
-        unlink_mock.assert_has_calls(unlink_calls)
         create_link_mock.assert_has_calls(create_link_calls)
 
-    @mock.patch('ironic.common.utils.create_link_without_raise', autospec=True)
-    @mock.patch('ironic_lib.utils.unlink_without_raise', autospec=True)
-    def test__write_mac_ipxe_configs(self, unlink_mock, create_link_mock):
+    @mock.patch('ironic.common.utils.replace_link_without_raise',
+                autospec=True)
+    def test__write_mac_ipxe_configs(self, create_link_mock):
         self.config(ipxe_enabled=True, group='pxe')
         port_1 = object_utils.create_test_port(
             self.context, node_id=self.node.id,
@@ -297,22 +286,17 @@ class TestPXEUtils(db_base.DbTestCase):
             mock.call(u'../1be26c0b-03f2-4d2e-ae87-c02d7f33c123/config',
                       '/httpboot/pxelinux.cfg/11-22-33-44-55-67'),
         ]
-        unlink_calls = [
-            mock.call('/httpboot/pxelinux.cfg/11-22-33-44-55-66'),
-            mock.call('/httpboot/pxelinux.cfg/11-22-33-44-55-67'),
-        ]
         with task_manager.acquire(self.context, self.node.uuid) as task:
             task.ports = [port_1, port_2]
             pxe_utils._link_mac_pxe_configs(task)
 
-        unlink_mock.assert_has_calls(unlink_calls)
         create_link_mock.assert_has_calls(create_link_calls)
 
-    @mock.patch('ironic.common.utils.create_link_without_raise', autospec=True)
-    @mock.patch('ironic_lib.utils.unlink_without_raise', autospec=True)
+    @mock.patch('ironic.common.utils.replace_link_without_raise',
+                autospec=True)
     @mock.patch('ironic.common.dhcp_factory.DHCPFactory.provider',
                 autospec=True)
-    def test__link_ip_address_pxe_configs(self, provider_mock, unlink_mock,
+    def test__link_ip_address_pxe_configs(self, provider_mock,
                                           create_link_mock):
         ip_address = '10.10.0.1'
         address = "aa:aa:aa:aa:aa:aa"
@@ -327,11 +311,10 @@ class TestPXEUtils(db_base.DbTestCase):
         with task_manager.acquire(self.context, self.node.uuid) as task:
             pxe_utils._link_ip_address_pxe_configs(task, False)
 
-        unlink_mock.assert_called_once_with('/tftpboot/10.10.0.1.conf')
         create_link_mock.assert_has_calls(create_link_calls)
 
     @mock.patch.object(os, 'chmod', autospec=True)
-    @mock.patch('ironic.common.utils.write_to_file', autospec=True)
+    @mock.patch('ironic.common.utils.replace_file', autospec=True)
     @mock.patch('ironic.common.utils.render_template', autospec=True)
     @mock.patch('oslo_utils.fileutils.ensure_tree', autospec=True)
     def test_create_pxe_config(self, ensure_tree_mock, render_mock,
@@ -358,7 +341,7 @@ class TestPXEUtils(db_base.DbTestCase):
                                       render_mock.return_value)
 
     @mock.patch.object(os, 'chmod', autospec=True)
-    @mock.patch('ironic.common.utils.write_to_file', autospec=True)
+    @mock.patch('ironic.common.utils.replace_file', autospec=True)
     @mock.patch('ironic.common.utils.render_template', autospec=True)
     @mock.patch('oslo_utils.fileutils.ensure_tree', autospec=True)
     def test_create_pxe_config_set_dir_permission(self, ensure_tree_mock,
@@ -389,7 +372,7 @@ class TestPXEUtils(db_base.DbTestCase):
 
     @mock.patch.object(os.path, 'isdir', autospec=True)
     @mock.patch.object(os, 'chmod', autospec=True)
-    @mock.patch('ironic.common.utils.write_to_file', autospec=True)
+    @mock.patch('ironic.common.utils.replace_file', autospec=True)
     @mock.patch('ironic.common.utils.render_template', autospec=True)
     @mock.patch('oslo_utils.fileutils.ensure_tree', autospec=True)
     def test_create_pxe_config_existing_dirs(self, ensure_tree_mock,
@@ -419,7 +402,7 @@ class TestPXEUtils(db_base.DbTestCase):
     @mock.patch.object(os, 'chmod', autospec=True)
     @mock.patch('ironic.common.pxe_utils._link_ip_address_pxe_configs',
                 autospec=True)
-    @mock.patch('ironic.common.utils.write_to_file', autospec=True)
+    @mock.patch('ironic.common.utils.replace_file', autospec=True)
     @mock.patch('ironic.common.utils.render_template', autospec=True)
     @mock.patch('oslo_utils.fileutils.ensure_tree', autospec=True)
     def test_create_pxe_config_uefi_elilo(self, ensure_tree_mock, render_mock,
@@ -455,7 +438,7 @@ class TestPXEUtils(db_base.DbTestCase):
     @mock.patch.object(os, 'chmod', autospec=True)
     @mock.patch('ironic.common.pxe_utils._link_ip_address_pxe_configs',
                 autospec=True)
-    @mock.patch('ironic.common.utils.write_to_file', autospec=True)
+    @mock.patch('ironic.common.utils.replace_file', autospec=True)
     @mock.patch('ironic.common.utils.render_template', autospec=True)
     @mock.patch('oslo_utils.fileutils.ensure_tree', autospec=True)
     def test_create_pxe_config_uefi_grub(self, ensure_tree_mock, render_mock,
@@ -487,7 +470,7 @@ class TestPXEUtils(db_base.DbTestCase):
     @mock.patch.object(os, 'chmod', autospec=True)
     @mock.patch('ironic.common.pxe_utils._link_mac_pxe_configs',
                 autospec=True)
-    @mock.patch('ironic.common.utils.write_to_file', autospec=True)
+    @mock.patch('ironic.common.utils.replace_file', autospec=True)
     @mock.patch('ironic.common.utils.render_template', autospec=True)
     @mock.patch('oslo_utils.fileutils.ensure_tree', autospec=True)
     def test_create_pxe_config_uefi_ipxe(self, ensure_tree_mock, render_mock,
@@ -49,6 +49,54 @@ class BareMetalUtilsTestCase(base.TestCase):
             utils.create_link_without_raise("/fake/source", "/fake/link")
             symlink_mock.assert_called_once_with("/fake/source", "/fake/link")
 
+    def test_replace_link(self):
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        link = os.path.join(tempdir, 'link')
+        utils.write_to_file(link, 'old')
+
+        utils.replace_link_without_raise('source', link)
+        self.assertEqual('source', os.readlink(link))
+        utils.replace_link_without_raise('other', link)
+        self.assertEqual('other', os.readlink(link))
+        self.assertEqual(['link'], os.listdir(tempdir))
+
+    @mock.patch.object(utils, 'LOG', autospec=True)
+    @mock.patch.object(os, 'rename', autospec=True)
+    def test_replace_link_fails(self, rename_mock, log_mock):
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        rename_mock.side_effect = OSError(errno.EACCES, 'denied')
+
+        utils.replace_link_without_raise('source',
+                                         os.path.join(tempdir, 'link'))
+        self.assertTrue(log_mock.warning.called)
+        self.assertEqual([], os.listdir(tempdir))
+
+    def test_replace_file(self):
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        path = os.path.join(tempdir, 'config')
+        utils.write_to_file(path, 'old')
+        inode = os.stat(path).st_ino
+
+        utils.replace_file(path, 'new')
+        with open(path) as f:
+            self.assertEqual('new', f.read())
+        # The file was replaced, not rewritten
+        self.assertNotEqual(inode, os.stat(path).st_ino)
+        self.assertEqual(['config'], os.listdir(tempdir))
+
+    @mock.patch.object(os, 'rename', autospec=True)
+    def test_replace_file_fails(self, rename_mock):
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        rename_mock.side_effect = OSError(errno.EACCES, 'denied')
+
+        self.assertRaises(OSError, utils.replace_file,
+                          os.path.join(tempdir, 'config'), 'new')
+        self.assertEqual([], os.listdir(tempdir))
+
 
 class ExecuteTestCase(base.TestCase):
 
@@ -555,6 +603,9 @@ class JinjaTemplatingTestCase(base.TestCase):
         self.template = '{{ foo }} {{ bar }}'
         self.params = {'foo': 'spam', 'bar': 'ham'}
         self.expected = 'spam ham'
+        patcher = mock.patch.dict(utils._JINJA_ENVIRONMENTS, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_render_string(self):
         self.assertEqual(self.expected,
@@ -571,3 +622,25 @@ class JinjaTemplatingTestCase(base.TestCase):
                          utils.render_template(path,
                                                self.params))
         jinja_fsl_mock.assert_called_once_with('/path/to')
+
+    def test_render_file_cached(self):
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        path = os.path.join(tempdir, 'template.j2')
+        utils.write_to_file(path, self.template)
+
+        self.assertEqual(self.expected, utils.render_template(path,
+                                                              self.params))
+        env = utils._JINJA_ENVIRONMENTS[tempdir]
+        with mock.patch.object(env, '_parse', wraps=env._parse) as parse_mock:
+            self.assertEqual(self.expected,
+                             utils.render_template(path, self.params))
+            self.assertFalse(parse_mock.called)
+
+            # A modified template is compiled again
+            utils.write_to_file(path, '{{ foo }}')
+            mtime = os.path.getmtime(path) + 10
+            os.utime(path, (mtime, mtime))
+            self.assertEqual('spam', utils.render_template(path, self.params))
+            self.assertEqual(1, parse_mock.call_count)
+        self.assertEqual([tempdir], list(utils._JINJA_ENVIRONMENTS))
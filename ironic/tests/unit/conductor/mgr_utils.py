@@ -17,7 +17,6 @@
 
 """Test utils for Ironic Managers."""
 
-from futurist import periodics
 import mock
 from oslo_utils import strutils
 from oslo_utils import uuidutils
@@ -28,6 +27,7 @@ from ironic.common import driver_factory
 from ironic.common import exception
 from ironic.common import states
 from ironic.conductor import manager
+from ironic.conductor import periodic_scheduler
 from ironic import objects
 
 
@@ -192,7 +192,8 @@ class ServiceSetUpMixin(object):
         if start_periodic_tasks:
             self.service.init_host()
         else:
-            with mock.patch.object(periodics, 'PeriodicWorker', autospec=True):
+            with mock.patch.object(periodic_scheduler, 'PeriodicScheduler',
+                                   autospec=True):
                 self.service.init_host()
         self.addCleanup(self._stop_service)
 
@@ -24,9 +24,14 @@ from oslo_utils import uuidutils
 
 from ironic.common import driver_factory
 from ironic.common import exception
+from ironic.common import metrics
+from ironic.common import notification_queue
 from ironic.conductor import base_manager
 from ironic.conductor import manager
+from ironic.conductor import node_snapshot
 from ironic.conductor import notification_utils
+from ironic.conductor import periodic_scheduler
+from ironic.conductor import power_events
 from ironic.conductor import task_manager
 from ironic.drivers import fake_hardware
 from ironic.drivers import generic
@@ -149,6 +154,45 @@ class StartStopTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
         self.assertTrue(periodics.is_periodic(obj.task))
         self.assertNotIn(obj.task, tasks)
 
+    @mock.patch.object(driver_factory.DriverFactory, '__getitem__')
+    def test_start_registers_node_snapshot_consumers(self, get_mock):
+        init_names = ['fake1']
+        self.config(enabled_drivers=init_names)
+
+        class TestInterface(object):
+            @node_snapshot.consumer(columns=['reservation'])
+            def iface(self, manager, context, nodes=None):
+                pass
+
+        class Driver(object):
+            core_interfaces = []
+            standard_interfaces = ['iface']
+            all_interfaces = core_interfaces + standard_interfaces
+
+            iface = TestInterface()
+
+        obj = Driver()
+        get_mock.return_value = mock.Mock(obj=obj)
+
+        with mock.patch.object(
+                driver_factory.DriverFactory()._extension_manager,
+                'names') as mock_names:
+            mock_names.return_value = init_names
+            self._start_service(start_periodic_tasks=True)
+
+        tasks = {c[0] for c in self.service._periodic_task_callables}
+        self.assertNotIn(obj.iface.iface, tasks)
+        self.assertIn(self.service._process_node_snapshot, tasks)
+        self.assertIn(self.service._process_deadline_node_snapshot, tasks)
+        consumers = {(c.func, c.args, c.lane)
+                     for c in self.service._node_snapshot._consumers}
+        self.assertIn((obj.iface.iface, (self.service,),
+                       periodic_scheduler.DEFAULT_LANE), consumers)
+        self.assertIn((self.service._check_deploy_timeouts, (),
+                       periodic_scheduler.DEADLINE_LANE), consumers)
+        self.assertIn((self.service._sync_local_state, (),
+                       periodic_scheduler.DEFAULT_LANE), consumers)
+
     @mock.patch.object(driver_factory.DriverFactory, '__init__')
     def test_start_fails_on_missing_driver(self, mock_df):
         mock_df.side_effect = exception.DriverNotFound('test')
@@ -184,7 +228,8 @@ class StartStopTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
         ht_mock.assert_called_once_with()
 
     @mock.patch.object(base_manager, 'LOG')
-    @mock.patch.object(base_manager.BaseConductorManager, 'del_host')
+    @mock.patch.object(base_manager.BaseConductorManager, 'del_host',
+                       autospec=True)
     @mock.patch.object(driver_factory, 'DriverFactory')
     def test_starts_with_only_dynamic_drivers(self, df_mock, del_mock,
                                               log_mock):
@@ -197,7 +242,8 @@ class StartStopTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
         self.assertFalse(del_mock.called)
 
     @mock.patch.object(base_manager, 'LOG')
-    @mock.patch.object(base_manager.BaseConductorManager, 'del_host')
+    @mock.patch.object(base_manager.BaseConductorManager, 'del_host',
+                       autospec=True)
     @mock.patch.object(driver_factory, 'HardwareTypesFactory')
     def test_starts_with_only_classic_drivers(self, ht_mock, del_mock,
                                               log_mock):
@@ -238,6 +284,13 @@ class StartStopTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
         self.assertRaisesRegex(RuntimeError, 'already running',
                                self.service.init_host)
 
+    def test_start_fails_on_too_many_reserved_workers(self):
+        self.config(workers_pool_size=10, workers_pool_reserved=10,
+                    group='conductor')
+        self.assertRaisesRegex(exception.ConfigInvalid,
+                               'workers_pool_reserved',
+                               self.service.init_host)
+
     @mock.patch.object(base_manager, 'LOG')
     def test_warning_on_low_workers_pool(self, log_mock):
         CONF.set_override('workers_pool_size', 3, 'conductor')
@@ -250,6 +303,38 @@ class StartStopTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
         self.service.del_host()
         self.assertTrue(wait_mock.called)
 
+    @mock.patch.object(power_events, 'stop', autospec=True)
+    def test_del_host_stops_power_events(self, stop_mock):
+        self._start_service()
+        self.service.del_host()
+        stop_mock.assert_called_once_with()
+
+    @mock.patch.object(notification_queue, 'flush', autospec=True)
+    def test_del_host_flushes_notifications(self, flush_mock):
+        self._start_service()
+        self.service.del_host()
+        flush_mock.assert_called_once_with()
+
+    @mock.patch.object(metrics, 'Exporter', autospec=True)
+    def test_metrics_exporter(self, exporter_mock):
+        self.config(expose_registry=True, group='metrics')
+        self._start_service()
+        exporter_mock.assert_called_once_with('127.0.0.1', 9608)
+        exporter_mock.return_value.start.assert_called_once_with()
+        self.assertIn('# TYPE ironic_conductor_tasks_executed_total counter',
+                      metrics.REGISTRY.render())
+        self.service.del_host()
+        exporter_mock.return_value.stop.assert_called_once_with()
+        self.assertIsNone(self.service._metrics_exporter)
+
+    @mock.patch.object(metrics, 'Exporter', autospec=True)
+    def test_metrics_exporter_disabled(self, exporter_mock):
+        self._start_service()
+        self.assertFalse(exporter_mock.called)
+        self.service.del_host()
+        self.assertNotIn(self.service._collect_metrics,
+                         metrics.REGISTRY._collectors)
+
     def test_start_fails_on_missing_config_for_configdrive(self):
         """Check to fail conductor on missing config options"""
 
@@ -305,7 +390,12 @@ class KeepAliveTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
                                    'is_set') as mock_is_set:
                 mock_is_set.side_effect = [False, True]
                 self.service._conductor_service_record_keepalive()
-            mock_touch.assert_called_once_with(self.hostname)
+            mock_touch.assert_called_once_with(self.hostname,
+                                               saturation=mock.ANY)
+        saturation = mock_touch.call_args[1]['saturation']
+        self.assertEqual(saturation,
+                         base_manager._WORKERS_SATURATION.get())
+        self.assertGreater(saturation, 0)
 
     def test__conductor_service_record_keepalive_failed_db_conn(self):
         self._start_service()
@@ -328,17 +418,68 @@ class ManagerSpawnWorkerTestCase(tests_base.TestCase):
         self.executor = mock.Mock(spec=futurist.GreenThreadPoolExecutor)
         self.service._executor = self.executor
 
+    def _set_workers_in_use(self, count):
+        self.executor.statistics = futurist.ExecutorStatistics(
+            executed=10, cancelled=2)
+        self.service._workers_submitted = 12 + count
+
     def test__spawn_worker(self):
         self.service._spawn_worker('fake', 1, 2, foo='bar', cat='meow')
 
         self.executor.submit.assert_called_once_with(
-            'fake', 1, 2, foo='bar', cat='meow')
+            self.service._run_worker, 'fake', 1, 2, foo='bar', cat='meow')
+
+    def test__spawn_worker_reserved(self):
+        self.config(workers_pool_size=10, workers_pool_reserved=2,
+                    group='conductor')
+        self._set_workers_in_use(7)
+        self.service._spawn_worker('fake')
+        self.assertTrue(self.executor.submit.called)
+
+    def test__spawn_worker_reserved_none_free(self):
+        self.config(workers_pool_size=10, workers_pool_reserved=2,
+                    group='conductor')
+        self._set_workers_in_use(8)
+        rejected = base_manager._WORKERS_REJECTED.get(priority='normal')
+
+        self.assertRaises(exception.NoFreeConductorWorker,
+                          self.service._spawn_worker, 'fake')
+        self.assertFalse(self.executor.submit.called)
+        self.assertEqual(rejected + 1,
+                         base_manager._WORKERS_REJECTED.get(priority='normal'))
+
+    def test__spawn_priority_worker_reserved(self):
+        self.config(workers_pool_size=10, workers_pool_reserved=2,
+                    group='conductor')
+        self._set_workers_in_use(9)
+        self.service._spawn_priority_worker('fake', 1, foo='bar')
+        self.executor.submit.assert_called_once_with(
+            self.service._run_worker, 'fake', 1, foo='bar')
+
+    def test__saturation(self):
+        self.config(workers_pool_size=10, group='conductor')
+        self._set_workers_in_use(4)
+        self.assertEqual(4, self.service._workers_in_use())
+        self.assertEqual(0.4, self.service._saturation())
+
+    def test__run_worker(self):
+        def fake_task(arg, kwarg=None):
+            return arg, kwarg
+
+        count = base_manager._WORKER_DURATION.get(task='fake_task')[0]
+        self.assertEqual((1, 2),
+                         self.service._run_worker(fake_task, 1, kwarg=2))
+        self.assertEqual(
+            count + 1, base_manager._WORKER_DURATION.get(task='fake_task')[0])
 
     def test__spawn_worker_none_free(self):
         self.executor.submit.side_effect = futurist.RejectedSubmission()
+        rejected = base_manager._WORKERS_REJECTED.get(priority='normal')
 
         self.assertRaises(exception.NoFreeConductorWorker,
                           self.service._spawn_worker, 'fake')
+        self.assertEqual(rejected + 1,
+                         base_manager._WORKERS_REJECTED.get(priority='normal'))
 
 
 @mock.patch.object(objects.Conductor, 'unregister_all_hardware_interfaces',
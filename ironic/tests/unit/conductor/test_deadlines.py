@@ -0,0 +1,187 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for the in-memory tracking of provisioning deadlines."""
+
+import datetime
+
+import eventlet
+import iso8601
+import mock
+from oslo_utils import timeutils
+
+from ironic.common import states
+from ironic.conductor import deadlines
+from ironic.tests import base
+
+NOW = datetime.datetime(2017, 1, 1, 12, 0)
+
+
+class GetDeadlineTestCase(base.TestCase):
+
+    def test_deploywait(self):
+        self.config(deploy_callback_timeout=60, group='conductor')
+        self.assertEqual(NOW + datetime.timedelta(seconds=60),
+                         deadlines.get_deadline(states.DEPLOYWAIT, NOW))
+
+    def test_inspecting_timezone_aware(self):
+        self.config(inspect_timeout=60, group='conductor')
+        started_at = NOW.replace(tzinfo=iso8601.iso8601.Utc())
+        self.assertEqual(NOW + datetime.timedelta(seconds=60),
+                         deadlines.get_deadline(states.INSPECTING,
+                                                started_at))
+
+    def test_not_tracked(self):
+        self.assertIsNone(deadlines.get_deadline(states.ACTIVE, NOW))
+
+    def test_disabled(self):
+        self.config(clean_callback_timeout=0, group='conductor')
+        self.assertIsNone(deadlines.get_deadline(states.CLEANWAIT, NOW))
+
+    def test_no_start(self):
+        self.assertIsNone(deadlines.get_deadline(states.DEPLOYWAIT, None))
+
+
+class NodeUpdatedTestCase(base.TestCase):
+
+    def setUp(self):
+        super(NodeUpdatedTestCase, self).setUp()
+        self.node = mock.Mock(uuid='uuid', provision_state=states.DEPLOYWAIT,
+                              provision_updated_at=NOW)
+        self.config(deploy_callback_timeout=60, group='conductor')
+
+    @mock.patch.object(deadlines, '_TRACKER', None)
+    @mock.patch.object(deadlines, 'get_deadline', autospec=True)
+    def test_no_tracker(self, get_deadline_mock):
+        deadlines.node_updated(self.node)
+        self.assertFalse(get_deadline_mock.called)
+
+    @mock.patch.object(deadlines, '_TRACKER')
+    def test_tracked(self, tracker_mock):
+        deadlines.node_updated(self.node)
+        tracker_mock.schedule.assert_called_once_with(
+            'uuid', NOW + datetime.timedelta(seconds=60))
+
+    @mock.patch.object(deadlines, '_TRACKER')
+    def test_not_tracked(self, tracker_mock):
+        self.node.provision_state = states.DEPLOYING
+        deadlines.node_updated(self.node)
+        tracker_mock.schedule.assert_called_once_with('uuid', None)
+
+
+class DeadlineTrackerTestCase(base.TestCase):
+
+    def setUp(self):
+        super(DeadlineTrackerTestCase, self).setUp()
+        self.manager = mock.Mock()
+        self.manager.ring_manager.ring = {}
+        self.tracker = deadlines.DeadlineTracker(self.manager)
+        timeutils.set_time_override(NOW)
+        self.addCleanup(timeutils.clear_time_override)
+
+    def test_schedule(self):
+        later = NOW + datetime.timedelta(seconds=30)
+        self.tracker.schedule('uuid1', later)
+        self.tracker.schedule('uuid2', NOW)
+        self.tracker.schedule('uuid3', NOW - datetime.timedelta(seconds=1))
+        self.assertEqual(3, len(self.tracker))
+
+        reached, wait = self.tracker._pop_reached()
+        self.assertEqual(['uuid3', 'uuid2'], reached)
+        self.assertEqual(30, wait)
+        self.assertEqual(1, len(self.tracker))
+
+    def test_schedule_moved_and_cancelled(self):
+        self.tracker.schedule('uuid1', NOW)
+        self.tracker.schedule('uuid1', NOW + datetime.timedelta(seconds=10))
+        self.tracker.schedule('uuid2', NOW)
+        self.tracker.schedule('uuid2', None)
+        self.assertEqual(1, len(self.tracker))
+
+        reached, wait = self.tracker._pop_reached()
+        self.assertEqual([], reached)
+        self.assertEqual(10, wait)
+
+    def test_pop_reached_empty(self):
+        self.assertEqual(([], None), self.tracker._pop_reached())
+
+    def test_schedule_wakes_up(self):
+        self.tracker.schedule('uuid1', NOW + datetime.timedelta(seconds=10))
+        self.tracker._wakeup.clear()
+        self.tracker.schedule('uuid2', NOW + datetime.timedelta(seconds=20))
+        self.assertFalse(self.tracker._wakeup.is_set())
+        self.tracker.schedule('uuid3', NOW)
+        self.assertTrue(self.tracker._wakeup.is_set())
+
+    def test_rebuild(self):
+        self.config(deploy_callback_timeout=60, group='conductor')
+        self.config(inspect_timeout=0, group='conductor')
+        self.tracker.schedule('stale', NOW)
+        self.manager.iter_nodes.return_value = [
+            ('uuid1', 'driver', states.DEPLOYWAIT, NOW, None),
+            ('uuid2', 'driver', states.INSPECTING, None, NOW),
+        ]
+
+        self.tracker.rebuild()
+
+        self.manager.iter_nodes.assert_called_once_with(
+            fields=['provision_state', 'provision_updated_at',
+                    'inspection_started_at'],
+            filters={'maintenance': False,
+                     'provision_state_in': mock.ANY})
+        self.assertEqual(
+            sorted(deadlines.TRACKED_STATES),
+            sorted(self.manager.iter_nodes.call_args[1]['filters']
+                   ['provision_state_in']))
+        self.assertEqual(1, len(self.tracker))
+        self.assertEqual({'uuid1': NOW + datetime.timedelta(seconds=60)},
+                         self.tracker._deadlines)
+
+    def test_ring_changed(self):
+        self.manager.ring_manager.ring = {'fake': mock.Mock(nodes={'a': 1})}
+        self.assertFalse(self.tracker._ring_changed())
+        self.assertFalse(self.tracker._ring_changed())
+        self.manager.ring_manager.ring = {
+            'fake': mock.Mock(nodes={'a': 1, 'b': 1})}
+        self.assertTrue(self.tracker._ring_changed())
+        self.assertFalse(self.tracker._ring_changed())
+
+    def test_start_stop(self):
+        self.config(deploy_callback_timeout=60, group='conductor')
+        self.manager.iter_nodes.return_value = [
+            ('uuid1', 'driver', states.DEPLOYWAIT,
+             NOW - datetime.timedelta(seconds=61), None),
+        ]
+
+        self.tracker.start()
+        self.assertIs(self.tracker, deadlines._TRACKER)
+        eventlet.sleep(0)
+        self.tracker.stop()
+
+        self.assertIsNone(deadlines._TRACKER)
+        self.manager._handle_provision_deadline.assert_called_once_with(
+            'uuid1')
+        self.assertEqual(0, len(self.tracker))
+
+    def test_run_handler_fails(self):
+        self.manager._handle_provision_deadline.side_effect = RuntimeError
+        self.tracker.schedule('uuid1', NOW)
+
+        with mock.patch.object(deadlines.LOG, 'exception',
+                               autospec=True) as log_mock:
+            self.tracker._thread = eventlet.spawn(self.tracker._run)
+            eventlet.sleep(0)
+            self.tracker.stop()
+
+        self.assertTrue(log_mock.called)
+        self.manager._handle_provision_deadline.assert_called_once_with(
+            'uuid1')
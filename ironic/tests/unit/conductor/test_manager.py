@@ -24,11 +24,11 @@ import eventlet
 import mock
 from oslo_config import cfg
 import oslo_messaging as messaging
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 from oslo_versionedobjects import base as ovo_base
 from oslo_versionedobjects import fields
 import six
-from six.moves import queue
 
 from ironic.common import boot_devices
 from ironic.common import driver_factory
@@ -38,6 +38,8 @@ from ironic.common import states
 from ironic.common import swift
 from ironic.conductor import manager
 from ironic.conductor import notification_utils
+from ironic.conductor import power_events
+from ironic.conductor import sensors
 from ironic.conductor import task_manager
 from ironic.conductor import utils as conductor_utils
 from ironic.db import api as dbapi
@@ -174,6 +176,24 @@ class ChangeNodePowerStateTestCase(mgr_utils.ServiceSetUpMixin,
             # Verify the picked reservation has been cleared due to full pool.
             self.assertIsNone(node.reservation)
 
+    @mock.patch.object(manager.ConductorManager, '_spawn_worker',
+                       autospec=True)
+    @mock.patch.object(manager.ConductorManager, '_spawn_priority_worker',
+                       autospec=True)
+    def test_change_node_power_state_power_off_priority(self, priority_mock,
+                                                        spawn_mock):
+        node = obj_utils.create_test_node(self.context, driver='fake',
+                                          power_state=states.POWER_ON)
+        self._start_service()
+
+        self.service.change_node_power_state(self.context, node.uuid,
+                                             states.POWER_OFF)
+        priority_mock.assert_called_once_with(
+            self.service, conductor_utils.node_power_action, mock.ANY,
+            states.POWER_OFF, timeout=None)
+        self.assertNotIn(conductor_utils.node_power_action,
+                         [args[1] for args, _kw in spawn_mock.call_args_list])
+
     def test_change_node_power_state_exception_in_background_task(
             self):
         # Test change_node_power_state including integration with
@@ -441,6 +461,238 @@ class ChangeNodePowerStateTestCase(mgr_utils.ServiceSetUpMixin,
             self.assertIsNone(node.last_error)
 
 
+@mgr_utils.mock_record_keepalive
+class BulkNodeActionTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
+
+    def _create_nodes(self, count=3, **kwargs):
+        return [obj_utils.create_test_node(self.context,
+                                           uuid=uuidutils.generate_uuid(),
+                                           driver='fake', **kwargs)
+                for i in range(count)]
+
+    @mock.patch.object(manager.ConductorManager, 'change_node_power_state')
+    def test_power(self, mock_power):
+        nodes = self._create_nodes()
+        node_ids = [n.uuid for n in nodes]
+        self._start_service()
+        result = self.service.bulk_node_action(
+            self.context, node_ids, 'power', states.POWER_OFF, timeout=10)
+        self.assertEqual(dict.fromkeys(node_ids), result)
+        mock_power.assert_has_calls(
+            [mock.call(self.context, node_id, states.POWER_OFF, timeout=10)
+             for node_id in node_ids], any_order=True)
+
+    @mock.patch.object(manager.ConductorManager, 'change_node_power_state')
+    def test_power_partial_failure(self, mock_power):
+        nodes = self._create_nodes(count=2)
+        locked = nodes[1].uuid
+        self._start_service()
+
+        def _power(context, node_id, new_state, timeout=None):
+            if node_id == locked:
+                raise exception.NodeLocked(node=node_id, host='other')
+
+        mock_power.side_effect = _power
+        result = self.service.bulk_node_action(
+            self.context, [n.uuid for n in nodes], 'power', states.POWER_ON)
+        self.assertIsNone(result[nodes[0].uuid])
+        self.assertEqual(409, result[locked]['code'])
+        self.assertIn('other', result[locked]['error'])
+
+    def test_power_expected_exception_unwrapped(self):
+        node = self._create_nodes(count=1, reservation='other-host')[0]
+        self._start_service()
+        result = self.service.bulk_node_action(
+            self.context, [node.uuid], 'power', states.POWER_ON)
+        self.assertEqual(409, result[node.uuid]['code'])
+
+    @mock.patch.object(manager.ConductorManager, 'do_provisioning_action')
+    @mock.patch.object(manager.ConductorManager, 'do_node_tear_down')
+    @mock.patch.object(manager.ConductorManager, 'do_node_deploy')
+    def test_provision(self, mock_deploy, mock_tear_down, mock_action):
+        node = self._create_nodes(count=1)[0]
+        self._start_service()
+        self.service.bulk_node_action(self.context, [node.uuid], 'provision',
+                                      states.ACTIVE)
+        mock_deploy.assert_called_once_with(self.context, node.uuid,
+                                            rebuild=False)
+        self.service.bulk_node_action(self.context, [node.uuid], 'provision',
+                                      states.DELETED)
+        mock_tear_down.assert_called_once_with(self.context, node.uuid)
+        self.service.bulk_node_action(self.context, [node.uuid], 'provision',
+                                      'manage')
+        mock_action.assert_called_once_with(self.context, node.uuid,
+                                            'manage')
+
+    def test_maintenance(self):
+        nodes = self._create_nodes(count=2)
+        self._start_service()
+        result = self.service.bulk_node_action(
+            self.context, [n.uuid for n in nodes], 'maintenance', True,
+            reason='broken rack')
+        self.assertEqual(dict.fromkeys(n.uuid for n in nodes), result)
+        for node in nodes:
+            node.refresh()
+            self.assertTrue(node.maintenance)
+            self.assertEqual('broken rack', node.maintenance_reason)
+            self.assertIsNone(node.reservation)
+
+    def test_unsupported_action(self):
+        self._start_service()
+        exc = self.assertRaises(messaging.rpc.ExpectedException,
+                                self.service.bulk_node_action,
+                                self.context, ['fake-node'], 'destroy', True)
+        # Compare true exception hidden by @messaging.expected_exceptions
+        self.assertEqual(exception.InvalidParameterValue, exc.exc_info[0])
+
+    @mock.patch.object(manager.ConductorManager, 'change_node_power_state')
+    def test_no_free_worker(self, mock_power):
+        nodes = self._create_nodes(count=2)
+        self._start_service()
+        with mock.patch.object(self.service, '_spawn_worker',
+                               autospec=True) as mock_spawn:
+            mock_spawn.side_effect = exception.NoFreeConductorWorker()
+            result = self.service.bulk_node_action(
+                self.context, [n.uuid for n in nodes], 'power',
+                states.POWER_OFF)
+        for node in nodes:
+            self.assertEqual(503, result[node.uuid]['code'])
+        self.assertFalse(mock_power.called)
+
+
+@mgr_utils.mock_record_keepalive
+class RunJobTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
+
+    def setUp(self):
+        super(RunJobTestCase, self).setUp()
+        self.node = obj_utils.create_test_node(self.context, driver='fake')
+
+    def _create_job(self, action='get_boot_device', args=None):
+        return obj_utils.create_test_job(self.context, node_id=self.node.id,
+                                         action=action, args=args or {})
+
+    def test_run_job(self):
+        job = self._create_job()
+        self._start_service()
+        with mock.patch.object(self.service, '_spawn_worker',
+                               autospec=True) as mock_spawn:
+            self.service.run_job(self.context, job.uuid)
+        mock_spawn.assert_called_once_with(self.service._do_run_job,
+                                           self.context, mock.ANY)
+        self.assertEqual(job.uuid, mock_spawn.call_args[0][2].uuid)
+
+    def test_run_job_not_found(self):
+        self._start_service()
+        with mock.patch.object(self.service, '_spawn_worker',
+                               autospec=True) as mock_spawn:
+            self.service.run_job(self.context, uuidutils.generate_uuid())
+        self.assertFalse(mock_spawn.called)
+
+    def test_run_job_not_pending(self):
+        job = self._create_job()
+        job.status = states.JOB_SUCCESS
+        job.save()
+        self._start_service()
+        with mock.patch.object(self.service, '_spawn_worker',
+                               autospec=True) as mock_spawn:
+            self.service.run_job(self.context, job.uuid)
+        self.assertFalse(mock_spawn.called)
+
+    def test_run_job_no_free_worker(self):
+        job = self._create_job()
+        self._start_service()
+        with mock.patch.object(self.service, '_spawn_worker',
+                               autospec=True) as mock_spawn:
+            mock_spawn.side_effect = exception.NoFreeConductorWorker()
+            self.service.run_job(self.context, job.uuid)
+        job.refresh()
+        self.assertEqual(states.JOB_ERROR, job.status)
+        self.assertIn('Requested action cannot be performed', job.error)
+
+    @mock.patch.object(manager.ConductorManager, 'set_boot_device')
+    def test__do_run_job(self, mock_sbd):
+        job = self._create_job(action='set_boot_device',
+                               args={'device': boot_devices.PXE,
+                                     'persistent': True})
+        self._start_service()
+        self.service._do_run_job(self.context, job)
+        mock_sbd.assert_called_once_with(self.context, self.node.uuid,
+                                         device=boot_devices.PXE,
+                                         persistent=True)
+        job.refresh()
+        self.assertEqual(states.JOB_SUCCESS, job.status)
+        self.assertEqual({}, job.result)
+        self.assertIsNone(job.error)
+
+    def test__do_run_job_result(self):
+        job = self._create_job()
+        self._start_service()
+        self.service._do_run_job(self.context, job)
+        job.refresh()
+        self.assertEqual(states.JOB_SUCCESS, job.status)
+        self.assertEqual({'boot_device': boot_devices.PXE,
+                          'persistent': False}, job.result)
+
+    def test__do_run_job_expected_exception(self):
+        self.node.reservation = 'other-host'
+        self.node.save()
+        job = self._create_job(action='inject_nmi')
+        self._start_service()
+        self.service._do_run_job(self.context, job)
+        job.refresh()
+        self.assertEqual(states.JOB_ERROR, job.status)
+        self.assertIn('other-host', job.error)
+        self.assertEqual({}, job.result)
+
+    def test__do_run_job_unsupported_action(self):
+        job = self._create_job(action='destroy_node')
+        self._start_service()
+        with mock.patch.object(self.service, 'destroy_node',
+                               autospec=True) as mock_destroy:
+            self.service._do_run_job(self.context, job)
+        self.assertFalse(mock_destroy.called)
+        job.refresh()
+        self.assertEqual(states.JOB_ERROR, job.status)
+        self.assertIn('Unsupported job action', job.error)
+
+    @mock.patch.object(dbapi.IMPL, 'expire_pending_jobs', autospec=True)
+    @mock.patch.object(dbapi.IMPL, 'destroy_finished_jobs', autospec=True)
+    def test__clean_up_jobs(self, mock_destroy, mock_expire):
+        self.config(job_retention_period=3600, group='conductor')
+        self.config(job_pending_timeout=600, group='conductor')
+        self._start_service()
+        self.service._clean_up_jobs(self.context)
+        self.assertEqual(1, mock_destroy.call_count)
+        self.assertEqual(1, mock_expire.call_count)
+
+    @mock.patch.object(dbapi.IMPL, 'expire_pending_jobs', autospec=True)
+    @mock.patch.object(dbapi.IMPL, 'destroy_finished_jobs', autospec=True)
+    def test__clean_up_jobs_disabled(self, mock_destroy, mock_expire):
+        self.config(job_retention_period=0, group='conductor')
+        self.config(job_pending_timeout=0, group='conductor')
+        self._start_service()
+        self.service._clean_up_jobs(self.context)
+        self.assertFalse(mock_destroy.called)
+        self.assertFalse(mock_expire.called)
+
+    def test__clean_up_jobs_lost(self):
+        self.config(job_pending_timeout=600, group='conductor')
+        self._start_service()
+        job = obj_utils.create_test_job(
+            self.context, node_id=self.node.id, action='get_boot_device',
+            created_at=timeutils.utcnow() - datetime.timedelta(hours=1))
+        self.service._clean_up_jobs(self.context)
+        job.refresh()
+        self.assertEqual(states.JOB_ERROR, job.status)
+        self.assertIn('Timed out', job.error)
+
+        # A late request to run the job is ignored
+        with mock.patch.object(self.service, '_spawn_worker',
+                               autospec=True) as mock_spawn:
+            self.service.run_job(self.context, job.uuid)
+        self.assertFalse(mock_spawn.called)
+
+
 @mgr_utils.mock_record_keepalive
 class CreateNodeTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
     def test_create_node(self):
@@ -1521,6 +1773,132 @@ class DoNodeDeployTearDownTestCase(mgr_utils.ServiceSetUpMixin,
     def test__check_cleanwait_timeouts_manual_clean(self):
         self._check_cleanwait_timeouts(manual=True)
 
+    @mock.patch('ironic.drivers.modules.fake.FakeDeploy.clean_up')
+    def test__process_node_snapshot_deploy_timeouts(self, mock_cleanup):
+        self._start_service()
+        CONF.set_override('deploy_callback_timeout', 1, group='conductor')
+        node = obj_utils.create_test_node(
+            self.context, driver='fake',
+            provision_state=states.DEPLOYWAIT,
+            target_provision_state=states.ACTIVE,
+            provision_updated_at=datetime.datetime(2000, 1, 1, 0, 0))
+        recent = obj_utils.create_test_node(
+            self.context, driver='fake', uuid=uuidutils.generate_uuid(),
+            provision_state=states.DEPLOYWAIT,
+            target_provision_state=states.ACTIVE,
+            provision_updated_at=timeutils.utcnow())
+
+        with mock.patch.object(self.dbapi, 'get_nodeinfo_list',
+                               wraps=self.dbapi.get_nodeinfo_list) as get_mock:
+            self.service._process_deadline_node_snapshot(self.context)
+        self._stop_service()
+        self.assertEqual(1, get_mock.call_count)
+        node.refresh()
+        self.assertEqual(states.DEPLOYFAIL, node.provision_state)
+        self.assertIsNotNone(node.last_error)
+        mock_cleanup.assert_called_once_with(mock.ANY)
+        recent.refresh()
+        self.assertEqual(states.DEPLOYWAIT, recent.provision_state)
+
+    @mock.patch('ironic.drivers.modules.fake.FakeDeploy.clean_up')
+    def test__check_deploy_timeouts_snapshot_outdated(self, mock_cleanup):
+        self._start_service()
+        CONF.set_override('deploy_callback_timeout', 1, group='conductor')
+        node = obj_utils.create_test_node(
+            self.context, driver='fake',
+            provision_state=states.DEPLOYWAIT,
+            target_provision_state=states.ACTIVE,
+            provision_updated_at=timeutils.utcnow())
+        # The node has been touched since the snapshot was loaded
+        nodes = [{'uuid': node.uuid, 'driver': 'fake',
+                  'provision_state': states.DEPLOYWAIT, 'reservation': None,
+                  'provision_updated_at': datetime.datetime(2000, 1, 1)}]
+
+        self.service._check_deploy_timeouts(self.context, nodes=nodes)
+        self._stop_service()
+        node.refresh()
+        self.assertEqual(states.DEPLOYWAIT, node.provision_state)
+        self.assertFalse(mock_cleanup.called)
+
+    @mock.patch('ironic.drivers.modules.fake.FakeDeploy.clean_up')
+    def test__handle_provision_deadline(self, mock_cleanup):
+        self._start_service()
+        CONF.set_override('deploy_callback_timeout', 1, group='conductor')
+        node = obj_utils.create_test_node(
+            self.context, driver='fake',
+            provision_state=states.DEPLOYWAIT,
+            target_provision_state=states.ACTIVE,
+            provision_updated_at=datetime.datetime(2000, 1, 1, 0, 0))
+
+        self.service._handle_provision_deadline(node.uuid)
+        self._stop_service()
+        node.refresh()
+        self.assertEqual(states.DEPLOYFAIL, node.provision_state)
+        self.assertIsNotNone(node.last_error)
+        mock_cleanup.assert_called_once_with(mock.ANY)
+
+    def test__handle_provision_deadline_moved(self):
+        self._start_service()
+        CONF.set_override('deploy_callback_timeout', 60, group='conductor')
+        now = timeutils.utcnow()
+        node = obj_utils.create_test_node(
+            self.context, driver='fake',
+            provision_state=states.DEPLOYWAIT,
+            target_provision_state=states.ACTIVE,
+            provision_updated_at=now)
+
+        with mock.patch.object(self.service._deadlines, 'schedule',
+                               autospec=True) as schedule_mock:
+            self.service._handle_provision_deadline(node.uuid)
+        self._stop_service()
+        node.refresh()
+        self.assertEqual(states.DEPLOYWAIT, node.provision_state)
+        schedule_mock.assert_called_once_with(
+            node.uuid, now + datetime.timedelta(seconds=60))
+
+    def test__handle_provision_deadline_state_changed(self):
+        self._start_service()
+        node = obj_utils.create_test_node(
+            self.context, driver='fake', provision_state=states.ACTIVE,
+            provision_updated_at=datetime.datetime(2000, 1, 1, 0, 0))
+
+        with mock.patch.object(self.service, '_check_deploy_timeouts',
+                               autospec=True) as check_mock:
+            self.service._handle_provision_deadline(node.uuid)
+        self.assertFalse(check_mock.called)
+
+    def test_process_event_tracks_deadline(self):
+        self._start_service()
+        CONF.set_override('deploy_callback_timeout', 60, group='conductor')
+        node = obj_utils.create_test_node(
+            self.context, driver='fake',
+            provision_state=states.DEPLOYING,
+            target_provision_state=states.ACTIVE)
+
+        with task_manager.acquire(self.context, node.uuid) as task:
+            task.process_event('wait')
+            self.assertIn(node.uuid, self.service._deadlines._deadlines)
+            task.process_event('resume')
+            self.assertNotIn(node.uuid, self.service._deadlines._deadlines)
+
+    def test__process_node_snapshot_cleanwait_timeouts(self):
+        self._start_service()
+        CONF.set_override('clean_callback_timeout', 1, group='conductor')
+        node = obj_utils.create_test_node(
+            self.context, driver='fake',
+            provision_state=states.CLEANWAIT,
+            target_provision_state=states.AVAILABLE,
+            provision_updated_at=datetime.datetime(2000, 1, 1, 0, 0),
+            clean_step={'interface': 'deploy', 'step': 'erase_devices'},
+            driver_internal_info={'clean_step_index': 0})
+
+        self.service._process_deadline_node_snapshot(self.context)
+        self._stop_service()
+        node.refresh()
+        self.assertEqual(states.CLEANFAIL, node.provision_state)
+        self.assertEqual(states.AVAILABLE, node.target_provision_state)
+        self.assertIsNotNone(node.last_error)
+
     def test_do_node_tear_down_invalid_state(self):
         self._start_service()
         # test node.provision_state is incorrect for tear_down
@@ -1629,7 +2007,8 @@ class DoNodeDeployTearDownTestCase(mgr_utils.ServiceSetUpMixin,
     #             deletion -- not that such a node's deletion could later be
     #             completed.
 
-    @mock.patch('ironic.conductor.manager.ConductorManager._spawn_worker')
+    @mock.patch('ironic.conductor.manager.ConductorManager.'
+                '_spawn_priority_worker')
     def test_do_node_tear_down_worker_pool_full(self, mock_spawn):
         prv_state = states.ACTIVE
         tgt_prv_state = states.NOSTATE
@@ -2668,6 +3047,7 @@ class DoNodeVerifyTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
         mock_get_power_state.return_value = states.POWER_OFF
         # Required for exception handling
         mock_notif.__name__ = 'NodeCorrectedPowerStateNotification'
+        self.config(notification_level='info')
         node = obj_utils.create_test_node(
             self.context, driver='fake',
             provision_state=states.VERIFYING,
@@ -2830,6 +3210,7 @@ class MiscTestCase(mgr_utils.ServiceSetUpMixin, mgr_utils.CommonMixIn,
     @mock.patch.object(dbapi.IMPL, 'get_nodeinfo_list')
     def test_iter_nodes(self, mock_nodeinfo_list, mock_mapped,
                         mock_fail_if_state):
+        self.config(track_provision_timeouts=False, group='conductor')
         self._start_service()
         self.columns = ['uuid', 'driver', 'id']
         nodes = [self._create_node(id=i, driver='fake') for i in range(2)]
@@ -3505,11 +3886,17 @@ class UpdatePortTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
         expected_result = {}
         self.assertEqual(expected_result, actual_result)
 
+    @staticmethod
+    def _sensor_queue(count=1):
+        return sensors.SensorQueue(
+            [{'uuid': 'fake_uuid-%d' % i, 'driver': 'fake',
+              'instance_uuid': None, 'driver_info': {}, 'extra': {}}
+             for i in range(count)], 1)
+
     @mock.patch.object(task_manager, 'acquire')
     def test_send_sensor_task(self, acquire_mock):
-        nodes = queue.Queue()
-        for i in range(5):
-            nodes.put_nowait(('fake_uuid-%d' % i, 'fake', None))
+        nodes = self._sensor_queue(5)
+        batcher = mock.Mock(spec=sensors.NotificationBatcher)
         self._start_service()
         CONF.set_override('send_sensor_data', True, group='conductor')
 
@@ -3518,26 +3905,31 @@ class UpdatePortTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
                                'get_sensors_data') as get_sensors_data_mock:
             with mock.patch.object(self.driver.management,
                                    'validate') as validate_mock:
-                get_sensors_data_mock.return_value = 'fake-sensor-data'
-                self.service._sensors_nodes_task(self.context, nodes)
+                get_sensors_data_mock.return_value = {'t1': {'f1': 'v1'}}
+                self.service._sensors_nodes_task(self.context, nodes,
+                                                 batcher)
                 self.assertEqual(5, acquire_mock.call_count)
                 self.assertEqual(5, validate_mock.call_count)
                 self.assertEqual(5, get_sensors_data_mock.call_count)
+        self.assertEqual(5, batcher.add.call_count)
+        message = batcher.add.call_args[0][0]
+        self.assertEqual('fake_uuid-4', message['node_uuid'])
+        self.assertEqual({'t1': {'f1': 'v1'}}, message['payload'])
+        self.assertEqual(0, nodes.qsize())
 
     @mock.patch.object(task_manager, 'acquire')
     def test_send_sensor_task_shutdown(self, acquire_mock):
-        nodes = queue.Queue()
-        nodes.put_nowait(('fake_uuid', 'fake', None))
+        nodes = self._sensor_queue()
         self._start_service()
         self.service._shutdown = True
         CONF.set_override('send_sensor_data', True, group='conductor')
-        self.service._sensors_nodes_task(self.context, nodes)
+        self.service._sensors_nodes_task(self.context, nodes, mock.Mock())
         acquire_mock.__enter__.assert_not_called()
 
     @mock.patch.object(task_manager, 'acquire', autospec=True)
     def test_send_sensor_task_no_management(self, acquire_mock):
-        nodes = queue.Queue()
-        nodes.put_nowait(('fake_uuid', 'fake', None))
+        nodes = self._sensor_queue()
+        batcher = mock.Mock(spec=sensors.NotificationBatcher)
 
         CONF.set_override('send_sensor_data', True, group='conductor')
 
@@ -3550,11 +3942,13 @@ class UpdatePortTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
                                autospec=True) as get_sensors_data_mock:
             with mock.patch.object(fake.FakeManagement, 'validate',
                                    autospec=True) as validate_mock:
-                self.service._sensors_nodes_task(self.context, nodes)
+                self.service._sensors_nodes_task(self.context, nodes,
+                                                 batcher)
 
         self.assertTrue(acquire_mock.called)
         self.assertFalse(get_sensors_data_mock.called)
         self.assertFalse(validate_mock.called)
+        self.assertFalse(batcher.add.called)
 
     @mock.patch.object(manager.ConductorManager, '_spawn_worker')
     @mock.patch.object(manager.ConductorManager, '_mapped_to_this_conductor')
@@ -3569,11 +3963,21 @@ class UpdatePortTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
         CONF.set_override('send_sensor_data_wait_timeout', 0,
                           group='conductor')
         _mapped_to_this_conductor_mock.return_value = True
-        get_nodeinfo_list_mock.return_value = [('fake_uuid', 'fake', None)]
+        get_nodeinfo_list_mock.return_value = [
+            ('fake_uuid', 'fake', None, {'ipmi_address': '1.2.3.4'}, {})]
         self.service._send_sensor_data(self.context)
         mock_spawn.assert_called_with(self.service._sensors_nodes_task,
                                       self.context,
-                                      mock.ANY)
+                                      mock.ANY, mock.ANY)
+        get_nodeinfo_list_mock.assert_called_with(
+            columns=['uuid', 'driver', 'instance_uuid', 'driver_info',
+                     'extra'],
+            filters={'associated': True})
+        nodes = mock_spawn.call_args[0][2]
+        self.assertEqual([{'uuid': 'fake_uuid', 'driver': 'fake',
+                           'instance_uuid': None,
+                           'driver_info': {'ipmi_address': '1.2.3.4'},
+                           'extra': {}}], list(nodes._pending))
 
     @mock.patch('ironic.conductor.manager.ConductorManager._spawn_worker')
     @mock.patch.object(manager.ConductorManager, '_mapped_to_this_conductor')
@@ -3593,8 +3997,8 @@ class UpdatePortTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
                           group='conductor')
 
         _mapped_to_this_conductor_mock.return_value = True
-        get_nodeinfo_list_mock.return_value = [('fake_uuid', 'fake',
-                                                None)] * 20
+        get_nodeinfo_list_mock.return_value = [
+            ('fake_uuid-%d' % i, 'fake', None, {}, {}) for i in range(20)]
         self.service._send_sensor_data(self.context)
         self.assertEqual(number_of_workers,
                          mock_spawn.call_count)
@@ -4206,6 +4610,68 @@ class ManagerDoSyncPowerStateTestCase(db_base.DbTestCase):
         self.assertFalse(node_power_action.called)
         self.assertFalse(self.task.upgrade_lock.called)
 
+    def test_state_known(self, node_power_action):
+        self.node.power_state = states.POWER_ON
+        count = manager.do_sync_power_state(self.task, 0,
+                                            power_state=states.POWER_ON)
+
+        self.assertEqual(0, count)
+        self.assertFalse(self.power.get_power_state.called)
+        self.assertFalse(self.task.upgrade_lock.called)
+
+    def test_state_known_changed(self, node_power_action):
+        self.node.power_state = states.POWER_ON
+        self.power.get_power_state.return_value = states.POWER_OFF
+        count = manager.do_sync_power_state(self.task, 0,
+                                            power_state=states.POWER_OFF)
+
+        self.assertEqual(1, count)
+        # Read again with the exclusive lock before acting
+        self.power.get_power_state.assert_called_once_with(self.task)
+        self.assertFalse(node_power_action.called)
+        self.assertEqual(states.POWER_OFF, self.node.power_state)
+        self.task.upgrade_lock.assert_called_once_with()
+
+    def test_state_known_outdated(self, node_power_action):
+        # The node was powered on by a user after its power state was read
+        self.node.power_state = states.POWER_ON
+        self.power.get_power_state.return_value = states.POWER_ON
+        count = manager.do_sync_power_state(self.task, 0,
+                                            power_state=states.POWER_OFF)
+
+        self.assertEqual(0, count)
+        self.power.get_power_state.assert_called_once_with(self.task)
+        self.assertFalse(node_power_action.called)
+        self.assertEqual(states.POWER_ON, self.node.power_state)
+
+    def test_state_known_power_action_in_progress(self, node_power_action):
+        self.config(force_power_state_during_sync=True, group='conductor')
+        self.node.power_state = states.POWER_ON
+
+        def _upgrade_lock():
+            self.node.target_power_state = states.POWER_OFF
+
+        self.task.upgrade_lock.side_effect = _upgrade_lock
+        count = manager.do_sync_power_state(self.task, 0,
+                                            power_state=states.POWER_OFF)
+
+        self.assertEqual(0, count)
+        self.assertFalse(self.power.get_power_state.called)
+        self.assertFalse(node_power_action.called)
+        self.assertEqual(states.POWER_ON, self.node.power_state)
+
+    def test_state_known_get_power_state_fail(self, node_power_action):
+        self.config(force_power_state_during_sync=True, group='conductor')
+        self.node.power_state = states.POWER_ON
+        self.power.get_power_state.side_effect = (
+            exception.IronicException('foo'))
+        count = manager.do_sync_power_state(self.task, 0,
+                                            power_state=states.POWER_OFF)
+
+        self.assertEqual(1, count)
+        self.assertFalse(node_power_action.called)
+        self.assertEqual(states.POWER_ON, self.node.power_state)
+
     def test_state_not_set(self, node_power_action):
         self._do_sync_power_state(None, states.POWER_ON)
 
@@ -4257,6 +4723,7 @@ class ManagerDoSyncPowerStateTestCase(db_base.DbTestCase):
     def test_state_changed_no_sync_notify(self, mock_notif, node_power_action):
         # Required for exception handling
         mock_notif.__name__ = 'NodeCorrectedPowerStateNotification'
+        self.config(notification_level='info')
 
         self._do_sync_power_state(states.POWER_ON, states.POWER_OFF)
 
@@ -4350,6 +4817,7 @@ class ManagerDoSyncPowerStateTestCase(db_base.DbTestCase):
         self.config(power_state_sync_max_retries=1, group='conductor')
         # Required for exception handling
         mock_notif.__name__ = 'NodeCorrectedPowerStateNotification'
+        self.config(notification_level='info')
 
         self._do_sync_power_state(states.POWER_ON, [states.POWER_OFF,
                                                     states.POWER_OFF])
@@ -4449,6 +4917,8 @@ class ManagerSyncPowerStatesTestCase(mgr_utils.CommonMixIn,
                                      db_base.DbTestCase):
     def setUp(self):
         super(ManagerSyncPowerStatesTestCase, self).setUp()
+        # NOTE: the bulk power state retrieval is tested separately
+        self.config(sync_power_state_bulk_size=0, group='conductor')
         self.service = manager.ConductorManager('hostname', 'test-topic')
         self.service.dbapi = self.dbapi
         self.node = self._create_node()
@@ -4671,6 +5141,193 @@ class ManagerSyncPowerStatesTestCase(mgr_utils.CommonMixIn,
                       mock.call(tasks[5], mock.ANY)]
         self.assertEqual(sync_calls, sync_mock.call_args_list)
 
+    @mock.patch.object(power_events, 'needs_sync', autospec=True)
+    def test_node_subscribed(self, needs_sync_mock, get_nodeinfo_mock,
+                             mapped_mock, acquire_mock, sync_mock):
+        get_nodeinfo_mock.return_value = self._get_nodeinfo_list_response()
+        mapped_mock.return_value = True
+        needs_sync_mock.return_value = False
+
+        self.service._sync_power_states(self.context)
+
+        needs_sync_mock.assert_called_once_with(self.node.uuid)
+        self.assertFalse(acquire_mock.called)
+        self.assertFalse(sync_mock.called)
+
+    @mock.patch.object(power_events, 'synced', autospec=True)
+    def test_node_synced(self, synced_mock, get_nodeinfo_mock,
+                         mapped_mock, acquire_mock, sync_mock):
+        get_nodeinfo_mock.return_value = self._get_nodeinfo_list_response()
+        mapped_mock.return_value = True
+        task = self._create_task(node_attrs=dict(uuid=self.node.uuid))
+        acquire_mock.side_effect = self._get_acquire_side_effect(task)
+        sync_mock.return_value = 0
+
+        self.service._sync_power_states(self.context)
+
+        synced_mock.assert_called_once_with(self.node.uuid)
+
+    @mock.patch.object(power_events, 'synced', autospec=True)
+    def test_node_sync_failed(self, synced_mock, get_nodeinfo_mock,
+                              mapped_mock, acquire_mock, sync_mock):
+        get_nodeinfo_mock.return_value = self._get_nodeinfo_list_response()
+        mapped_mock.return_value = True
+        task = self._create_task(node_attrs=dict(uuid=self.node.uuid))
+        acquire_mock.side_effect = self._get_acquire_side_effect(task)
+        sync_mock.return_value = 1
+
+        self.service._sync_power_states(self.context)
+
+        self.assertEqual(1, self.service.power_state_sync_count[
+            self.node.uuid])
+        self.assertFalse(synced_mock.called)
+
+    @mock.patch.object(manager.ConductorManager, '_spawn_worker',
+                       autospec=True)
+    def test__handle_power_event(self, spawn_mock, get_nodeinfo_mock,
+                                 mapped_mock, acquire_mock, sync_mock):
+        self.service._handle_power_event(self.node.uuid)
+        spawn_mock.assert_called_once_with(
+            self.service, self.service._sync_node_power_state, mock.ANY,
+            self.node.uuid)
+
+    @mock.patch.object(manager.ConductorManager, '_spawn_worker',
+                       autospec=True)
+    def test__handle_power_event_no_worker(self, spawn_mock,
+                                           get_nodeinfo_mock, mapped_mock,
+                                           acquire_mock, sync_mock):
+        spawn_mock.side_effect = exception.NoFreeConductorWorker()
+        self.service._handle_power_event(self.node.uuid)
+        self.assertTrue(spawn_mock.called)
+
+
+@mock.patch.object(manager, 'do_sync_power_state')
+@mock.patch.object(task_manager, 'acquire')
+@mock.patch.object(manager.ConductorManager, '_mapped_to_this_conductor')
+@mock.patch.object(dbapi.IMPL, 'get_nodeinfo_list')
+class ManagerSyncPowerStatesBulkTestCase(mgr_utils.CommonMixIn,
+                                         db_base.DbTestCase):
+    def setUp(self):
+        super(ManagerSyncPowerStatesBulkTestCase, self).setUp()
+        self.config(sync_power_state_bulk_size=100, group='conductor')
+        self.service = manager.ConductorManager('hostname', 'test-topic')
+        self.service.dbapi = self.dbapi
+        self.columns = ['uuid', 'driver', 'id']
+        self.power = mock.Mock(spec_set=drivers_base.PowerInterface)
+        self.power.get_power_state_bulk_key.side_effect = (
+            lambda task: task.node.driver_info.get('pdu'))
+
+    def _create_bulk_task(self, pdu=None, **attrs):
+        node = self._create_node(id=len(attrs), driver_info={'pdu': pdu},
+                                 **attrs)
+        task = mock.Mock(spec_set=['node', 'driver', 'release_resources'])
+        task.node = node
+        task.driver.power = self.power
+        return task
+
+    def _prepare(self, get_nodeinfo_mock, mapped_mock, acquire_mock,
+                 tasks):
+        get_nodeinfo_mock.return_value = self._get_nodeinfo_list_response(
+            [task.node for task in tasks])
+        mapped_mock.return_value = True
+        acquire_mock.side_effect = tasks
+
+    def test_bulk(self, get_nodeinfo_mock, mapped_mock, acquire_mock,
+                  sync_mock):
+        tasks = [self._create_bulk_task(pdu='pdu1'),
+                 self._create_bulk_task(),
+                 self._create_bulk_task(pdu='pdu2'),
+                 self._create_bulk_task(pdu='pdu1')]
+        self._prepare(get_nodeinfo_mock, mapped_mock, acquire_mock, tasks)
+        self.power.get_power_state_bulk.side_effect = [
+            {tasks[0].node.uuid: states.POWER_ON},
+            {tasks[2].node.uuid: states.POWER_OFF}]
+        sync_mock.return_value = 0
+
+        self.service._sync_power_states(self.context)
+
+        acquire_mock.assert_has_calls(
+            [mock.call(self.context, task.node.uuid, purpose=mock.ANY,
+                       shared=True) for task in tasks])
+        self.assertEqual(
+            [mock.call([tasks[0], tasks[3]]), mock.call([tasks[2]])],
+            self.power.get_power_state_bulk.call_args_list)
+        self.assertEqual(
+            [mock.call(tasks[1], 0),
+             mock.call(tasks[0], 0, power_state=states.POWER_ON),
+             mock.call(tasks[3], 0),
+             mock.call(tasks[2], 0, power_state=states.POWER_OFF)],
+            sync_mock.call_args_list)
+        for task in tasks:
+            task.release_resources.assert_called_once_with()
+
+    def test_bulk_size(self, get_nodeinfo_mock, mapped_mock, acquire_mock,
+                       sync_mock):
+        self.config(sync_power_state_bulk_size=2, group='conductor')
+        tasks = [self._create_bulk_task(pdu='pdu1') for i in range(3)]
+        self._prepare(get_nodeinfo_mock, mapped_mock, acquire_mock, tasks)
+        self.power.get_power_state_bulk.return_value = {}
+        sync_mock.return_value = 0
+
+        self.service._sync_power_states(self.context)
+
+        self.assertEqual(
+            [mock.call(tasks[:2]), mock.call(tasks[2:])],
+            self.power.get_power_state_bulk.call_args_list)
+        self.assertEqual(3, sync_mock.call_count)
+
+    def test_bulk_fails(self, get_nodeinfo_mock, mapped_mock, acquire_mock,
+                        sync_mock):
+        tasks = [self._create_bulk_task(pdu='pdu1') for i in range(2)]
+        self._prepare(get_nodeinfo_mock, mapped_mock, acquire_mock, tasks)
+        self.power.get_power_state_bulk.side_effect = (
+            exception.SNMPFailure(operation='GET', error='boom'))
+        sync_mock.side_effect = [exception.NodeLocked(node='node',
+                                                      host='host'), 2]
+
+        self.service._sync_power_states(self.context)
+
+        self.assertEqual([mock.call(tasks[0], 0), mock.call(tasks[1], 0)],
+                         sync_mock.call_args_list)
+        self.assertEqual(
+            2, self.service.power_state_sync_count[tasks[1].node.uuid])
+        for task in tasks:
+            task.release_resources.assert_called_once_with()
+
+    def test_bulk_key_fails(self, get_nodeinfo_mock, mapped_mock,
+                            acquire_mock, sync_mock):
+        tasks = [self._create_bulk_task(pdu='pdu1')]
+        self._prepare(get_nodeinfo_mock, mapped_mock, acquire_mock, tasks)
+        self.power.get_power_state_bulk_key.side_effect = (
+            exception.InvalidParameterValue('invalid'))
+        sync_mock.return_value = 0
+
+        self.service._sync_power_states(self.context)
+
+        self.assertFalse(self.power.get_power_state_bulk.called)
+        sync_mock.assert_called_once_with(tasks[0], 0)
+        tasks[0].release_resources.assert_called_once_with()
+
+    def test_excluded(self, get_nodeinfo_mock, mapped_mock, acquire_mock,
+                      sync_mock):
+        tasks = [self._create_bulk_task(pdu='pdu1', maintenance=True),
+                 self._create_bulk_task(pdu='pdu1',
+                                        target_power_state=states.POWER_ON),
+                 self._create_bulk_task(pdu='pdu1', reservation='host')]
+        tasks[0].node.provision_state = states.AVAILABLE
+        self._prepare(get_nodeinfo_mock, mapped_mock, acquire_mock, tasks)
+        # The last node disappears
+        get_nodeinfo_mock.return_value.append(('uuid', 'fake', 42))
+        acquire_mock.side_effect = tasks + [
+            exception.NodeNotFound(node='uuid')]
+
+        self.service._sync_power_states(self.context)
+
+        self.assertFalse(self.power.get_power_state_bulk_key.called)
+        self.assertFalse(sync_mock.called)
+        for task in tasks:
+            task.release_resources.assert_called_once_with()
+
 
 @mock.patch.object(task_manager, 'acquire')
 @mock.patch.object(manager.ConductorManager, '_mapped_to_this_conductor')
@@ -5107,6 +5764,23 @@ class ManagerSyncLocalStateTestCase(mgr_utils.CommonMixIn, db_base.DbTestCase):
             self.service._spawn_worker,
             self.service._do_takeover, self.task)
 
+    def test_good_snapshot(self, get_nodeinfo_mock, mapped_mock,
+                           acquire_mock):
+        acquire_mock.side_effect = self._get_acquire_side_effect(self.task)
+        nodes = [{'uuid': self.node.uuid, 'driver': self.node.driver,
+                  'id': self.node.id, 'conductor_affinity': None,
+                  'provision_state': states.ACTIVE, 'reservation': None}]
+
+        self.service._sync_local_state(self.context, nodes=nodes)
+
+        self.assertFalse(get_nodeinfo_mock.called)
+        self.assertFalse(mapped_mock.called)
+        acquire_mock.assert_called_once_with(self.context, self.node.uuid,
+                                             purpose=mock.ANY)
+        self.task.spawn_after.assert_called_once_with(
+            self.service._spawn_worker,
+            self.service._do_takeover, self.task)
+
     def test_no_free_worker(self, get_nodeinfo_mock, mapped_mock,
                             acquire_mock):
         mapped_mock.return_value = True
@@ -5306,6 +5980,22 @@ class NodeInspectHardware(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
         self.assertEqual(states.MANAGEABLE, node.target_provision_state)
         self.assertIsNotNone(node.last_error)
 
+    def test__process_node_snapshot_inspect_timeouts(self):
+        self._start_service()
+        CONF.set_override('inspect_timeout', 1, group='conductor')
+        node = obj_utils.create_test_node(
+            self.context, driver='fake',
+            provision_state=states.INSPECTING,
+            target_provision_state=states.MANAGEABLE,
+            inspection_started_at=datetime.datetime(2000, 1, 1, 0, 0))
+
+        self.service._process_deadline_node_snapshot(self.context)
+        self._stop_service()
+        node.refresh()
+        self.assertEqual(states.INSPECTFAIL, node.provision_state)
+        self.assertEqual(states.MANAGEABLE, node.target_provision_state)
+        self.assertIsNotNone(node.last_error)
+
     @mock.patch('ironic.conductor.manager.ConductorManager._spawn_worker')
     def test_inspect_hardware_worker_pool_full(self, mock_spawn):
         prv_state = states.MANAGEABLE
@@ -6085,7 +6775,8 @@ class DoNodeAdoptionTestCase(mgr_utils.ServiceSetUpMixin, db_base.DbTestCase):
         self.assertEqual(states.NOSTATE, node.target_provision_state)
         self.assertIsNone(node.last_error)
 
-    @mock.patch('ironic.conductor.manager.ConductorManager._spawn_worker')
+    @mock.patch('ironic.conductor.manager.ConductorManager.'
+                '_spawn_priority_worker')
     def test_heartbeat(self, mock_spawn):
         """Test heartbeating."""
         node = obj_utils.create_test_node(
@@ -0,0 +1,141 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for the shared snapshot of nodes."""
+
+import mock
+
+from ironic.conductor import node_snapshot
+from ironic.conductor import periodic_scheduler
+from ironic.tests import base
+
+
+class ConsumerTestCase(base.TestCase):
+
+    def test_consumer(self):
+        @node_snapshot.consumer(columns=['id'])
+        def func(context, nodes=None):
+            pass
+
+        self.assertTrue(node_snapshot.is_consumer(func))
+
+    def test_consumer_disabled(self):
+        @node_snapshot.consumer(columns=['id'], enabled=False)
+        def func(context, nodes=None):
+            pass
+
+        self.assertFalse(node_snapshot.is_consumer(func))
+
+    def test_not_consumer(self):
+        self.assertFalse(node_snapshot.is_consumer(lambda: None))
+        self.assertFalse(node_snapshot.is_consumer(mock.Mock()))
+
+
+@mock.patch.object(node_snapshot.time, 'time', autospec=True,
+                   return_value=1000)
+class NodeSnapshotTestCase(base.TestCase):
+
+    def setUp(self):
+        super(NodeSnapshotTestCase, self).setUp()
+        self.manager = mock.Mock()
+        self.manager.iter_nodes.return_value = [
+            ('uuid1', 'driver1', 1, 'active'),
+            ('uuid2', 'driver2', 2, 'deploying'),
+        ]
+        self.snapshot = node_snapshot.NodeSnapshot(self.manager)
+        self.context = mock.sentinel.context
+        self.calls = []
+
+    def _consumer(self, name, **kwargs):
+        @node_snapshot.consumer(**kwargs)
+        def func(*args, **kw):
+            self.calls.append((name, args, kw['nodes']))
+        return func
+
+    def test_process(self, time_mock):
+        self.snapshot.register(self._consumer(
+            'first', columns=['id']), ('arg',))
+        self.snapshot.register(self._consumer(
+            'second', columns=['provision_state', 'id'],
+            predicate=lambda node: node['provision_state'] == 'active'))
+        self.assertEqual(2, len(self.snapshot))
+
+        self.snapshot.process(self.context)
+
+        self.manager.iter_nodes.assert_called_once_with(
+            fields=['id', 'provision_state'],
+            filters={'maintenance': False})
+        node1 = {'uuid': 'uuid1', 'driver': 'driver1', 'id': 1,
+                 'provision_state': 'active'}
+        node2 = {'uuid': 'uuid2', 'driver': 'driver2', 'id': 2,
+                 'provision_state': 'deploying'}
+        self.assertEqual([('first', ('arg', self.context), [node1, node2]),
+                          ('second', (self.context,), [node1])],
+                         self.calls)
+
+    def test_process_lanes(self, time_mock):
+        self.snapshot.register(self._consumer('default', columns=['id']))
+        self.snapshot.register(periodic_scheduler.deadline_sensitive(
+            self._consumer('deadline', columns=['provision_state'])))
+
+        self.snapshot.process(self.context)
+        self.manager.iter_nodes.assert_called_once_with(
+            fields=['id'], filters={'maintenance': False})
+        self.assertEqual(['default'], [call[0] for call in self.calls])
+
+        self.manager.iter_nodes.reset_mock()
+        self.snapshot.process(self.context,
+                              lane=periodic_scheduler.DEADLINE_LANE)
+        self.manager.iter_nodes.assert_called_once_with(
+            fields=['provision_state'], filters={'maintenance': False})
+        self.assertEqual(['default', 'deadline'],
+                         [call[0] for call in self.calls])
+
+    def test_process_no_consumers(self, time_mock):
+        self.snapshot.process(self.context)
+        self.assertFalse(self.manager.iter_nodes.called)
+
+    def test_process_spacing(self, time_mock):
+        self.manager.iter_nodes.return_value = []
+        self.snapshot.register(self._consumer('every'))
+        self.snapshot.register(self._consumer('spaced', spacing=100))
+
+        self.snapshot.process(self.context)
+        time_mock.return_value = 1060
+        self.snapshot.process(self.context)
+        time_mock.return_value = 1100
+        self.snapshot.process(self.context)
+
+        self.assertEqual(['every', 'spaced', 'every', 'every', 'spaced'],
+                         [call[0] for call in self.calls])
+        self.assertEqual(3, self.manager.iter_nodes.call_count)
+
+    def test_process_only_spaced_not_due(self, time_mock):
+        self.snapshot.register(self._consumer('spaced', spacing=100))
+        self.snapshot.process(self.context)
+        time_mock.return_value = 1060
+        self.snapshot.process(self.context)
+        self.assertEqual(1, self.manager.iter_nodes.call_count)
+
+    @mock.patch.object(node_snapshot.LOG, 'exception', autospec=True)
+    def test_process_consumer_fails(self, log_mock, time_mock):
+        @node_snapshot.consumer()
+        def failing(context, nodes=None):
+            raise RuntimeError('boom')
+
+        self.snapshot.register(failing)
+        self.snapshot.register(self._consumer('next'))
+
+        self.snapshot.process(self.context)
+
+        self.assertTrue(log_mock.called)
+        self.assertEqual(['next'], [call[0] for call in self.calls])
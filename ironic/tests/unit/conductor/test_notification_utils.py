@@ -181,7 +181,7 @@ class ProvisionNotifyTestCase(tests_base.TestCase):
     @mock.patch('ironic.objects.node.NodeSetProvisionStateNotification')
     def test_emit_notification(self, provision_mock):
         provision_mock.__name__ = 'NodeSetProvisionStateNotification'
-        self.config(host='fake-host')
+        self.config(host='fake-host', notification_level='info')
         node = obj_utils.get_test_node(self.context,
                                        provision_state='fake state',
                                        target_provision_state='fake target',
@@ -212,6 +212,19 @@ class ProvisionNotifyTestCase(tests_base.TestCase):
                          payload.previous_target_provision_state)
         self.assertEqual({'foo': 'baz'}, payload.instance_info)
 
+    @mock.patch('ironic.objects.node.NodeSetProvisionStatePayload')
+    @mock.patch('ironic.objects.node.NodeSetProvisionStateNotification')
+    def test_emit_notification_level_not_enabled(self, provision_mock,
+                                                 payload_mock):
+        self.config(notification_level='error')
+        task = mock.Mock(spec=task_manager.TaskManager)
+        notif_utils.emit_provision_set_notification(
+            task, fields.NotificationLevel.INFO,
+            fields.NotificationStatus.SUCCESS, 'fake_old',
+            'fake_old_target', 'event')
+        self.assertFalse(payload_mock.called)
+        self.assertFalse(provision_mock.called)
+
     def test_mask_secrets(self):
         test_info = {'configdrive': 'fake_drive', 'image_url': 'fake-url',
                      'some_value': 'fake-value'}
@@ -0,0 +1,186 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for the scheduling of periodic tasks."""
+
+import futurist
+from futurist import periodics
+import mock
+
+from ironic.common import metrics
+from ironic.conductor import periodic_scheduler
+from ironic.tests import base
+
+
+@periodics.periodic(spacing=10)
+def _regular_task():
+    pass
+
+
+@periodic_scheduler.deadline_sensitive
+@periodics.periodic(spacing=10)
+def _deadline_task():
+    pass
+
+
+class LaneTestCase(base.TestCase):
+
+    def test_get_lane_default(self):
+        self.assertEqual(periodic_scheduler.DEFAULT_LANE,
+                         periodic_scheduler.get_lane(_regular_task))
+
+    def test_get_lane_deadline(self):
+        self.assertEqual(periodic_scheduler.DEADLINE_LANE,
+                         periodic_scheduler.get_lane(_deadline_task))
+
+    def test_get_lane_unknown_value(self):
+        self.assertEqual(periodic_scheduler.DEFAULT_LANE,
+                         periodic_scheduler.get_lane(mock.Mock()))
+
+    def test_deadline_sensitive_keeps_periodic(self):
+        self.assertTrue(periodics.is_periodic(_deadline_task))
+        self.assertEqual(10, _deadline_task._periodic_spacing)
+
+
+@mock.patch.object(periodic_scheduler._random, 'random', autospec=True)
+class FirstRunTestCase(base.TestCase):
+
+    def test_full_jitter(self, random_mock):
+        random_mock.return_value = 0.25
+        self.assertEqual(107.5,
+                         periodic_scheduler._first_run(_regular_task, 100))
+
+    def test_no_jitter(self, random_mock):
+        self.config(periodic_max_jitter=0, group='conductor')
+        random_mock.return_value = 0.25
+        self.assertEqual(110,
+                         periodic_scheduler._first_run(_regular_task, 100))
+
+    def test_partial_jitter(self, random_mock):
+        self.config(periodic_max_jitter=0.5, group='conductor')
+        random_mock.return_value = 0.5
+        self.assertEqual(107.5,
+                         periodic_scheduler._first_run(_regular_task, 100))
+
+
+class NextRunTestCase(base.TestCase):
+
+    def setUp(self):
+        super(NextRunTestCase, self).setUp()
+        self.name = 'ironic.tests.unit.conductor.test_periodic_scheduler.' \
+            '_regular_task'
+        self.overruns = periodic_scheduler._OVERRUNS.get(task=self.name)
+        self.skipped = periodic_scheduler._SKIPPED.get(task=self.name)
+
+    @mock.patch.object(periodic_scheduler.LOG, 'warning', autospec=True)
+    def test_in_time(self, log_mock):
+        self.assertEqual(110, periodic_scheduler._next_run(
+            _regular_task, 100, 105, mock.Mock()))
+        self.assertFalse(log_mock.called)
+        self.assertEqual(self.overruns,
+                         periodic_scheduler._OVERRUNS.get(task=self.name))
+
+    @mock.patch.object(periodic_scheduler.LOG, 'warning', autospec=True)
+    def test_overrun(self, log_mock):
+        self.assertEqual(130, periodic_scheduler._next_run(
+            _regular_task, 100, 125, mock.Mock()))
+        self.assertTrue(log_mock.called)
+        self.assertEqual(self.overruns + 1,
+                         periodic_scheduler._OVERRUNS.get(task=self.name))
+        self.assertEqual(self.skipped + 2,
+                         periodic_scheduler._SKIPPED.get(task=self.name))
+
+    @mock.patch.object(periodic_scheduler.LOG, 'warning', autospec=True)
+    def test_overrun_exact_tick(self, log_mock):
+        self.assertEqual(120, periodic_scheduler._next_run(
+            _regular_task, 100, 120, mock.Mock()))
+        self.assertTrue(log_mock.called)
+        self.assertEqual(self.skipped + 1,
+                         periodic_scheduler._SKIPPED.get(task=self.name))
+
+    def test_metrics_registered(self):
+        rendered = metrics.REGISTRY.render()
+        self.assertIn('ironic_conductor_periodic_overruns_total', rendered)
+        self.assertIn('ironic_conductor_periodic_skipped_total', rendered)
+
+
+class PeriodicSchedulerTestCase(base.TestCase):
+
+    def setUp(self):
+        super(PeriodicSchedulerTestCase, self).setUp()
+        self.executor = futurist.SynchronousExecutor()
+        self.scheduler = periodic_scheduler.PeriodicScheduler(
+            [(_regular_task, (), {}), (_deadline_task, (), {})],
+            self.executor)
+
+    def test_lanes(self):
+        default = [watcher.work.name
+                   for watcher in self.scheduler._default.iter_watchers()]
+        deadline = [watcher.work.name
+                    for watcher in self.scheduler._deadline.iter_watchers()]
+        self.assertEqual(1, len(default))
+        self.assertIn('_regular_task', default[0])
+        self.assertEqual(1, len(deadline))
+        self.assertIn('_deadline_task', deadline[0])
+        self.assertEqual(2, len(list(self.scheduler.iter_watchers())))
+        self.assertIsInstance(self.scheduler._deadline_executor,
+                              futurist.GreenThreadPoolExecutor)
+
+    def test_start(self):
+        with mock.patch.object(self.scheduler._default, 'start',
+                               autospec=True) as default_mock, \
+                mock.patch.object(self.scheduler._deadline_executor,
+                                  'submit', autospec=True) as submit_mock:
+            self.scheduler.start()
+        default_mock.assert_called_once_with(allow_empty=False)
+        submit_mock.assert_called_once_with(self.scheduler._deadline.start,
+                                            allow_empty=True)
+
+    def test_stop_and_wait(self):
+        with mock.patch.object(self.scheduler._default, 'stop',
+                               autospec=True) as default_stop, \
+                mock.patch.object(self.scheduler._deadline, 'stop',
+                                  autospec=True) as deadline_stop, \
+                mock.patch.object(self.scheduler._default, 'wait',
+                                  autospec=True) as default_wait, \
+                mock.patch.object(self.scheduler._deadline, 'wait',
+                                  autospec=True) as deadline_wait, \
+                mock.patch.object(self.scheduler._deadline_executor,
+                                  'shutdown', autospec=True) as shutdown:
+            self.scheduler.stop()
+            self.scheduler.wait(timeout=5)
+        default_stop.assert_called_once_with()
+        deadline_stop.assert_called_once_with()
+        default_wait.assert_called_once_with(timeout=5)
+        deadline_wait.assert_called_once_with(timeout=5)
+        shutdown.assert_called_once_with(wait=True)
+
+    def test_run(self):
+        self.config(periodic_max_jitter=0, group='conductor')
+        calls = []
+
+        @periodics.periodic(spacing=0.01, run_immediately=True)
+        def regular():
+            calls.append('regular')
+            scheduler.stop()
+
+        @periodic_scheduler.deadline_sensitive
+        @periodics.periodic(spacing=0.01, run_immediately=True)
+        def deadline():
+            calls.append('deadline')
+
+        scheduler = periodic_scheduler.PeriodicScheduler(
+            [(regular, (), {}), (deadline, (), {})],
+            futurist.GreenThreadPoolExecutor())
+        scheduler.start()
+        scheduler.wait()
+        self.assertIn('regular', calls)
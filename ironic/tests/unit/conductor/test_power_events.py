@@ -0,0 +1,79 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for the out-of-band notifications of power state changes."""
+
+import mock
+
+from ironic.conductor import power_events
+from ironic.tests import base
+
+
+@mock.patch.object(power_events.time, 'time', autospec=True,
+                   return_value=1000)
+class PowerEventsTestCase(base.TestCase):
+
+    def setUp(self):
+        super(PowerEventsTestCase, self).setUp()
+        for name in ('_SUBSCRIPTIONS', '_LAST_SYNC'):
+            patcher = mock.patch.dict(getattr(power_events, name),
+                                      clear=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(power_events, '_STOP_CALLBACKS', [])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(power_events.set_handler, None)
+
+    def test_not_subscribed(self, time_mock):
+        self.assertFalse(power_events.is_subscribed('uuid'))
+        self.assertTrue(power_events.needs_sync('uuid'))
+        power_events.synced('uuid')
+        self.assertTrue(power_events.needs_sync('uuid'))
+
+    def test_subscribed(self, time_mock):
+        power_events.subscribe('uuid', 100)
+        self.assertTrue(power_events.is_subscribed('uuid'))
+        self.assertTrue(power_events.needs_sync('uuid'))
+
+        power_events.synced('uuid')
+        time_mock.return_value = 1099
+        self.assertFalse(power_events.needs_sync('uuid'))
+        time_mock.return_value = 1100
+        self.assertTrue(power_events.needs_sync('uuid'))
+
+        power_events.unsubscribe('uuid')
+        self.assertFalse(power_events.is_subscribed('uuid'))
+        self.assertEqual({}, power_events._LAST_SYNC)
+
+    def test_power_event(self, time_mock):
+        handler = mock.Mock()
+        power_events.set_handler(handler)
+        self.assertTrue(power_events.power_event('uuid'))
+        handler.assert_called_once_with('uuid')
+
+    def test_power_event_no_handler(self, time_mock):
+        self.assertFalse(power_events.power_event('uuid'))
+
+    def test_stop(self, time_mock):
+        power_events.set_handler(mock.Mock())
+        callbacks = [mock.Mock(side_effect=Exception()), mock.Mock()]
+        for callback in callbacks:
+            power_events.add_stop_callback(callback)
+
+        power_events.stop()
+
+        self.assertFalse(power_events.power_event('uuid'))
+        for callback in callbacks:
+            callback.assert_called_once_with()
+        power_events.stop()
+        self.assertEqual(1, callbacks[1].call_count)
@@ -146,6 +146,34 @@ class RPCAPITestCase(db_base.DbTestCase):
         self.assertEqual('fake-topic.fake-host',
                          rpcapi.get_topic_for_driver('fake-driver'))
 
+    def _register_saturated_conductors(self):
+        for host, saturation in (('busy-host', 0.95), ('idle-host', 0.1)):
+            self.dbapi.register_conductor({'hostname': host,
+                                           'drivers': ['fake-driver']})
+            self.dbapi.touch_conductor(host, saturation=saturation)
+
+    def test_get_topic_for_avoids_saturated_conductor(self):
+        CONF.set_override('hash_distribution_replicas', 2)
+        self._register_saturated_conductors()
+        rpcapi = conductor_rpcapi.ConductorAPI(topic='fake-topic')
+        for _i in range(5):
+            self.assertEqual('fake-topic.idle-host',
+                             rpcapi.get_topic_for(self.fake_node_obj))
+
+    def test_get_topic_for_driver_avoids_saturated_conductor(self):
+        self._register_saturated_conductors()
+        rpcapi = conductor_rpcapi.ConductorAPI(topic='fake-topic')
+        for _i in range(5):
+            self.assertEqual('fake-topic.idle-host',
+                             rpcapi.get_topic_for_driver('fake-driver'))
+
+    def test_get_topic_for_driver_all_saturated(self):
+        self._register_saturated_conductors()
+        self.config(saturation_threshold=0.05, group='conductor')
+        rpcapi = conductor_rpcapi.ConductorAPI(topic='fake-topic')
+        self.assertIn(rpcapi.get_topic_for_driver('fake-driver'),
+                      ('fake-topic.busy-host', 'fake-topic.idle-host'))
+
     def _test_rpcapi(self, method, rpc_method, **kwargs):
         rpcapi = conductor_rpcapi.ConductorAPI(topic='fake-topic')
 
@@ -483,3 +511,37 @@ class RPCAPITestCase(db_base.DbTestCase):
                           'call',
                           node_id='fake-node',
                           version='1.38')
+
+    def test_bulk_node_action(self):
+        self._test_rpcapi('bulk_node_action',
+                          'call',
+                          node_ids=['fake-node'],
+                          action='power',
+                          target=states.POWER_OFF,
+                          timeout=None,
+                          reason=None,
+                          version='1.42')
+
+    def test_run_job(self):
+        self._test_rpcapi('run_job',
+                          'cast',
+                          job_id='fake-job',
+                          version='1.43')
+
+    def test_can_run_bulk_node_actions(self):
+        rpcapi = conductor_rpcapi.ConductorAPI(topic='fake-topic')
+        self.assertTrue(rpcapi.can_run_bulk_node_actions())
+
+    def test_can_run_bulk_node_actions_pinned(self):
+        self.config(pin_release_version='ocata')
+        rpcapi = conductor_rpcapi.ConductorAPI(topic='fake-topic')
+        self.assertFalse(rpcapi.can_run_bulk_node_actions())
+
+    def test_can_run_jobs(self):
+        rpcapi = conductor_rpcapi.ConductorAPI(topic='fake-topic')
+        self.assertTrue(rpcapi.can_run_jobs())
+
+    def test_can_run_jobs_pinned(self):
+        self.config(pin_release_version='ocata')
+        rpcapi = conductor_rpcapi.ConductorAPI(topic='fake-topic')
+        self.assertFalse(rpcapi.can_run_jobs())
@@ -0,0 +1,154 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for the sensor data collection pipeline."""
+
+import eventlet
+import mock
+
+from ironic.conductor import sensors
+from ironic.tests import base
+
+
+def _node(uuid, address=None, rack=None):
+    return {'uuid': uuid, 'driver': 'fake', 'instance_uuid': None,
+            'driver_info': {'ipmi_address': address} if address else {},
+            'extra': {'rack': rack} if rack else {}}
+
+
+class HelpersTestCase(base.TestCase):
+
+    def test_bmc_address(self):
+        node = _node('uuid')
+        node['driver_info'] = {'ipmi_username': 'admin',
+                               'ipmi_address': '1.2.3.4',
+                               'ipmi_target_address': '0x20'}
+        self.assertEqual('1.2.3.4', sensors.bmc_address(node))
+
+    def test_bmc_address_other_driver(self):
+        node = _node('uuid')
+        node['driver_info'] = {'redfish_address': 'https://bmc'}
+        self.assertEqual('https://bmc', sensors.bmc_address(node))
+
+    def test_bmc_address_unknown(self):
+        self.assertEqual('uuid', sensors.bmc_address(_node('uuid')))
+        node = _node('uuid')
+        node['driver_info'] = None
+        self.assertEqual('uuid', sensors.bmc_address(node))
+
+    def test_rack(self):
+        self.assertEqual('r1', sensors.rack(_node('uuid', rack='r1')))
+        self.assertIsNone(sensors.rack(_node('uuid')))
+
+    def test_get_queue(self):
+        self.config(send_sensor_data_bmc_concurrency=2,
+                    send_sensor_data_rack_concurrency=3, group='conductor')
+        nodes = sensors.get_queue([_node('uuid')])
+        self.assertEqual(1, nodes.qsize())
+        self.assertEqual(2, nodes._bmc_limit)
+        self.assertEqual(3, nodes._rack_limit)
+
+
+class SensorQueueTestCase(base.TestCase):
+
+    def test_get_in_order(self):
+        nodes = sensors.SensorQueue([_node('uuid1'), _node('uuid2')], 1)
+        self.assertEqual('uuid1', nodes.get()['uuid'])
+        self.assertEqual('uuid2', nodes.get()['uuid'])
+        self.assertIsNone(nodes.get())
+        self.assertEqual(0, nodes.qsize())
+
+    def test_bmc_limit(self):
+        nodes = sensors.SensorQueue([_node('uuid1', address='bmc1'),
+                                     _node('uuid2', address='bmc1'),
+                                     _node('uuid3', address='bmc2')], 1)
+        first = nodes.get()
+        self.assertEqual('uuid1', first['uuid'])
+        self.assertEqual('uuid3', nodes.get()['uuid'])
+        nodes.done(first)
+        self.assertEqual('uuid2', nodes.get()['uuid'])
+
+    def test_rack_limit(self):
+        nodes = sensors.SensorQueue([_node('uuid1', rack='r1'),
+                                     _node('uuid2', rack='r1'),
+                                     _node('uuid3'),
+                                     _node('uuid4', rack='r1')], 5, 2)
+        self.assertEqual(['uuid1', 'uuid2', 'uuid3'],
+                         [nodes.get()['uuid'] for i in range(3)])
+        self.assertEqual(1, nodes.qsize())
+
+    def test_get_waits_for_done(self):
+        nodes = sensors.SensorQueue([_node('uuid1', address='bmc'),
+                                     _node('uuid2', address='bmc')], 1)
+        first = nodes.get()
+        waiter = eventlet.spawn(nodes.get)
+        eventlet.sleep(0)
+        self.assertFalse(waiter.dead)
+        nodes.done(first)
+        self.assertEqual('uuid2', waiter.wait()['uuid'])
+
+    def test_stop(self):
+        nodes = sensors.SensorQueue([_node('uuid1', address='bmc'),
+                                     _node('uuid2', address='bmc')], 1)
+        nodes.get()
+        waiter = eventlet.spawn(nodes.get)
+        eventlet.sleep(0)
+        nodes.stop()
+        self.assertIsNone(waiter.wait())
+
+
+class NotificationBatcherTestCase(base.TestCase):
+
+    def setUp(self):
+        super(NotificationBatcherTestCase, self).setUp()
+        self.notifier = mock.Mock()
+        self.context = mock.sentinel.context
+
+    def test_no_batching(self):
+        batcher = sensors.NotificationBatcher(self.notifier, self.context)
+        batcher.add({'node_uuid': 'uuid1'})
+        self.notifier.info.assert_called_once_with(
+            self.context, 'hardware.ipmi.metrics', {'node_uuid': 'uuid1'})
+        batcher.close()
+        self.assertEqual(1, self.notifier.info.call_count)
+
+    def test_batching(self):
+        batcher = sensors.NotificationBatcher(self.notifier, self.context, 2)
+        for i in range(3):
+            batcher.add({'node_uuid': 'uuid%d' % i})
+        self.notifier.info.assert_called_once_with(
+            self.context, 'hardware.ipmi.metrics.batch', mock.ANY)
+        payload = self.notifier.info.call_args[0][2]
+        self.assertEqual('hardware.ipmi.metrics.batch', payload['event_type'])
+        self.assertEqual([{'node_uuid': 'uuid0'}, {'node_uuid': 'uuid1'}],
+                         payload['payload'])
+
+        batcher.close()
+        self.assertEqual(2, self.notifier.info.call_count)
+        self.assertEqual([{'node_uuid': 'uuid2'}],
+                         self.notifier.info.call_args[0][2]['payload'])
+
+        # Late messages are not held back
+        batcher.add({'node_uuid': 'uuid3'})
+        self.assertEqual(3, self.notifier.info.call_count)
+
+    def test_close_empty(self):
+        batcher = sensors.NotificationBatcher(self.notifier, self.context, 2)
+        batcher.close()
+        self.assertFalse(self.notifier.info.called)
+
+    @mock.patch.object(sensors.LOG, 'exception', autospec=True)
+    def test_send_fails(self, log_mock):
+        self.notifier.info.side_effect = RuntimeError
+        batcher = sensors.NotificationBatcher(self.notifier, self.context)
+        batcher.add({'node_uuid': 'uuid1'})
+        self.assertTrue(log_mock.called)
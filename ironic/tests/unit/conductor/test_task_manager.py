@@ -79,6 +79,21 @@ class TaskManagerTestCase(db_base.DbTestCase):
         release_mock.assert_called_once_with(self.context, self.host,
                                              self.node.id)
 
+    def test_excl_lock_metrics(
+            self, get_voltgt_mock, get_volconn_mock, get_portgroups_mock,
+            get_ports_mock, build_driver_mock,
+            reserve_mock, release_mock, node_get_mock):
+        reserve_mock.return_value = self.node
+        held = task_manager._LOCKS_HELD.get()
+        acquired = task_manager._LOCKS_ACQUIRED.get()
+        waits = task_manager._LOCK_WAIT.get()[0]
+        with task_manager.TaskManager(self.context, 'fake-node-id'):
+            self.assertEqual(held + 1, task_manager._LOCKS_HELD.get())
+            self.assertEqual(waits + 1, task_manager._LOCK_WAIT.get()[0])
+
+        self.assertEqual(held, task_manager._LOCKS_HELD.get())
+        self.assertEqual(acquired + 1, task_manager._LOCKS_ACQUIRED.get())
+
     def test_excl_lock_with_driver(
             self, get_voltgt_mock, get_volconn_mock, get_portgroups_mock,
             get_ports_mock, build_driver_mock,
@@ -693,16 +708,16 @@ class TaskManagerTestCase(db_base.DbTestCase):
         on_error_handler.assert_called_once_with(expected_exception,
                                                  'fake-argument')
 
-    @mock.patch.object(states.machine, 'copy')
+    @mock.patch.object(states.frozen_machine, 'cursor')
     def test_init_prepares_fsm(
-            self, copy_mock, get_volconn_mock, get_voltgt_mock,
+            self, cursor_mock, get_volconn_mock, get_voltgt_mock,
             get_portgroups_mock, get_ports_mock,
             build_driver_mock, reserve_mock, release_mock, node_get_mock):
-        m = mock.Mock(spec=fsm.FSM)
+        m = mock.Mock(spec=fsm.FSMCursor)
         reserve_mock.return_value = self.node
-        copy_mock.return_value = m
+        cursor_mock.return_value = m
         t = task_manager.TaskManager('fake', 'fake')
-        copy_mock.assert_called_once_with()
+        cursor_mock.assert_called_once_with()
         self.assertIs(m, t.fsm)
         m.initialize.assert_called_once_with(
             start_state=self.node.provision_state,
@@ -712,7 +727,7 @@ class TaskManagerTestCase(db_base.DbTestCase):
 class TaskManagerStateModelTestCases(tests_base.TestCase):
     def setUp(self):
         super(TaskManagerStateModelTestCases, self).setUp()
-        self.fsm = mock.Mock(spec=fsm.FSM)
+        self.fsm = mock.Mock(spec=fsm.FSMCursor)
         self.node = mock.Mock(spec=objects.Node)
         self.task = mock.Mock(spec=task_manager.TaskManager)
         self.task.fsm = self.fsm
@@ -651,6 +651,30 @@ class MigrationCheckersMixin(object):
             self.assertIsInstance(table.c.version.type,
                                   sqlalchemy.types.String)
 
+    def _check_9ec8e3b3095a(self, engine, data):
+        jobs = db_utils.get_table(engine, 'jobs')
+        col_names = [column.name for column in jobs.c]
+        expected_names = ['created_at', 'updated_at', 'version', 'id', 'uuid',
+                          'node_id', 'action', 'args', 'status', 'result',
+                          'error']
+        self.assertEqual(sorted(expected_names), sorted(col_names))
+
+        self.assertIsInstance(jobs.c.id.type, sqlalchemy.types.Integer)
+        self.assertIsInstance(jobs.c.uuid.type, sqlalchemy.types.String)
+        self.assertIsInstance(jobs.c.node_id.type, sqlalchemy.types.Integer)
+        self.assertIsInstance(jobs.c.action.type, sqlalchemy.types.String)
+        self.assertIsInstance(jobs.c.args.type, sqlalchemy.types.TEXT)
+        self.assertIsInstance(jobs.c.status.type, sqlalchemy.types.String)
+        self.assertIsInstance(jobs.c.result.type, sqlalchemy.types.TEXT)
+        self.assertIsInstance(jobs.c.error.type, sqlalchemy.types.TEXT)
+
+    def _check_4c5e8b2a9d17(self, engine, data):
+        conductors = db_utils.get_table(engine, 'conductors')
+        col_names = [column.name for column in conductors.c]
+        self.assertIn('saturation', col_names)
+        self.assertIsInstance(conductors.c.saturation.type,
+                              sqlalchemy.types.Float)
+
     def test_upgrade_and_version(self):
         with patch_with_engine(self.engine):
             self.migration_api.upgrade('head')
@@ -132,6 +132,17 @@ class DbConductorTestCase(base.DbTestCase):
         c = self.dbapi.get_conductor(c.hostname)
         self.assertEqual(test_time, timeutils.normalize_time(c.updated_at))
 
+    def test_touch_conductor_saturation(self):
+        c = self._create_test_cdr()
+        self.assertIsNone(c.saturation)
+        self.dbapi.touch_conductor(c.hostname, saturation=0.25)
+        c = self.dbapi.get_conductor(c.hostname)
+        self.assertEqual(0.25, c.saturation)
+        # Not reported, kept as is
+        self.dbapi.touch_conductor(c.hostname)
+        c = self.dbapi.get_conductor(c.hostname)
+        self.assertEqual(0.25, c.saturation)
+
     @mock.patch.object(oslo_db.api.time, 'sleep', autospec=True)
     @mock.patch.object(sqlalchemy.orm.Query, 'update', autospec=True)
     def test_touch_conductor_deadlock(self, mock_update, mock_sleep):
@@ -203,6 +214,24 @@ class DbConductorTestCase(base.DbTestCase):
         result = self.dbapi.get_active_driver_dict()
         self.assertEqual(expected, result)
 
+    @mock.patch.object(timeutils, 'utcnow', autospec=True)
+    def test_get_active_conductor_saturation(self, mock_utcnow):
+        past = datetime.datetime(2000, 1, 1, 0, 0)
+        present = past + datetime.timedelta(minutes=2)
+        mock_utcnow.return_value = past
+        self._create_test_cdr(id=1, hostname='stale')
+        self.dbapi.touch_conductor('stale', saturation=1.0)
+
+        mock_utcnow.return_value = present
+        self._create_test_cdr(id=2, hostname='busy')
+        self.dbapi.touch_conductor('busy', saturation=0.95)
+        self._create_test_cdr(id=3, hostname='idle')
+        self.dbapi.touch_conductor('idle', saturation=0.0)
+        self._create_test_cdr(id=4, hostname='unknown')
+
+        result = self.dbapi.get_active_conductor_saturation()
+        self.assertEqual({'busy': 0.95, 'idle': 0.0}, result)
+
     @mock.patch.object(timeutils, 'utcnow', autospec=True)
     def test_get_active_driver_dict_one_host_one_driver(self, mock_utcnow):
         h = 'fake-host'
@@ -0,0 +1,128 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for manipulating Jobs via the DB API"""
+
+import datetime
+
+import mock
+from oslo_utils import timeutils
+from oslo_utils import uuidutils
+
+from ironic.common import exception
+from ironic.common import states
+from ironic.tests.unit.db import base
+from ironic.tests.unit.db import utils as db_utils
+
+
+class DbJobTestCase(base.DbTestCase):
+
+    def setUp(self):
+        super(DbJobTestCase, self).setUp()
+        self.node = db_utils.create_test_node()
+        self.job = db_utils.create_test_job(node_id=self.node.id)
+
+    def test_create_job_defaults(self):
+        job = db_utils.get_test_job(node_id=self.node.id)
+        del job['id']
+        del job['uuid']
+        del job['status']
+        res = self.dbapi.create_job(job)
+        self.assertTrue(uuidutils.is_uuid_like(res.uuid))
+        self.assertEqual(states.JOB_PENDING, res.status)
+
+    def test_create_job_duplicated_uuid(self):
+        self.assertRaises(exception.JobAlreadyExists,
+                          db_utils.create_test_job,
+                          uuid=self.job.uuid, node_id=self.node.id)
+
+    def test_get_job_by_id(self):
+        res = self.dbapi.get_job_by_id(self.job.id)
+        self.assertEqual(self.job.uuid, res.uuid)
+        self.assertRaises(exception.JobNotFound,
+                          self.dbapi.get_job_by_id, -1)
+
+    def test_get_job_by_uuid(self):
+        res = self.dbapi.get_job_by_uuid(self.job.uuid)
+        self.assertEqual(self.job.id, res.id)
+        self.assertRaises(exception.JobNotFound,
+                          self.dbapi.get_job_by_uuid,
+                          uuidutils.generate_uuid())
+
+    def test_update_job(self):
+        res = self.dbapi.update_job(self.job.id,
+                                    {'status': states.JOB_SUCCESS,
+                                     'result': {'boot_device': 'pxe'}})
+        self.assertEqual(states.JOB_SUCCESS, res.status)
+        self.assertEqual({'boot_device': 'pxe'}, res.result)
+
+    def test_update_job_uuid(self):
+        self.assertRaises(exception.InvalidParameterValue,
+                          self.dbapi.update_job, self.job.id,
+                          {'uuid': uuidutils.generate_uuid()})
+
+    def test_update_job_not_found(self):
+        self.assertRaises(exception.JobNotFound,
+                          self.dbapi.update_job,
+                          uuidutils.generate_uuid(),
+                          {'status': states.JOB_RUNNING})
+
+    @mock.patch.object(timeutils, 'utcnow', autospec=True)
+    def test_expire_pending_jobs(self, mock_utcnow):
+        past = datetime.datetime(2000, 1, 1, 0, 0)
+        mock_utcnow.return_value = past
+        pending = db_utils.create_test_job(uuid=uuidutils.generate_uuid(),
+                                           node_id=self.node.id)
+        running = db_utils.create_test_job(uuid=uuidutils.generate_uuid(),
+                                           node_id=self.node.id)
+        self.dbapi.update_job(running.id, {'status': states.JOB_RUNNING})
+        mock_utcnow.return_value = past + datetime.timedelta(hours=2)
+        recent = db_utils.create_test_job(uuid=uuidutils.generate_uuid(),
+                                          node_id=self.node.id)
+
+        count = self.dbapi.expire_pending_jobs(
+            past + datetime.timedelta(hours=1), 'timed out')
+
+        self.assertEqual(1, count)
+        res = self.dbapi.get_job_by_id(pending.id)
+        self.assertEqual(states.JOB_ERROR, res.status)
+        self.assertEqual('timed out', res.error)
+        self.assertEqual(past + datetime.timedelta(hours=2),
+                         res.updated_at.replace(tzinfo=None))
+        self.assertEqual(states.JOB_RUNNING,
+                         self.dbapi.get_job_by_id(running.id).status)
+        self.assertEqual(states.JOB_PENDING,
+                         self.dbapi.get_job_by_id(recent.id).status)
+
+    @mock.patch.object(timeutils, 'utcnow', autospec=True)
+    def test_destroy_finished_jobs(self, mock_utcnow):
+        past = datetime.datetime(2000, 1, 1, 0, 0)
+        mock_utcnow.return_value = past
+        finished = db_utils.create_test_job(uuid=uuidutils.generate_uuid(),
+                                            node_id=self.node.id)
+        self.dbapi.update_job(finished.id, {'status': states.JOB_ERROR})
+        running = db_utils.create_test_job(uuid=uuidutils.generate_uuid(),
+                                           node_id=self.node.id)
+        self.dbapi.update_job(running.id, {'status': states.JOB_RUNNING})
+        mock_utcnow.return_value = past + datetime.timedelta(hours=2)
+        recent = db_utils.create_test_job(uuid=uuidutils.generate_uuid(),
+                                          node_id=self.node.id)
+        self.dbapi.update_job(recent.id, {'status': states.JOB_SUCCESS})
+
+        count = self.dbapi.destroy_finished_jobs(
+            past + datetime.timedelta(hours=1))
+
+        self.assertEqual(1, count)
+        self.assertRaises(exception.JobNotFound,
+                          self.dbapi.get_job_by_id, finished.id)
+        self.dbapi.get_job_by_id(running.id)
+        self.dbapi.get_job_by_id(recent.id)
@@ -192,6 +192,20 @@ class DbNodeTestCase(base.DbTestCase):
                                                     states.DEPLOYWAIT})
         self.assertEqual([node2.id], [r[0] for r in res])
 
+    def test_get_nodeinfo_list_provision_state_in(self):
+        node1 = utils.create_test_node(uuid=uuidutils.generate_uuid(),
+                                       provision_state=states.DEPLOYWAIT)
+        node2 = utils.create_test_node(uuid=uuidutils.generate_uuid(),
+                                       provision_state=states.CLEANWAIT)
+        utils.create_test_node(uuid=uuidutils.generate_uuid(),
+                               provision_state=states.ACTIVE)
+
+        res = self.dbapi.get_nodeinfo_list(
+            filters={'provision_state_in': [states.DEPLOYWAIT,
+                                            states.CLEANWAIT]})
+        self.assertEqual(sorted([node1.id, node2.id]),
+                         sorted(r[0] for r in res))
+
     @mock.patch.object(timeutils, 'utcnow', autospec=True)
     def test_get_nodeinfo_list_inspection(self, mock_utcnow):
         past = datetime.datetime(2000, 1, 1, 0, 0)
@@ -399,6 +413,16 @@ class DbNodeTestCase(base.DbTestCase):
         self.assertRaises(exception.VolumeTargetNotFound,
                           self.dbapi.get_volume_target_by_id, target.id)
 
+    def test_job_gets_destroyed_after_destroying_a_node(self):
+        node = utils.create_test_node()
+
+        job = utils.create_test_job(node_id=node.id)
+
+        self.dbapi.destroy_node(node.id)
+
+        self.assertRaises(exception.JobNotFound,
+                          self.dbapi.get_job_by_id, job.id)
+
     def test_update_node(self):
         node = utils.create_test_node()
 
@@ -22,6 +22,7 @@ from ironic.db import api as db_api
 from ironic.drivers import base as drivers_base
 from ironic.objects import chassis
 from ironic.objects import conductor
+from ironic.objects import job
 from ironic.objects import node
 from ironic.objects import port
 from ironic.objects import portgroup
@@ -356,6 +357,39 @@ def create_test_volume_target(**kw):
     return dbapi.create_volume_target(target)
 
 
+def get_test_job(**kw):
+    return {
+        'id': kw.get('id', 789),
+        'version': kw.get('version', job.Job.VERSION),
+        'uuid': kw.get('uuid', 'd8a3f2e6-4c1b-4e5f-9a8b-0c7d6e5f4a3b'),
+        'node_id': kw.get('node_id', 123),
+        'action': kw.get('action', 'get_boot_device'),
+        'args': kw.get('args', {}),
+        'status': kw.get('status', states.JOB_PENDING),
+        'result': kw.get('result', {}),
+        'error': kw.get('error'),
+        'created_at': kw.get('created_at'),
+        'updated_at': kw.get('updated_at'),
+    }
+
+
+def create_test_job(**kw):
+    """Create test job entry in DB and return Job DB object.
+
+    Function to be used to create test Job objects in the database.
+
+    :param kw: kwargs with overriding values for job's attributes.
+    :returns: Test Job DB object.
+
+    """
+    db_job = get_test_job(**kw)
+    # Let DB generate ID if it isn't specified explicitly
+    if 'id' not in kw:
+        del db_job['id']
+    dbapi = db_api.get_instance()
+    return dbapi.create_job(db_job)
+
+
 def get_test_chassis(**kw):
     return {
         'id': kw.get('id', 42),
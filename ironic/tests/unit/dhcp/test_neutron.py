@@ -136,25 +136,89 @@ class TestNeutron(db_base.DbTestCase):
             mock_gnvi.assert_called_once_with(task)
         self.assertEqual(2, mock_updo.call_count)
 
-    @mock.patch.object(neutron, 'LOG', autospec=True)
-    @mock.patch('time.sleep', autospec=True)
+    @mock.patch('ironic.common.neutron.get_client', autospec=True)
     @mock.patch.object(neutron.NeutronDHCPApi, 'update_port_dhcp_opts',
                        autospec=True)
     @mock.patch('ironic.common.network.get_node_vif_ids', autospec=True)
-    def test_update_dhcp_set_sleep_and_fake(self, mock_gnvi, mock_updo,
-                                            mock_ts, mock_log):
-        mock_gnvi.return_value = {'ports': {'port-uuid': 'vif-uuid'},
+    def _test_update_dhcp_wait_for_ports(self, list_ports_result, expired,
+                                         leftover, mock_gnvi, mock_updo,
+                                         mock_client):
+        mock_gnvi.return_value = {'ports': {'port-uuid': 'vif-uuid',
+                                            'port-uuid2': 'vif-uuid2'},
                                   'portgroups': {}}
+        list_ports = mock_client.return_value.list_ports
+        list_ports.side_effect = list_ports_result
         self.config(port_setup_delay=30, group='neutron')
         with task_manager.acquire(self.context,
                                   self.node.uuid) as task:
             opts = pxe_utils.dhcp_options_for_instance(task)
             api = dhcp_factory.DHCPFactory()
-            api.update_dhcp(task, opts)
-            mock_log.debug.assert_called_once_with(
-                "Waiting %d seconds for Neutron.", 30)
-            mock_ts.assert_called_with(30)
-        mock_updo.assert_called_once_with(mock.ANY, 'vif-uuid', opts)
+            with mock.patch.object(neutron.timeutils, 'StopWatch',
+                                   autospec=True) as mock_timer, \
+                    mock.patch.object(neutron, 'time',
+                                      autospec=True) as mock_time:
+                timer = mock_timer.return_value.start.return_value
+                timer.expired.side_effect = expired
+                timer.leftover.return_value = leftover
+                api.update_dhcp(task, opts)
+
+        self.assertEqual(2, mock_updo.call_count)
+        list_ports.assert_called_with(id=mock.ANY, fields=['id', 'status'])
+        self.assertEqual({'vif-uuid', 'vif-uuid2'},
+                         set(list_ports.call_args[1]['id']))
+        return list_ports, mock_time.sleep, mock_timer
+
+    _DOWN = {'ports': [{'id': 'vif-uuid', 'status': 'DOWN'},
+                       {'id': 'vif-uuid2', 'status': 'DOWN'}]}
+    _ACTIVE = {'ports': [{'id': 'vif-uuid', 'status': 'ACTIVE'},
+                         {'id': 'vif-uuid2', 'status': 'ACTIVE'}]}
+
+    def test_update_dhcp_wait_for_ports(self):
+        list_ports, mock_sleep, mock_timer = (
+            self._test_update_dhcp_wait_for_ports(
+                [self._DOWN,
+                 {'ports': [{'id': 'vif-uuid', 'status': 'ACTIVE'},
+                            {'id': 'vif-uuid2', 'status': 'DOWN'}]},
+                 self._ACTIVE],
+                [False], 29))
+        self.assertEqual(3, list_ports.call_count)
+        mock_timer.assert_called_once_with(duration=30)
+        mock_sleep.assert_called_once_with(neutron.PORT_STATUS_POLL_INTERVAL)
+
+    def test_update_dhcp_wait_for_ports_timeout(self):
+        list_ports, mock_sleep, mock_timer = (
+            self._test_update_dhcp_wait_for_ports(
+                [self._DOWN, self._DOWN, self._DOWN], [False, True], 0.5))
+        self.assertEqual(3, list_ports.call_count)
+        mock_sleep.assert_called_once_with(0.5)
+
+    def test_update_dhcp_wait_for_ports_already_active(self):
+        # The ports are ACTIVE from the first poll, before their DHCP options
+        # are updated: their status cannot tell when the new options are
+        # applied
+        list_ports, mock_sleep, mock_timer = (
+            self._test_update_dhcp_wait_for_ports(
+                [self._ACTIVE, self._ACTIVE], [], 29))
+        self.assertEqual(1, list_ports.call_count)
+        self.assertFalse(mock_timer.called)
+        mock_sleep.assert_called_once_with(30)
+
+    def test_update_dhcp_wait_for_ports_status_fail(self):
+        list_ports, mock_sleep, mock_timer = (
+            self._test_update_dhcp_wait_for_ports(
+                neutron_client_exc.NeutronClientException(), [], 29))
+        self.assertEqual(1, list_ports.call_count)
+        # Falls back to waiting for the whole delay
+        mock_sleep.assert_called_once_with(30)
+
+    def test_update_dhcp_wait_for_ports_fail(self):
+        list_ports, mock_sleep, mock_timer = (
+            self._test_update_dhcp_wait_for_ports(
+                [self._DOWN, neutron_client_exc.NeutronClientException()],
+                [], 30))
+        self.assertEqual(2, list_ports.call_count)
+        # Falls back to waiting for the rest of the delay
+        mock_sleep.assert_called_once_with(30)
 
     @mock.patch.object(neutron, 'LOG', autospec=True)
     @mock.patch.object(neutron.NeutronDHCPApi, 'update_port_dhcp_opts',
@@ -116,6 +116,24 @@ class DracPeriodicTaskTestCase(db_base.DbTestCase):
 
         self.assertEqual(0, self.driver.raid._check_node_raid_jobs.call_count)
 
+    @mock.patch.object(task_manager, 'acquire', autospec=True)
+    def test__query_raid_config_job_status_snapshot(self, mock_acquire):
+        mock_manager = mock.Mock()
+        nodes = [{'uuid': self.node.uuid, 'driver': 'pxe_drac',
+                  'driver_internal_info': {'raid_config_job_ids': ['42']},
+                  'reservation': None}]
+        task = mock.Mock(node=self.node,
+                         driver=self.driver)
+        mock_acquire.return_value = mock.MagicMock(
+            __enter__=mock.MagicMock(return_value=task))
+        self.driver.raid._check_node_raid_jobs = mock.Mock()
+
+        self.driver.raid._query_raid_config_job_status(
+            mock_manager, self.context, nodes=nodes)
+
+        self.assertFalse(mock_manager.iter_nodes.called)
+        self.driver.raid._check_node_raid_jobs.assert_called_once_with(task)
+
     @mock.patch.object(drac_common, 'get_drac_client', spec_set=True,
                        autospec=True)
     def test__check_node_raid_jobs_without_update(self, mock_get_drac_client):
@@ -0,0 +1,355 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import requests
+
+from ironic.conductor import power_events
+from ironic.drivers.modules.redfish import events
+from ironic.tests.unit.conductor import mgr_utils
+from ironic.tests.unit.db import base as db_base
+from ironic.tests.unit.db import utils as db_utils
+from ironic.tests.unit.objects import utils as obj_utils
+
+INFO_DICT = db_utils.get_test_redfish_info()
+
+
+@mock.patch.object(power_events, 'unsubscribe', autospec=True)
+@mock.patch.object(power_events, 'subscribe', autospec=True)
+@mock.patch.object(events.requests, 'request', autospec=True)
+class EventSubscriberTestCase(db_base.DbTestCase):
+
+    def setUp(self):
+        super(EventSubscriberTestCase, self).setUp()
+        self.config(enabled_hardware_types=['redfish'],
+                    enabled_power_interfaces=['redfish'],
+                    enabled_management_interfaces=['redfish'])
+        mgr_utils.mock_the_extension_manager(
+            driver='redfish', namespace='ironic.hardware.types')
+        self.config(event_destination_url='http://conductor:6388/',
+                    event_poll_interval=1800, group='redfish')
+        self.node = obj_utils.create_test_node(
+            self.context, driver='redfish', power_interface='redfish',
+            driver_info=INFO_DICT)
+        self.manager = mock.Mock()
+        self.manager.iter_nodes.return_value = [
+            (self.node.uuid, 'redfish', 'redfish'),
+            ('other-uuid', 'ipmi', 'ipmitool'),
+        ]
+        self.subscriber = events.EventSubscriber()
+        patcher = mock.patch.object(self.subscriber, 'start', autospec=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _receive_event(self):
+        subscription = self.subscriber._subscriptions[self.node.uuid]
+        with mock.patch.object(power_events, 'power_event', autospec=True):
+            self.subscriber.app(
+                {'REQUEST_METHOD': 'POST',
+                 'PATH_INFO': '/%s/%s' % (self.node.uuid,
+                                          subscription.token)},
+                mock.Mock())
+
+    def _response(self, location='/redfish/v1/EventService/Subscriptions/1'):
+        response = mock.Mock(spec=requests.Response)
+        response.headers = {'Location': location} if location else {}
+        response.json.return_value = {
+            '@odata.id': '/redfish/v1/EventService/Subscriptions/2'}
+        return response
+
+    def test_sync_subscribes(self, request_mock, subscribe_mock,
+                             unsubscribe_mock):
+        request_mock.return_value = self._response()
+
+        self.subscriber.sync(self.manager, self.context)
+
+        self.manager.iter_nodes.assert_called_once_with(
+            fields=['power_interface'], filters={'maintenance': False})
+        request_mock.assert_has_calls([
+            mock.call('POST', 'https://example.com/redfish/v1/EventService/'
+                      'Subscriptions', auth=('username', 'password'),
+                      verify=True, timeout=events.REQUEST_TIMEOUT,
+                      json=mock.ANY),
+            mock.call('POST', 'https://example.com/redfish/v1/EventService/'
+                      'Actions/EventService.SubmitTestEvent',
+                      auth=('username', 'password'), verify=True,
+                      timeout=events.REQUEST_TIMEOUT, json=mock.ANY)])
+        self.assertEqual(2, request_mock.call_count)
+        body = request_mock.call_args_list[0][1]['json']
+        subscription = self.subscriber._subscriptions[self.node.uuid]
+        self.assertEqual(
+            'http://conductor:6388/%s/%s' % (self.node.uuid,
+                                             subscription.token),
+            body['Destination'])
+        self.assertEqual(
+            [{'@odata.id': '/redfish/v1/Systems/FAKESYSTEM'}],
+            body['OriginResources'])
+        self.assertEqual('https://example.com/redfish/v1/EventService/'
+                         'Subscriptions/1', subscription.url)
+        self.assertEqual('/redfish/v1/Systems/FAKESYSTEM',
+                         request_mock.call_args[1]['json'][
+                             'OriginOfCondition'])
+        # The node is polled until an event is received
+        self.assertFalse(subscribe_mock.called)
+        self.assertEqual(1, len(self.subscriber))
+        self.subscriber.start.assert_called_once_with()
+
+        self._receive_event()
+        subscribe_mock.assert_called_once_with(self.node.uuid, 1800)
+        self._receive_event()
+        subscribe_mock.assert_called_once_with(self.node.uuid, 1800)
+
+    def test_sync_test_event_fails(self, request_mock, subscribe_mock,
+                                   unsubscribe_mock):
+        request_mock.side_effect = [self._response(),
+                                    requests.HTTPError()]
+        self.subscriber.sync(self.manager, self.context)
+        self.assertEqual(1, len(self.subscriber))
+        self.assertFalse(subscribe_mock.called)
+        self.assertFalse(unsubscribe_mock.called)
+
+    def test_sync_subscribes_no_location(self, request_mock, subscribe_mock,
+                                         unsubscribe_mock):
+        request_mock.return_value = self._response(location=None)
+        self.subscriber.sync(self.manager, self.context)
+        self.assertEqual('https://example.com/redfish/v1/EventService/'
+                         'Subscriptions/2',
+                         self.subscriber._subscriptions[self.node.uuid].url)
+
+    def test_sync_subscribe_fails(self, request_mock, subscribe_mock,
+                                  unsubscribe_mock):
+        request_mock.side_effect = requests.ConnectionError()
+        self.subscriber.sync(self.manager, self.context)
+        self.assertEqual(0, len(self.subscriber))
+        self.assertFalse(subscribe_mock.called)
+        unsubscribe_mock.assert_called_once_with(self.node.uuid)
+
+    @mock.patch.object(events.time, 'time', autospec=True)
+    def test_sync_checks(self, time_mock, request_mock, subscribe_mock,
+                         unsubscribe_mock):
+        self.config(event_subscription_interval=300, group='redfish')
+        time_mock.return_value = 1000
+        request_mock.return_value = self._response()
+        self.subscriber.sync(self.manager, self.context)
+        self._receive_event()
+
+        # Checked recently
+        time_mock.return_value = 1299
+        self.subscriber.sync(self.manager, self.context)
+        self.assertEqual(2, request_mock.call_count)
+
+        time_mock.return_value = 1300
+        self.subscriber.sync(self.manager, self.context)
+        self.assertEqual(3, request_mock.call_count)
+        request_mock.assert_called_with(
+            'GET', 'https://example.com/redfish/v1/EventService/'
+            'Subscriptions/1', auth=('username', 'password'), verify=True,
+            timeout=events.REQUEST_TIMEOUT)
+        self.assertEqual(1300, self.subscriber._subscriptions[
+            self.node.uuid].checked_at)
+        self.assertEqual(2, subscribe_mock.call_count)
+
+    @mock.patch.object(events.time, 'time', autospec=True)
+    def test_sync_checks_no_event(self, time_mock, request_mock,
+                                  subscribe_mock, unsubscribe_mock):
+        time_mock.return_value = 1000
+        request_mock.return_value = self._response()
+        self.subscriber.sync(self.manager, self.context)
+
+        time_mock.return_value = 10000
+        self.subscriber.sync(self.manager, self.context)
+
+        # The test event is submitted again
+        self.assertEqual(4, request_mock.call_count)
+        self.assertEqual('GET', request_mock.call_args_list[2][0][0])
+        self.assertEqual('https://example.com/redfish/v1/EventService/'
+                         'Actions/EventService.SubmitTestEvent',
+                         request_mock.call_args[0][1])
+        self.assertFalse(subscribe_mock.called)
+
+    @mock.patch.object(events.time, 'time', autospec=True)
+    def test_sync_subscription_gone(self, time_mock, request_mock,
+                                    subscribe_mock, unsubscribe_mock):
+        time_mock.return_value = 1000
+        request_mock.return_value = self._response()
+        self.subscriber.sync(self.manager, self.context)
+        self._receive_event()
+        old_token = self.subscriber._subscriptions[self.node.uuid].token
+
+        not_found = requests.HTTPError(response=mock.Mock(status_code=404))
+        request_mock.side_effect = [not_found, self._response(),
+                                    self._response()]
+        time_mock.return_value = 10000
+        self.subscriber.sync(self.manager, self.context)
+
+        self.assertEqual(5, request_mock.call_count)
+        self.assertEqual('POST', request_mock.call_args_list[3][0][0])
+        self.assertNotEqual(
+            old_token, self.subscriber._subscriptions[self.node.uuid].token)
+        self.assertFalse(
+            self.subscriber._subscriptions[self.node.uuid].received)
+        self.assertEqual(1, subscribe_mock.call_count)
+        unsubscribe_mock.assert_called_once_with(self.node.uuid)
+
+    @mock.patch.object(events.time, 'time', autospec=True)
+    def test_sync_check_fails(self, time_mock, request_mock, subscribe_mock,
+                              unsubscribe_mock):
+        time_mock.return_value = 1000
+        request_mock.return_value = self._response()
+        self.subscriber.sync(self.manager, self.context)
+        self._receive_event()
+        subscription = self.subscriber._subscriptions[self.node.uuid]
+
+        request_mock.side_effect = requests.ConnectionError()
+        time_mock.return_value = 10000
+        self.subscriber.sync(self.manager, self.context)
+
+        # The subscription is kept instead of creating another one
+        self.assertEqual(3, request_mock.call_count)
+        self.assertEqual('GET', request_mock.call_args[0][0])
+        self.assertIs(subscription,
+                      self.subscriber._subscriptions[self.node.uuid])
+        unsubscribe_mock.assert_called_once_with(self.node.uuid)
+
+        request_mock.side_effect = None
+        self.subscriber.sync(self.manager, self.context)
+        self.assertEqual(4, request_mock.call_count)
+        self.assertEqual('GET', request_mock.call_args[0][0])
+        self.assertEqual(10000, subscription.checked_at)
+        self.assertEqual(2, subscribe_mock.call_count)
+
+    def test_sync_unsubscribes(self, request_mock, subscribe_mock,
+                               unsubscribe_mock):
+        request_mock.return_value = self._response()
+        self.subscriber.sync(self.manager, self.context)
+
+        self.manager.iter_nodes.return_value = []
+        self.subscriber.sync(self.manager, self.context)
+
+        self.assertEqual(0, len(self.subscriber))
+        request_mock.assert_called_with(
+            'DELETE', 'https://example.com/redfish/v1/EventService/'
+            'Subscriptions/1', auth=('username', 'password'), verify=True,
+            timeout=events.REQUEST_TIMEOUT)
+        unsubscribe_mock.assert_called_once_with(self.node.uuid)
+
+    @mock.patch.object(events.EventSubscriber, 'stop', autospec=True)
+    def test_shutdown(self, stop_mock, request_mock, subscribe_mock,
+                      unsubscribe_mock):
+        request_mock.return_value = self._response()
+        self.subscriber.sync(self.manager, self.context)
+
+        self.subscriber.shutdown()
+
+        self.assertEqual(0, len(self.subscriber))
+        request_mock.assert_called_with(
+            'DELETE', 'https://example.com/redfish/v1/EventService/'
+            'Subscriptions/1', auth=('username', 'password'), verify=True,
+            timeout=events.REQUEST_TIMEOUT)
+        unsubscribe_mock.assert_called_once_with(self.node.uuid)
+        stop_mock.assert_called_once_with(self.subscriber)
+
+
+class GetSubscriberTestCase(db_base.DbTestCase):
+
+    def setUp(self):
+        super(GetSubscriberTestCase, self).setUp()
+        patcher = mock.patch.object(events, '_SUBSCRIBER', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(power_events, '_STOP_CALLBACKS', [])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch.object(events.EventSubscriber, 'shutdown', autospec=True)
+    def test_stopped_with_the_conductor(self, shutdown_mock):
+        subscriber = events.get_subscriber()
+        self.assertIs(subscriber, events.get_subscriber())
+
+        power_events.stop()
+
+        shutdown_mock.assert_called_once_with(subscriber)
+        self.assertIsNone(events._SUBSCRIBER)
+        self.assertIsNot(subscriber, events.get_subscriber())
+
+
+@mock.patch.object(power_events, 'power_event', autospec=True)
+class EventReceiverTestCase(db_base.DbTestCase):
+
+    def setUp(self):
+        super(EventReceiverTestCase, self).setUp()
+        self.subscriber = events.EventSubscriber()
+        self.subscriber._subscriptions['uuid'] = events._Subscription(
+            'url', 'token', {}, 0)
+        self.start_response = mock.Mock()
+
+    def _call(self, path, method='POST'):
+        return self.subscriber.app(
+            {'REQUEST_METHOD': method, 'PATH_INFO': path},
+            self.start_response)
+
+    @mock.patch.object(power_events, 'subscribe', autospec=True)
+    def test_event(self, subscribe_mock, event_mock):
+        self.config(event_poll_interval=1800, group='redfish')
+        self._call('/uuid/token')
+        event_mock.assert_called_once_with('uuid')
+        self.start_response.assert_called_once_with('204 No Content', [])
+        subscribe_mock.assert_called_once_with('uuid', 1800)
+        self.assertTrue(self.subscriber._subscriptions['uuid'].received)
+
+    def test_wrong_token(self, event_mock):
+        self._call('/uuid/other')
+        self.assertFalse(event_mock.called)
+        self.assertEqual('404 Not Found',
+                         self.start_response.call_args[0][0])
+
+    def test_unknown_node(self, event_mock):
+        self._call('/other/token')
+        self.assertFalse(event_mock.called)
+        self.assertEqual('404 Not Found',
+                         self.start_response.call_args[0][0])
+
+    def test_wrong_method(self, event_mock):
+        self._call('/uuid/token', method='GET')
+        self.assertFalse(event_mock.called)
+        self.assertEqual('405 Method Not Allowed',
+                         self.start_response.call_args[0][0])
+
+    @mock.patch.object(events.LOG, 'warning', autospec=True)
+    @mock.patch.object(events.eventlet, 'spawn', autospec=True)
+    @mock.patch.object(events.eventlet, 'listen', autospec=True)
+    def test_start_loopback(self, listen_mock, spawn_mock, warning_mock,
+                            event_mock):
+        self.config(event_destination_url='http://conductor:6388/',
+                    group='redfish')
+        self.subscriber.start()
+        listen_mock.assert_called_once_with(('127.0.0.1', 6388))
+        self.assertTrue(warning_mock.called)
+
+    @mock.patch.object(events.LOG, 'warning', autospec=True)
+    @mock.patch.object(events.eventlet, 'spawn', autospec=True)
+    @mock.patch.object(events.eventlet, 'listen', autospec=True)
+    def test_start_stop(self, listen_mock, spawn_mock, warning_mock,
+                        event_mock):
+        self.config(event_listen_host='192.0.2.10', event_listen_port=6390,
+                    group='redfish')
+        self.subscriber.start()
+        self.subscriber.start()
+        listen_mock.assert_called_once_with(('192.0.2.10', 6390))
+        self.assertFalse(warning_mock.called)
+        spawn_mock.assert_called_once_with(
+            events.wsgi.server, listen_mock.return_value,
+            self.subscriber.app, log_output=False)
+
+        self.subscriber.stop()
+        spawn_mock.return_value.kill.assert_called_once_with()
+        listen_mock.return_value.close.assert_called_once_with()
@@ -168,6 +168,17 @@ class RedfishPowerTestCase(db_base.DbTestCase):
                 sushy.RESET_ON)
             mock_get_system.assert_called_once_with(task.node)
 
+    @mock.patch.object(redfish_utils, 'invalidate_system', autospec=True)
+    @mock.patch.object(redfish_utils, 'get_system', autospec=True)
+    def test_set_power_state_invalidates_system(self, mock_get_system,
+                                                mock_invalidate):
+        mock_get_system.return_value.power_state = (
+            sushy.SYSTEM_POWER_STATE_ON)
+        with task_manager.acquire(self.context, self.node.uuid,
+                                  shared=False) as task:
+            task.driver.power.set_power_state(task, states.POWER_ON)
+            mock_invalidate.assert_called_once_with(task.node)
+
     @mock.patch.object(redfish_utils, 'get_system', autospec=True)
     def test_reboot(self, mock_get_system):
         with task_manager.acquire(self.context, self.node.uuid,
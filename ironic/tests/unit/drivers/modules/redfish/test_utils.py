@@ -18,6 +18,7 @@ import os
 
 import mock
 from oslo_utils import importutils
+from oslo_utils import uuidutils
 
 from ironic.common import exception
 from ironic.drivers.modules.redfish import utils as redfish_utils
@@ -58,6 +59,8 @@ class RedfishUtilsTestCase(db_base.DbTestCase):
             'verify_ca': True,
             'node_uuid': self.node.uuid
         }
+        redfish_utils._SESSION_CACHE.clear()
+        self.addCleanup(redfish_utils._SESSION_CACHE.clear)
 
     def test_parse_driver_info(self):
         response = redfish_utils.parse_driver_info(self.node)
@@ -191,3 +194,105 @@ class RedfishUtilsTestCase(db_base.DbTestCase):
         fake_conn.get_system.assert_has_calls(expected_get_system_calls)
         mock_sleep.assert_called_with(
             redfish_utils.CONF.redfish.connection_retry_interval)
+
+    @mock.patch('ironic.drivers.modules.redfish.utils.sushy')
+    def test_get_system_connection_cached(self, mock_sushy):
+        fake_conn = mock_sushy.Sushy.return_value
+        node2 = obj_utils.create_test_node(
+            self.context, driver='redfish', uuid=uuidutils.generate_uuid(),
+            driver_info=dict(INFO_DICT,
+                             redfish_system_id='/redfish/v1/Systems/2'))
+
+        redfish_utils.get_system(self.node)
+        redfish_utils.get_system(self.node)
+        redfish_utils.get_system(node2)
+
+        mock_sushy.Sushy.assert_called_once_with(
+            'https://example.com', username='username', password='password',
+            verify=True)
+        self.assertEqual(3, fake_conn.get_system.call_count)
+        fake_conn.get_system.assert_called_with('/redfish/v1/Systems/2')
+        self.assertEqual(1, len(redfish_utils._SESSION_CACHE))
+
+    @mock.patch('ironic.drivers.modules.redfish.utils.sushy')
+    def test_get_system_connection_cache_disabled(self, mock_sushy):
+        self.config(connection_cache_size=0, group='redfish')
+        redfish_utils.get_system(self.node)
+        redfish_utils.get_system(self.node)
+        self.assertEqual(2, mock_sushy.Sushy.call_count)
+        self.assertEqual(0, len(redfish_utils._SESSION_CACHE))
+
+    @mock.patch('ironic.drivers.modules.redfish.utils.sushy')
+    def test_get_system_password_changed(self, mock_sushy):
+        redfish_utils.get_system(self.node)
+        self.node.driver_info = dict(INFO_DICT, redfish_password='new')
+        redfish_utils.get_system(self.node)
+        self.assertEqual(2, mock_sushy.Sushy.call_count)
+        mock_sushy.Sushy.assert_called_with(
+            'https://example.com', username='username', password='new',
+            verify=True)
+
+    @mock.patch('ironic.drivers.modules.redfish.utils.sushy')
+    def test_get_system_connection_cache_lru(self, mock_sushy):
+        self.config(connection_cache_size=2, group='redfish')
+        for address in ('bmc1', 'bmc2', 'bmc1', 'bmc3'):
+            self.node.driver_info = dict(INFO_DICT, redfish_address=address)
+            redfish_utils.get_system(self.node)
+
+        self.assertEqual(3, mock_sushy.Sushy.call_count)
+        self.assertEqual(
+            ['https://bmc1', 'https://bmc3'],
+            [key[0] for key in redfish_utils._SESSION_CACHE._sessions])
+
+    @mock.patch.object(redfish_utils.time, 'time', autospec=True)
+    @mock.patch('ironic.drivers.modules.redfish.utils.sushy')
+    def test_get_system_connection_cache_idle(self, mock_sushy, mock_time):
+        self.config(connection_cache_idle_timeout=60, group='redfish')
+        mock_time.return_value = 1000
+        redfish_utils.get_system(self.node)
+        mock_time.return_value = 1059
+        redfish_utils.get_system(self.node)
+        self.assertEqual(1, mock_sushy.Sushy.call_count)
+        mock_time.return_value = 1119
+        redfish_utils.get_system(self.node)
+        self.assertEqual(2, mock_sushy.Sushy.call_count)
+
+    @mock.patch('ironic.drivers.modules.redfish.utils.sushy')
+    def test_get_system_connection_error_evicts(self, mock_sushy):
+        fake_conn = mock_sushy.Sushy.return_value
+        mock_sushy.exceptions.ResourceNotFoundError = (
+            MockedResourceNotFoundError)
+        mock_sushy.exceptions.ConnectionError = MockedConnectionError
+        redfish_utils.get_system(self.node)
+        fake_conn.get_system.side_effect = MockedConnectionError()
+
+        self.assertRaises(exception.RedfishConnectionError,
+                          redfish_utils.get_system, self.node)
+        self.assertEqual(0, len(redfish_utils._SESSION_CACHE))
+
+    @mock.patch.object(redfish_utils.time, 'time', autospec=True)
+    @mock.patch('ironic.drivers.modules.redfish.utils.sushy')
+    def test_get_system_cached(self, mock_sushy, mock_time):
+        self.config(system_cache_ttl=10, group='redfish')
+        fake_conn = mock_sushy.Sushy.return_value
+        mock_time.return_value = 1000
+
+        system = redfish_utils.get_system(self.node)
+        mock_time.return_value = 1009
+        self.assertIs(system, redfish_utils.get_system(self.node))
+        self.assertEqual(1, fake_conn.get_system.call_count)
+
+        mock_time.return_value = 1010
+        redfish_utils.get_system(self.node)
+        self.assertEqual(2, fake_conn.get_system.call_count)
+
+        redfish_utils.invalidate_system(self.node)
+        redfish_utils.get_system(self.node)
+        self.assertEqual(3, fake_conn.get_system.call_count)
+
+    @mock.patch('ironic.drivers.modules.redfish.utils.sushy')
+    def test_get_system_not_cached(self, mock_sushy):
+        fake_conn = mock_sushy.Sushy.return_value
+        redfish_utils.get_system(self.node)
+        redfish_utils.get_system(self.node)
+        self.assertEqual(2, fake_conn.get_system.call_count)
@@ -0,0 +1,149 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""A local SNMP agent standing in for a PDU in tests and benchmarks.
+
+The agent serves a table of objects over UDP on the loopback interface,
+answering GET, GETNEXT, GETBULK and SET requests of SNMP versions 1 and 2c.
+It runs in a green thread of the process, so the tests must run with
+eventlet monkey patching, as the unit tests of ironic do. It requires the
+real pysnmp library, not the mock of the unit tests.
+"""
+
+import bisect
+
+import eventlet
+import fixtures
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.entity import config
+from pysnmp.entity import engine
+from pysnmp.entity.rfc3413 import cmdrsp
+from pysnmp.entity.rfc3413 import context
+from pysnmp.proto import rfc1902
+from pysnmp.proto import rfc1905
+from pysnmp.smi import instrum
+
+COMMUNITY = 'public'
+
+# Maximum time to stop the agent, in seconds
+STOP_INTERVAL = 0.05
+
+
+class _Instrumentation(instrum.AbstractMibInstrumController):
+    """Serves the objects of the agent."""
+
+    def __init__(self, objects):
+        self.objects = objects
+
+    def readVars(self, varBinds, acInfo=(None, None)):
+        return [(name, self._value(tuple(name))) for name, _val in varBinds]
+
+    def readNextVars(self, varBinds, acInfo=(None, None)):
+        names = sorted(self.objects)
+        result = []
+        for name, _val in varBinds:
+            index = bisect.bisect_right(names, tuple(name))
+            if index < len(names):
+                next_name = names[index]
+                result.append((rfc1902.ObjectName(next_name),
+                               self._value(next_name)))
+            else:
+                result.append((name, rfc1905.endOfMibView))
+        return result
+
+    def writeVars(self, varBinds, acInfo=(None, None)):
+        for name, val in varBinds:
+            self.objects[tuple(name)] = int(val)
+        return varBinds
+
+    def _value(self, name):
+        if name not in self.objects:
+            return rfc1905.noSuchInstance
+        return rfc1902.Integer(self.objects[name])
+
+
+def is_supported():
+    """Whether the installed pysnmp library can run the agent.
+
+    Some combinations of pysnmp and pyasn1 versions fail to configure an
+    SNMP engine.
+    """
+    try:
+        config.addV1System(engine.SnmpEngine(), 'ironic-test', COMMUNITY)
+    except Exception:
+        return False
+    return True
+
+
+def _responder(responder_cls, operation, requests):
+    """Make a command responder class recording the requests received."""
+
+    class Responder(responder_cls):
+        def handleMgmtOperation(self, *args, **kwargs):
+            requests.append(operation)
+            return super(Responder, self).handleMgmtOperation(*args,
+                                                              **kwargs)
+
+    return Responder
+
+
+class SNMPAgent(fixtures.Fixture):
+    """Runs a local SNMP agent serving a table of integer objects.
+
+    :param objects: a dictionary mapping OIDs, as tuples of integers, to
+        the integer values of the objects. The agent updates it on SET
+        requests.
+    """
+
+    def __init__(self, objects):
+        super(SNMPAgent, self).__init__()
+        self.objects = objects
+        # Operations of the requests received, e.g. 'GETBULK'
+        self.requests = []
+        self.address = '127.0.0.1'
+        self.port = None
+
+    def _setUp(self):
+        self.engine = engine.SnmpEngine()
+        transport = udp.UdpTransport().openServerMode((self.address, 0))
+        self.port = transport.socket.getsockname()[1]
+        config.addTransport(self.engine, udp.domainName, transport)
+        config.addV1System(self.engine, 'ironic-test', COMMUNITY)
+        for model in (1, 2):
+            config.addVacmUser(self.engine, model, 'ironic-test',
+                               'noAuthNoPriv', (1, 3, 6), (1, 3, 6))
+
+        snmp_context = context.SnmpContext(self.engine)
+        # Replace the default context serving the MIBs of the agent itself
+        snmp_context.unregisterContextName(rfc1902.OctetString(''))
+        snmp_context.registerContextName(rfc1902.OctetString(''),
+                                         _Instrumentation(self.objects))
+        for responder_cls, operation in (
+                (cmdrsp.GetCommandResponder, 'GET'),
+                (cmdrsp.NextCommandResponder, 'GETNEXT'),
+                (cmdrsp.BulkCommandResponder, 'GETBULK'),
+                (cmdrsp.SetCommandResponder, 'SET')):
+            _responder(responder_cls, operation, self.requests)(
+                self.engine, snmp_context)
+
+        dispatcher = self.engine.transportDispatcher
+        # The dispatcher notices that it is stopped on its timer ticks
+        dispatcher.setTimerResolution(STOP_INTERVAL)
+        dispatcher.jobStarted(1)
+        self.thread = eventlet.spawn(dispatcher.runDispatcher)
+        self.addCleanup(self._stop)
+
+    def _stop(self):
+        dispatcher = self.engine.transportDispatcher
+        dispatcher.jobFinished(1)
+        self.thread.wait()
+        dispatcher.closeDispatcher()
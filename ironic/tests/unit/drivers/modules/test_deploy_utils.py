@@ -841,6 +841,17 @@ class SwitchPxeConfigTestCase(tests_base.TestCase):
             pxeconf = f.read()
         self.assertEqual(_PXECONF_BOOT_PARTITION, pxeconf)
 
+    @mock.patch.object(common_utils, 'replace_file', autospec=True,
+                       side_effect=common_utils.replace_file)
+    def test_switch_pxe_config_replaced_once(self, replace_mock):
+        fname = self._create_config()
+        utils.switch_pxe_config(fname,
+                                '12345678-1234-1234-1234-1234567890abcdef',
+                                'bios',
+                                False)
+        replace_mock.assert_called_once_with(fname,
+                                             _PXECONF_BOOT_PARTITION)
+
     def test_switch_pxe_config_whole_disk_image(self):
         boot_mode = 'bios'
         fname = self._create_config()
@@ -38,8 +38,6 @@ def touch(filename):
     open(filename, 'w').close()
 
 
-@mock.patch('ironic.common.glance_service.service_utils.parse_image_ref',
-            lambda image: (image, 'example.com', True))
 class TestImageCacheFetch(base.TestCase):
 
     def setUp(self):
@@ -158,6 +156,16 @@ class TestImageCacheFetch(base.TestCase):
             ctx=None, force_raw=True)
         self.assertTrue(mock_clean_up.called)
 
+    def test_get_master_file_name(self):
+        self.assertEqual(self.uuid,
+                         image_cache.get_master_file_name(self.uuid))
+        self.assertEqual(self.uuid, image_cache.get_master_file_name(
+            'glance://%s' % self.uuid))
+        href = u'http://abc.com/ubuntu.qcow2'
+        href_encoded = href.encode('utf-8') if six.PY2 else href
+        self.assertEqual(str(uuid.uuid5(uuid.NAMESPACE_URL, href_encoded)),
+                         image_cache.get_master_file_name(href))
+
     @mock.patch.object(image_cache, '_fetch', autospec=True)
     def test__download_image(self, mock_fetch):
         def _fake_fetch(ctx, uuid, tmp_path, *args):
@@ -23,6 +23,7 @@
 import contextlib
 import os
 import random
+import shutil
 import stat
 import subprocess
 import tempfile
@@ -709,6 +710,30 @@ class IPMIToolPrivateMethodTestCase(db_base.DbTestCase):
         mock_exec.assert_called_once_with(*args)
         self.assertFalse(mock_sleep.called)
 
+    @mock.patch.object(ipmi, '_is_option_supported', autospec=True)
+    @mock.patch.object(ipmi, '_make_password_file', _make_password_file_stub)
+    @mock.patch.object(utils, 'execute', autospec=True)
+    def test__exec_ipmitool_sdr_cache(self, mock_exec, mock_support,
+                                      mock_sleep):
+        ipmi.LAST_CMD_TIME = {}
+        args = [
+            'ipmitool',
+            '-I', 'lanplus',
+            '-H', self.info['address'],
+            '-L', self.info['priv_level'],
+            '-U', self.info['username'],
+            '-S', '/cache/bmc.sdr',
+            '-f', awesome_password_filename,
+            'sdr', '-v',
+        ]
+
+        mock_support.return_value = False
+        mock_exec.return_value = (None, None)
+
+        ipmi._exec_ipmitool(self.info, 'sdr -v', sdr_cache='/cache/bmc.sdr')
+
+        mock_exec.assert_called_once_with(*args)
+
     @mock.patch.object(ipmi, '_is_option_supported', autospec=True)
     @mock.patch.object(ipmi, '_make_password_file', _make_password_file_stub)
     @mock.patch.object(utils, 'execute', autospec=True)
@@ -2465,6 +2490,258 @@ class IPMIToolDriverTestCase(db_base.DbTestCase):
                           self.node,
                           fake_sensors_data)
 
+    def test__parse_ipmi_sensor_data_types(self):
+        fake_sensors_data = """Sensor ID              : Temp (0x1)
+ Sensor Type (Analog)  : Temperature
+ Sensor Reading        : 50 (+/- 1) degrees C
+
+Sensor ID              : FAN MOD 1A RPM (0x30)
+ Sensor Type (Analog)  : Fan
+ Sensor Reading        : 8400 (+/- 75) RPM
+"""
+        ret = ipmi._parse_ipmi_sensors_data(self.node, fake_sensors_data,
+                                            {'fan'})
+        self.assertEqual(
+            {'Fan': {'FAN MOD 1A RPM (0x30)': {
+                'Sensor ID': 'FAN MOD 1A RPM (0x30)',
+                'Sensor Type (Analog)': 'Fan',
+                'Sensor Reading': '8400 (+/- 75) RPM'}}},
+            ret)
+
+    def test__parse_ipmi_sensor_data_types_nothing(self):
+        fake_sensors_data = """Sensor ID              : Temp (0x1)
+ Sensor Type (Analog)  : Temperature
+ Sensor Reading        : 50 (+/- 1) degrees C
+"""
+        self.assertEqual({}, ipmi._parse_ipmi_sensors_data(
+            self.node, fake_sensors_data, {'fan'}))
+
+    def test__parse_ipmi_sensor_data_types_no_sensor(self):
+        fake_sensors_data = """Sensor ID              : Temp (0x1)
+ Sensor Type (Analog)  : Temperature
+"""
+        self.assertRaises(exception.FailedToParseSensorData,
+                          ipmi._parse_ipmi_sensors_data,
+                          self.node, fake_sensors_data, {'temperature'})
+
+    def test__get_sensor_types(self):
+        self.config(send_sensor_data_types=['Temperature', 'fan'],
+                    group='conductor')
+        self.assertEqual({'temperature', 'fan'}, ipmi._get_sensor_types())
+
+    def test__get_sensor_types_all(self):
+        self.config(send_sensor_data_types=['Fan', 'All'], group='conductor')
+        self.assertIsNone(ipmi._get_sensor_types())
+
+    def test__get_sensor_types_space(self):
+        self.config(send_sensor_data_types=['Fan', 'Power Supply'],
+                    group='conductor')
+        self.assertIsNone(ipmi._get_sensor_types())
+
+    @mock.patch.object(ipmi, '_parse_ipmi_sensors_data', autospec=True)
+    @mock.patch.object(ipmi, '_exec_ipmitool', autospec=True)
+    def test_management_interface_get_sensors_data(self, mock_exec,
+                                                   mock_parse):
+        mock_exec.return_value = ('output', '')
+        mock_parse.return_value = {'Fan': {}}
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.assertEqual(
+                {'Fan': {}},
+                self.driver.management.get_sensors_data(task))
+            mock_parse.assert_called_once_with(task.node, 'output', None)
+        mock_exec.assert_called_once_with(self.info, 'sdr -v',
+                                          sdr_cache=None)
+
+    @mock.patch.object(ipmi, '_parse_ipmi_sensors_data', autospec=True)
+    @mock.patch.object(ipmi, '_exec_ipmitool', autospec=True)
+    def test_management_interface_get_sensors_data_types(self, mock_exec,
+                                                         mock_parse):
+        self.config(send_sensor_data_types=['Temperature', 'Fan'],
+                    group='conductor')
+        mock_exec.return_value = ('output', '')
+        mock_parse.return_value = {'Fan': {}, 'Temperature': {}}
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.assertEqual(
+                {'Fan': {}, 'Temperature': {}},
+                self.driver.management.get_sensors_data(task))
+        # A single ipmitool call for several types
+        mock_exec.assert_called_once_with(self.info, 'sdr -v',
+                                          sdr_cache=None)
+        mock_parse.assert_called_once_with(mock.ANY, 'output',
+                                           {'temperature', 'fan'})
+
+    @mock.patch.object(ipmi, '_parse_ipmi_sensors_data', autospec=True)
+    @mock.patch.object(ipmi, '_exec_ipmitool', autospec=True)
+    def test_management_interface_get_sensors_data_type(self, mock_exec,
+                                                        mock_parse):
+        self.config(send_sensor_data_types=['fan'], group='conductor')
+        mock_exec.return_value = ('output', '')
+        mock_parse.return_value = {'Fan': {}}
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.assertEqual(
+                {'Fan': {}}, self.driver.management.get_sensors_data(task))
+        mock_exec.assert_called_once_with(self.info, 'sdr -v type Fan',
+                                          sdr_cache=None)
+        mock_parse.assert_called_once_with(mock.ANY, 'output', {'fan'})
+
+    @mock.patch.object(ipmi, '_exec_ipmitool', autospec=True)
+    def test_management_interface_get_sensors_data_type_prefix(self,
+                                                               mock_exec):
+        # "Power" is the first word of the Power Supply and Power Unit
+        # types, which ipmitool only accepts with their full name
+        self.config(send_sensor_data_types=['Power'], group='conductor')
+        mock_exec.return_value = ("""Sensor ID              : PS1 (0x50)
+ Sensor Type (Discrete): Power Supply
+ Sensor Reading        : 0h
+
+Sensor ID              : Temp (0x1)
+ Sensor Type (Analog)  : Temperature
+ Sensor Reading        : 50 (+/- 1) degrees C
+
+Sensor ID              : PU (0x51)
+ Sensor Type (Discrete): Power Unit
+ Sensor Reading        : 0h
+""", '')
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            sensors_data = self.driver.management.get_sensors_data(task)
+        mock_exec.assert_called_once_with(self.info, 'sdr -v',
+                                          sdr_cache=None)
+        self.assertEqual(['Power'], list(sensors_data))
+        self.assertEqual(['PS1 (0x50)', 'PU (0x51)'],
+                         sorted(sensors_data['Power']))
+
+    @mock.patch.object(ipmi, '_exec_ipmitool', autospec=True)
+    def test_management_interface_get_sensors_data_fails(self, mock_exec):
+        mock_exec.side_effect = processutils.ProcessExecutionError()
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.assertRaises(exception.FailedToGetSensorData,
+                              self.driver.management.get_sensors_data, task)
+
+    @mock.patch.object(ipmi, '_invalidate_sdr_cache', autospec=True)
+    @mock.patch.object(ipmi, '_get_sdr_cache', autospec=True)
+    @mock.patch.object(ipmi, '_parse_ipmi_sensors_data', autospec=True)
+    @mock.patch.object(ipmi, '_exec_ipmitool', autospec=True)
+    def test_management_interface_get_sensors_data_sdr_cache(
+            self, mock_exec, mock_parse, mock_cache, mock_invalidate):
+        mock_cache.return_value = '/cache/bmc.sdr'
+        mock_exec.return_value = ('output', '')
+        mock_parse.return_value = {'Fan': {}}
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.driver.management.get_sensors_data(task)
+            mock_cache.assert_called_once_with(task, self.info)
+        mock_exec.assert_called_once_with(self.info, 'sdr -v',
+                                          sdr_cache='/cache/bmc.sdr')
+        self.assertFalse(mock_invalidate.called)
+
+    @mock.patch.object(ipmi, '_invalidate_sdr_cache', autospec=True)
+    @mock.patch.object(ipmi, '_get_sdr_cache', autospec=True)
+    @mock.patch.object(ipmi, '_exec_ipmitool', autospec=True)
+    def test_management_interface_get_sensors_data_sdr_cache_fails(
+            self, mock_exec, mock_cache, mock_invalidate):
+        mock_cache.return_value = '/cache/bmc.sdr'
+        mock_exec.side_effect = processutils.ProcessExecutionError()
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.assertRaises(exception.FailedToGetSensorData,
+                              self.driver.management.get_sensors_data, task)
+        mock_invalidate.assert_called_once_with('/cache/bmc.sdr')
+
+    def test__sdr_cache_path(self):
+        self.assertIsNone(ipmi._sdr_cache_path(self.info))
+        self.config(sdr_cache_dir='/cache', group='ipmi')
+        path = ipmi._sdr_cache_path(self.info)
+        self.assertEqual('/cache', os.path.dirname(path))
+        self.assertTrue(path.endswith('.sdr'))
+        self.assertEqual(path, ipmi._sdr_cache_path(dict(self.info)))
+
+        bridged_info = dict(self.info, target_address='0x20')
+        self.assertNotEqual(path, ipmi._sdr_cache_path(bridged_info))
+
+    @mock.patch.object(ipmi, '_exec_ipmitool', autospec=True)
+    def test__get_sdr_repository_stamp(self, mock_exec):
+        mock_exec.return_value = (
+            'SDR Version                         : 0x51\n'
+            'Record Count                        : 47\n'
+            'Most recent Addition                : 03/10/2016 14:40:40\n'
+            'Most recent Erase                   : 03/10/2016 14:39:13\n',
+            '')
+        self.assertEqual('47|03/10/2016 14:40:40|03/10/2016 14:39:13',
+                         ipmi._get_sdr_repository_stamp(self.info))
+        mock_exec.assert_called_once_with(self.info, 'sdr info')
+
+    @mock.patch.object(ipmi, '_exec_ipmitool', autospec=True)
+    def test__get_sdr_repository_stamp_unknown(self, mock_exec):
+        mock_exec.return_value = ('SDR Version : 0x51\n', '')
+        self.assertIsNone(ipmi._get_sdr_repository_stamp(self.info))
+
+    def _setup_sdr_cache(self):
+        self.config(sdr_cache_dir=tempfile.mkdtemp(), group='ipmi')
+        self.addCleanup(shutil.rmtree, CONF.ipmi.sdr_cache_dir)
+
+        def dump(task, file_path):
+            with open(file_path, 'w') as f:
+                f.write('sdr')
+
+        patcher = mock.patch.object(ipmi, 'dump_sdr', autospec=True,
+                                    side_effect=dump)
+        dump_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(ipmi, '_get_sdr_repository_stamp',
+                                    autospec=True, return_value='stamp1')
+        stamp_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        return dump_mock, stamp_mock
+
+    def test__get_sdr_cache_disabled(self):
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.assertIsNone(ipmi._get_sdr_cache(task, self.info))
+
+    @mock.patch.object(time, 'time', autospec=True)
+    def test__get_sdr_cache(self, mock_time):
+        dump_mock, stamp_mock = self._setup_sdr_cache()
+        mock_time.return_value = 1000
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            path = ipmi._get_sdr_cache(task, self.info)
+            self.assertEqual(ipmi._sdr_cache_path(self.info), path)
+            with open(path) as f:
+                self.assertEqual('sdr', f.read())
+            self.assertEqual(1, dump_mock.call_count)
+            self.assertEqual([os.path.basename(path),
+                              '%s.json' % os.path.basename(path)],
+                             sorted(os.listdir(CONF.ipmi.sdr_cache_dir)))
+
+            # Checked recently, the BMC is not queried
+            mock_time.return_value = 1599
+            self.assertEqual(path, ipmi._get_sdr_cache(task, self.info))
+            self.assertEqual(1, stamp_mock.call_count)
+
+            # The stamp has not changed
+            mock_time.return_value = 1600
+            self.assertEqual(path, ipmi._get_sdr_cache(task, self.info))
+            self.assertEqual(2, stamp_mock.call_count)
+            self.assertEqual(1, dump_mock.call_count)
+
+            # The stamp has changed
+            stamp_mock.return_value = 'stamp2'
+            mock_time.return_value = 2200
+            self.assertEqual(path, ipmi._get_sdr_cache(task, self.info))
+            self.assertEqual(2, dump_mock.call_count)
+
+    def test__get_sdr_cache_no_stamp(self):
+        self.config(sdr_cache_check_interval=0, group='ipmi')
+        dump_mock, stamp_mock = self._setup_sdr_cache()
+        stamp_mock.return_value = None
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            ipmi._get_sdr_cache(task, self.info)
+            ipmi._get_sdr_cache(task, self.info)
+        self.assertEqual(2, dump_mock.call_count)
+
+    def test__get_sdr_cache_dump_fails(self):
+        dump_mock, stamp_mock = self._setup_sdr_cache()
+        dump_mock.side_effect = exception.IPMIFailure(cmd='sdr dump')
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            self.assertIsNone(ipmi._get_sdr_cache(task, self.info))
+        self.assertEqual([], os.listdir(CONF.ipmi.sdr_cache_dir))
+
     @mock.patch.object(ipmi, '_exec_ipmitool', autospec=True)
     def test_dump_sdr_ok(self, mock_exec):
         mock_exec.return_value = (None, None)
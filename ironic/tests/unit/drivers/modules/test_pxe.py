@@ -31,10 +31,12 @@ from ironic.common import exception
 from ironic.common.glance_service import base_image_service
 from ironic.common import pxe_utils
 from ironic.common import states
+from ironic.common import utils
 from ironic.conductor import task_manager
 from ironic.conductor import utils as manager_utils
 from ironic.drivers.modules import agent_base_vendor
 from ironic.drivers.modules import deploy_utils
+from ironic.drivers.modules import image_cache
 from ironic.drivers.modules import pxe
 from ironic.drivers.modules.storage import noop as noop_storage
 from ironic.tests.unit.conductor import mgr_utils
@@ -92,6 +94,26 @@ class PXEPrivateMethodsTestCase(db_base.DbTestCase):
         image_info = pxe._get_deploy_image_info(self.node)
         self.assertEqual(expected_info, image_info)
 
+    def test__get_deploy_image_info_shared(self):
+        self.config(shared_boot_images=True, group='pxe')
+        shared_dir = os.path.join(CONF.pxe.tftp_root, 'images')
+        expected_info = {'deploy_ramdisk':
+                         (DRV_INFO_DICT['deploy_ramdisk'],
+                          os.path.join(shared_dir, 'deploy_ramdisk_uuid')),
+                         'deploy_kernel':
+                         (DRV_INFO_DICT['deploy_kernel'],
+                          os.path.join(shared_dir, 'deploy_kernel_uuid'))}
+        image_info = pxe._get_deploy_image_info(self.node)
+        self.assertEqual(expected_info, image_info)
+
+    def test__get_deploy_image_info_shared_no_cache(self):
+        self.config(shared_boot_images=True, tftp_master_path='',
+                    group='pxe')
+        image_info = pxe._get_deploy_image_info(self.node)
+        self.assertEqual(os.path.join(CONF.pxe.tftp_root, self.node.uuid,
+                                      'deploy_kernel'),
+                         image_info['deploy_kernel'][1])
+
     def test__get_deploy_image_info_missing_deploy_kernel(self):
         del self.node.driver_info['deploy_kernel']
         self.assertRaises(exception.MissingParameterValue,
@@ -146,6 +168,22 @@ class PXEPrivateMethodsTestCase(db_base.DbTestCase):
         self.node.save()
         self._test__get_instance_image_info()
 
+    def test__get_instance_image_info_shared(self):
+        self.config(shared_boot_images=True, ipxe_enabled=True, group='pxe')
+        self.node.instance_info = dict(self.node.instance_info,
+                                       kernel='http://host/vmlinuz',
+                                       ramdisk='glance://ramdisk_uuid')
+        image_info = pxe._get_instance_image_info(self.node, self.context)
+        shared_dir = os.path.join(CONF.deploy.http_root, 'images')
+        self.assertEqual(
+            {'kernel': ('http://host/vmlinuz',
+                        os.path.join(shared_dir,
+                                     image_cache.get_master_file_name(
+                                         'http://host/vmlinuz'))),
+             'ramdisk': ('glance://ramdisk_uuid',
+                         os.path.join(shared_dir, 'ramdisk_uuid'))},
+            image_info)
+
     @mock.patch('ironic.drivers.modules.deploy_utils.get_boot_option',
                 return_value='local')
     def test__get_instance_image_info_localboot(self, boot_opt_mock):
@@ -415,6 +453,27 @@ class PXEPrivateMethodsTestCase(db_base.DbTestCase):
         self._test_build_pxe_config_options_ipxe(whle_dsk_img=True,
                                                  ipxe_timeout=120)
 
+    @mock.patch('ironic.common.utils.render_template', autospec=True)
+    def test__build_pxe_config_options_ipxe_shared(self, render_mock):
+        self.config(ipxe_enabled=True, shared_boot_images=True, group='pxe')
+        self.config(http_url='http://192.1.2.3:1234', group='deploy')
+        self.node.driver_internal_info['is_whole_disk_image'] = False
+        self.node.save()
+        shared_dir = os.path.join(CONF.deploy.http_root, 'images')
+        image_info = {
+            label: (label, os.path.join(shared_dir, label + '_uuid'))
+            for label in ('deploy_kernel', 'deploy_ramdisk', 'kernel',
+                          'ramdisk')}
+        with task_manager.acquire(self.context, self.node.uuid,
+                                  shared=True) as task:
+            options = pxe._build_pxe_config_options(task, image_info)
+        for label, option in (('deploy_kernel', 'deployment_aki_path'),
+                              ('deploy_ramdisk', 'deployment_ari_path'),
+                              ('kernel', 'aki_path'),
+                              ('ramdisk', 'ari_path')):
+            self.assertEqual('http://192.1.2.3:1234/images/%s_uuid' % label,
+                             options[option])
+
     def test__build_pxe_config_options_ipxe_and_iscsi_boot(self):
         vol_id = uuidutils.generate_uuid()
         vol_id2 = uuidutils.generate_uuid()
@@ -652,6 +711,136 @@ class CleanUpPxeEnvTestCase(db_base.DbTestCase):
             mock_unlink.assert_any_call('deploy_kernel')
         mock_cache.return_value.clean_up.assert_called_once_with()
 
+    @mock.patch.object(pxe, '_update_shared_images_index', autospec=True)
+    def test__clean_up_pxe_env_shared(self, mock_index, mock_cache,
+                                      mock_pxe_clean, mock_unlink):
+        self.config(shared_boot_images=True, group='pxe')
+        mock_index.return_value = ['deploy_kernel']
+        image_info = {'label': ['', 'deploy_kernel']}
+        with task_manager.acquire(self.context, self.node.uuid,
+                                  shared=True) as task:
+            pxe._clean_up_pxe_env(task, image_info)
+            mock_pxe_clean.assert_called_once_with(task)
+        mock_index.assert_called_once_with(self.node.uuid, image_info,
+                                           release=True)
+        self.assertFalse(mock_unlink.called)
+        mock_cache.return_value.clean_up.assert_called_once_with()
+
+    @mock.patch.object(pxe, '_update_shared_images_index', autospec=True)
+    def test__clean_up_pxe_env_shared_still_used(self, mock_index,
+                                                 mock_cache, mock_pxe_clean,
+                                                 mock_unlink):
+        self.config(shared_boot_images=True, group='pxe')
+        mock_index.return_value = []
+        image_info = {'label': ['', 'deploy_kernel']}
+        with task_manager.acquire(self.context, self.node.uuid,
+                                  shared=True) as task:
+            pxe._clean_up_pxe_env(task, image_info)
+            mock_pxe_clean.assert_called_once_with(task)
+        self.assertFalse(mock_unlink.called)
+        mock_cache.return_value.clean_up.assert_called_once_with()
+
+
+@mock.patch.object(deploy_utils, 'fetch_images', autospec=True)
+class SharedImagesTestCase(db_base.DbTestCase):
+
+    def setUp(self):
+        super(SharedImagesTestCase, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(utils.rmtree_without_raise, self.temp_dir)
+        self.master_dir = os.path.join(self.temp_dir, 'master_images')
+        self.config(tftp_root=self.temp_dir, shared_boot_images=True,
+                    tftp_master_path=self.master_dir, group='pxe')
+        self.shared_dir = os.path.join(self.temp_dir, 'images')
+        self.image_info = {
+            'deploy_kernel': ('glance://kernel',
+                              os.path.join(self.shared_dir, 'kernel')),
+            'deploy_ramdisk': ('glance://ramdisk',
+                               os.path.join(self.shared_dir, 'ramdisk'))}
+        fileutils.ensure_tree(self.shared_dir)
+        for href, path in self.image_info.values():
+            with open(path, 'w') as image_file:
+                image_file.write(href)
+
+    def _get_index(self):
+        with open(os.path.join(self.shared_dir, '.index.json'), 'rb') as f:
+            return json.load(f)
+
+    def test__cache_ramdisk_kernel(self, mock_fetch_images):
+        pxe._cache_ramdisk_kernel(self.context, mock.Mock(uuid='node1'),
+                                  self.image_info)
+        pxe._cache_ramdisk_kernel(self.context, mock.Mock(uuid='node2'),
+                                  {'kernel': self.image_info['deploy_kernel']})
+
+        self.assertEqual({'kernel': ['node1/deploy_kernel', 'node2/kernel'],
+                          'ramdisk': ['node1/deploy_ramdisk']},
+                         self._get_index())
+        mock_fetch_images.assert_called_with(
+            self.context, mock.ANY, [self.image_info['deploy_kernel']], True)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir,
+                                                     'node1')))
+
+    def test__update_shared_images_index_release(self, mock_fetch_images):
+        pxe._update_shared_images_index('node1', self.image_info)
+        pxe._update_shared_images_index('node2', self.image_info)
+
+        removed = pxe._update_shared_images_index('node1', self.image_info,
+                                                  release=True)
+        self.assertEqual([], removed)
+        self.assertEqual({'kernel': ['node2/deploy_kernel'],
+                          'ramdisk': ['node2/deploy_ramdisk']},
+                         self._get_index())
+
+        removed = pxe._update_shared_images_index(
+            'node2', {'deploy_kernel': self.image_info['deploy_kernel']},
+            release=True)
+        self.assertEqual([self.image_info['deploy_kernel'][1]], removed)
+        self.assertEqual({'ramdisk': ['node2/deploy_ramdisk']},
+                         self._get_index())
+        self.assertFalse(os.path.exists(self.image_info['deploy_kernel'][1]))
+        self.assertTrue(os.path.exists(self.image_info['deploy_ramdisk'][1]))
+
+    def test__update_shared_images_index_release_unknown(self,
+                                                         mock_fetch_images):
+        pxe._update_shared_images_index('node1', self.image_info)
+
+        removed = pxe._update_shared_images_index('node2', self.image_info,
+                                                  release=True)
+        self.assertEqual([], removed)
+        self.assertEqual({'kernel': ['node1/deploy_kernel'],
+                          'ramdisk': ['node1/deploy_ramdisk']},
+                         self._get_index())
+
+    def test__update_shared_images_index_release_no_index(
+            self, mock_fetch_images):
+        utils.rmtree_without_raise(self.shared_dir)
+        removed = pxe._update_shared_images_index('node1', self.image_info,
+                                                  release=True)
+        self.assertEqual([], removed)
+        self.assertFalse(os.path.exists(self.shared_dir))
+
+    @mock.patch.object(pxe.lockutils, 'lock', autospec=True)
+    def test__update_shared_images_index_locks(self, mock_lock,
+                                               mock_fetch_images):
+        pxe._update_shared_images_index('node1', self.image_info)
+        mock_lock.assert_called_once_with('shared-boot-images',
+                                          external=True,
+                                          lock_path=self.master_dir)
+        self.assertTrue(mock_lock.return_value.__enter__.called)
+
+    @mock.patch.object(pxe.LOG, 'warning', autospec=True)
+    def test__update_shared_images_index_invalid(self, mock_log,
+                                                 mock_fetch_images):
+        with open(os.path.join(self.shared_dir, '.index.json'), 'w') as f:
+            f.write('{')
+
+        pxe._update_shared_images_index('node1', self.image_info)
+
+        self.assertTrue(mock_log.called)
+        self.assertEqual({'kernel': ['node1/deploy_kernel'],
+                          'ramdisk': ['node1/deploy_ramdisk']},
+                         self._get_index())
+
 
 class PXEBootTestCase(db_base.DbTestCase):
 
@@ -20,8 +20,10 @@ import time
 
 import mock
 from oslo_config import cfg
+from oslo_utils import importutils
 from pysnmp.entity.rfc3413.oneliner import cmdgen
 from pysnmp import error as snmp_error
+from pysnmp.proto import rfc1902
 
 from ironic.common import exception
 from ironic.common import states
@@ -33,6 +35,10 @@ from ironic.tests.unit.db import base as db_base
 from ironic.tests.unit.db import utils as db_utils
 from ironic.tests.unit.objects import utils as obj_utils
 
+# NOTE: the SNMP agent requires the real pysnmp library
+snmp_agent = importutils.try_import(
+    'ironic.tests.unit.drivers.modules.snmp_agent')
+
 CONF = cfg.CONF
 INFO_DICT = db_utils.get_test_snmp_info()
 
@@ -70,6 +76,18 @@ class SNMPClientTestCase(base.TestCase):
         mock_cmdgen.assert_called_once_with()
         mock_user.assert_called_once_with(client.security)
 
+    @mock.patch.object(cmdgen, 'UdpTransportTarget', autospec=True)
+    @mock.patch.object(cmdgen, 'CommunityData', autospec=True)
+    def test__get_auth_transport_reused(self, mock_community, mock_transport,
+                                        mock_cmdgen):
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        for _i in range(2):
+            self.assertEqual(mock_community.return_value, client._get_auth())
+            self.assertEqual(mock_transport.return_value,
+                             client._get_transport())
+        mock_community.assert_called_once_with(client.community, mpModel=1)
+        mock_transport.assert_called_once_with((client.address, client.port))
+
     @mock.patch.object(cmdgen, 'UdpTransportTarget', autospec=True)
     def test__get_transport(self, mock_transport, mock_cmdgen):
         client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V3)
@@ -97,6 +115,205 @@ class SNMPClientTestCase(base.TestCase):
         mock_cmdgenerator.getCmd.assert_called_once_with(mock.ANY, mock.ANY,
                                                          self.oid)
 
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_many(self, mock_auth, mock_transport, mock_cmdgen):
+        var_binds = [('oid1', 'value1'), ('oid2', 'value2')]
+        mock_cmdgenerator = mock_cmdgen.return_value
+        mock_cmdgenerator.getCmd.return_value = ("", None, 0, var_binds)
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V3)
+        val = client.get_many(['oid1', 'oid2'])
+        self.assertEqual(['value1', 'value2'], val)
+        mock_cmdgenerator.getCmd.assert_called_once_with(mock.ANY, mock.ANY,
+                                                         'oid1', 'oid2')
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_many_err_pdu(self, mock_auth, mock_transport, mock_cmdgen):
+        mock_cmdgenerator = mock_cmdgen.return_value
+        error_status = mock.Mock()
+        error_status.prettyPrint.return_value = 'tooBig'
+        mock_cmdgenerator.getCmd.return_value = ("", error_status, 1, [])
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V3)
+        self.assertRaises(exception.SNMPFailure, client.get_many,
+                          ['oid1', 'oid2'])
+
+    def _mock_get_cmd(self, mock_cmdgen, results):
+        mock_cmdgen.return_value.snmpEngine = mock.Mock()
+
+        def _get_cmd(snmp_engine, auth, transport, context, *var_binds,
+                     **kwargs):
+            index = kwargs['cbCtx']
+            if index < len(results):
+                kwargs['cbFun'](snmp_engine, None,
+                                *(results[index] + (index,)))
+
+        # Make the variable bindings sent by getCmd the bare OIDs
+        for name in ('ObjectType', 'ObjectIdentity'):
+            patcher = mock.patch.object(snmp.snmp_asyncore, name,
+                                        autospec=True,
+                                        side_effect=lambda oid: oid)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+        patcher = mock.patch.object(snmp.snmp_asyncore, 'getCmd',
+                                    autospec=True, side_effect=_get_cmd)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_many_max_oids(self, mock_auth, mock_transport, mock_cmdgen):
+        oids = [(1, 3, 6, i) for i in range(snmp.MAX_OIDS_PER_REQUEST)]
+        mock_get_cmd = self._mock_get_cmd(mock_cmdgen, [])
+        mock_cmdgenerator = mock_cmdgen.return_value
+        mock_cmdgenerator.getCmd.return_value = (
+            "", None, 0, [(oid, i) for i, oid in enumerate(oids)])
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        self.assertEqual(list(range(snmp.MAX_OIDS_PER_REQUEST)),
+                         client.get_many(oids))
+        mock_cmdgenerator.getCmd.assert_called_once_with(mock.ANY, mock.ANY,
+                                                         *oids)
+        self.assertFalse(mock_get_cmd.called)
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_many_pipelined(self, mock_auth, mock_transport,
+                                mock_cmdgen):
+        oids = [(1, 3, 6, i) for i in range(12)]
+        mock_get_cmd = self._mock_get_cmd(
+            mock_cmdgen,
+            [("", None, 0, [(oid, i) for i, oid in enumerate(oids[:10])]),
+             ("", None, 0, [(oids[10], 10), (oids[11], 11)])])
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        self.assertEqual(list(range(12)), client.get_many(oids))
+        engine = mock_cmdgen.return_value.snmpEngine
+        mock_get_cmd.assert_has_calls([
+            mock.call(engine, mock_auth.return_value,
+                      mock_transport.return_value, mock.ANY, *oids[:10],
+                      cbFun=mock.ANY, cbCtx=0, lookupMib=False),
+            mock.call(engine, mock_auth.return_value,
+                      mock_transport.return_value, mock.ANY, *oids[10:],
+                      cbFun=mock.ANY, cbCtx=1, lookupMib=False)])
+        self.assertEqual(2, mock_get_cmd.call_count)
+        # All the requests are sent before waiting for the responses
+        engine.transportDispatcher.runDispatcher.assert_called_once_with()
+        self.assertFalse(mock_cmdgen.return_value.getCmd.called)
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_many_pipelined_chunks(self, mock_auth, mock_transport,
+                                       mock_cmdgen):
+        oids = [(1, 3, 6, i) for i in range(25)]
+        mock_get_cmd = self._mock_get_cmd(
+            mock_cmdgen,
+            [("", None, 0, [(oid, i) for i, oid in enumerate(oids)
+                            if i // 10 == chunk])
+             for chunk in range(3)])
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        self.assertEqual(list(range(25)), client.get_many(oids))
+        self.assertEqual([oids[:10], oids[10:20], oids[20:]],
+                         [list(c[0][4:]) for c in mock_get_cmd.call_args_list])
+        self.assertEqual([0, 1, 2], [c[1]['cbCtx']
+                                     for c in mock_get_cmd.call_args_list])
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_many_pipelined_no_response(self, mock_auth, mock_transport,
+                                            mock_cmdgen):
+        oids = [(1, 3, 6, i) for i in range(12)]
+        self._mock_get_cmd(
+            mock_cmdgen,
+            [("", None, 0, [(oid, i) for i, oid in enumerate(oids[:10])])])
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        self.assertRaises(exception.SNMPFailure, client.get_many, oids)
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_many_pipelined_err_engine(self, mock_auth, mock_transport,
+                                           mock_cmdgen):
+        oids = [(1, 3, 6, i) for i in range(12)]
+        self._mock_get_cmd(
+            mock_cmdgen,
+            [("engine error", None, 0, []),
+             ("", None, 0, [(oids[10], 10), (oids[11], 11)])])
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        self.assertRaises(exception.SNMPFailure, client.get_many, oids)
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_many_pipelined_err_dispatcher(self, mock_auth,
+                                               mock_transport, mock_cmdgen):
+        oids = [(1, 3, 6, i) for i in range(12)]
+        self._mock_get_cmd(mock_cmdgen, [])
+        engine = mock_cmdgen.return_value.snmpEngine
+        engine.transportDispatcher.runDispatcher.side_effect = (
+            snmp_error.PySnmpError('timeout'))
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        self.assertRaises(exception.SNMPFailure, client.get_many, oids)
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_many_pipelined_err_pdu(self, mock_auth, mock_transport,
+                                        mock_cmdgen):
+        error_status = mock.Mock()
+        error_status.prettyPrint.return_value = 'tooBig'
+        oids = [(1, 3, 6, i) for i in range(12)]
+        self._mock_get_cmd(
+            mock_cmdgen,
+            [("", None, 0, [(oid, i) for i, oid in enumerate(oids[:10])]),
+             ("", error_status, 1, [])])
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        self.assertRaises(exception.SNMPFailure, client.get_many, oids)
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_bulk(self, mock_auth, mock_transport, mock_cmdgen):
+        mock_cmdgenerator = mock_cmdgen.return_value
+        mock_cmdgenerator.bulkCmd.return_value = (
+            "", None, 0, [[((1, 3, 6, 1), 1)], [((1, 3, 6, 2), 2)]])
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        self.assertEqual({(1, 3, 6, 1): 1, (1, 3, 6, 2): 2},
+                         client.get_bulk((1, 3, 6), 8))
+        mock_cmdgenerator.bulkCmd.assert_called_once_with(
+            mock.ANY, mock.ANY, 0, 8, (1, 3, 6), maxRows=8)
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_bulk_several_rows(self, mock_auth, mock_transport,
+                                   mock_cmdgen):
+        mock_cmdgenerator = mock_cmdgen.return_value
+        mock_cmdgenerator.bulkCmd.return_value = (
+            "", None, 0, [[((1, 3, 6, 1, 1), 1), ((1, 3, 7, 1, 1), 3)],
+                          [((1, 3, 6, 1, 2), 2), ((1, 3, 7, 1, 2), 4)]])
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        self.assertEqual({(1, 3, 6, 1, 1): 1, (1, 3, 7, 1, 1): 3,
+                          (1, 3, 6, 1, 2): 2, (1, 3, 7, 1, 2): 4},
+                         client.get_bulk((1, 3, 6, 1), 2))
+        mock_cmdgenerator.bulkCmd.assert_called_once_with(
+            mock.ANY, mock.ANY, 0, 2, (1, 3, 6, 1), maxRows=2)
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_bulk_err_transport(self, mock_auth, mock_transport,
+                                    mock_cmdgen):
+        mock_cmdgenerator = mock_cmdgen.return_value
+        mock_cmdgenerator.bulkCmd.side_effect = snmp_error.PySnmpError(
+            'transport error')
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        self.assertRaises(exception.SNMPFailure, client.get_bulk, (1, 3, 6),
+                          8)
+
+    @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
+    @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
+    def test_get_bulk_err_engine(self, mock_auth, mock_transport,
+                                 mock_cmdgen):
+        mock_cmdgenerator = mock_cmdgen.return_value
+        mock_cmdgenerator.bulkCmd.return_value = ("engine error", None, 0,
+                                                  [])
+        client = snmp.SNMPClient(self.address, self.port, snmp.SNMP_V2C)
+        self.assertRaises(exception.SNMPFailure, client.get_bulk, (1, 3, 6),
+                          8)
+
     @mock.patch.object(snmp.SNMPClient, '_get_transport', autospec=True)
     @mock.patch.object(snmp.SNMPClient, '_get_auth', autospec=True)
     def test_get_next(self, mock_auth, mock_transport, mock_cmdgen):
@@ -197,6 +414,98 @@ class SNMPClientTestCase(base.TestCase):
                                                          var_bind)
 
 
+@mock.patch.object(cmdgen, 'CommandGenerator', autospec=True)
+class SNMPGetClientTestCase(base.TestCase):
+    def setUp(self):
+        super(SNMPGetClientTestCase, self).setUp()
+        patcher = mock.patch.dict(snmp._CLIENTS, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.snmp_info = {'address': '1.2.3.4', 'port': 161,
+                          'version': snmp.SNMP_V2C, 'community': 'public',
+                          'driver': 'teltronix', 'outlet': 1}
+
+    def test__get_client(self, mock_cmdgen):
+        client = snmp._get_client(self.snmp_info)
+        self.assertEqual(('1.2.3.4', 161, snmp.SNMP_V2C),
+                         (client.address, client.port, client.version))
+        self.assertEqual('public', client.community)
+        # Reused by the other outlets of the PDU
+        self.assertIs(client, snmp._get_client(dict(self.snmp_info,
+                                                    outlet=2)))
+        mock_cmdgen.assert_called_once_with()
+
+    def test__get_client_other_parameters(self, mock_cmdgen):
+        client = snmp._get_client(self.snmp_info)
+        other = snmp._get_client(dict(self.snmp_info, community='private'))
+        self.assertIsNot(client, other)
+        self.assertEqual('private', other.community)
+
+
+class SNMPClientAgentTestCase(base.TestCase):
+    """SNMP client tests against a local SNMP agent."""
+
+    column = (1, 3, 6, 1, 4, 1, 23620, 1, 2, 2, 1, 4)
+
+    def setUp(self):
+        super(SNMPClientAgentTestCase, self).setUp()
+        if not (snmp_agent and snmp_agent.is_supported()):
+            self.skipTest('requires a pysnmp library able to run an SNMP '
+                          'agent')
+        self.objects = {self.column + (outlet,): 1 + outlet % 2
+                        for outlet in range(1, 25)}
+        # Past the end of the column
+        self.objects[(1, 3, 6, 1, 4, 1, 23620, 1, 3, 1)] = 0
+        self.agent = self.useFixture(snmp_agent.SNMPAgent(self.objects))
+
+    def _get_client(self, version=snmp.SNMP_V2C):
+        return snmp.SNMPClient(self.agent.address, self.agent.port, version,
+                               community=snmp_agent.COMMUNITY)
+
+    def test_get(self):
+        client = self._get_client(snmp.SNMP_V1)
+        self.assertEqual(2, client.get(self.column + (1,)))
+        self.assertEqual(['GET'], self.agent.requests)
+
+    def test_get_many_pipelined(self):
+        client = self._get_client(snmp.SNMP_V1)
+        values = client.get_many([self.column + (outlet,)
+                                  for outlet in range(1, 25)])
+        self.assertEqual([1 + outlet % 2 for outlet in range(1, 25)],
+                         [int(value) for value in values])
+        self.assertEqual(['GET'] * 3, self.agent.requests)
+
+    def test_get_bulk(self):
+        client = self._get_client()
+        values = client.get_bulk(self.column, 24)
+        self.assertEqual({oid: value for oid, value in self.objects.items()
+                          if oid[:len(self.column)] == self.column},
+                         {oid: int(value) for oid, value in values.items()})
+        self.assertEqual(['GETBULK'], self.agent.requests)
+
+    def test_set(self):
+        client = self._get_client()
+        client.set(self.column + (3,), rfc1902.Integer(1))
+        self.assertEqual(1, self.objects[self.column + (3,)])
+        self.assertEqual(['SET'], self.agent.requests)
+
+    def test_get_power_states(self):
+        snmp_info = {'address': self.agent.address, 'port': self.agent.port,
+                     'version': snmp.SNMP_V2C,
+                     'community': snmp_agent.COMMUNITY}
+        client = self._get_client()
+        drivers = []
+        for outlet in (4, 7, 24):
+            with mock.patch.object(snmp, '_get_client', autospec=True,
+                                   return_value=client):
+                drivers.append(snmp.SNMPDriverTeltronix(
+                    dict(snmp_info, outlet=outlet)))
+        self.assertEqual([states.POWER_OFF, states.POWER_ON,
+                          states.POWER_OFF],
+                         snmp._get_power_states(drivers))
+        self.assertEqual(['GETBULK'], self.agent.requests)
+
+
 class SNMPValidateParametersTestCase(db_base.DbTestCase):
 
     def _get_test_node(self, driver_info):
@@ -1184,6 +1493,79 @@ class SNMPDeviceDriverTestCase(db_base.DbTestCase):
         mock_client.get.assert_has_calls(calls)
         self.assertEqual(states.POWER_ON, pstate)
 
+    def test__get_power_states(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.version = snmp.SNMP_V1
+        drivers = []
+        for outlet in range(1, 13):
+            self._update_driver_info(snmp_outlet=str(outlet))
+            drivers.append(snmp._get_driver(self.node))
+        on, off = drivers[0].value_power_on, drivers[0].value_power_off
+        mock_client.get_many.return_value = [on, off] * 5 + [42, on]
+
+        pstates = snmp._get_power_states(drivers)
+
+        self.assertEqual([states.POWER_ON, states.POWER_OFF] * 5 +
+                         [states.ERROR, states.POWER_ON], pstates)
+        mock_client.get_many.assert_called_once_with(
+            [driver._snmp_oid() for driver in drivers])
+        self.assertFalse(mock_client.get.called)
+        self.assertFalse(mock_client.get_bulk.called)
+
+    def test__get_power_states_bulk(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.version = snmp.SNMP_V2C
+        drivers = []
+        for outlet in (2, 5, 3):
+            self._update_driver_info(snmp_outlet=str(outlet))
+            drivers.append(snmp._get_driver(self.node))
+        on, off = drivers[0].value_power_on, drivers[0].value_power_off
+        # The agent returned less rows than requested
+        mock_client.get_bulk.return_value = {drivers[0]._snmp_oid(): on,
+                                             drivers[2]._snmp_oid(): off}
+        mock_client.get_many.return_value = [on]
+
+        pstates = snmp._get_power_states(drivers)
+
+        self.assertEqual([states.POWER_ON, states.POWER_ON,
+                          states.POWER_OFF], pstates)
+        mock_client.get_bulk.assert_called_once_with(
+            drivers[0].oid_enterprise + drivers[0].oid_device, 5)
+        mock_client.get_many.assert_called_once_with(
+            [drivers[1]._snmp_oid()])
+
+    def test__get_power_states_eaton_power(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.version = snmp.SNMP_V1
+        self._set_snmp_driver("eatonpower")
+        driver = snmp._get_driver(self.node)
+        mock_client.get_many.return_value = [driver.status_pending_off]
+        self.assertEqual([states.POWER_ON],
+                         snmp._get_power_states([driver]))
+        mock_client.get_many.assert_called_once_with(
+            [driver._snmp_oid(driver.oid_status)])
+
+    def test__get_power_states_eaton_power_bulk(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.version = snmp.SNMP_V3
+        self._set_snmp_driver("eatonpower")
+        driver = snmp._get_driver(self.node)
+        mock_client.get_bulk.return_value = {
+            driver._snmp_oid(driver.oid_status): driver.status_pending_on}
+        self.assertEqual([states.POWER_OFF],
+                         snmp._get_power_states([driver]))
+        mock_client.get_bulk.assert_called_once_with(
+            driver.oid_base + driver.oid_status, 1)
+        self.assertFalse(mock_client.get_many.called)
+
+    def test__get_power_states_snmp_failure(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.version = snmp.SNMP_V1
+        mock_client.get_many.side_effect = self._get_snmp_failure()
+        driver = snmp._get_driver(self.node)
+        self.assertRaises(exception.SNMPFailure, snmp._get_power_states,
+                          [driver])
+
 
 @mock.patch.object(snmp, '_get_driver', autospec=True)
 class SNMPDriverTestCase(db_base.DbTestCase):
@@ -1321,3 +1703,30 @@ class SNMPDriverTestCase(db_base.DbTestCase):
             self.assertRaises(exception.PowerStateFailure,
                               task.driver.power.reboot, task)
         mock_driver.power_reset.assert_called_once_with()
+
+    def test_get_power_state_bulk_key(self, mock_get_driver):
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            key = task.driver.power.get_power_state_bulk_key(task)
+            task.node.driver_info = dict(INFO_DICT, snmp_outlet='2')
+            self.assertEqual(key,
+                             task.driver.power.get_power_state_bulk_key(task))
+            task.node.driver_info = dict(INFO_DICT, snmp_address='1.2.3.5')
+            self.assertNotEqual(
+                key, task.driver.power.get_power_state_bulk_key(task))
+
+    @mock.patch.object(snmp, '_get_power_states', autospec=True)
+    def test_get_power_state_bulk(self, mock_get_power_states,
+                                  mock_get_driver):
+        node2 = obj_utils.create_test_node(
+            self.context, uuid='1be26c0b-03f2-4d2e-ae87-c02d7f33c781',
+            driver='fake_snmp', driver_info=dict(INFO_DICT, snmp_outlet='2'))
+        mock_get_power_states.return_value = [states.POWER_ON,
+                                              states.POWER_OFF]
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            with task_manager.acquire(self.context, node2.uuid) as task2:
+                pstates = task.driver.power.get_power_state_bulk([task,
+                                                                  task2])
+        self.assertEqual({self.node.uuid: states.POWER_ON,
+                          node2.uuid: states.POWER_OFF}, pstates)
+        mock_get_power_states.assert_called_once_with(
+            [mock_get_driver.return_value] * 2)
@@ -231,6 +231,10 @@ class SSHPrivateMethodsTestCase(db_base.DbTestCase):
 
     def setUp(self):
         super(SSHPrivateMethodsTestCase, self).setUp()
+        for name in ('_CONNECTIONS', '_INVENTORIES'):
+            patcher = mock.patch.dict(getattr(ssh, name), clear=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
         self.node = obj_utils.get_test_node(
             self.context,
             driver='fake_ssh',
@@ -254,6 +258,63 @@ class SSHPrivateMethodsTestCase(db_base.DbTestCase):
         driver_info = ssh._parse_driver_info(self.node)
         ssh_connect_mock.assert_called_once_with(driver_info)
 
+    def _active_client(self, active=True):
+        client = mock.Mock(spec=paramiko.SSHClient)
+        client.get_transport.return_value.is_active.return_value = active
+        return client
+
+    @mock.patch.object(utils, 'ssh_connect', autospec=True)
+    def test__get_connection_reused(self, ssh_connect_mock):
+        ssh_connect_mock.return_value = self._active_client()
+        client = ssh._get_connection(self.node)
+        self.assertIs(client, ssh._get_connection(self.node))
+        self.assertEqual(1, ssh_connect_mock.call_count)
+
+    @mock.patch.object(utils, 'ssh_connect', autospec=True)
+    def test__get_connection_other_host(self, ssh_connect_mock):
+        ssh_connect_mock.side_effect = [self._active_client(),
+                                        self._active_client()]
+        other_node = obj_utils.get_test_node(
+            self.context, driver='fake_ssh',
+            driver_info=dict(db_utils.get_test_ssh_info(),
+                             ssh_address='10.0.0.2'))
+        self.assertIsNot(ssh._get_connection(self.node),
+                         ssh._get_connection(other_node))
+        self.assertEqual(2, ssh_connect_mock.call_count)
+
+    @mock.patch.object(utils, 'ssh_connect', autospec=True)
+    def test__get_connection_inactive(self, ssh_connect_mock):
+        dead = self._active_client(active=False)
+        ssh_connect_mock.side_effect = [dead, self._active_client()]
+        ssh._get_connection(self.node)
+        client = ssh._get_connection(self.node)
+        self.assertIsNot(dead, client)
+        dead.close.assert_called_once_with()
+        self.assertEqual(2, ssh_connect_mock.call_count)
+
+    @mock.patch.object(ssh.time, 'time', autospec=True)
+    @mock.patch.object(utils, 'ssh_connect', autospec=True)
+    def test__get_connection_idle_timeout(self, ssh_connect_mock, time_mock):
+        self.config(connection_idle_timeout=300, group='ssh')
+        idle = self._active_client()
+        ssh_connect_mock.side_effect = [idle, self._active_client()]
+        time_mock.return_value = 1000
+        ssh._get_connection(self.node)
+        time_mock.return_value = 1299
+        self.assertIs(idle, ssh._get_connection(self.node))
+        time_mock.return_value = 1599
+        self.assertIsNot(idle, ssh._get_connection(self.node))
+        idle.close.assert_called_once_with()
+
+    @mock.patch.object(utils, 'ssh_connect', autospec=True)
+    def test__get_connection_no_reuse(self, ssh_connect_mock):
+        self.config(connection_idle_timeout=0, group='ssh')
+        ssh_connect_mock.return_value = self._active_client()
+        ssh._get_connection(self.node)
+        ssh._get_connection(self.node)
+        self.assertEqual(2, ssh_connect_mock.call_count)
+        self.assertEqual({}, ssh._CONNECTIONS)
+
     @mock.patch.object(processutils, 'ssh_execute', autospec=True)
     def test__ssh_execute(self, exec_ssh_mock):
         ssh_cmd = "somecmd"
@@ -421,6 +482,84 @@ class SSHPrivateMethodsTestCase(db_base.DbTestCase):
         self.assertEqual('NodeName', found_name)
         self.assertEqual(expected, exec_ssh_mock.call_args_list)
 
+    def _vms_side_effect(self):
+        return [('NodeName\nOtherNode', ''),
+                ('52:54:00:cf:2d:31', ''),
+                ('52:54:00:cf:2d:32', '')]
+
+    @mock.patch.object(processutils, 'ssh_execute', autospec=True)
+    def test__get_hosts_name_for_node_inventory(self, exec_ssh_mock):
+        info = ssh._parse_driver_info(self.node)
+        info['macs'] = ["52:54:00:cf:2d:31"]
+        other_info = ssh._parse_driver_info(self.node)
+        other_info['macs'] = ["52:54:00:cf:2d:32"]
+        exec_ssh_mock.side_effect = self._vms_side_effect()
+
+        self.assertEqual('NodeName',
+                         ssh._get_hosts_name_for_node(self.sshclient, info))
+        self.assertEqual('OtherNode',
+                         ssh._get_hosts_name_for_node(self.sshclient,
+                                                      other_info))
+        self.assertEqual(3, exec_ssh_mock.call_count)
+
+    @mock.patch.object(processutils, 'ssh_execute', autospec=True)
+    def test__get_hosts_name_for_node_inventory_mismatch(self,
+                                                         exec_ssh_mock):
+        info = ssh._parse_driver_info(self.node)
+        info['macs'] = ["52:54:00:cf:2d:31"]
+        exec_ssh_mock.side_effect = self._vms_side_effect() + [
+            ('NewNode', ''), ('52:54:00:cf:2d:33', '')]
+        ssh._get_hosts_name_for_node(self.sshclient, info)
+
+        info['macs'] = ["52:54:00:cf:2d:33"]
+        self.assertEqual('NewNode',
+                         ssh._get_hosts_name_for_node(self.sshclient, info))
+        self.assertEqual(5, exec_ssh_mock.call_count)
+
+    @mock.patch.object(ssh.time, 'time', autospec=True)
+    @mock.patch.object(processutils, 'ssh_execute', autospec=True)
+    def test__get_hosts_name_for_node_inventory_expired(self, exec_ssh_mock,
+                                                        time_mock):
+        self.config(vm_inventory_ttl=60, group='ssh')
+        info = ssh._parse_driver_info(self.node)
+        info['macs'] = ["52:54:00:cf:2d:31"]
+        exec_ssh_mock.side_effect = self._vms_side_effect() * 2
+        time_mock.return_value = 1000
+        ssh._get_hosts_name_for_node(self.sshclient, info)
+        time_mock.return_value = 1059
+        ssh._get_hosts_name_for_node(self.sshclient, info)
+        self.assertEqual(3, exec_ssh_mock.call_count)
+        time_mock.return_value = 1060
+        ssh._get_hosts_name_for_node(self.sshclient, info)
+        self.assertEqual(6, exec_ssh_mock.call_count)
+
+    @mock.patch.object(processutils, 'ssh_execute', autospec=True)
+    def test__get_hosts_name_for_node_no_inventory(self, exec_ssh_mock):
+        self.config(vm_inventory_ttl=0, group='ssh')
+        info = ssh._parse_driver_info(self.node)
+        info['macs'] = ["52:54:00:cf:2d:31"]
+        exec_ssh_mock.side_effect = self._vms_side_effect()[:2] * 2
+
+        ssh._get_hosts_name_for_node(self.sshclient, info)
+        ssh._get_hosts_name_for_node(self.sshclient, info)
+
+        # Only the MACs of the first VM are retrieved
+        self.assertEqual(4, exec_ssh_mock.call_count)
+        self.assertIsNone(ssh._get_inventory(info).vms)
+
+    @mock.patch.object(processutils, 'ssh_execute', autospec=True)
+    def test__run_on_vm_exception(self, exec_ssh_mock):
+        info = ssh._parse_driver_info(self.node)
+        inventory = ssh._get_inventory(info)
+        inventory.vms = [('NodeName', [])]
+        inventory.running = ['NodeName']
+        exec_ssh_mock.side_effect = processutils.ProcessExecutionError
+
+        self.assertRaises(exception.SSHCommandFailed, ssh._run_on_vm,
+                          self.sshclient, info, 'somecmd')
+        self.assertIsNone(inventory.vms)
+        self.assertIsNone(inventory.running)
+
     @mock.patch.object(processutils, 'ssh_execute', autospec=True)
     def test__get_hosts_name_for_node_exception(self, exec_ssh_mock):
         info = ssh._parse_driver_info(self.node)
@@ -443,6 +582,60 @@ class SSHPrivateMethodsTestCase(db_base.DbTestCase):
                           info)
         self.assertEqual(expected, exec_ssh_mock.call_args_list)
 
+    @mock.patch.object(processutils, 'ssh_execute', autospec=True)
+    @mock.patch.object(ssh, '_get_hosts_name_for_node', autospec=True)
+    def test__get_power_status_cached(self, get_hosts_name_mock,
+                                      exec_ssh_mock):
+        info = ssh._parse_driver_info(self.node)
+        exec_ssh_mock.return_value = ('"NodeName"\n"seed"\n', '')
+        get_hosts_name_mock.side_effect = ['NodeName', 'OtherNode']
+
+        self.assertEqual(states.POWER_ON,
+                         ssh._get_power_status(self.sshclient, info))
+        self.assertEqual(states.POWER_OFF,
+                         ssh._get_power_status(self.sshclient, info))
+        self.assertEqual(1, exec_ssh_mock.call_count)
+
+    @mock.patch.object(processutils, 'ssh_execute', autospec=True)
+    @mock.patch.object(ssh, '_get_hosts_name_for_node', autospec=True)
+    def test__get_power_status_not_cached(self, get_hosts_name_mock,
+                                          exec_ssh_mock):
+        self.config(power_state_cache_ttl=0, group='ssh')
+        info = ssh._parse_driver_info(self.node)
+        exec_ssh_mock.return_value = ('"NodeName"\n', '')
+        get_hosts_name_mock.return_value = 'NodeName'
+
+        ssh._get_power_status(self.sshclient, info)
+        ssh._get_power_status(self.sshclient, info)
+        self.assertEqual(2, exec_ssh_mock.call_count)
+
+    @mock.patch.object(processutils, 'ssh_execute', autospec=True)
+    @mock.patch.object(ssh, '_get_hosts_name_for_node', autospec=True)
+    def test__get_power_status_per_node_command(self, get_hosts_name_mock,
+                                                exec_ssh_mock):
+        self.node.driver_info['ssh_virt_type'] = 'vmware'
+        info = ssh._parse_driver_info(self.node)
+        exec_ssh_mock.return_value = ('"NodeName"\n', '')
+        get_hosts_name_mock.return_value = 'NodeName'
+
+        ssh._get_power_status(self.sshclient, info)
+        ssh._get_power_status(self.sshclient, info)
+        self.assertEqual(2, exec_ssh_mock.call_count)
+        self.assertIsNone(ssh._get_inventory(info).running)
+
+    @mock.patch.object(processutils, 'ssh_execute', autospec=True)
+    @mock.patch.object(ssh, '_get_hosts_name_for_node', autospec=True)
+    def test__power_on_refreshes_power_state(self, get_hosts_name_mock,
+                                             exec_ssh_mock):
+        info = ssh._parse_driver_info(self.node)
+        ssh._get_inventory(info).running = ['NodeName']
+        get_hosts_name_mock.return_value = 'NodeName'
+        exec_ssh_mock.side_effect = [('', ''), ('', ''), ('NodeName', '')]
+
+        self.assertEqual(states.POWER_ON, ssh._power_on(self.sshclient, info))
+        self.assertEqual(3, exec_ssh_mock.call_count)
+        self.assertEqual(['NodeName'], ssh._get_inventory(info).running)
+
     @mock.patch.object(processutils, 'ssh_execute', autospec=True)
     @mock.patch.object(ssh, '_get_power_status', autospec=True)
     @mock.patch.object(ssh, '_get_hosts_name_for_node', autospec=True)
@@ -588,6 +781,10 @@ class SSHDriverTestCase(db_base.DbTestCase):
 
     def setUp(self):
         super(SSHDriverTestCase, self).setUp()
+        for name in ('_CONNECTIONS', '_INVENTORIES'):
+            patcher = mock.patch.dict(getattr(ssh, name), clear=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
         mgr_utils.mock_the_extension_manager(driver="fake_ssh")
         self.driver = driver_factory.get_driver("fake_ssh")
         self.node = obj_utils.create_test_node(
@@ -1004,6 +1201,49 @@ class SSHDriverTestCase(db_base.DbTestCase):
             self.assertEqual(expected,
                              self.driver.management.get_boot_device(task))
 
+    def test_get_power_state_bulk_key(self):
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            expected = ssh._get_host_key(ssh._parse_driver_info(task.node))
+            self.assertEqual(expected,
+                             self.driver.power.get_power_state_bulk_key(task))
+
+    def test_get_power_state_bulk_key_vmware(self):
+        with task_manager.acquire(self.context, self.node.uuid) as task:
+            task.node['driver_info']['ssh_virt_type'] = 'vmware'
+            self.assertIsNone(
+                self.driver.power.get_power_state_bulk_key(task))
+
+    @mock.patch.object(ssh, '_get_connection', autospec=True)
+    @mock.patch.object(ssh, '_get_hosts_name_for_node', autospec=True)
+    @mock.patch.object(ssh, '_ssh_execute', autospec=True)
+    def test_get_power_state_bulk(self, mock_exc, mock_h, mock_get_conn):
+        node2 = obj_utils.create_test_node(
+            self.context, uuid=uuidutils.generate_uuid(), driver='fake_ssh',
+            driver_info=db_utils.get_test_ssh_info())
+        node3 = obj_utils.create_test_node(
+            self.context, uuid=uuidutils.generate_uuid(), driver='fake_ssh',
+            driver_info=db_utils.get_test_ssh_info())
+        mock_get_conn.return_value = self.sshclient
+        mock_exc.return_value = ['"vm1"']
+        mock_h.side_effect = ['vm1', 'vm2', exception.NodeNotFound(node='x')]
+        tasks = [task_manager.acquire(self.context, uuid, shared=True)
+                 for uuid in (self.node.uuid, node2.uuid, node3.uuid)]
+        try:
+            result = self.driver.power.get_power_state_bulk(tasks)
+        finally:
+            for task in tasks:
+                task.release_resources()
+
+        self.assertEqual({self.node.uuid: states.POWER_ON,
+                          node2.uuid: states.POWER_OFF}, result)
+        info = ssh._parse_driver_info(self.node)
+        mock_exc.assert_called_once_with(
+            self.sshclient, "%s %s" % (info['cmd_set']['base_cmd'],
+                                       info['cmd_set']['list_running']))
+        self.assertEqual(3, mock_h.call_count)
+        inventory = ssh._get_inventory(info)
+        self.assertEqual(['"vm1"'], inventory.running)
+
     @mock.patch.object(ssh, '_get_connection', autospec=True)
     @mock.patch.object(ssh, '_get_hosts_name_for_node', autospec=True)
     @mock.patch.object(ssh, '_ssh_execute', autospec=True)
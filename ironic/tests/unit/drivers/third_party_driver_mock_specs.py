@@ -73,6 +73,7 @@ PYWSMAN_SPEC = (
 PYWSNMP_SPEC = (
     'entity',
     'error',
+    'hlapi',
     'proto',
 )
 
@@ -153,6 +153,8 @@ if not pysnmp:
         pysnmp.entity.rfc3413.oneliner.cmdgen)
     sys.modules["pysnmp.error"] = pysnmp.error
     pysnmp.error.PySnmpError = Exception
+    sys.modules["pysnmp.hlapi"] = pysnmp.hlapi
+    sys.modules["pysnmp.hlapi.asyncore"] = pysnmp.hlapi.asyncore
     sys.modules["pysnmp.proto"] = pysnmp.proto
     sys.modules["pysnmp.proto.rfc1902"] = pysnmp.proto.rfc1902
     # Patch the RFC1902 integer class with a python int
@@ -61,7 +61,18 @@ class TestConductorObject(db_base.DbTestCase):
                 c = objects.Conductor.get_by_hostname(self.context, host)
                 c.touch(self.context)
                 mock_get_cdr.assert_called_once_with(host)
-                mock_touch_cdr.assert_called_once_with(host)
+                mock_touch_cdr.assert_called_once_with(host, saturation=None)
+
+    def test_touch_saturation(self):
+        host = self.fake_conductor['hostname']
+        with mock.patch.object(self.dbapi, 'get_conductor',
+                               autospec=True) as mock_get_cdr:
+            with mock.patch.object(self.dbapi, 'touch_conductor',
+                                   autospec=True) as mock_touch_cdr:
+                mock_get_cdr.return_value = self.fake_conductor
+                c = objects.Conductor.get_by_hostname(self.context, host)
+                c.touch(saturation=0.5)
+                mock_touch_cdr.assert_called_once_with(host, saturation=0.5)
 
     def test_refresh(self):
         host = self.fake_conductor['hostname']
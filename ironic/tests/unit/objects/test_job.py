@@ -0,0 +1,101 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from ironic.common import exception
+from ironic.common import states
+from ironic import objects
+from ironic.tests.unit.db import base as db_base
+from ironic.tests.unit.db import utils as db_utils
+
+
+class TestJobObject(db_base.DbTestCase):
+
+    def setUp(self):
+        super(TestJobObject, self).setUp()
+        self.job_dict = db_utils.get_test_job()
+
+    @mock.patch('ironic.objects.Job.get_by_uuid')
+    @mock.patch('ironic.objects.Job.get_by_id')
+    def test_get(self, mock_get_by_id, mock_get_by_uuid):
+        id = self.job_dict['id']
+        uuid = self.job_dict['uuid']
+
+        objects.Job.get(self.context, id)
+        mock_get_by_id.assert_called_once_with(self.context, id)
+        self.assertFalse(mock_get_by_uuid.called)
+
+        objects.Job.get(self.context, uuid)
+        mock_get_by_uuid.assert_called_once_with(self.context, uuid)
+
+        self.assertRaises(exception.InvalidIdentity,
+                          objects.Job.get,
+                          self.context, 'not-valid-identifier')
+
+    def test_get_by_uuid(self):
+        uuid = self.job_dict['uuid']
+        with mock.patch.object(self.dbapi, 'get_job_by_uuid',
+                               autospec=True) as mock_get_job:
+            mock_get_job.return_value = self.job_dict
+
+            job = objects.Job.get_by_uuid(self.context, uuid)
+
+            mock_get_job.assert_called_once_with(uuid)
+            self.assertIsInstance(job, objects.Job)
+            self.assertEqual(self.context, job._context)
+
+    def test_create(self):
+        with mock.patch.object(self.dbapi, 'create_job',
+                               autospec=True) as mock_db_create:
+            mock_db_create.return_value = self.job_dict
+            new_job = objects.Job(self.context, **self.job_dict)
+            new_job.create()
+
+            mock_db_create.assert_called_once_with(self.job_dict)
+
+    def test_save(self):
+        uuid = self.job_dict['uuid']
+        result = {'boot_device': 'pxe', 'persistent': False}
+        with mock.patch.object(self.dbapi, 'get_job_by_uuid',
+                               autospec=True) as mock_get_job:
+            mock_get_job.return_value = self.job_dict
+            with mock.patch.object(self.dbapi, 'update_job',
+                                   autospec=True) as mock_update_job:
+                mock_update_job.return_value = db_utils.get_test_job(
+                    status=states.JOB_SUCCESS, result=result)
+                job = objects.Job.get_by_uuid(self.context, uuid)
+                job.status = states.JOB_SUCCESS
+                job.result = result
+                job.save()
+
+                mock_update_job.assert_called_once_with(
+                    uuid,
+                    {'version': objects.Job.VERSION,
+                     'status': states.JOB_SUCCESS,
+                     'result': result})
+                self.assertEqual(result, job.result)
+
+    def test_refresh(self):
+        uuid = self.job_dict['uuid']
+        returns = [self.job_dict,
+                   db_utils.get_test_job(status=states.JOB_RUNNING)]
+        with mock.patch.object(self.dbapi, 'get_job_by_uuid',
+                               side_effect=returns,
+                               autospec=True) as mock_get_job:
+            job = objects.Job.get_by_uuid(self.context, uuid)
+            self.assertEqual(states.JOB_PENDING, job.status)
+            job.refresh()
+            self.assertEqual(states.JOB_RUNNING, job.status)
+
+            self.assertEqual([mock.call(uuid), mock.call(uuid)],
+                             mock_get_job.call_args_list)
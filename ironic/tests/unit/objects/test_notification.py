@@ -13,6 +13,7 @@
 import mock
 
 from ironic.common import exception
+from ironic.common import notification_queue
 from ironic.objects import base
 from ironic.objects import fields
 from ironic.objects import notification
@@ -130,6 +131,45 @@ class TestNotificationBase(test_base.TestCase):
             expected_publisher='ironic-conductor.host',
             notif_level=fields.NotificationLevel.DEBUG)
 
+    @mock.patch.object(notification_queue, 'put', autospec=True)
+    @mock.patch('ironic.common.rpc.VERSIONED_NOTIFIER')
+    def test_emit_notification_queued(self, mock_notifier, mock_put):
+        self.config(notification_level='debug', notification_queue_size=10)
+        payload = self.TestNotificationPayload(an_extra_field='extra',
+                                               an_optional_field=1)
+        payload.populate_schema(test_obj=self.fake_obj)
+        notif = self.TestNotification(
+            event_type=notification.EventType(
+                object='test_object', action='test',
+                status=fields.NotificationStatus.START),
+            level=fields.NotificationLevel.DEBUG,
+            publisher=notification.NotificationPublisher(
+                service='ironic-conductor',
+                host='host'),
+            payload=payload)
+
+        mock_context = mock.Mock()
+        notif.emit(mock_context)
+
+        self.assertFalse(mock_notifier.prepare.called)
+        mock_put.assert_called_once_with(
+            mock_context, 'ironic-conductor.host',
+            fields.NotificationLevel.DEBUG,
+            'baremetal.test_object.test.start', mock.ANY)
+        self.assertEqual('TestNotificationPayload',
+                         mock_put.call_args[0][4]['ironic_object.name'])
+
+    def test_should_notify(self):
+        self.assertFalse(
+            notification.should_notify(fields.NotificationLevel.CRITICAL))
+        self.config(notification_level='warning')
+        self.assertFalse(
+            notification.should_notify(fields.NotificationLevel.INFO))
+        self.assertTrue(
+            notification.should_notify(fields.NotificationLevel.WARNING))
+        self.assertTrue(
+            notification.should_notify(fields.NotificationLevel.ERROR))
+
     @mock.patch('ironic.common.rpc.VERSIONED_NOTIFIER')
     def test_no_emit_level_too_low(self, mock_notifier):
         # Make sure notification doesn't emit when set notification
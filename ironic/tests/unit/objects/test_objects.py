@@ -685,7 +685,7 @@ expected_object_fingerprints = {
     'Chassis': '1.3-d656e039fd8ae9f34efc232ab3980905',
     'Port': '1.7-898a47921f4a1f53fcdddd4eeb179e0b',
     'Portgroup': '1.3-71923a81a86743b313b190f5c675e258',
-    'Conductor': '1.2-5091f249719d4a465062a1b3dc7f860d',
+    'Conductor': '1.3-5091f249719d4a465062a1b3dc7f860d',
     'EventType': '1.1-aa2ba1afd38553e3880c267404e8d370',
     'NotificationPublisher': '1.0-51a09397d6c0687771fb5be9a999605d',
     'NodePayload': '1.4-1ab0efe090ee3b2bd48d280a5acec1d4',
@@ -713,6 +713,7 @@ expected_object_fingerprints = {
     'VolumeConnectorCRUDPayload': '1.0-5e8dbb41e05b6149d8f7bfd4daff9339',
     'VolumeTargetCRUDNotification': '1.0-59acc533c11d306f149846f922739c15',
     'VolumeTargetCRUDPayload': '1.0-30dcc4735512c104a3a36a2ae1e2aeb2',
+    'Job': '1.0-d77a8fc7a1404b1cc80a23d3bd05dee4',
 }
 
 
@@ -44,3 +44,4 @@ class PolicyFixture(fixtures.Fixture):
         CONF.set_override('policy_file', self.policy_file_name, 'oslo_policy')
         ironic_policy._ENFORCER = None
         self.addCleanup(ironic_policy.get_enforcer().clear)
+        self.addCleanup(ironic_policy.disable_request_cache)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the API version checks of a node detail listing.
+
+Converting a node for the API hides the fields which are not available to
+the requested API version. This script runs those checks for every node of
+a listing by comparing the requested version for every field, like the API
+used to, and by checking the bitmap of features computed once per request.
+"""
+
+import argparse
+import threading
+import timeit
+
+from oslo_config import cfg
+import pecan.core
+import wsme
+
+from ironic.api.controllers import base
+from ironic.api.controllers.v1 import node
+from ironic.api.controllers.v1 import utils as api_utils
+from ironic.api.controllers.v1 import versions
+from ironic.common import states
+
+CONF = cfg.CONF
+
+
+class FakeRequest(object):
+    def __init__(self, version):
+        self.version = version
+
+
+class FakeNode(object):
+    provision_state = states.AVAILABLE
+
+
+def legacy_hide_fields(obj):
+    """Version comparisons done by the API before the feature bitmap."""
+    version = pecan.request.version
+    if version.minor < versions.MINOR_2_AVAILABLE_STATE:
+        obj.provision_state = states.NOSTATE
+    if version.minor < versions.MINOR_3_DRIVER_INTERNAL_INFO:
+        obj.driver_internal_info = wsme.Unset
+    if not api_utils.allow_node_logical_names():
+        obj.name = wsme.Unset
+    if pecan.request.version.minor < versions.MINOR_6_INSPECT_STATE:
+        obj.inspection_finished_at = wsme.Unset
+        obj.inspection_started_at = wsme.Unset
+    if pecan.request.version.minor < versions.MINOR_7_NODE_CLEAN:
+        obj.clean_step = wsme.Unset
+    if pecan.request.version.minor < versions.MINOR_12_RAID_CONFIG:
+        obj.raid_config = wsme.Unset
+        obj.target_raid_config = wsme.Unset
+    if pecan.request.version.minor < versions.MINOR_20_NETWORK_INTERFACE:
+        obj.network_interface = wsme.Unset
+    if not api_utils.allow_resource_class():
+        obj.resource_class = wsme.Unset
+    if not api_utils.allow_dynamic_interfaces():
+        for field in api_utils.V31_FIELDS:
+            setattr(obj, field, wsme.Unset)
+    if not api_utils.allow_storage_interface():
+        obj.storage_interface = wsme.Unset
+    api_utils.allow_links_node_states_and_driver_properties()
+    api_utils.allow_portgroups_subcontrollers()
+    api_utils.allow_volume()
+
+
+def feature_hide_fields(obj):
+    """Feature bitmap checks done by Node.convert_with_links()."""
+    features = api_utils.get_request_features()
+    node.update_state_in_older_versions(obj, features)
+    node.hide_fields_in_newer_versions(obj, features)
+    bool(features & api_utils.FEATURE_LINKS_NODE_STATES)
+    bool(features & api_utils.FEATURE_PORTGROUPS_SUBCONTROLLERS)
+    bool(features & api_utils.FEATURE_VOLUME)
+
+
+def run(count, repeat, minor, func):
+    version = base.Version({base.Version.string: '1.%d' % minor},
+                           versions.MIN_VERSION_STRING,
+                           versions.MAX_VERSION_STRING)
+
+    def listing():
+        # NOTE: the API computes the bitmap once per request, in
+        # ironic.api.hooks.FeaturesHook.
+        pecan.core.state.request = FakeRequest(version)
+        pecan.core.state.request.features = api_utils.compute_features(
+            version)
+        for _i in range(count):
+            func(FakeNode())
+
+    return min(timeit.repeat(listing, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--nodes', type=int, default=1000,
+                        help='number of nodes in the listing')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of listings to run, the best is kept')
+    parser.add_argument('--minor', type=int, default=1,
+                        help='minor API version of the requests')
+    args = parser.parse_args()
+
+    CONF([], project='ironic')
+    pecan.core.state = threading.local()
+
+    for name, func in (('versions', legacy_hide_fields),
+                       ('bitmap', feature_hide_fields)):
+        elapsed = run(args.nodes, args.repeat, args.minor, func)
+        print('%-9s %8.2f ms per listing, %6.2f us per node' % (
+              name, elapsed * 1000, elapsed * 1e6 / args.nodes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the cost of building a driver when acquiring nodes.
+
+Every task acquired for a node builds a driver for it: the node interfaces
+are validated against the hardware type and the enabled interfaces, and their
+implementations are attached to a new BareDriver. This script builds drivers
+for nodes of the "fake-hardware" hardware type with all interfaces set, with
+and without the cache of validated compositions, and prints the cost per
+node.
+"""
+
+import argparse
+import timeit
+
+from oslo_config import cfg
+
+from ironic.common import driver_factory
+from ironic.drivers import base as driver_base
+from ironic import objects
+
+CONF = cfg.CONF
+
+
+class FakeTask(object):
+
+    def __init__(self, node):
+        self.node = node
+
+
+def make_nodes(count):
+    interfaces = {'%s_interface' % iface: 'fake'
+                  for iface in driver_base.ALL_INTERFACES}
+    interfaces.update(network_interface='noop', storage_interface='noop')
+    nodes = []
+    for i in range(count):
+        node = objects.Node(id=i, driver='fake-hardware', **interfaces)
+        node.obj_reset_changes()
+        nodes.append(node)
+    return nodes
+
+
+def run(nodes, repeat, cached):
+    def acquire_all():
+        for node in nodes:
+            if not cached:
+                driver_factory._COMPOSITION_CACHE.clear()
+            driver_factory.build_driver_for_task(FakeTask(node))
+
+    return min(timeit.repeat(acquire_all, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--nodes', type=int, default=1000,
+                        help='number of nodes to build drivers for')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of rounds to run, the best is kept')
+    args = parser.parse_args()
+
+    CONF([], project='ironic')
+    CONF.set_override('enabled_hardware_types', ['fake-hardware'])
+    for iface in driver_base.ALL_INTERFACES - {'network', 'storage'}:
+        CONF.set_override('enabled_%s_interfaces' % iface, ['fake'])
+    CONF.set_override('enabled_network_interfaces', ['noop'])
+    CONF.set_override('enabled_storage_interfaces', ['noop'])
+    objects.register_all()
+
+    nodes = make_nodes(args.nodes)
+    for cached in (False, True):
+        elapsed = run(nodes, args.repeat, cached)
+        print('%-9s %8.2f ms per round, %6.2f us per node' % (
+              'cached' if cached else 'uncached', elapsed * 1000,
+              elapsed * 1e6 / args.nodes))
+
+
+if __name__ == '__main__':
+    main()
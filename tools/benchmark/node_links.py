@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the cost of the links of a node detail listing.
+
+Every node of a detail listing links to itself and to its ports, states,
+portgroups and volume sub-resources. This script builds those links for
+every node of a listing by formatting every URL, like the API used to, with
+the per-request link templates, and without the links to sub-resources
+(``?links=false``).
+"""
+
+import argparse
+import threading
+import timeit
+
+from oslo_utils import uuidutils
+import pecan.core
+
+from ironic.api.controllers import link
+from ironic.api.controllers.v1 import node
+
+URL = 'http://127.0.0.1:6385'
+SUB_RESOURCES = ('ports', 'states', 'portgroups', 'volume')
+
+
+class FakeRequest(object):
+    pass
+
+
+def legacy_links(node_obj):
+    """Links built by Node._convert_with_links() before the templates."""
+    for sub in SUB_RESOURCES:
+        setattr(node_obj, sub, [
+            link.Link.make_link('self', URL, 'nodes',
+                                node_obj.uuid + '/' + sub),
+            link.Link.make_link('bookmark', URL, 'nodes',
+                                node_obj.uuid + '/' + sub, bookmark=True)])
+    node_obj.links = [
+        link.Link.make_link('self', URL, 'nodes', node_obj.uuid),
+        link.Link.make_link('bookmark', URL, 'nodes', node_obj.uuid,
+                            bookmark=True)]
+
+
+def template_links(node_obj):
+    node.Node._convert_with_links(node_obj, URL)
+
+
+def no_sub_links(node_obj):
+    node.Node._convert_with_links(node_obj, URL, sub_links=False)
+
+
+def run(nodes, repeat, func):
+    def listing():
+        pecan.core.state.request = FakeRequest()
+        pecan.core.state.request.link_templates = {}
+        for node_obj in nodes:
+            func(node_obj)
+
+    return min(timeit.repeat(listing, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--nodes', type=int, default=1000,
+                        help='number of nodes in the listing')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of listings to run, the best is kept')
+    args = parser.parse_args()
+
+    pecan.core.state = threading.local()
+    nodes = [node.Node(uuid=uuidutils.generate_uuid())
+             for _i in range(args.nodes)]
+
+    for name, func in (('format', legacy_links),
+                       ('templates', template_links),
+                       ('no-links', no_sub_links)):
+        elapsed = run(nodes, args.repeat, func)
+        print('%-9s %8.2f ms per listing, %6.2f us per node' % (
+              name, elapsed * 1000, elapsed * 1e6 / args.nodes))
+
+
+if __name__ == '__main__':
+    main()
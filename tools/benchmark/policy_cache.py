@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the policy cost of a node detail listing.
+
+Converting a node for the API checks the "show_password" and
+"show_instance_secrets" rules against the credentials of the request. This
+script runs those checks for every node of a listing, with and without the
+per-request cache of policy decisions, and prints the cost per node.
+"""
+
+import argparse
+import timeit
+
+from oslo_config import cfg
+
+from ironic.common import policy
+
+CONF = cfg.CONF
+
+CREDS = {
+    'user_id': 'f6a2b4c8d0e1f2a3b4c5d6e7f8091a2b',
+    'project_id': '0c1d2e3f4a5b6c7d8e9f0a1b2c3d4e5f',
+    'roles': ['member', 'reader'],
+    'is_public_api': False,
+    'domain_id': None,
+    'user_domain_id': 'default',
+    'project_domain_id': 'default',
+}
+
+NODE_RULES = ('show_password', 'show_instance_secrets')
+
+
+def list_nodes(count):
+    for _i in range(count):
+        for rule in NODE_RULES:
+            policy.check(rule, CREDS, CREDS)
+
+
+def run(count, repeat, cached):
+    def listing():
+        if cached:
+            policy.enable_request_cache()
+        try:
+            list_nodes(count)
+        finally:
+            policy.disable_request_cache()
+
+    return min(timeit.repeat(listing, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--nodes', type=int, default=1000,
+                        help='number of nodes in the listing')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of listings to run, the best is kept')
+    args = parser.parse_args()
+
+    CONF([], project='ironic')
+    policy.get_enforcer().load_rules()
+
+    for cached in (False, True):
+        elapsed = run(args.nodes, args.repeat, cached)
+        print('%-9s %8.2f ms per listing, %6.2f us per node' % (
+              'cached' if cached else 'uncached', elapsed * 1000,
+              elapsed * 1e6 / args.nodes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the cost of reading the power states of the outlets of a PDU.
+
+A local SNMP agent stands in for an APC rack PDU. This script reads the
+power states of all its outlets one outlet at a time, then all at once with
+SNMP version 1 (pipelined GET requests) and version 2c (GETBULK requests),
+and prints the cost per outlet and the number of requests received by the
+agent.
+"""
+
+import argparse
+import timeit
+
+from ironic.drivers.modules import snmp
+# NOTE: importing the unit tests monkey patches eventlet, which the agent
+# requires
+from ironic.tests.unit.drivers.modules import snmp_agent
+
+
+def get_drivers(agent, version, outlets):
+    snmp_info = {'address': agent.address, 'port': agent.port,
+                 'version': version, 'community': snmp_agent.COMMUNITY}
+    return [snmp.SNMPDriverAPCRackPDU(dict(snmp_info, outlet=outlet))
+            for outlet in range(1, outlets + 1)]
+
+
+def run(agent, version, outlets, repeat, bulk):
+    drivers = get_drivers(agent, version, outlets)
+
+    def read():
+        if bulk:
+            snmp._get_power_states(drivers)
+        else:
+            for driver in drivers:
+                driver.power_state()
+
+    del agent.requests[:]
+    elapsed = min(timeit.repeat(read, number=1, repeat=repeat))
+    return elapsed, len(agent.requests) // repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--outlets', type=int, default=48,
+                        help='number of outlets of the PDU')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of reads to run, the best is kept')
+    args = parser.parse_args()
+
+    column = (snmp.SNMPDriverAPCRackPDU.oid_enterprise +
+              snmp.SNMPDriverAPCRackPDU.oid_device)
+    objects = {column + (outlet,): 1 for outlet in range(1, args.outlets + 1)}
+    with snmp_agent.SNMPAgent(objects) as agent:
+        for name, version, bulk in (('per outlet', snmp.SNMP_V2C, False),
+                                    ('v1 GET', snmp.SNMP_V1, True),
+                                    ('v2c GETBULK', snmp.SNMP_V2C, True)):
+            elapsed, requests = run(agent, version, args.outlets,
+                                    args.repeat, bulk)
+            print('%-12s %8.2f ms per PDU, %6.2f ms per outlet, '
+                  '%3d requests' % (name, elapsed * 1000,
+                                    elapsed * 1000 / args.outlets, requests))
+
+
+if __name__ == '__main__':
+    main()